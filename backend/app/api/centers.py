@@ -2,44 +2,53 @@
 Distribution Centers API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.pagination import page_size, decode_cursor, next_cursor, set_next_cursor
 from app.models import DistributionCenter
 from app.schemas.distribution_center import (
     DistributionCenterCreate,
     DistributionCenterUpdate,
     DistributionCenterResponse
 )
+from app.services.reference_data import reference_data, CENTERS
 
 router = APIRouter(prefix="/centers", tags=["Distribution Centers"])
 
 
 @router.get("", response_model=List[DistributionCenterResponse])
 def get_centers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: str = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all distribution centers"""
-    query = db.query(DistributionCenter)
+    """Get all distribution centers (served from the reference-data cache)"""
+    centers = reference_data.all(db, CENTERS)
 
     if status:
-        query = query.filter(DistributionCenter.status == status)
+        centers = [c for c in centers if c.status == status]
 
-    centers = query.offset(skip).limit(limit).all()
-    return centers
+    limit = page_size(limit)
+    if cursor:
+        (after,) = decode_cursor(cursor, 1)
+        centers = [row for row in centers if row.center_id > after]
+    else:
+        centers = centers[skip:]
+
+    set_next_cursor(response, next_cursor(centers, limit, lambda row: (row.center_id,)))
+    return centers[:limit]
 
 
 @router.get("/{center_id}", response_model=DistributionCenterResponse)
 def get_center(center_id: int, db: Session = Depends(get_db)):
     """Get a specific distribution center"""
-    center = db.query(DistributionCenter).filter(
-        DistributionCenter.center_id == center_id
-    ).first()
+    center = reference_data.get(db, CENTERS, center_id)
 
     if not center:
         raise HTTPException(status_code=404, detail="Distribution center not found")
@@ -55,6 +64,7 @@ def create_center(
     """Create a new distribution center"""
     db_center = DistributionCenter(**center.model_dump())
     db.add(db_center)
+    reference_data.invalidate(db, CENTERS)
     db.commit()
     db.refresh(db_center)
     return db_center
@@ -78,6 +88,7 @@ def update_center(
     for field, value in update_data.items():
         setattr(db_center, field, value)
 
+    reference_data.invalidate(db, CENTERS)
     db.commit()
     db.refresh(db_center)
     return db_center
@@ -94,5 +105,6 @@ def delete_center(center_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Distribution center not found")
 
     db.delete(db_center)
+    reference_data.invalidate(db, CENTERS)
     db.commit()
     return {"message": "Distribution center deleted successfully"}
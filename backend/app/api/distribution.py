@@ -2,29 +2,64 @@
 Distribution API Routes - Core functionality with concurrency control
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from typing import List, Optional
 from datetime import datetime
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse, rows_as_dicts
+from app.core.pagination import (
+    TotalMode,
+    page_size,
+    decode_cursor,
+    keyset_after,
+    next_cursor,
+    count_rows
+)
 from app.schemas.distribution import (
     DistributionRequest,
     DistributionResponse,
+    BatchDistributionRequest,
+    BatchDistributionItemResult,
+    BatchDistributionResponse,
     EligibilityCheckRequest,
     EligibilityCheckResponse,
-    DistributionLogResponse
+    EligibilityMatrixRequest,
+    EligibilityMatrixResponse,
+    DistributionLogPage,
+    HouseholdDistributionHistory
 )
 from app.services.distribution_service import DistributionService
-from app.models import DistributionLog
+from app.services.inventory_strategies import INVENTORY_STRATEGIES
+from app.services.transaction_retry import transient_error_stats
+from app.services import idempotency
+from app.services.idempotency import IdempotentRequest
+from app.core.config import settings
+from app.models import DistributionLog, Household, AidPackage, DistributionCenter
 
 router = APIRouter(prefix="/distribution", tags=["Distribution"])
 
 
+def replayed_response(
+    status: str,
+    message: str,
+    idempotent: IdempotentRequest
+) -> DistributionResponse | None:
+    """Map idempotency.lookup() to the stored response, an HTTP error or None (new key)"""
+    if status == "conflict":
+        raise HTTPException(status_code=422, detail=message)
+    if status == "replay":
+        return DistributionResponse(**idempotent.response)
+    return None
+
+
 @router.post("/distribute", response_model=DistributionResponse)
 def distribute_package(
     request: DistributionRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """
     Distribute aid package to household
@@ -33,19 +68,41 @@ def distribute_package(
     to prevent race conditions when multiple workers distribute simultaneously.
 
     Uses SELECT ... FOR UPDATE to lock inventory rows during distribution.
+
+    With an Idempotency-Key header, repeating the request returns the
+    first successful response instead of distributing again; reusing the
+    key for a different request is rejected with 422.
     """
+    idempotent = None
+    if idempotency_key:
+        idempotent = IdempotentRequest(idempotency_key, idempotency.request_hash(request))
+        replay = replayed_response(*idempotency.lookup(db, idempotent), idempotent)
+        if replay:
+            return replay
+
     status, message, log_id = DistributionService.distribute_package(
         db=db,
         household_id=request.household_id,
         package_id=request.package_id,
         center_id=request.center_id,
         staff_id=request.staff_id,
-        quantity=request.quantity
+        quantity=request.quantity,
+        idempotent=idempotent
     )
 
+    if status == "duplicate":
+        # A concurrent request with the same key committed first
+        replay = replayed_response(*idempotency.lookup(db, idempotent), idempotent)
+        if replay is None:
+            raise HTTPException(status_code=409, detail="Idempotency-Key is in use, please retry")
+        return replay
+
     if status == "error":
         raise HTTPException(status_code=400, detail=message)
 
+    if idempotent:
+        return DistributionResponse(**idempotent.response)
+
     return DistributionResponse(
         status=status,
         message=message,
@@ -54,6 +111,45 @@ def distribute_package(
     )
 
 
+@router.post("/distribute-batch", response_model=BatchDistributionResponse)
+def distribute_batch(
+    request: BatchDistributionRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Distribute many aid packages in one call
+
+    Items are grouped by center and each center runs as ONE transaction:
+    inventory rows are locked in ascending package order (SELECT ... FOR UPDATE)
+    and all distribution logs are written with a single multi-row INSERT.
+
+    Every item gets its own result; an ineligible household or an empty
+    shelf fails only that item, not the rest of the batch.
+    """
+    outcomes = DistributionService.distribute_batch(db=db, items=request.items)
+
+    results = [
+        BatchDistributionItemResult(
+            index=index,
+            household_id=item.household_id,
+            package_id=item.package_id,
+            center_id=item.center_id,
+            status=status,
+            message=message,
+            log_id=log_id
+        )
+        for index, (item, (status, message, log_id)) in enumerate(zip(request.items, outcomes))
+    ]
+    succeeded = sum(1 for result in results if result.status == "success")
+
+    return BatchDistributionResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        distribution_date=datetime.now()
+    )
+
+
 @router.post("/check-eligibility", response_model=EligibilityCheckResponse)
 def check_eligibility(
     request: EligibilityCheckRequest,
@@ -78,49 +174,207 @@ def check_eligibility(
     )
 
 
-@router.get("/logs")
+@router.post("/eligibility-matrix", response_model=EligibilityMatrixResponse)
+def check_eligibility_matrix(
+    request: EligibilityMatrixRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Check every household against every package in one call
+
+    Each cell carries the same (eligible, message) as check-eligibility.
+    Read-only; runs a fixed number of set-based queries per chunk of
+    households instead of one call per pair.
+    """
+    cells = len(set(request.household_ids)) * len(set(request.package_ids))
+    if cells > settings.ELIGIBILITY_MATRIX_MAX_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Matrix too large: {cells} cells requested, "
+                f"maximum is {settings.ELIGIBILITY_MATRIX_MAX_CELLS}"
+            )
+        )
+
+    outcomes = DistributionService.check_eligibility_matrix(
+        db=db,
+        household_ids=request.household_ids,
+        package_ids=request.package_ids
+    )
+
+    results = [
+        EligibilityCheckResponse(
+            eligible=eligible,
+            message=message,
+            household_id=household_id,
+            package_id=package_id
+        )
+        for household_id, package_id, eligible, message in outcomes
+    ]
+
+    return EligibilityMatrixResponse(
+        results=results,
+        eligible=sum(1 for result in results if result.eligible),
+        total=len(results)
+    )
+
+
+@router.get("/strategy-stats")
+def get_strategy_stats():
+    """
+    Inventory concurrency strategy configuration and counters, and the
+    lock wait timeout / deadlock retry counters of distribute_package
+    (errors seen, retries, give-ups on retries or on the deadline)
+
+    Counters are per API process and reset on restart.
+    """
+    return {
+        "default_strategy": settings.DISTRIBUTION_LOCK_STRATEGY,
+        "strategy_by_center": settings.DISTRIBUTION_LOCK_STRATEGY_BY_CENTER,
+        "max_retries": settings.OPTIMISTIC_MAX_RETRIES,
+        "strategies": {
+            name: strategy.stats.snapshot()
+            for name, strategy in INVENTORY_STRATEGIES.items()
+        },
+        "lock_wait_timeout_seconds": settings.DISTRIBUTION_LOCK_WAIT_TIMEOUT_SECONDS,
+        "transient_errors": transient_error_stats.snapshot()
+    }
+
+
+# Columns of a log row in API responses, names included (one PK join each
+# instead of loading three ORM relationships per row)
+LOG_COLUMNS = (
+    DistributionLog.log_id,
+    DistributionLog.distribution_date,
+    DistributionLog.transaction_status,
+    DistributionLog.household_id,
+    DistributionLog.package_id,
+    DistributionLog.center_id,
+    DistributionLog.staff_id,
+    DistributionLog.quantity_distributed,
+    DistributionLog.failure_reason,
+    DistributionLog.notes,
+    Household.primary_contact_name.label("household_contact"),
+    AidPackage.package_name,
+    DistributionCenter.center_name,
+)
+LOG_KEYS = tuple(column.key for column in LOG_COLUMNS)
+
+
+def logs_statement(
+    limit: int | None,
+    offset: int = 0,
+    cursor: str | None = None,
+    household_id: int | None = None
+):
+    """
+    Newest-first page of distribution logs (limit + 1 rows of LOG_COLUMNS;
+    every row when limit is None)
+
+    With a cursor the page starts after the (distribution_date, log_id) it
+    encodes - a range scan on idx_date, whose entries already end with the
+    primary key - and offset is ignored.
+    """
+    statement = select(*LOG_COLUMNS).select_from(DistributionLog).outerjoin(
+        Household, Household.household_id == DistributionLog.household_id
+    ).outerjoin(
+        AidPackage, AidPackage.package_id == DistributionLog.package_id
+    ).outerjoin(
+        DistributionCenter, DistributionCenter.center_id == DistributionLog.center_id
+    )
+
+    if household_id is not None:
+        statement = statement.filter(DistributionLog.household_id == household_id)
+
+    if cursor:
+        statement = statement.filter(keyset_after(
+            (DistributionLog.distribution_date, DistributionLog.log_id),
+            decode_cursor(cursor, 2),
+            descending=True
+        ))
+    elif offset:
+        statement = statement.offset(offset)
+
+    statement = statement.order_by(
+        DistributionLog.distribution_date.desc(),
+        DistributionLog.log_id.desc()
+    )
+    return statement if limit is None else statement.limit(limit + 1)
+
+
+def log_sort_key(log):
+    return (log.distribution_date, log.log_id)
+
+
+# Page size of a household history paged with a cursor but no limit
+HISTORY_PAGE_SIZE = 100
+
+
+def history_page_size(limit: int | None, cursor: str | None) -> int | None:
+    """Page size of a household history: None (everything) unless paging was asked for"""
+    if limit is None and cursor is None:
+        return None
+    return page_size(HISTORY_PAGE_SIZE if limit is None else limit)
+
+
+@router.get("/logs", response_model=DistributionLogPage)
 def get_distribution_logs(
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    total: TotalMode = "exact",
     db: Session = Depends(get_db)
 ):
     """
-    Get distribution logs (audit trail)
+    Get distribution logs (audit trail), newest first
+
+    Pass `next_cursor` back as `cursor` for the next page; `offset` still
+    works but reads every skipped row. `total` is a COUNT(*) by default;
+    total=estimated reads it from table statistics instead (instant on a
+    large log), total=none skips it.
     """
-    logs = db.query(DistributionLog).options(
-        joinedload(DistributionLog.household),
-        joinedload(DistributionLog.package),
-        joinedload(DistributionLog.center)
-    ).order_by(
-        DistributionLog.distribution_date.desc()
-    ).offset(offset).limit(limit).all()
+    limit = page_size(limit)
+    logs = db.execute(logs_statement(limit, offset, cursor)).all()
 
-    return {
-        "logs": [DistributionLogResponse.model_validate(log) for log in logs],
-        "total": db.query(DistributionLog).count(),
+    return FastJSONResponse({
+        "logs": rows_as_dicts(logs[:limit], LOG_KEYS),
+        "next_cursor": next_cursor(logs, limit, log_sort_key),
+        "total": count_rows(db, DistributionLog, total),
+        "total_estimated": total == "estimated",
         "limit": limit,
         "offset": offset
-    }
+    })
 
 
-
-@router.get("/logs/household/{household_id}")
+@router.get("/logs/household/{household_id}", response_model=HouseholdDistributionHistory)
 def get_household_distribution_history(
     household_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
-    Get distribution history for a specific household
+    Get distribution history for a specific household, newest first
+
+    The full history by default; with `limit` (or a `cursor`) one page,
+    continued by passing `next_cursor` back as `cursor`.
     """
-    logs = db.query(DistributionLog).filter(
+    limit = history_page_size(limit, cursor)
+    logs = db.execute(
+        logs_statement(limit, cursor=cursor, household_id=household_id)
+    ).all()
+
+    # Index range count on idx_household_package
+    household_total = db.query(func.count(DistributionLog.log_id)).filter(
         DistributionLog.household_id == household_id
-    ).order_by(DistributionLog.distribution_date.desc()).all()
+    ).scalar()
 
-    return {
+    return FastJSONResponse({
         "household_id": household_id,
-        "distributions": logs,
-        "total": len(logs)
-    }
+        "distributions": rows_as_dicts(logs[:limit], LOG_KEYS),
+        "next_cursor": next_cursor(logs, limit, log_sort_key) if limit else None,
+        "total": household_total
+    })
 
 
 @router.delete("/test/reset")
@@ -134,11 +388,7 @@ def reset_test_data(
     This allows the concurrency demo to be run multiple times
     """
     try:
-        deleted_count = db.query(DistributionLog).filter(
-            DistributionLog.household_id.in_(household_ids),
-            DistributionLog.package_id == package_id
-        ).delete(synchronize_session=False)
-        
+        deleted_count = DistributionService.delete_logs(db, household_ids, package_id)
         db.commit()
         
         return {
@@ -0,0 +1,285 @@
+"""
+Distribution API Routes (async) - same endpoints as distribution.py on an
+AsyncSession
+
+Mounted instead of distribution.py when settings.ASYNC_DB_ENABLED is set:
+a request waiting on an inventory row lock awaits its connection instead
+of holding a threadpool thread.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Header
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+
+from app.core.database import get_async_db
+from app.core.pagination import TotalMode, page_size, next_cursor, count_rows
+from app.core.responses import FastJSONResponse, rows_as_dicts
+from app.schemas.distribution import (
+    DistributionRequest,
+    DistributionResponse,
+    BatchDistributionRequest,
+    BatchDistributionItemResult,
+    BatchDistributionResponse,
+    EligibilityCheckRequest,
+    EligibilityCheckResponse,
+    EligibilityMatrixRequest,
+    EligibilityMatrixResponse,
+    DistributionLogPage,
+    HouseholdDistributionHistory
+)
+from app.services.async_distribution_service import AsyncDistributionService
+from app.services.distribution_service import DistributionService
+from app.services import idempotency
+from app.services.idempotency import IdempotentRequest
+from app.core.config import settings
+from app.models import DistributionLog
+from app.api.distribution import (
+    get_strategy_stats,
+    logs_statement,
+    log_sort_key,
+    history_page_size,
+    replayed_response,
+    LOG_KEYS
+)
+
+router = APIRouter(prefix="/distribution", tags=["Distribution"])
+
+
+@router.post("/distribute", response_model=DistributionResponse)
+async def distribute_package(
+    request: DistributionRequest,
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
+):
+    """
+    Distribute aid package to household
+
+    Same ACID transaction and SELECT ... FOR UPDATE locking as the sync
+    endpoint; lock waits are awaited on the event loop. Idempotency-Key
+    handling is the sync endpoint's too.
+    """
+    idempotent = None
+    if idempotency_key:
+        idempotent = IdempotentRequest(idempotency_key, idempotency.request_hash(request))
+        replay = replayed_response(*await db.run_sync(idempotency.lookup, idempotent), idempotent)
+        if replay:
+            return replay
+
+    status, message, log_id = await AsyncDistributionService.distribute_package(
+        db=db,
+        household_id=request.household_id,
+        package_id=request.package_id,
+        center_id=request.center_id,
+        staff_id=request.staff_id,
+        quantity=request.quantity,
+        idempotent=idempotent
+    )
+
+    if status == "duplicate":
+        # A concurrent request with the same key committed first
+        replay = replayed_response(*await db.run_sync(idempotency.lookup, idempotent), idempotent)
+        if replay is None:
+            raise HTTPException(status_code=409, detail="Idempotency-Key is in use, please retry")
+        return replay
+
+    if status == "error":
+        raise HTTPException(status_code=400, detail=message)
+
+    if idempotent:
+        return DistributionResponse(**idempotent.response)
+
+    return DistributionResponse(
+        status=status,
+        message=message,
+        log_id=log_id,
+        distribution_date=datetime.now()
+    )
+
+
+@router.post("/distribute-batch", response_model=BatchDistributionResponse)
+async def distribute_batch(
+    request: BatchDistributionRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Distribute many aid packages in one call
+
+    One transaction per center, inventory rows locked in ascending
+    package order; every item gets its own result.
+    """
+    outcomes = await AsyncDistributionService.distribute_batch(db=db, items=request.items)
+
+    results = [
+        BatchDistributionItemResult(
+            index=index,
+            household_id=item.household_id,
+            package_id=item.package_id,
+            center_id=item.center_id,
+            status=status,
+            message=message,
+            log_id=log_id
+        )
+        for index, (item, (status, message, log_id)) in enumerate(zip(request.items, outcomes))
+    ]
+    succeeded = sum(1 for result in results if result.status == "success")
+
+    return BatchDistributionResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        distribution_date=datetime.now()
+    )
+
+
+@router.post("/check-eligibility", response_model=EligibilityCheckResponse)
+async def check_eligibility(
+    request: EligibilityCheckRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Check if household is eligible for a package
+
+    Read-only operation - no locking required
+    """
+    eligible, message = await AsyncDistributionService.check_eligibility(
+        db=db,
+        household_id=request.household_id,
+        package_id=request.package_id
+    )
+
+    return EligibilityCheckResponse(
+        eligible=eligible,
+        message=message,
+        household_id=request.household_id,
+        package_id=request.package_id
+    )
+
+
+@router.post("/eligibility-matrix", response_model=EligibilityMatrixResponse)
+async def check_eligibility_matrix(
+    request: EligibilityMatrixRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Check every household against every package in one call
+    """
+    cells = len(set(request.household_ids)) * len(set(request.package_ids))
+    if cells > settings.ELIGIBILITY_MATRIX_MAX_CELLS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Matrix too large: {cells} cells requested, "
+                f"maximum is {settings.ELIGIBILITY_MATRIX_MAX_CELLS}"
+            )
+        )
+
+    outcomes = await AsyncDistributionService.check_eligibility_matrix(
+        db=db,
+        household_ids=request.household_ids,
+        package_ids=request.package_ids
+    )
+
+    results = [
+        EligibilityCheckResponse(
+            eligible=eligible,
+            message=message,
+            household_id=household_id,
+            package_id=package_id
+        )
+        for household_id, package_id, eligible, message in outcomes
+    ]
+
+    return EligibilityMatrixResponse(
+        results=results,
+        eligible=sum(1 for result in results if result.eligible),
+        total=len(results)
+    )
+
+
+# Process-local counters, no database access: shared with the sync router
+router.get("/strategy-stats")(get_strategy_stats)
+
+
+@router.get("/logs", response_model=DistributionLogPage)
+async def get_distribution_logs(
+    limit: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    total: TotalMode = "exact",
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get distribution logs (audit trail), newest first
+    """
+    limit = page_size(limit)
+    result = await db.execute(logs_statement(limit, offset, cursor))
+    logs = result.all()
+
+    return FastJSONResponse({
+        "logs": rows_as_dicts(logs[:limit], LOG_KEYS),
+        "next_cursor": next_cursor(logs, limit, log_sort_key),
+        "total": await db.run_sync(count_rows, DistributionLog, total),
+        "total_estimated": total == "estimated",
+        "limit": limit,
+        "offset": offset
+    })
+
+
+@router.get("/logs/household/{household_id}", response_model=HouseholdDistributionHistory)
+async def get_household_distribution_history(
+    household_id: int,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get distribution history for a specific household, newest first
+    (the full history unless `limit` or `cursor` is given)
+    """
+    limit = history_page_size(limit, cursor)
+    result = await db.execute(
+        logs_statement(limit, cursor=cursor, household_id=household_id)
+    )
+    logs = result.all()
+
+    household_total = await db.scalar(
+        select(func.count(DistributionLog.log_id)).filter(
+            DistributionLog.household_id == household_id
+        )
+    )
+
+    return FastJSONResponse({
+        "household_id": household_id,
+        "distributions": rows_as_dicts(logs[:limit], LOG_KEYS),
+        "next_cursor": next_cursor(logs, limit, log_sort_key) if limit else None,
+        "total": household_total
+    })
+
+
+@router.delete("/test/reset")
+async def reset_test_data(
+    household_ids: List[int] = [6, 7],
+    package_id: int = 1,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Reset test data by deleting recent distribution logs for test households
+    This allows the concurrency demo to be run multiple times
+    """
+    try:
+        deleted_count = await db.run_sync(
+            DistributionService.delete_logs, household_ids, package_id
+        )
+        await db.commit()
+
+        return {
+            "status": "success",
+            "message": f"Deleted {deleted_count} test distribution logs",
+            "household_ids": household_ids,
+            "package_id": package_id
+        }
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,95 @@
+"""
+Duplicate Households API Routes - clusters of possibly duplicate
+registrations, found by the detection job, reviewed by staff
+"""
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+
+from app.core.database import get_db
+from app.core.pagination import page_size
+from app.schemas.duplicate import ClusterReviewRequest
+from app.services import duplicate_detection
+
+router = APIRouter(prefix="/duplicates", tags=["Duplicates"])
+
+
+@router.post("/scan", status_code=202)
+def scan_duplicates(
+    background_tasks: BackgroundTasks,
+    full: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Start duplicate detection in the background; poll
+    GET /duplicates/scan/{job_id} for the outcome
+
+    By default only households registered since the last run are checked;
+    `full` compares every pair again. New candidate pairs join the pending
+    clusters they touch or start new ones.
+    """
+    job = duplicate_detection.queue_scan(db, full=full)
+    background_tasks.add_task(duplicate_detection.run_scan, job["job_id"])
+    return job
+
+
+@router.get("/scan/{job_id}")
+def get_scan(job_id: int, db: Session = Depends(get_db)):
+    """
+    A scan job: status queued, running, success, busy (another run held
+    the job) or error; `summary` holds the run's counts once it succeeded
+    """
+    job = duplicate_detection.get_scan(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return job
+
+
+@router.get("/clusters")
+def get_clusters(
+    status: Optional[Literal["pending", "confirmed", "dismissed"]] = "pending",
+    limit: int = 50,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """Duplicate clusters with their households and scored pairs, strongest first"""
+    return duplicate_detection.list_clusters(db, status, page_size(limit), max(offset, 0))
+
+
+@router.get("/clusters/{cluster_id}")
+def get_cluster(cluster_id: int, db: Session = Depends(get_db)):
+    """One duplicate cluster with its households and scored pairs"""
+    cluster = duplicate_detection.get_cluster(db, cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Duplicate cluster not found")
+    return cluster
+
+
+@router.post("/clusters/{cluster_id}/review")
+def review_cluster(
+    cluster_id: int,
+    request: ClusterReviewRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Record a review decision: `confirmed` (same family), `dismissed` (not a
+    duplicate) or `pending` (reopen)
+
+    Reviewed pairs are never proposed again; later registrations matching a
+    reviewed cluster's households start a new cluster.
+    """
+    status, message, cluster = duplicate_detection.review_cluster(
+        db,
+        cluster_id,
+        request.status,
+        request.staff_id,
+        request.notes
+    )
+
+    if status == "not_found":
+        raise HTTPException(status_code=404, detail=message)
+    if status != "success":
+        raise HTTPException(status_code=400, detail=message)
+
+    return cluster
@@ -0,0 +1,173 @@
+"""
+Export API Routes - full extracts streamed as CSV / NDJSON
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime
+from typing import Literal, Optional, Tuple
+
+from app.services.export_service import (
+    ExportFormat,
+    MEDIA_TYPES,
+    stream_query,
+    date_range_params
+)
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+ReportName = Literal["monthly-summary", "distribution-statistics", "pending-households"]
+
+
+def _streaming_response(
+    sql: str,
+    params: dict,
+    name: str,
+    fmt: ExportFormat,
+    gzip: bool
+) -> StreamingResponse:
+    filename = f"{name}-{datetime.now():%Y%m%d-%H%M%S}.{fmt}"
+    media_type = MEDIA_TYPES[fmt]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        stream_query(sql, params, fmt, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/distribution-logs")
+def export_distribution_logs(
+    format: ExportFormat = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    center_id: Optional[int] = None,
+    transaction_status: Optional[str] = None,
+    gzip: bool = False
+):
+    """
+    Stream the distribution log (with package and center names) in log_id order
+
+    `start_date` / `end_date` are inclusive and filter on distribution_date.
+    """
+    conditions = []
+    params = date_range_params(start_date, end_date)
+
+    if start_date:
+        conditions.append("dl.distribution_date >= :start")
+    if end_date:
+        conditions.append("dl.distribution_date < :end")
+    if center_id is not None:
+        conditions.append("dl.center_id = :center_id")
+        params["center_id"] = center_id
+    if transaction_status:
+        conditions.append("dl.transaction_status = :transaction_status")
+        params["transaction_status"] = transaction_status
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    sql = f"""
+        SELECT
+            dl.log_id,
+            dl.distribution_date,
+            dl.transaction_status,
+            dl.household_id,
+            dl.package_id,
+            ap.package_name,
+            ap.category,
+            dl.center_id,
+            dc.center_name,
+            dl.staff_id,
+            dl.quantity_distributed,
+            dl.failure_reason,
+            dl.notes
+        FROM Distribution_Log dl
+        INNER JOIN Aid_Packages ap ON ap.package_id = dl.package_id
+        INNER JOIN Distribution_Centers dc ON dc.center_id = dl.center_id
+        {where}
+        ORDER BY dl.log_id
+    """
+
+    return _streaming_response(sql, params, "distribution-logs", format, gzip)
+
+
+def report_sql(
+    report: ReportName,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    center_id: Optional[int] = None
+) -> Tuple[str, dict]:
+    """
+    SELECT over a report view with the export filters, and its parameters
+
+    - monthly-summary: date range (by month) and center filters
+    - distribution-statistics: center filter
+    - pending-households: no filters
+    """
+    conditions = []
+    params = {}
+
+    if report == "monthly-summary":
+        view = "vw_monthly_summary"
+        order_by = "year, month, center_name, category"
+        if start_date:
+            conditions.append("(year * 100 + month) >= :start_month")
+            params["start_month"] = start_date.year * 100 + start_date.month
+        if end_date:
+            conditions.append("(year * 100 + month) <= :end_month")
+            params["end_month"] = end_date.year * 100 + end_date.month
+        if center_id is not None:
+            conditions.append(
+                "center_name = (SELECT center_name FROM Distribution_Centers "
+                "WHERE center_id = :center_id)"
+            )
+            params["center_id"] = center_id
+
+    elif report == "distribution-statistics":
+        view = "vw_distribution_statistics"
+        order_by = "center_name, total_distributions DESC"
+        conditions.append("total_distributions > 0")
+        if start_date or end_date:
+            raise HTTPException(
+                status_code=400,
+                detail="distribution-statistics covers all time; date filters are not supported"
+            )
+        if center_id is not None:
+            conditions.append("center_id = :center_id")
+            params["center_id"] = center_id
+
+    else:
+        view = "vw_pending_households"
+        order_by = "priority_level, registration_date"
+        if start_date or end_date or center_id is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="pending-households does not support filters"
+            )
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT * FROM {view} {where} ORDER BY {order_by}", params
+
+
+@router.get("/reports/{report}")
+def export_report(
+    report: ReportName,
+    format: ExportFormat = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    center_id: Optional[int] = None,
+    gzip: bool = False
+):
+    """
+    Stream a full report view
+
+    - monthly-summary: date range (by month) and center filters
+    - distribution-statistics: center filter
+    - pending-households: no filters
+    """
+    sql, params = report_sql(report, start_date, end_date, center_id)
+
+    return _streaming_response(sql, params, report, format, gzip)
@@ -2,12 +2,24 @@
 Households API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, rows_as_dicts
+from app.core.pagination import (
+    page_size,
+    decode_cursor,
+    keyset_after,
+    next_cursor,
+    set_next_cursor
+)
 from app.models import Household
+from app.services import pending_queue, household_import, household_search
+from app.services.household_import import ImportFormat
 from app.schemas.household import (
     HouseholdCreate,
     HouseholdUpdate,
@@ -17,6 +29,30 @@ from app.schemas.household import (
 router = APIRouter(prefix="/households", tags=["Households"])
 
 
+# Columns of HouseholdResponse, in Households column order
+HOUSEHOLD_COLUMNS = (
+    Household.household_id,
+    Household.family_name,
+    Household.primary_contact_name,
+    Household.phone_number,
+    Household.email,
+    Household.address,
+    Household.city,
+    Household.state,
+    Household.zip_code,
+    Household.family_size,
+    Household.income_level,
+    Household.priority_level,
+    Household.registration_date,
+    Household.last_verified_date,
+    Household.status,
+    Household.notes,
+    Household.created_at,
+    Household.updated_at,
+)
+HOUSEHOLD_KEYS = tuple(column.key for column in HOUSEHOLD_COLUMNS)
+
+
 @router.get("", response_model=List[HouseholdResponse])
 def get_households(
     skip: int = 0,
@@ -24,22 +60,89 @@ def get_households(
     status: str = None,
     priority: str = None,
     city: str = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all households"""
-    query = db.query(Household)
+    """
+    Get all households, by household_id
+
+    The X-Next-Cursor response header, passed back as `cursor`, fetches the
+    next page with a primary-key range instead of skipping `skip` rows.
+    """
+    statement = select(*HOUSEHOLD_COLUMNS)
 
     if status:
-        query = query.filter(Household.status == status)
+        statement = statement.filter(Household.status == status)
 
     if priority:
-        query = query.filter(Household.priority_level == priority)
+        statement = statement.filter(Household.priority_level == priority)
 
     if city:
-        query = query.filter(Household.city == city)
+        statement = statement.filter(Household.city == city)
+
+    limit = page_size(limit)
+    if cursor:
+        statement = statement.filter(keyset_after((Household.household_id,), decode_cursor(cursor, 1)))
+    else:
+        statement = statement.offset(skip)
+
+    households = db.execute(statement.order_by(Household.household_id).limit(limit + 1)).all()
+
+    response = FastJSONResponse(rows_as_dicts(households[:limit], HOUSEHOLD_KEYS))
+    set_next_cursor(response, next_cursor(households, limit, lambda h: (h.household_id,)))
+    return response
+
+
+@router.post("/import")
+def import_households(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Register many households from a CSV (header row) or NDJSON file
+
+    `format` defaults to the file extension. Rows are validated, checked
+    for duplicate phone numbers (within the file and against existing
+    households) and inserted HOUSEHOLD_IMPORT_CHUNK_SIZE at a time, one
+    transaction per chunk. Every row gets an entry in `rows`.
+    """
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+
+    return household_import.import_households(
+        db,
+        household_import.read_rows(file.file, format),
+        max_rows=settings.HOUSEHOLD_IMPORT_MAX_ROWS
+    )
+
+
+@router.get("/search")
+def search_households(
+    q: str,
+    limit: int = 20,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Find households by name / address fragments, or by the last digits of
+    their phone number when `q` has no letters
+
+    Results are ranked by relevance, at most HOUSEHOLD_SEARCH_MAX_RESULTS.
+    A query the server cannot answer within HOUSEHOLD_SEARCH_TIMEOUT_MS is
+    cancelled and answered with 503.
+    """
+    status_code, message, result = household_search.search_households(
+        db, q, max(limit, 1), status
+    )
+
+    if status_code == "timeout":
+        raise HTTPException(status_code=503, detail=message)
+    if status_code != "success":
+        raise HTTPException(status_code=400, detail=message)
 
-    households = query.offset(skip).limit(limit).all()
-    return households
+    return result
 
 
 @router.get("/{household_id}", response_model=HouseholdResponse)
@@ -74,6 +177,8 @@ def create_household(
 
     db_household = Household(**household.model_dump())
     db.add(db_household)
+    db.flush()
+    pending_queue.sync(db, [db_household.household_id])
     db.commit()
     db.refresh(db_household)
     return db_household
@@ -97,6 +202,9 @@ def update_household(
     for field, value in update_data.items():
         setattr(db_household, field, value)
 
+    # Status, priority and registration date decide queue membership/order
+    db.flush()
+    pending_queue.sync(db, [household_id])
     db.commit()
     db.refresh(db_household)
     return db_household
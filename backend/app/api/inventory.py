@@ -2,80 +2,171 @@
 Inventory API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import text
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, text
+from typing import List, Optional, Tuple
 
 from app.core.database import get_db
-from app.models import Inventory
+from app.core.responses import FastJSONResponse, rows_as_dicts
+from app.core.pagination import (
+    page_size,
+    decode_cursor,
+    keyset_after,
+    next_cursor,
+    set_next_cursor
+)
+from app.models import Inventory, DistributionCenter, AidPackage
 from app.schemas.inventory import (
-    InventoryCreate,
-    InventoryUpdate,
     InventoryResponse,
-    RestockRequest
+    RestockRequest,
+    BulkRestockRequest,
+    ShardConfigRequest
 )
+from app.core.config import settings
 from app.services.distribution_service import DistributionService
+from app.services import restock_service
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
 
 
+# Columns of InventoryResponse; sharded rows report stock summed over shards
+INVENTORY_COLUMNS = (
+    Inventory.inventory_id,
+    Inventory.center_id,
+    Inventory.package_id,
+    Inventory.total_quantity.label("quantity_on_hand"),
+    Inventory.reorder_level,
+    Inventory.shard_count,
+    Inventory.version,
+    Inventory.last_restock_date,
+    Inventory.last_restock_quantity,
+    Inventory.created_at,
+    Inventory.updated_at,
+    DistributionCenter.center_name,
+    func.concat(DistributionCenter.city, ", ", DistributionCenter.state).label("center_location"),
+    AidPackage.package_name,
+    AidPackage.category.label("package_category"),
+)
+INVENTORY_KEYS = tuple(column.key for column in INVENTORY_COLUMNS)
+
+
 @router.get("", response_model=List[InventoryResponse])
 def get_inventory(
     skip: int = 0,
     limit: int = 100,
     center_id: int = None,
     low_stock: bool = False,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get inventory records"""
-    query = db.query(Inventory)
+    """
+    Get inventory records, by inventory_id
+
+    The X-Next-Cursor response header, passed back as `cursor`, fetches the
+    next page with a primary-key range instead of skipping `skip` rows.
+    """
+    statement = select(*INVENTORY_COLUMNS).select_from(Inventory).outerjoin(
+        DistributionCenter, DistributionCenter.center_id == Inventory.center_id
+    ).outerjoin(
+        AidPackage, AidPackage.package_id == Inventory.package_id
+    )
 
     if center_id:
-        query = query.filter(Inventory.center_id == center_id)
+        statement = statement.filter(Inventory.center_id == center_id)
 
     if low_stock:
-        query = query.filter(Inventory.quantity_on_hand <= Inventory.reorder_level)
+        statement = statement.filter(Inventory.total_quantity <= Inventory.reorder_level)
 
-    inventory = query.options(
-        joinedload(Inventory.center),
-        joinedload(Inventory.package)
-    ).offset(skip).limit(limit).all()
-    return inventory
+    limit = page_size(limit)
+    if cursor:
+        statement = statement.filter(keyset_after((Inventory.inventory_id,), decode_cursor(cursor, 1)))
+    else:
+        statement = statement.offset(skip)
+
+    inventory = db.execute(statement.order_by(Inventory.inventory_id).limit(limit + 1)).all()
+
+    items = rows_as_dicts(inventory[:limit], INVENTORY_KEYS)
+    for item in items:
+        item["quantity"] = item["quantity_on_hand"]
+
+    response = FastJSONResponse(items)
+    set_next_cursor(response, next_cursor(inventory, limit, lambda i: (i.inventory_id,)))
+    return response
+
+
+def _inventory_status(
+    db: Session,
+    where: str,
+    order_by: str,
+    limit: int | None,
+    offset: int
+) -> Tuple[List[dict], int, bool]:
+    """
+    Rows of vw_current_inventory_status: all of them, or one page when
+    `limit` is given
+
+    Returns:
+        (rows, total, has_more) - total counts every matching row, also
+        when only a page was read
+    """
+    sql = f"SELECT * FROM vw_current_inventory_status {where} ORDER BY {order_by}"
+    if limit is None:
+        result = db.execute(text(sql))
+        rows = [dict(zip(result.keys(), row)) for row in result.fetchall()]
+        return rows, len(rows), False
+
+    limit = page_size(limit)
+    result = db.execute(
+        text(f"{sql} LIMIT :limit OFFSET :offset"), {"limit": limit + 1, "offset": offset}
+    )
+    rows = [dict(zip(result.keys(), row)) for row in result.fetchall()]
+    total = db.execute(text(f"SELECT COUNT(*) FROM vw_current_inventory_status {where}")).scalar()
+    return rows[:limit], total, len(rows) > limit
 
 
 @router.get("/status")
-def get_inventory_status(db: Session = Depends(get_db)):
-    """Get inventory status from view"""
-    result = db.execute(text("""
-        SELECT * FROM vw_current_inventory_status
-        ORDER BY stock_status, center_name
-    """))
+def get_inventory_status(
+    limit: Optional[int] = None,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Get inventory status from view
 
-    rows = result.fetchall()
-    columns = result.keys()
+    Every row by default; `limit` / `offset` read one page (`total` still
+    counts all rows, `has_more` says whether another page exists).
+    """
+    rows, total, has_more = _inventory_status(
+        db, "", "stock_status, center_name", limit, offset
+    )
 
     return {
-        "inventory": [dict(zip(columns, row)) for row in rows],
-        "total": len(rows)
+        "inventory": rows,
+        "total": total,
+        "has_more": has_more
     }
 
 
 @router.get("/low-stock")
-def get_low_stock_alerts(db: Session = Depends(get_db)):
-    """Get low stock and out of stock items"""
-    result = db.execute(text("""
-        SELECT * FROM vw_current_inventory_status
-        WHERE stock_status IN ('LOW_STOCK', 'OUT_OF_STOCK')
-        ORDER BY stock_status, quantity_on_hand
-    """))
-
-    rows = result.fetchall()
-    columns = result.keys()
+def get_low_stock_alerts(
+    limit: Optional[int] = None,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """Get low stock and out of stock items (paged like /status)"""
+    rows, total, has_more = _inventory_status(
+        db,
+        "WHERE stock_status IN ('LOW_STOCK', 'OUT_OF_STOCK')",
+        "stock_status, quantity_on_hand",
+        limit,
+        offset
+    )
 
     return {
-        "alerts": [dict(zip(columns, row)) for row in rows],
-        "total": len(rows)
+        "alerts": rows,
+        "total": total,
+        "has_more": has_more
     }
 
 
@@ -98,6 +189,93 @@ def restock_inventory(
     return {"status": status, "message": message}
 
 
+def _restock_response(lines, errors, db: Session) -> dict:
+    status, message, summary = restock_service.restock_many(db, lines)
+    summary["rejected"] += len(errors)
+    summary["errors"] = sorted(errors + summary["errors"], key=lambda error: error["line"])
+
+    if status == "error":
+        raise HTTPException(
+            status_code=400,
+            detail={"message": message, "errors": summary["errors"]}
+        )
+
+    return {"status": status, "message": message, **summary}
+
+
+@router.post("/restock/bulk")
+def restock_inventory_bulk(
+    request: BulkRestockRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Restock many (center, package) pairs in one transaction
+
+    Lines are validated one by one: invalid lines are reported in `errors`
+    (`line` is the 1-based position in `lines`) and skipped, the rest are
+    merged per pair and added with atomic upserts.
+    """
+    if len(request.lines) > settings.RESTOCK_MANIFEST_MAX_LINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.RESTOCK_MANIFEST_MAX_LINES} lines per request"
+        )
+
+    lines = [
+        (index, line.center_id, line.package_id, line.quantity)
+        for index, line in enumerate(request.lines, start=1)
+    ]
+    return _restock_response(lines, [], db)
+
+
+@router.post("/restock/manifest")
+def restock_inventory_manifest(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Restock from a CSV manifest (header row with center_id, package_id,
+    quantity; other columns are ignored)
+
+    Same rules as /restock/bulk; `line` in `errors` is the CSV line number.
+    """
+    lines, errors = restock_service.parse_manifest(file.file)
+    return _restock_response(lines, errors, db)
+
+
+@router.put("/{inventory_id}/shards", response_model=InventoryResponse)
+def set_inventory_shards(
+    inventory_id: int,
+    request: ShardConfigRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Split a hot inventory record across N shard rows (1 = no sharding)
+
+    Distributions of a sharded record lock only one shard, so several
+    workers can hand out the same package at the same center in parallel.
+    """
+    inventory = db.query(Inventory).filter(
+        Inventory.inventory_id == inventory_id
+    ).first()
+
+    if not inventory:
+        raise HTTPException(status_code=404, detail="Inventory record not found")
+
+    status, message = DistributionService.set_shard_count(
+        db=db,
+        center_id=inventory.center_id,
+        package_id=inventory.package_id,
+        shard_count=request.shard_count
+    )
+
+    if status == "error":
+        raise HTTPException(status_code=400, detail=message)
+
+    db.refresh(inventory)
+    return inventory
+
+
 @router.get("/{inventory_id}", response_model=InventoryResponse)
 def get_inventory_item(inventory_id: int, db: Session = Depends(get_db)):
     """Get a specific inventory record"""
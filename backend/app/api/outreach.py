@@ -0,0 +1,75 @@
+"""
+Outreach API Routes - caseworkers split the pending-household list
+through claims on Pending_Queue
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.config import settings
+from app.models import StaffMember
+from app.schemas.outreach import ClaimRequest, ReleaseRequest
+from app.services import pending_queue
+
+router = APIRouter(prefix="/outreach", tags=["Outreach"])
+
+
+def _require_active_staff(db: Session, staff_id: int) -> None:
+    staff = db.query(StaffMember.status).filter(StaffMember.staff_id == staff_id).first()
+    if not staff:
+        raise HTTPException(status_code=404, detail="Staff member not found")
+    if staff.status != "active":
+        raise HTTPException(status_code=400, detail="Staff member is not active")
+
+
+@router.post("/claim")
+def claim_households(request: ClaimRequest, db: Session = Depends(get_db)):
+    """
+    Claim the next pending households, highest priority first
+
+    Concurrent claims never return the same household and do not wait on
+    each other. A claim expires after `timeout_seconds` (default
+    PENDING_CLAIM_TIMEOUT_SECONDS) and the household goes back to the queue;
+    a distribution to the household ends it immediately.
+    """
+    if request.count > settings.PENDING_CLAIM_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PENDING_CLAIM_MAX} households per claim"
+        )
+    _require_active_staff(db, request.staff_id)
+
+    households = pending_queue.claim(
+        db,
+        staff_id=request.staff_id,
+        count=request.count,
+        timeout_seconds=request.timeout_seconds
+    )
+
+    return {
+        "staff_id": request.staff_id,
+        "households": households,
+        "claimed": len(households)
+    }
+
+
+@router.get("/claims/{staff_id}")
+def get_claims(staff_id: int, db: Session = Depends(get_db)):
+    """Households a caseworker currently holds (unexpired claims)"""
+    households = pending_queue.claims(db, staff_id)
+    return {
+        "staff_id": staff_id,
+        "households": households,
+        "total": len(households)
+    }
+
+
+@router.post("/release")
+def release_households(request: ReleaseRequest, db: Session = Depends(get_db)):
+    """Give claimed households back to the queue before their claim expires"""
+    released = pending_queue.release(db, request.staff_id, request.household_ids)
+    return {
+        "staff_id": request.staff_id,
+        "released": released
+    }
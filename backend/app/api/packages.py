@@ -2,48 +2,58 @@
 Aid Packages API Routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.core.database import get_db
+from app.core.pagination import page_size, decode_cursor, next_cursor, set_next_cursor
 from app.models import AidPackage
 from app.schemas.aid_package import (
     AidPackageCreate,
     AidPackageUpdate,
     AidPackageResponse
 )
+from app.services.reference_data import reference_data, PACKAGES
+from app.services import last_distribution
 
 router = APIRouter(prefix="/packages", tags=["Aid Packages"])
 
 
 @router.get("", response_model=List[AidPackageResponse])
 def get_packages(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: str = None,
     is_active: bool = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all aid packages"""
-    query = db.query(AidPackage)
+    """Get all aid packages (served from the reference-data cache)"""
+    packages = reference_data.all(db, PACKAGES)
 
     if category:
-        query = query.filter(AidPackage.category == category)
+        packages = [p for p in packages if p.category == category]
 
     if is_active is not None:
-        query = query.filter(AidPackage.is_active == is_active)
+        packages = [p for p in packages if p.is_active == is_active]
 
-    packages = query.offset(skip).limit(limit).all()
-    return packages
+    limit = page_size(limit)
+    if cursor:
+        (after,) = decode_cursor(cursor, 1)
+        packages = [row for row in packages if row.package_id > after]
+    else:
+        packages = packages[skip:]
+
+    set_next_cursor(response, next_cursor(packages, limit, lambda row: (row.package_id,)))
+    return packages[:limit]
 
 
 @router.get("/{package_id}", response_model=AidPackageResponse)
 def get_package(package_id: int, db: Session = Depends(get_db)):
     """Get a specific aid package"""
-    package = db.query(AidPackage).filter(
-        AidPackage.package_id == package_id
-    ).first()
+    package = reference_data.get(db, PACKAGES, package_id)
 
     if not package:
         raise HTTPException(status_code=404, detail="Aid package not found")
@@ -59,6 +69,7 @@ def create_package(
     """Create a new aid package"""
     db_package = AidPackage(**package.model_dump())
     db.add(db_package)
+    reference_data.invalidate(db, PACKAGES)
     db.commit()
     db.refresh(db_package)
     return db_package
@@ -82,6 +93,11 @@ def update_package(
     for field, value in update_data.items():
         setattr(db_package, field, value)
 
+    if "validity_period_days" in update_data:
+        db.flush()
+        last_distribution.refresh_package(db, package_id)
+
+    reference_data.invalidate(db, PACKAGES)
     db.commit()
     db.refresh(db_package)
     return db_package
@@ -98,5 +114,6 @@ def delete_package(package_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Aid package not found")
 
     db.delete(db_package)
+    reference_data.invalidate(db, PACKAGES)
     db.commit()
     return {"message": "Aid package deleted successfully"}
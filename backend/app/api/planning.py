@@ -0,0 +1,86 @@
+"""
+Planning API Routes - allocation plans for scarce stock, reviewed before
+they are executed
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from app.core.database import get_db
+from app.core.config import settings
+from app.schemas.distribution import BatchDistributionItemResult, BatchDistributionResponse
+from app.schemas.planning import AllocationPlanRequest, PlanExecuteRequest
+from app.services.allocation_planner import plan_package
+from app.services.distribution_service import DistributionService
+
+router = APIRouter(prefix="/planning", tags=["Planning"])
+
+
+@router.post("/allocations")
+def plan_allocations(request: AllocationPlanRequest, db: Session = Depends(get_db)):
+    """
+    Plan which households receive each package from which center
+
+    Nothing is distributed: review the returned items, then POST them (as
+    is or edited) to /planning/execute. `refine` switches from the greedy
+    plan to the min-cost-flow one.
+    """
+    plans = []
+    for package_id in dict.fromkeys(request.package_ids):
+        status, message, plan = plan_package(
+            db,
+            package_id=package_id,
+            quantity=request.quantity_per_household,
+            center_ids=request.center_ids,
+            pending_only=request.pending_only,
+            refine=request.refine,
+            cross_city_penalty=request.cross_city_penalty
+        )
+        if status == "error":
+            raise HTTPException(status_code=400, detail=message)
+        plans.append(plan)
+
+    return {
+        "plans": plans,
+        "planned": sum(plan["planned"] for plan in plans),
+        "generated_at": datetime.now()
+    }
+
+
+@router.post("/execute", response_model=BatchDistributionResponse)
+def execute_plan(request: PlanExecuteRequest, db: Session = Depends(get_db)):
+    """
+    Distribute a reviewed plan
+
+    Items go through the batch distribution path PLANNER_EXECUTE_BATCH_SIZE
+    at a time (one transaction per center per batch); eligibility and stock
+    are checked again, so items that went stale since planning fail on
+    their own.
+    """
+    items = request.items
+    size = settings.PLANNER_EXECUTE_BATCH_SIZE
+    outcomes = []
+    for start in range(0, len(items), size):
+        outcomes.extend(DistributionService.distribute_batch(db=db, items=items[start:start + size]))
+
+    results = [
+        BatchDistributionItemResult(
+            index=index,
+            household_id=item.household_id,
+            package_id=item.package_id,
+            center_id=item.center_id,
+            status=status,
+            message=message,
+            log_id=log_id
+        )
+        for index, (item, (status, message, log_id)) in enumerate(zip(items, outcomes))
+    ]
+    succeeded = sum(1 for result in results if result.status == "success")
+
+    return BatchDistributionResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        distribution_date=datetime.now()
+    )
@@ -3,114 +3,172 @@ Reports API Routes - Analytics and summaries
 """
 
 from fastapi import APIRouter, Depends
+from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.core.database import get_db
+from app.core.pagination import page_size
+from app.services import report_rollups, dashboard, pending_queue
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
+def _rollup_as_of(db: Session) -> dict | None:
+    """Watermark of the report rollups: last log_id folded in and when"""
+    mark = report_rollups.watermark(db)
+    if not mark:
+        return None
+    return {"last_log_id": mark.last_log_id, "updated_at": mark.updated_at}
+
+
 @router.get("/monthly-summary")
-def get_monthly_summary(db: Session = Depends(get_db)):
-    """Get monthly distribution summary"""
+def get_monthly_summary(
+    limit: int = 100,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Get monthly distribution summary
+
+    Read from the report rollups (same columns as vw_monthly_summary);
+    `as_of` tells how far the rollup job has caught up.
+    """
+    limit = page_size(limit)
     result = db.execute(text("""
-        SELECT * FROM vw_monthly_summary
-        ORDER BY month DESC, center_name
-        LIMIT 100
-    """))
+        SELECT
+            YEAR(m.month_start) AS year,
+            MONTH(m.month_start) AS month,
+            dc.center_name,
+            m.category,
+            m.total_distributions,
+            COALESCE(u.unique_households, 0) AS unique_households,
+            m.total_packages,
+            m.total_value
+        FROM (
+            SELECT
+                r.rollup_date - INTERVAL (DAYOFMONTH(r.rollup_date) - 1) DAY AS month_start,
+                r.center_id,
+                ap.category,
+                SUM(r.distributions) AS total_distributions,
+                SUM(r.packages_distributed) AS total_packages,
+                SUM(ap.estimated_cost * r.packages_distributed) AS total_value
+            FROM Rollup_Daily_Distributions r
+            INNER JOIN Aid_Packages ap ON ap.package_id = r.package_id
+            GROUP BY month_start, r.center_id, ap.category
+        ) m
+        INNER JOIN Distribution_Centers dc ON dc.center_id = m.center_id
+        LEFT JOIN Rollup_Monthly_Unique u
+          ON u.month_start = m.month_start
+         AND u.center_id = m.center_id
+         AND u.category = m.category
+        ORDER BY year DESC, month DESC, dc.center_name, m.category
+        LIMIT :limit OFFSET :offset
+    """), {"limit": limit + 1, "offset": offset})
 
     rows = result.fetchall()
     columns = result.keys()
 
     return {
-        "summary": [dict(zip(columns, row)) for row in rows]
+        "summary": [dict(zip(columns, row)) for row in rows[:limit]],
+        "has_more": len(rows) > limit,
+        "as_of": _rollup_as_of(db)
     }
 
 
 @router.get("/pending-households")
-def get_pending_households(db: Session = Depends(get_db)):
-    """Get households that haven't received aid recently"""
-    result = db.execute(text("""
-        SELECT * FROM vw_pending_households
-        ORDER BY priority_level, registration_date
-    """))
-
-    rows = result.fetchall()
-    columns = result.keys()
+def get_pending_households(
+    limit: Optional[int] = None,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Get households that haven't received aid recently
+
+    Read from Pending_Queue in outreach order; `claimed_by` /
+    `claim_expires_at` show who is already contacting a household. Every
+    pending household by default; `limit` / `offset` read one page (`total`
+    still counts all of them, `has_more` says whether another page exists).
+    """
+    if limit is None:
+        rows = pending_queue.pending(db)
+        return {"households": rows, "total": len(rows), "has_more": False}
+
+    limit = page_size(limit)
+    rows = pending_queue.pending(db, limit + 1, offset)
 
     return {
-        "households": [dict(zip(columns, row)) for row in rows],
-        "total": len(rows)
+        "households": rows[:limit],
+        "total": pending_queue.count_pending(db),
+        "has_more": len(rows) > limit
     }
 
 
 @router.get("/distribution-statistics")
-def get_distribution_statistics(db: Session = Depends(get_db)):
-    """Get distribution statistics by center and package"""
-    result = db.execute(text("""
-        SELECT * FROM vw_distribution_statistics
-        WHERE total_distributions > 0
-        ORDER BY center_name, total_distributions DESC
-    """))
+def get_distribution_statistics(
+    limit: Optional[int] = None,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Get distribution statistics by center and package
+
+    Read from the report rollups (same columns as vw_distribution_statistics).
+    Every (center, package) by default; `limit` / `offset` read one page.
+    """
+    limit = None if limit is None else page_size(limit)
+    page = "" if limit is None else "LIMIT :limit OFFSET :offset"
+    result = db.execute(text(f"""
+        SELECT
+            dc.center_id,
+            dc.center_name,
+            dc.city,
+            ap.package_id,
+            ap.package_name,
+            ap.category,
+            s.total_distributions,
+            s.total_quantity,
+            COALESCE(u.unique_households, 0) AS unique_households_served,
+            s.first_distribution,
+            s.last_distribution,
+            ap.estimated_cost * s.total_quantity AS total_value_distributed
+        FROM (
+            SELECT
+                center_id,
+                package_id,
+                SUM(distributions) AS total_distributions,
+                SUM(packages_distributed) AS total_quantity,
+                MIN(first_distribution) AS first_distribution,
+                MAX(last_distribution) AS last_distribution
+            FROM Rollup_Daily_Distributions
+            GROUP BY center_id, package_id
+        ) s
+        INNER JOIN Distribution_Centers dc ON dc.center_id = s.center_id
+        INNER JOIN Aid_Packages ap ON ap.package_id = s.package_id
+        LEFT JOIN Rollup_Center_Package_Unique u
+          ON u.center_id = s.center_id
+         AND u.package_id = s.package_id
+        WHERE s.total_distributions > 0
+        ORDER BY dc.center_name, s.total_distributions DESC
+        {page}
+    """), {"limit": None if limit is None else limit + 1, "offset": offset})
 
     rows = result.fetchall()
     columns = result.keys()
 
     return {
-        "statistics": [dict(zip(columns, row)) for row in rows]
+        "statistics": [dict(zip(columns, row)) for row in rows[:limit]],
+        "has_more": limit is not None and len(rows) > limit,
+        "as_of": _rollup_as_of(db)
     }
 
 
 @router.get("/dashboard")
 def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get overall dashboard statistics"""
-
-    # Total households
-    total_households = db.execute(text("""
-        SELECT COUNT(*) as count FROM Households WHERE status = 'active'
-    """)).scalar()
-
-    # Total distributions (successful)
-    total_distributions = db.execute(text("""
-        SELECT COUNT(*) as count FROM Distribution_Log WHERE transaction_status = 'success'
-    """)).scalar()
-
-    # Total centers
-    total_centers = db.execute(text("""
-        SELECT COUNT(*) as count FROM Distribution_Centers WHERE status = 'active'
-    """)).scalar()
-
-    # Low stock items
-    low_stock_count = db.execute(text("""
-        SELECT COUNT(*) as count FROM Inventory
-        WHERE quantity_on_hand <= reorder_level
-    """)).scalar()
-
-    # Critical households (never received aid)
-    critical_households = db.execute(text("""
-        SELECT COUNT(*) as count FROM Households h
-        WHERE h.status = 'active'
-        AND h.priority_level = 'critical'
-        AND NOT EXISTS (
-            SELECT 1 FROM Distribution_Log dl
-            WHERE dl.household_id = h.household_id
-            AND dl.transaction_status = 'success'
-        )
-    """)).scalar()
-
-    # Recent distributions (last 7 days)
-    recent_distributions = db.execute(text("""
-        SELECT COUNT(*) as count FROM Distribution_Log
-        WHERE transaction_status = 'success'
-        AND distribution_date >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-    """)).scalar()
+    """
+    Get overall dashboard statistics
 
-    return {
-        "total_households": total_households,
-        "total_distributions": total_distributions,
-        "total_centers": total_centers,
-        "low_stock_items": low_stock_count,
-        "critical_households": critical_households,
-        "recent_distributions": recent_distributions
-    }
+    One query, cached for DASHBOARD_CACHE_TTL_SECONDS per worker;
+    `as_of` is when the numbers were computed.
+    """
+    return dashboard.get_dashboard(db)
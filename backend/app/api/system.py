@@ -0,0 +1,30 @@
+"""
+System API Routes
+Process-level caches and diagnostics
+"""
+
+from fastapi import APIRouter
+
+from app.services.reference_data import reference_data
+from app.services.dashboard import dashboard_cache
+from app.services.idempotency import idempotency_cache
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+@router.get("/cache")
+def get_cache_stats():
+    """
+    In-process cache counters (hits, misses, evictions, coalesced loads;
+    generation for the reference-data caches)
+
+    Counters are per API process and reset on restart.
+    """
+    return {
+        "enabled": reference_data.enabled,
+        "caches": {
+            **reference_data.stats(),
+            "dashboard": dashboard_cache.stats(),
+            "idempotency": idempotency_cache.stats()
+        }
+    }
@@ -0,0 +1,153 @@
+"""
+In-process caching primitives
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+import threading
+import time
+
+from app.core.metrics import CACHE_REQUESTS
+
+_MISSING = object()
+
+
+class _Load:
+    """A loader in flight: the thread running it, set once it returns"""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.done = threading.Event()
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache with TTL expiry and LRU eviction
+
+    Entries expire `ttl_seconds` after they were stored; when the cache
+    holds `max_entries`, storing a new key evicts the least recently used.
+    Setting `enabled = False` turns every lookup into a miss and every
+    store into a no-op (handy in tests).
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int, enabled: bool = True):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self._loading: dict = {}
+        self._hit_metric = CACHE_REQUESTS.labels(name, "hit")
+        self._miss_metric = CACHE_REQUESTS.labels(name, "miss")
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Cached value for key, or default when absent or expired"""
+        if not self.enabled:
+            return default
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                self._miss_metric.inc()
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit_metric.inc()
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Read-through lookup: call loader on a miss and cache its result
+
+        Single-flight: concurrent misses on the same key from other threads
+        wait for the first caller's loader instead of running their own
+        (counted as coalesced). No lock is held while the loader runs, and a
+        caller never waits for a load started on its own thread: on the
+        async path every request shares the event loop thread, and the
+        loader's query yields to the loop, so waiting there would block the
+        very load it waits for. Such callers run their own loader.
+        """
+        if not self.enabled:
+            return loader()
+
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            load = self._loading.get(key)
+            owner = load is None
+            if owner:
+                load = self._loading[key] = _Load()
+
+        if not owner and load.thread != threading.get_ident():
+            load.done.wait()
+            value = self._peek(key)
+            if value is not _MISSING:
+                with self._lock:
+                    self.coalesced += 1
+                return value
+            # The first loader failed or found nothing: load ourselves
+
+        try:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        finally:
+            if owner:
+                with self._lock:
+                    self._loading.pop(key, None)
+                load.done.set()
+
+        return value
+
+    def _peek(self, key: Hashable) -> Any:
+        """Unexpired value without touching LRU order or counters"""
+        if not self.enabled:
+            return _MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return _MISSING
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Literal, Optional
+
+InventoryStrategyName = Literal["pessimistic", "optimistic", "conditional"]
 
 
 class Settings(BaseSettings):
@@ -13,12 +15,127 @@ class Settings(BaseSettings):
     MYSQL_DATABASE: str = "aidtracker_db"
     DATABASE_URL: Optional[str] = None
 
+    # Async request path (aiomysql + AsyncSession) for the distribution
+    # routes; off by default so it can be rolled out gradually
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
     # API
     API_V1_PREFIX: str = "/api"
     PROJECT_NAME: str = "AidTracker API"
     VERSION: str = "1.0.0"
     DESCRIPTION: str = "Humanitarian Aid Distribution Management System"
 
+    # Distribution concurrency
+    # Strategy used to take stock from an Inventory row; can be overridden
+    # per center, e.g. DISTRIBUTION_LOCK_STRATEGY_BY_CENTER='{"7": "conditional"}'
+    DISTRIBUTION_LOCK_STRATEGY: InventoryStrategyName = "pessimistic"
+    DISTRIBUTION_LOCK_STRATEGY_BY_CENTER: Dict[int, InventoryStrategyName] = {}
+    OPTIMISTIC_MAX_RETRIES: int = 5
+
+    # Largest page any list/report endpoint returns
+    MAX_PAGE_SIZE: int = 1000
+
+    # Report rollups: catch-up job folding Distribution_Log into the
+    # rollup tables. It runs as its own process
+    # (python -m app.services.report_rollups run); ROLLUP_JOB_ENABLED also
+    # starts it inside the API, for single-worker setups. Every
+    # ROLLUP_RECONCILE_INTERVAL_SECONDS the last ROLLUP_RECONCILE_DAYS days
+    # are recomputed to pick up rows that committed after the settle window
+    ROLLUP_JOB_ENABLED: bool = False
+    ROLLUP_INTERVAL_SECONDS: float = 10.0
+    ROLLUP_BATCH_SIZE: int = 50_000
+    ROLLUP_SETTLE_SECONDS: int = 5
+    ROLLUP_RECONCILE_INTERVAL_SECONDS: float = 300.0
+    ROLLUP_RECONCILE_DAYS: int = 1
+
+    # Pending-household queue: how long a caseworker's claim lasts, and the
+    # most households one claim may take
+    PENDING_CLAIM_TIMEOUT_SECONDS: int = 1800
+    PENDING_CLAIM_MAX: int = 100
+
+    # Allocation planner: value of serving a household per priority level,
+    # cost of serving it from a center in another city (min-cost-flow
+    # refinement), and items per transaction batch when a plan is executed
+    PLANNER_PRIORITY_WEIGHTS: Dict[str, float] = {
+        "critical": 8.0, "high": 4.0, "medium": 2.0, "low": 1.0
+    }
+    PLANNER_CROSS_CITY_PENALTY: float = 3.0
+    PLANNER_EXECUTE_BATCH_SIZE: int = 500
+
+    # Bulk restock: rows per INSERT ... ON DUPLICATE KEY UPDATE statement,
+    # and the most lines one request or CSV manifest may carry
+    RESTOCK_BATCH_SIZE: int = 500
+    RESTOCK_MANIFEST_MAX_LINES: int = 10_000
+
+    # Household bulk import: rows validated, checked and inserted per chunk
+    # (one transaction each), and the most rows one upload may carry
+    HOUSEHOLD_IMPORT_CHUNK_SIZE: int = 1000
+    HOUSEHOLD_IMPORT_MAX_ROWS: int = 100_000
+
+    # Household search: server-side time limit per query (MAX_EXECUTION_TIME),
+    # most results returned, and the fewest digits a phone search may use
+    HOUSEHOLD_SEARCH_TIMEOUT_MS: int = 250
+    HOUSEHOLD_SEARCH_MAX_RESULTS: int = 50
+    HOUSEHOLD_SEARCH_MIN_DIGITS: int = 3
+
+    # Duplicate detection: lowest pair score proposed for review, blocks too
+    # common to compare, households signed per pool task, pool size, and how
+    # old a registration must be before an incremental run takes it
+    DUPLICATE_SCORE_THRESHOLD: float = 0.7
+    DUPLICATE_MAX_BLOCK_SIZE: int = 500
+    DUPLICATE_CHUNK_SIZE: int = 20_000
+    DUPLICATE_WORKERS: int = 4
+    DUPLICATE_SETTLE_SECONDS: int = 30
+
+    # Lock wait timeouts (1205) and deadlocks (1213) in distribute_package:
+    # innodb_lock_wait_timeout for the distribution session, and the retry
+    # budget (retries after the first attempt, full-jitter exponential
+    # backoff between base and max delay, deadline for the whole request)
+    DISTRIBUTION_LOCK_WAIT_TIMEOUT_SECONDS: int = 5
+    TRANSACTION_RETRY_MAX_RETRIES: int = 4
+    TRANSACTION_RETRY_BASE_DELAY_SECONDS: float = 0.05
+    TRANSACTION_RETRY_MAX_DELAY_SECONDS: float = 1.0
+    TRANSACTION_RETRY_DEADLINE_SECONDS: float = 15.0
+
+    # Idempotency-Key on POST /distribution/distribute: how long a key's
+    # stored response is replayed, the per-worker cache in front of
+    # Idempotency_Keys, and the purge of expired keys (rows per DELETE)
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 86_400
+    IDEMPOTENCY_CACHE_TTL_SECONDS: float = 600.0
+    IDEMPOTENCY_CACHE_MAX_ENTRIES: int = 10_000
+    IDEMPOTENCY_PURGE_ENABLED: bool = True
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 300.0
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 1000
+
+    # GET /metrics and the per-route latency middleware; with several
+    # workers also set PROMETHEUS_MULTIPROC_DIR (see core/metrics.py)
+    METRICS_ENABLED: bool = True
+
+    # Dashboard statistics are recomputed at most this often per worker
+    DASHBOARD_CACHE_TTL_SECONDS: float = 5.0
+
+    # Responses of at least this many bytes are gzipped for clients that
+    # accept it (level 1-9: higher is smaller but costs more CPU)
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
+
+    # Rows fetched per round trip by the streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Eligibility matrix: largest households x packages request accepted,
+    # and how many households are read per IN (...) query
+    ELIGIBILITY_MATRIX_MAX_CELLS: int = 100_000
+    ELIGIBILITY_MATRIX_CHUNK_SIZE: int = 1000
+
+    # Reference-data cache (Aid_Packages, Distribution_Centers)
+    # Other workers' writes are noticed through Cache_Generations, polled at
+    # most every REFERENCE_CACHE_GENERATION_CHECK_SECONDS
+    REFERENCE_CACHE_ENABLED: bool = True
+    REFERENCE_CACHE_TTL_SECONDS: float = 300.0
+    REFERENCE_CACHE_MAX_ENTRIES: int = 1024
+    REFERENCE_CACHE_GENERATION_CHECK_SECONDS: float = 1.0
+
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:5173", "http://frontend:3000"]
 
@@ -37,5 +154,12 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"mysql+pymysql://{self.MYSQL_USER}:{self.MYSQL_PASSWORD}@{self.MYSQL_HOST}:{self.MYSQL_PORT}/{self.MYSQL_DATABASE}"
 
+    @property
+    def async_database_url(self) -> str:
+        """Async (aiomysql) URL; derived from the sync one if not provided"""
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        return self.database_url.replace("+pymysql", "+aiomysql", 1)
+
 
 settings = Settings()
@@ -1,7 +1,9 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from .config import settings
+from .metrics import TimedQueuePool, TimedAsyncQueuePool, instrument_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,11 +15,30 @@ engine = create_engine(
     pool_size=10,  # Number of permanent connections
     max_overflow=20,  # Number of connections that can be created beyond pool_size
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    poolclass=TimedQueuePool,  # QueuePool that records checkout waits
 )
+instrument_pool(engine, "sync")
 
 # Create SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine/sessions for the async request path (ASYNC_DB_ENABLED).
+# Only created when enabled, so aiomysql is not needed otherwise.
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DB_ENABLED:
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+        echo=settings.DEBUG,
+        poolclass=TimedAsyncQueuePool,
+    )
+    instrument_pool(async_engine.sync_engine, "async")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -34,6 +55,15 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency function to get an async database session
+    (AsyncSession; only available with ASYNC_DB_ENABLED)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def test_connection():
     """Test database connection"""
     try:
@@ -0,0 +1,217 @@
+"""
+Prometheus metrics (served at GET /metrics in the text exposition format)
+
+- aidtracker_http_request_duration_seconds: latency per route template
+- aidtracker_distribution_transaction_seconds: distribute_package split into
+  validation, lock (inventory reservation) and commit, plus the total
+- aidtracker_inventory_lock_wait_seconds: the lock phase per
+  (center_id, package_id), to find hot inventory rows
+- aidtracker_db_pool_*: checked-out and overflow connections of each engine,
+  and how long a checkout waited for a connection
+- aidtracker_cache_requests_total: hits and misses per TTLCache
+- aidtracker_transaction_retry_events_total: lock wait timeout / deadlock
+  retries and give-ups
+
+Recording a sample is an in-memory increment; nothing is formatted until a
+scrape asks for it.
+
+Several uvicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty directory
+shared by the workers (cleared before they start). Each worker then writes
+its samples to files there, and /metrics sums them across workers,
+whichever worker answers the scrape.
+"""
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    Summary,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.types import Message, Receive, Scope, Send
+from typing import Tuple
+import os
+import time
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "aidtracker_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+DISTRIBUTION_SECONDS = Histogram(
+    "aidtracker_distribution_transaction_seconds",
+    "distribute_package transaction time by phase (validation, lock, commit, total)",
+    ["phase"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+INVENTORY_LOCK_WAIT_SECONDS = Summary(
+    "aidtracker_inventory_lock_wait_seconds",
+    "Time spent reserving (locking and decrementing) an inventory row",
+    ["center_id", "package_id"]
+)
+
+POOL_CHECKED_OUT = Gauge(
+    "aidtracker_db_pool_checked_out",
+    "Connections checked out of the pool",
+    ["engine"],
+    multiprocess_mode="livesum"
+)
+
+POOL_OVERFLOW = Gauge(
+    "aidtracker_db_pool_overflow",
+    "Open connections beyond pool_size",
+    ["engine"],
+    multiprocess_mode="livesum"
+)
+
+POOL_WAIT_SECONDS = Histogram(
+    "aidtracker_db_pool_wait_seconds",
+    "Time a checkout took to get a connection (free or newly opened)",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+
+CACHE_REQUESTS = Counter(
+    "aidtracker_cache_requests",
+    "TTLCache lookups by result (hit or miss)",
+    ["cache", "result"]
+)
+
+TRANSACTION_RETRY_EVENTS = Counter(
+    "aidtracker_transaction_retry_events",
+    "Lock wait timeout / deadlock handling in distribute_package",
+    ["error", "event"]
+)
+
+_DISTRIBUTION_PHASES = {
+    phase: DISTRIBUTION_SECONDS.labels(phase)
+    for phase in ("validation", "lock", "commit", "total")
+}
+
+
+def observe_distribution_phase(phase: str, seconds: float) -> None:
+    _DISTRIBUTION_PHASES[phase].observe(seconds)
+
+
+def observe_inventory_lock_wait(center_id: int, package_id: int, seconds: float) -> None:
+    INVENTORY_LOCK_WAIT_SECONDS.labels(str(center_id), str(package_id)).observe(seconds)
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout waited (POOL_WAIT_SECONDS)"""
+
+    metrics_engine = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT_SECONDS.labels(self.metrics_engine).observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool of the sync engine"""
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """Pool of the async engine"""
+
+    metrics_engine = "async"
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Keep the checked-out and overflow gauges of engine's pool current"""
+    pool = engine.pool
+    checked_out = POOL_CHECKED_OUT.labels(name)
+    overflow = POOL_OVERFLOW.labels(name)
+    open_connections = 0
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        nonlocal open_connections
+        open_connections += 1
+        overflow.set(max(0, open_connections - pool.size()))
+
+    @event.listens_for(engine, "close")
+    def _close(dbapi_connection, connection_record):
+        nonlocal open_connections
+        open_connections -= 1
+        overflow.set(max(0, open_connections - pool.size()))
+
+
+class MetricsMiddleware:
+    """
+    Record every HTTP request's latency under its route template
+    (/api/households/{household_id}, not the raw path)
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(
+                scope["method"], self._route(scope), str(status)
+            ).observe(time.perf_counter() - started)
+
+    def _route(self, scope: Scope) -> str:
+        # The router leaves the matched endpoint in the scope
+        if self._routes is None:
+            self._routes = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if getattr(route, "endpoint", None) is not None
+            }
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition-format body and content type for GET /metrics"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges (multiprocess mode, on shutdown)"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,129 @@
+"""
+Keyset (cursor) pagination helpers
+
+A cursor is the sort key of the last row of a page, e.g.
+(distribution_date, log_id), encoded as an opaque URL-safe string. The next
+page starts right after it with an indexed range condition, so page 10,000
+costs the same as page 1 (OFFSET has to walk and discard every earlier row).
+"""
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_, func, text
+from sqlalchemy.orm import Session
+from datetime import datetime, date
+from typing import Any, Literal, Sequence
+import base64
+import json
+
+from app.core.config import settings
+
+# How list endpoints report totals: not at all, from InnoDB's table
+# statistics (instant, approximate), or with COUNT(*) (exact, a scan)
+TotalMode = Literal["none", "estimated", "exact"]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_size(limit: int) -> int:
+    """Clamp a requested page size to 1..settings.MAX_PAGE_SIZE"""
+    return max(1, min(limit, settings.MAX_PAGE_SIZE))
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for a row's sort key"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    """
+    Sort key from a cursor made by encode_cursor
+
+    Raises:
+        HTTPException(400) if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return tuple(_decode_value(value) for value in values)
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_after(columns: Sequence, values: Sequence, descending: bool = False):
+    """
+    Rows strictly after `values` in (columns...) order
+
+    Expanded to (a > :a) OR (a = :a AND b > :b) ... which MySQL turns into
+    a range scan on an index over the same columns.
+    """
+    conditions = []
+    for i, column in enumerate(columns):
+        beyond = column < values[i] if descending else column > values[i]
+        equal = [columns[j] == values[j] for j in range(i)]
+        conditions.append(and_(*equal, beyond) if equal else beyond)
+    return or_(*conditions)
+
+
+def next_cursor(rows: Sequence, limit: int, key) -> str | None:
+    """
+    Cursor for the page after `rows`, or None on the last page
+
+    `rows` must have been fetched with limit + 1; the extra row is only a
+    "there is more" marker and is dropped by the caller.
+    """
+    if len(rows) <= limit:
+        return None
+    return encode_cursor(key(rows[limit - 1]))
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    """Expose the next cursor on endpoints that return a bare JSON list"""
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def count_rows(db: Session, model, mode: TotalMode) -> int | None:
+    """Total for a whole table according to `mode` (None for "none")"""
+    if mode == "exact":
+        return db.query(func.count()).select_from(model.__table__).scalar()
+    if mode == "estimated":
+        return estimated_row_count(db, model.__tablename__)
+    return None
+
+
+def estimated_row_count(db: Session, table_name: str) -> int | None:
+    """
+    Row count from InnoDB table statistics (information_schema.TABLES)
+
+    Instant regardless of table size but approximate: InnoDB samples index
+    pages, and MySQL 8 caches the value for information_schema_stats_expiry
+    seconds (ANALYZE TABLE refreshes it). Good for "about N rows", not for
+    arithmetic.
+    """
+    return db.execute(
+        text("""
+            SELECT TABLE_ROWS FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name
+        """),
+        {"table_name": table_name}
+    ).scalar()
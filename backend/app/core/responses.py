@@ -0,0 +1,71 @@
+"""
+Fast JSON responses and compression
+
+FastJSONResponse renders with orjson and is the app's default response
+class. List endpoints build it themselves from column tuples: a route that
+returns a Response skips response_model validation and jsonable_encoder,
+so each row is turned into JSON once instead of going through ORM object,
+Pydantic model and encoder.
+
+CompressionMiddleware gzips responses of at least GZIP_MINIMUM_SIZE bytes
+for clients that accept it, except bodies that are compressed already
+(gzip exports).
+"""
+
+from decimal import Decimal
+from typing import Any, Iterable, List, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Bodies GZipMiddleware must pass through untouched
+COMPRESSED_MEDIA_TYPES = ("application/gzip", "application/zip")
+
+
+def _default(value: Any) -> Any:
+    # Same as FastAPI's encoder: integral decimals as int, others as float
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (datetimes as ISO 8601)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+def rows_as_dicts(rows: Iterable[Sequence], keys: Sequence[str]) -> List[dict]:
+    """Column tuples (Row objects) to JSON-ready dicts"""
+    return [dict(zip(keys, row)) for row in rows]
+
+
+class _Responder(GZipResponder):
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            await super().send_with_gzip(message)
+            # Treated like a body with a Content-Encoding: sent as is
+            if content_type.startswith(COMPRESSED_MEDIA_TYPES):
+                self.content_encoding_set = True
+            return
+        await super().send_with_gzip(message)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves already compressed bodies alone"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _Responder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -3,22 +3,32 @@ AidTracker FastAPI Application
 Main entry point for the backend API
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.core.config import settings
-from app.core.database import test_connection
+from app.core.database import test_connection, async_engine
+from app.core.responses import FastJSONResponse, CompressionMiddleware
+from app.core import metrics
+from app.services import duplicate_detection, idempotency, report_rollups
 
 # Import routers
 from app.api import (
     distribution,
+    distribution_async,
     centers,
     packages,
     households,
     inventory,
-    reports
+    reports,
+    outreach,
+    planning,
+    duplicates,
+    exports,
+    system
 )
 
 # Configure logging
@@ -43,10 +53,26 @@ async def lifespan(app: FastAPI):
     else:
         logger.error("❌ Database connection failed!")
 
+    if settings.ASYNC_DB_ENABLED:
+        logger.info("⚡ Async distribution routes enabled")
+
+    background_tasks = []
+    if settings.ROLLUP_JOB_ENABLED:
+        background_tasks.append(asyncio.create_task(report_rollups.run_forever()))
+    if settings.IDEMPOTENCY_PURGE_ENABLED:
+        background_tasks.append(asyncio.create_task(idempotency.run_forever()))
+
     yield
 
     # Shutdown
     logger.info("👋 Shutting down AidTracker API...")
+    for task in background_tasks:
+        task.cancel()
+    # Only there if this worker ran a duplicate scan
+    duplicate_detection.stop_pool()
+    metrics.mark_process_dead()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 # Create FastAPI application
@@ -54,7 +80,15 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.DESCRIPTION,
     version=settings.VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
+)
+
+# Compress large responses for clients that accept gzip
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL
 )
 
 # Configure CORS
@@ -66,13 +100,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency for /metrics (outermost, so compression is included)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
-app.include_router(distribution.router, prefix=settings.API_V1_PREFIX)
+# Distribution routes: async stack when enabled, sync otherwise
+if settings.ASYNC_DB_ENABLED:
+    app.include_router(distribution_async.router, prefix=settings.API_V1_PREFIX)
+else:
+    app.include_router(distribution.router, prefix=settings.API_V1_PREFIX)
 app.include_router(centers.router, prefix=settings.API_V1_PREFIX)
 app.include_router(packages.router, prefix=settings.API_V1_PREFIX)
 app.include_router(households.router, prefix=settings.API_V1_PREFIX)
 app.include_router(inventory.router, prefix=settings.API_V1_PREFIX)
 app.include_router(reports.router, prefix=settings.API_V1_PREFIX)
+app.include_router(outreach.router, prefix=settings.API_V1_PREFIX)
+app.include_router(planning.router, prefix=settings.API_V1_PREFIX)
+app.include_router(duplicates.router, prefix=settings.API_V1_PREFIX)
+app.include_router(exports.router, prefix=settings.API_V1_PREFIX)
+app.include_router(system.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.get("/")
@@ -100,6 +147,15 @@ def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus metrics (text exposition format, summed over workers)"""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    body, content_type = metrics.render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -2,8 +2,14 @@ from .distribution_center import DistributionCenter
 from .aid_package import AidPackage
 from .household import Household
 from .staff_member import StaffMember
+from .inventory_shard import InventoryShard
 from .inventory import Inventory
 from .distribution_log import DistributionLog
+from .household_package_last import HouseholdPackageLast
+from .cache_generation import CacheGeneration
+from .pending_queue import PendingQueueEntry
+from .duplicate import DuplicateCluster, DuplicatePair
+from .idempotency_key import IdempotencyKey
 
 __all__ = [
     "DistributionCenter",
@@ -11,5 +17,12 @@ __all__ = [
     "Household",
     "StaffMember",
     "Inventory",
+    "InventoryShard",
     "DistributionLog",
+    "HouseholdPackageLast",
+    "CacheGeneration",
+    "PendingQueueEntry",
+    "DuplicateCluster",
+    "DuplicatePair",
+    "IdempotencyKey",
 ]
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, BigInteger, TIMESTAMP, text
+from app.core.database import Base
+
+
+class CacheGeneration(Base):
+    __tablename__ = "Cache_Generations"
+
+    cache_name = Column(String(50), primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    )
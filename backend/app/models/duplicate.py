@@ -0,0 +1,51 @@
+from sqlalchemy import (
+    Column, Integer, String, Enum, Numeric, Text, ForeignKey, TIMESTAMP, Index,
+    CheckConstraint, text
+)
+from app.core.database import Base
+
+
+class DuplicateCluster(Base):
+    """Households that may be one family, awaiting or after staff review"""
+    __tablename__ = "Duplicate_Clusters"
+    __table_args__ = (
+        Index("idx_review", "status", "max_score"),
+    )
+
+    cluster_id = Column(Integer, primary_key=True, autoincrement=True)
+    status = Column(
+        Enum('pending', 'confirmed', 'dismissed', name='duplicate_status_enum'),
+        nullable=False,
+        default='pending'
+    )
+    household_count = Column(Integer, nullable=False, default=0)
+    max_score = Column(Numeric(5, 4), nullable=False, default=0)
+    reviewed_by = Column(Integer, ForeignKey('Staff_Members.staff_id', ondelete='SET NULL'), nullable=True)
+    reviewed_at = Column(TIMESTAMP, nullable=True)
+    review_notes = Column(Text)
+    created_at = Column(TIMESTAMP, server_default=text('CURRENT_TIMESTAMP'))
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    )
+
+
+class DuplicatePair(Base):
+    """One scored candidate pair (household_id_a < household_id_b)"""
+    __tablename__ = "Duplicate_Pairs"
+    __table_args__ = (
+        Index("idx_household_b", "household_id_b"),
+        Index("idx_cluster", "cluster_id"),
+        CheckConstraint("household_id_a < household_id_b", name="chk_pair_order"),
+    )
+
+    household_id_a = Column(Integer, ForeignKey('Households.household_id', ondelete='CASCADE'), primary_key=True)
+    household_id_b = Column(Integer, ForeignKey('Households.household_id', ondelete='CASCADE'), primary_key=True)
+    cluster_id = Column(
+        Integer,
+        ForeignKey('Duplicate_Clusters.cluster_id', ondelete='CASCADE'),
+        nullable=False
+    )
+    score = Column(Numeric(5, 4), nullable=False)
+    blocking_key = Column(String(150), nullable=False)
+    detected_at = Column(TIMESTAMP, server_default=text('CURRENT_TIMESTAMP'))
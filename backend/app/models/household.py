@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Enum, Text, TIMESTAMP, text
+from sqlalchemy import Column, Integer, String, Date, Enum, Text, TIMESTAMP, Computed, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -10,11 +10,21 @@ class Household(Base):
     family_name = Column(String(100), nullable=False)
     primary_contact_name = Column(String(100), nullable=False)
     phone_number = Column(String(20), nullable=False, unique=True)
+    # Digits of phone_number reversed, for suffix search (13_household_search.sql)
+    phone_digits_reversed = Column(
+        String(20),
+        Computed(
+            "REVERSE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE("
+            "phone_number, '-', ''), ' ', ''), '(', ''), ')', ''), '+', ''), '.', ''))",
+            persisted=True
+        ),
+        index=True
+    )
     email = Column(String(100))
     address = Column(String(255), nullable=False)
     city = Column(String(100), nullable=False, index=True)
     state = Column(String(50), nullable=False)
-    zip_code = Column(String(10), nullable=False)
+    zip_code = Column(String(10), nullable=False, index=True)
     family_size = Column(Integer, nullable=False)
     income_level = Column(
         Enum('no_income', 'very_low', 'low', 'moderate', name='income_level_enum'),
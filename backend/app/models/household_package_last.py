@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, TIMESTAMP, text
+from app.core.database import Base
+
+
+class HouseholdPackageLast(Base):
+    """Newest successful distribution per (household, package), kept in step with Distribution_Log"""
+    __tablename__ = "Household_Package_Last"
+
+    household_id = Column(Integer, ForeignKey('Households.household_id', ondelete='CASCADE'), primary_key=True)
+    package_id = Column(Integer, ForeignKey('Aid_Packages.package_id', ondelete='CASCADE'), primary_key=True, index=True)
+    last_distribution_date = Column(TIMESTAMP, nullable=False)
+    next_eligible_date = Column(Date, nullable=False, index=True)
+    last_log_id = Column(Integer, nullable=False)
+    distribution_count = Column(Integer, nullable=False, default=1)
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    )
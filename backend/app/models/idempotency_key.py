@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, CHAR, JSON, TIMESTAMP, Index, func
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response of a distribution sent with an Idempotency-Key header"""
+    __tablename__ = "Idempotency_Keys"
+    __table_args__ = (
+        Index("idx_expires_at", "expires_at"),
+    )
+
+    idempotency_key = Column(String(255), primary_key=True)
+    request_hash = Column(CHAR(64), nullable=False)
+    log_id = Column(Integer, nullable=True)
+    response = Column(JSON, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    expires_at = Column(TIMESTAMP, nullable=False)
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey, TIMESTAMP, text, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, Date, ForeignKey, TIMESTAMP, text, UniqueConstraint, func, select
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, validates
 from app.core.database import Base
+from .inventory_shard import InventoryShard
 
 
 class Inventory(Base):
@@ -11,6 +13,8 @@ class Inventory(Base):
     package_id = Column(Integer, ForeignKey('Aid_Packages.package_id', ondelete='CASCADE'), nullable=False, index=True)
     quantity_on_hand = Column(Integer, nullable=False, default=0, index=True)
     reorder_level = Column(Integer, nullable=False, default=50)
+    shard_count = Column(Integer, nullable=False, default=1)
+    version = Column(Integer, nullable=False, default=1)
     last_restock_date = Column(Date)
     last_restock_quantity = Column(Integer)
     created_at = Column(TIMESTAMP, server_default=text('CURRENT_TIMESTAMP'))
@@ -23,9 +27,46 @@ class Inventory(Base):
         UniqueConstraint('center_id', 'package_id', name='uq_center_package'),
     )
 
+    # Every ORM UPDATE checks and bumps the version (optimistic concurrency)
+    __mapper_args__ = {"version_id_col": version}
+
     # Relationships
     center = relationship("DistributionCenter", back_populates="inventory")
     package = relationship("AidPackage", back_populates="inventory")
+    shards = relationship(
+        "InventoryShard",
+        back_populates="inventory",
+        cascade="all, delete-orphan",
+        order_by=InventoryShard.shard_no
+    )
+
+    @validates("quantity_on_hand")
+    def _validate_quantity_on_hand(self, key, quantity):
+        """A sharded row keeps its stock in the shards (see set_shard_count)"""
+        if quantity and self.shard_count and self.shard_count > 1:
+            raise ValueError(
+                "Inventory is split across shards; change its stock through "
+                "restock or set_shard_count"
+            )
+        return quantity
+
+    @hybrid_property
+    def total_quantity(self):
+        """Stock on the row itself plus its shards (when sharded)"""
+        if self.shard_count and self.shard_count > 1:
+            return self.quantity_on_hand + sum(shard.quantity_on_hand for shard in self.shards)
+        return self.quantity_on_hand
+
+    @total_quantity.inplace.expression
+    @classmethod
+    def _total_quantity_expression(cls):
+        shard_quantity = select(
+            func.sum(InventoryShard.quantity_on_hand)
+        ).where(
+            InventoryShard.center_id == cls.center_id,
+            InventoryShard.package_id == cls.package_id
+        ).correlate(cls).scalar_subquery()
+        return cls.quantity_on_hand + func.coalesce(shard_quantity, 0)
 
     @property
     def center_name(self):
@@ -45,4 +86,4 @@ class Inventory(Base):
 
     @property
     def quantity(self):
-        return self.quantity_on_hand
+        return self.total_quantity
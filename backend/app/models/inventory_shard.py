@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, TIMESTAMP, text, ForeignKeyConstraint
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class InventoryShard(Base):
+    __tablename__ = "Inventory_Shards"
+
+    center_id = Column(Integer, primary_key=True)
+    package_id = Column(Integer, primary_key=True)
+    shard_no = Column(Integer, primary_key=True)
+    quantity_on_hand = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    )
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['center_id', 'package_id'],
+            ['Inventory.center_id', 'Inventory.package_id'],
+            name='fk_shard_inventory',
+            ondelete='CASCADE'
+        ),
+    )
+
+    # Relationships
+    inventory = relationship("Inventory", back_populates="shards")
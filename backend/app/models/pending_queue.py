@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, SmallInteger, Date, ForeignKey, TIMESTAMP, Index, text
+from app.core.database import Base
+
+
+class PendingQueueEntry(Base):
+    """One active household in outreach order, with its caseworker claim"""
+    __tablename__ = "Pending_Queue"
+    __table_args__ = (
+        Index("idx_queue_order", "priority_rank", "registration_date", "household_id"),
+        Index("idx_claimed_by", "claimed_by", "claim_expires_at"),
+    )
+
+    household_id = Column(Integer, ForeignKey('Households.household_id', ondelete='CASCADE'), primary_key=True)
+    priority_rank = Column(SmallInteger, nullable=False)
+    registration_date = Column(Date, nullable=False)
+    last_distribution_date = Column(TIMESTAMP, nullable=True)
+    total_distributions = Column(Integer, nullable=False, default=0)
+    claimed_by = Column(Integer, ForeignKey('Staff_Members.staff_id', ondelete='SET NULL'), nullable=True)
+    claimed_at = Column(TIMESTAMP, nullable=True)
+    claim_expires_at = Column(TIMESTAMP, nullable=True)
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    )
@@ -21,14 +21,30 @@ from .inventory import (
     InventoryCreate,
     InventoryUpdate,
     InventoryResponse,
-    RestockRequest
+    RestockRequest,
+    BulkRestockRequest,
+    ShardConfigRequest
 )
 from .distribution import (
     DistributionRequest,
     DistributionResponse,
+    BatchDistributionRequest,
+    BatchDistributionItemResult,
+    BatchDistributionResponse,
     EligibilityCheckRequest,
-    EligibilityCheckResponse
+    EligibilityCheckResponse,
+    EligibilityMatrixRequest,
+    EligibilityMatrixResponse
 )
+from .planning import (
+    AllocationPlanRequest,
+    PlanExecuteRequest
+)
+from .outreach import (
+    ClaimRequest,
+    ReleaseRequest
+)
+from .duplicate import ClusterReviewRequest
 from .staff_member import (
     StaffMemberBase,
     StaffMemberCreate,
@@ -54,10 +70,22 @@ __all__ = [
     "InventoryUpdate",
     "InventoryResponse",
     "RestockRequest",
+    "BulkRestockRequest",
+    "ShardConfigRequest",
     "DistributionRequest",
     "DistributionResponse",
+    "BatchDistributionRequest",
+    "BatchDistributionItemResult",
+    "BatchDistributionResponse",
     "EligibilityCheckRequest",
     "EligibilityCheckResponse",
+    "EligibilityMatrixRequest",
+    "EligibilityMatrixResponse",
+    "AllocationPlanRequest",
+    "PlanExecuteRequest",
+    "ClaimRequest",
+    "ReleaseRequest",
+    "ClusterReviewRequest",
     "StaffMemberBase",
     "StaffMemberCreate",
     "StaffMemberUpdate",
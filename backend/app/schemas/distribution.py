@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -20,6 +20,30 @@ class DistributionResponse(BaseModel):
     distribution_date: Optional[datetime] = None
 
 
+class BatchDistributionRequest(BaseModel):
+    """Request to distribute many packages in one call"""
+    items: List[DistributionRequest] = Field(..., min_length=1, max_length=500)
+
+
+class BatchDistributionItemResult(BaseModel):
+    """Outcome of one item of a batch distribution"""
+    index: int
+    household_id: int
+    package_id: int
+    center_id: int
+    status: str  # 'success' or 'error'
+    message: str
+    log_id: Optional[int] = None
+
+
+class BatchDistributionResponse(BaseModel):
+    """Response after a batch distribution attempt"""
+    results: List[BatchDistributionItemResult]
+    succeeded: int
+    failed: int
+    distribution_date: datetime
+
+
 class EligibilityCheckRequest(BaseModel):
     """Request to check if household is eligible for a package"""
     household_id: int
@@ -34,6 +58,19 @@ class EligibilityCheckResponse(BaseModel):
     package_id: int
 
 
+class EligibilityMatrixRequest(BaseModel):
+    """Request to check every household against every package"""
+    household_ids: List[int] = Field(..., min_length=1)
+    package_ids: List[int] = Field(..., min_length=1)
+
+
+class EligibilityMatrixResponse(BaseModel):
+    """One cell per (household, package), household-major order"""
+    results: List[EligibilityCheckResponse]
+    eligible: int
+    total: int
+
+
 class DistributionLogResponse(BaseModel):
     """Distribution log entry with details"""
     log_id: int
@@ -42,7 +79,10 @@ class DistributionLogResponse(BaseModel):
     household_id: int
     package_id: int
     center_id: int
+    staff_id: Optional[int] = None
     quantity_distributed: int
+    failure_reason: Optional[str] = None
+    notes: Optional[str] = None
     
     # Flattened fields from properties
     household_contact: Optional[str] = None
@@ -51,3 +91,21 @@ class DistributionLogResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class DistributionLogPage(BaseModel):
+    """Page of GET /distribution/logs (documents the fast JSON path)"""
+    logs: List[DistributionLogResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_estimated: bool
+    limit: int
+    offset: int
+
+
+class HouseholdDistributionHistory(BaseModel):
+    """Page of GET /distribution/logs/household/{household_id}"""
+    household_id: int
+    distributions: List[DistributionLogResponse]
+    next_cursor: Optional[str] = None
+    total: int
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+
+class ClusterReviewRequest(BaseModel):
+    """A reviewer's decision on a duplicate cluster ("pending" reopens it)"""
+    status: Literal["confirmed", "dismissed", "pending"]
+    staff_id: int
+    notes: Optional[str] = None
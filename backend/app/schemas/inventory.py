@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, AliasChoices
+from typing import List, Optional
 from datetime import date, datetime
 
 
@@ -21,6 +21,10 @@ class InventoryUpdate(BaseModel):
 
 class InventoryResponse(InventoryBase):
     inventory_id: int
+    # Sharded rows report the stock summed over their shards
+    quantity_on_hand: int = Field(0, validation_alias=AliasChoices("total_quantity", "quantity_on_hand"))
+    shard_count: int = 1
+    version: int = 1
     last_restock_date: Optional[date] = None
     last_restock_quantity: Optional[int] = None
     created_at: datetime
@@ -41,3 +45,12 @@ class RestockRequest(BaseModel):
     center_id: int
     package_id: int
     quantity: int
+
+
+class BulkRestockRequest(BaseModel):
+    """Many restock lines (e.g. one truck), applied in one transaction"""
+    lines: List[RestockRequest] = Field(..., min_length=1)
+
+
+class ShardConfigRequest(BaseModel):
+    shard_count: int = Field(..., ge=1, le=64)
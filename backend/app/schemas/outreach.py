@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class ClaimRequest(BaseModel):
+    """Request to claim the next pending households for a caseworker"""
+    staff_id: int
+    count: int = Field(10, ge=1)
+    timeout_seconds: Optional[int] = Field(None, ge=1)
+
+
+class ReleaseRequest(BaseModel):
+    """Request to give back claims (all of the caseworker's if no ids)"""
+    staff_id: int
+    household_ids: Optional[List[int]] = None
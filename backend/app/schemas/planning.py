@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from app.schemas.distribution import DistributionRequest
+
+
+class AllocationPlanRequest(BaseModel):
+    """Request to plan the distribution of scarce packages"""
+    package_ids: List[int] = Field(..., min_length=1)
+    center_ids: Optional[List[int]] = None
+    quantity_per_household: int = Field(1, ge=1)
+    pending_only: bool = True
+    refine: bool = False
+    cross_city_penalty: Optional[float] = Field(None, ge=0)
+
+
+class PlanExecuteRequest(BaseModel):
+    """A reviewed plan's items, distributed through the batch path"""
+    items: List[DistributionRequest] = Field(..., min_length=1)
@@ -0,0 +1,364 @@
+"""
+Allocation Planner
+Plans which households receive a scarce package from which center, for
+review before anything is distributed
+
+For each package, candidates (active, eligible and - by default - pending
+households) and the stock of every active center are read with one query
+each into NumPy arrays; the plan is computed without further database
+access:
+
+- greedy: the stock serves the most deserving households (priority level,
+  then larger families, then earliest registration); each is served from a
+  center in its own city while that city has stock, then from what is left
+- min-cost flow (refine): households are grouped by (city, priority level)
+  and the groups matched to centers by a min-cost max-flow over that small
+  graph, trading priority weight (PLANNER_PRIORITY_WEIGHTS) against sending
+  a family to another city (PLANNER_CROSS_CITY_PENALTY)
+
+Both serve as many households as the stock allows. A reviewed plan is
+executed through DistributionService.distribute_batch, which re-checks
+eligibility and stock under row locks: a plan that went stale during review
+fails item by item instead of over-distributing.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam
+from typing import Dict, List, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.services.reference_data import reference_data, PACKAGES
+from app.services.pending_queue import PENDING_SQL
+
+PRIORITY_LEVELS = ("critical", "high", "medium", "low")
+
+_CANDIDATES_SQL = """
+    SELECT
+        h.household_id,
+        FIELD(h.priority_level, 'critical', 'high', 'medium', 'low') - 1 AS priority_rank,
+        h.family_size,
+        TO_DAYS(h.registration_date) AS registered,
+        h.city
+    FROM Households h
+    {pending_join}
+    LEFT JOIN Household_Package_Last hpl
+      ON hpl.household_id = h.household_id
+     AND hpl.package_id = :package_id
+    WHERE h.status = 'active'
+      AND (hpl.next_eligible_date IS NULL OR hpl.next_eligible_date <= CURRENT_DATE)
+    ORDER BY h.household_id
+"""
+
+# Stock as distributions see it: center row plus its shards
+_STOCK_SQL = """
+    SELECT
+        dc.center_id,
+        dc.city,
+        i.quantity_on_hand + COALESCE(s.shard_quantity, 0) AS available
+    FROM Inventory i
+    INNER JOIN Distribution_Centers dc ON dc.center_id = i.center_id
+    LEFT JOIN (
+        SELECT center_id, SUM(quantity_on_hand) AS shard_quantity
+        FROM Inventory_Shards
+        WHERE package_id = :package_id
+        GROUP BY center_id
+    ) s ON s.center_id = i.center_id
+    WHERE i.package_id = :package_id
+      AND dc.status = 'active'{center_filter}
+    ORDER BY dc.center_id
+"""
+
+
+def _service_order(rank: np.ndarray, family_size: np.ndarray, registered: np.ndarray) -> np.ndarray:
+    """Household indexes, most deserving first (stable: ties keep load order)"""
+    return np.lexsort((registered, -family_size, rank))
+
+
+def plan_greedy(
+    rank: np.ndarray,
+    family_size: np.ndarray,
+    registered: np.ndarray,
+    household_city: np.ndarray,
+    center_city: np.ndarray,
+    capacity: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Greedy plan
+
+    Args:
+        rank: priority rank per household (0 = critical)
+        household_city / center_city: integer city codes
+        capacity: households each center can serve
+
+    Returns:
+        (household indexes, center indexes) of the planned distributions
+    """
+    order = _service_order(rank, family_size, registered)
+    served = order[:int(capacity.sum())]
+    remaining = capacity.copy()
+    assigned = np.full(len(served), -1, dtype=np.int64)
+
+    # Same city first: per city, the most deserving take the local slots
+    served_city = household_city[served]
+    by_city = np.argsort(served_city, kind="stable")
+    cities, starts, counts = np.unique(
+        served_city[by_city], return_index=True, return_counts=True
+    )
+    for city, start, count in zip(cities, starts, counts):
+        local = np.flatnonzero(center_city == city)
+        if not len(local):
+            continue
+        members = by_city[start:start + count]
+        slots = np.repeat(local, remaining[local])[:count]
+        assigned[members[:len(slots)]] = slots
+        remaining -= np.bincount(slots, minlength=len(remaining))
+
+    # Everyone else from whatever stock is left, in service order
+    rest = np.flatnonzero(assigned < 0)
+    assigned[rest] = np.repeat(np.arange(len(remaining)), remaining)[:len(rest)]
+
+    return served, assigned
+
+
+def _min_cost_max_flow(supply: np.ndarray, capacity: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """
+    Min-cost max-flow from groups (supply) to centers (capacity)
+
+    Successive shortest paths; each path is found with a vectorized
+    Bellman-Ford over the residual arcs (costs may be negative).
+
+    Returns:
+        Flow matrix, groups x centers
+    """
+    groups, centers = cost.shape
+    source, sink = 0, groups + centers + 1
+    nodes = sink + 1
+    group_nodes = np.arange(1, groups + 1)
+    center_nodes = np.arange(groups + 1, groups + centers + 1)
+
+    grid_group, grid_center = np.meshgrid(group_nodes, center_nodes, indexing="ij")
+    tail = np.concatenate([np.zeros(groups, dtype=np.int64), grid_group.ravel(), center_nodes])
+    head = np.concatenate([group_nodes, grid_center.ravel(), np.full(centers, sink)])
+    arc_cost = np.concatenate([np.zeros(groups), cost.ravel(), np.zeros(centers)])
+    residual = np.concatenate([
+        supply,
+        np.minimum.outer(supply, capacity).ravel(),
+        capacity
+    ]).astype(np.int64)
+
+    # Reverse arcs follow the forward ones: arc a and a + arcs are a pair
+    arcs = len(tail)
+    tail, head = np.concatenate([tail, head]), np.concatenate([head, tail])
+    arc_cost = np.concatenate([arc_cost, -arc_cost])
+    residual = np.concatenate([residual, np.zeros(arcs, dtype=np.int64)])
+    partner = np.concatenate([np.arange(arcs) + arcs, np.arange(arcs)])
+
+    while True:
+        dist = np.full(nodes, np.inf)
+        dist[source] = 0.0
+        pred = np.full(nodes, -1, dtype=np.int64)
+
+        for _ in range(nodes):
+            candidate = dist[tail] + arc_cost
+            improving = np.flatnonzero((residual > 0) & (candidate < dist[head] - 1e-9))
+            if not len(improving):
+                break
+            # Best improving arc per head node
+            best = improving[np.lexsort((candidate[improving], head[improving]))]
+            first = np.ones(len(best), dtype=bool)
+            first[1:] = head[best][1:] != head[best][:-1]
+            best = best[first]
+            dist[head[best]] = candidate[best]
+            pred[head[best]] = best
+
+        if not np.isfinite(dist[sink]):
+            break
+
+        path = []
+        node = sink
+        while node != source:
+            arc = pred[node]
+            path.append(arc)
+            node = tail[arc]
+            if len(path) > nodes:
+                raise RuntimeError("Allocation planner found a negative cycle")
+
+        path = np.array(path)
+        push = residual[path].min()
+        residual[path] -= push
+        residual[partner[path]] += push
+
+    # Flow on a group -> center arc is what its reverse arc holds
+    return residual[arcs + groups:arcs + groups + groups * centers].reshape(groups, centers)
+
+
+def plan_min_cost_flow(
+    rank: np.ndarray,
+    family_size: np.ndarray,
+    registered: np.ndarray,
+    household_city: np.ndarray,
+    center_city: np.ndarray,
+    capacity: np.ndarray,
+    weights: np.ndarray,
+    cross_city_penalty: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min-cost-flow plan (same arguments and result as plan_greedy)
+
+    Within a (city, priority) group households are interchangeable for the
+    objective, so each group's flow goes to its members in service order.
+    """
+    order = _service_order(rank, family_size, registered)
+    levels = len(PRIORITY_LEVELS)
+    keys, group_of, group_size = np.unique(
+        household_city[order] * levels + rank[order],
+        return_inverse=True,
+        return_counts=True
+    )
+    group_city = keys // levels
+    group_rank = keys % levels
+
+    same_city = group_city[:, None] == center_city[None, :]
+    cost = np.where(same_city, 0.0, cross_city_penalty) - weights[group_rank][:, None]
+    flow = _min_cost_max_flow(group_size, capacity, cost)
+
+    by_group = order[np.argsort(group_of, kind="stable")]
+    starts = np.concatenate([[0], np.cumsum(group_size)[:-1]])
+    households, centers = [], []
+    for group, start in enumerate(starts):
+        # Local centers first; the objective is the same either way
+        center_order = np.argsort(~same_city[group], kind="stable")
+        slots = np.repeat(center_order, flow[group][center_order])
+        households.append(by_group[start:start + len(slots)])
+        centers.append(slots)
+
+    return np.concatenate(households), np.concatenate(centers)
+
+
+def _city_codes(*cities: List[str]) -> List[np.ndarray]:
+    """Integer codes for city names, shared across the lists"""
+    names = [city.strip().lower() for group in cities for city in group]
+    _, codes = np.unique(np.array(names, dtype=object), return_inverse=True)
+    return np.split(codes.astype(np.int64), np.cumsum([len(group) for group in cities])[:-1])
+
+
+def plan_package(
+    db: Session,
+    package_id: int,
+    quantity: int = 1,
+    center_ids: List[int] | None = None,
+    pending_only: bool = True,
+    refine: bool = False,
+    cross_city_penalty: float | None = None
+) -> Tuple[str, str, Dict | None]:
+    """
+    Plan one package's distribution
+
+    Returns:
+        (status, message, plan) - plan is None on error
+    """
+    package = reference_data.get(db, PACKAGES, package_id)
+    if not package:
+        return ("error", f"Package {package_id} not found", None)
+    if not package.is_active:
+        return ("error", f"Package {package_id} is not active", None)
+
+    pending_join = (
+        f"INNER JOIN Pending_Queue q ON q.household_id = h.household_id AND {PENDING_SQL}"
+        if pending_only else ""
+    )
+    candidates = db.execute(
+        text(_CANDIDATES_SQL.format(pending_join=pending_join)),
+        {"package_id": package_id}
+    ).all()
+
+    params = {"package_id": package_id}
+    stock_sql = text(_STOCK_SQL.format(
+        center_filter=" AND dc.center_id IN :center_ids" if center_ids else ""
+    ))
+    if center_ids:
+        stock_sql = stock_sql.bindparams(bindparam("center_ids", expanding=True))
+        params["center_ids"] = center_ids
+    stock = db.execute(stock_sql, params).all()
+
+    household_ids = np.array([row.household_id for row in candidates], dtype=np.int64)
+    rank = np.array([row.priority_rank for row in candidates], dtype=np.int64)
+    family_size = np.array([row.family_size for row in candidates], dtype=np.int64)
+    registered = np.array([row.registered for row in candidates], dtype=np.int64)
+    center_id_array = np.array([row.center_id for row in stock], dtype=np.int64)
+    available = np.array([max(row.available, 0) for row in stock], dtype=np.int64)
+    capacity = available // quantity
+
+    household_city, center_city = _city_codes(
+        [row.city for row in candidates],
+        [row.city for row in stock]
+    )
+
+    weights = np.array(
+        [settings.PLANNER_PRIORITY_WEIGHTS[level] for level in PRIORITY_LEVELS],
+        dtype=float
+    )
+    penalty = (
+        settings.PLANNER_CROSS_CITY_PENALTY
+        if cross_city_penalty is None else cross_city_penalty
+    )
+
+    if not len(household_ids) or not capacity.sum():
+        planned = np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    elif refine:
+        planned = plan_min_cost_flow(
+            rank, family_size, registered, household_city, center_city,
+            capacity, weights, penalty
+        )
+    else:
+        planned = plan_greedy(
+            rank, family_size, registered, household_city, center_city, capacity
+        )
+
+    household_index, center_index = planned
+    same_city = household_city[household_index] == center_city[center_index]
+    per_center = np.bincount(center_index, minlength=len(center_id_array))
+
+    items = [
+        {
+            "household_id": household_id,
+            "package_id": package_id,
+            "center_id": center_id,
+            "quantity": quantity,
+            "priority_level": PRIORITY_LEVELS[priority],
+            "same_city": local
+        }
+        for household_id, center_id, priority, local in zip(
+            household_ids[household_index].tolist(),
+            center_id_array[center_index].tolist(),
+            rank[household_index].tolist(),
+            same_city.tolist()
+        )
+    ]
+
+    plan = {
+        "package_id": package_id,
+        "package_name": package.package_name,
+        "strategy": "min_cost_flow" if refine else "greedy",
+        "candidates": len(household_ids),
+        "planned": len(items),
+        "unserved": len(household_ids) - len(items),
+        "cross_city": int((~same_city).sum()),
+        "score": float(
+            weights[rank[household_index]].sum() - penalty * (~same_city).sum()
+        ),
+        "by_priority": {
+            level: int((rank[household_index] == index).sum())
+            for index, level in enumerate(PRIORITY_LEVELS)
+        },
+        "by_center": [
+            {"center_id": center_id, "available": int(units), "planned": int(count)}
+            for center_id, units, count in zip(
+                center_id_array.tolist(), available, per_center
+            )
+        ],
+        "items": items
+    }
+
+    return ("success", f"Planned {len(items)} of {len(household_ids)} candidate household(s)", plan)
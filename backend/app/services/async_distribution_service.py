@@ -0,0 +1,138 @@
+"""
+Async Distribution Service - same transactions as DistributionService,
+driven from an AsyncSession
+
+Each unit of work runs the sync service code through AsyncSession.run_sync:
+SQLAlchemy executes it in a greenlet on the event loop, so every statement
+(including a SELECT ... FOR UPDATE waiting on a row lock) awaits the
+aiomysql connection instead of blocking a threadpool thread. The locking
+and validation logic is therefore exactly the sync one; only the retry
+pause is awaited here instead of slept. The queries themselves are the sync
+service's (an async request path, not an async data path), and nothing they
+call may block the loop thread (see TTLCache.get_or_load).
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Tuple
+import asyncio
+import logging
+import random
+
+from app.core.config import settings
+from app.services.distribution_service import DistributionService
+from app.services.idempotency import IdempotentRequest
+from app.services.transaction_retry import (
+    TransactionRetry,
+    busy_message,
+    set_lock_wait_timeout,
+    transient_error
+)
+from app.services.inventory_strategies import InventoryConflict, get_inventory_strategy
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDistributionService:
+    """Async counterpart of DistributionService (see its docstrings)"""
+
+    @staticmethod
+    async def distribute_package(
+        db: AsyncSession,
+        household_id: int,
+        package_id: int,
+        center_id: int,
+        staff_id: int | None,
+        quantity: int = 1,
+        idempotent: IdempotentRequest | None = None
+    ) -> Tuple[str, str, int | None]:
+        """
+        Distribute aid package to household with full ACID transaction
+
+        Returns:
+            Tuple of (status, message, log_id), as DistributionService
+        """
+
+        strategy = get_inventory_strategy(center_id)
+        retry = TransactionRetry()
+        conflicts = 0
+
+        try:
+            while True:
+                try:
+                    lock_wait_timeout = retry.next_lock_wait_timeout()
+                    if lock_wait_timeout is not None:
+                        await db.run_sync(set_lock_wait_timeout, lock_wait_timeout)
+
+                    return await db.run_sync(
+                        DistributionService._distribute_once,
+                        strategy, household_id, package_id, center_id, staff_id, quantity,
+                        idempotent
+                    )
+
+                except InventoryConflict:
+                    # Optimistic update lost the race: retry in a new transaction
+                    # after a short jittered pause (without blocking the loop)
+                    await db.rollback()
+                    if conflicts == settings.OPTIMISTIC_MAX_RETRIES:
+                        break
+                    strategy.stats.record("retries")
+                    await asyncio.sleep(random.uniform(0, 0.002 * 2 ** conflicts))
+                    conflicts += 1
+
+                except Exception as e:
+                    # Rollback on any error
+                    await db.rollback()
+                    error = transient_error(e)
+                    if error is None:
+                        logger.error(f"❌ Distribution failed: {str(e)}")
+                        return ("error", f"Transaction failed: {str(e)}", None)
+
+                    # Lock wait timeout or deadlock: run the transaction again
+                    pause = retry.next_pause(error)
+                    if pause is None:
+                        logger.warning(
+                            f"⚠️ Distribution gave up after {retry.retries} retries ({error}): "
+                            f"Center {center_id}, Package {package_id}"
+                        )
+                        return ("error", busy_message(error), None)
+                    await asyncio.sleep(pause)
+
+            strategy.stats.record("exhausted")
+            logger.warning(
+                f"⚠️ Distribution gave up after {settings.OPTIMISTIC_MAX_RETRIES} retries: "
+                f"Center {center_id}, Package {package_id}"
+            )
+            return ("error", "Inventory is busy, please retry the distribution", None)
+
+        finally:
+            await db.run_sync(DistributionService._restore_lock_wait_timeout, retry)
+
+    @staticmethod
+    async def distribute_batch(
+        db: AsyncSession,
+        items: List
+    ) -> List[Tuple[str, str, int | None]]:
+        """Distribute many packages, one ACID transaction per center"""
+        return await db.run_sync(DistributionService.distribute_batch, items)
+
+    @staticmethod
+    async def check_eligibility(
+        db: AsyncSession,
+        household_id: int,
+        package_id: int
+    ) -> Tuple[bool, str]:
+        """Check if household is eligible for a package (read-only)"""
+        return await db.run_sync(
+            DistributionService.check_eligibility, household_id, package_id
+        )
+
+    @staticmethod
+    async def check_eligibility_matrix(
+        db: AsyncSession,
+        household_ids: List[int],
+        package_ids: List[int]
+    ) -> List[Tuple[int, int, bool, str]]:
+        """check_eligibility for every (household, package) pair"""
+        return await db.run_sync(
+            DistributionService.check_eligibility_matrix, household_ids, package_ids
+        )
@@ -0,0 +1,81 @@
+"""
+Dashboard Statistics
+One round trip for all dashboard counters, behind a short TTL cache
+
+Every open browser tab polls /reports/dashboard; with the cache's
+single-flight loading, N concurrent polls in one worker cost at most one
+query per DASHBOARD_CACHE_TTL_SECONDS. `as_of` tells the client when the
+numbers were computed.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from datetime import datetime
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.report_rollups import JOB_NAME as ROLLUP_JOB
+
+dashboard_cache = TTLCache(
+    "dashboard",
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+    max_entries=1
+)
+
+# - total_distributions: rollup sum plus the log tail the rollup job has
+#   not folded in yet (a primary-key range)
+# - critical_households: anti-join against Household_Package_Last
+#   (primary-key probes) instead of the whole log
+# - recent_distributions: range on idx_date, bounded by one week of rows
+_DASHBOARD_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM Households WHERE status = 'active')
+            AS total_households,
+        (SELECT COALESCE(SUM(distributions), 0) FROM Rollup_Daily_Distributions)
+        + (
+            SELECT COUNT(*) FROM Distribution_Log
+            WHERE transaction_status = 'success'
+              AND log_id > COALESCE((
+                  SELECT last_log_id FROM Job_Watermarks WHERE job_name = :rollup_job
+              ), 0)
+        ) AS total_distributions,
+        (SELECT COUNT(*) FROM Distribution_Centers WHERE status = 'active')
+            AS total_centers,
+        (
+            SELECT COUNT(*) FROM Inventory i
+            LEFT JOIN (
+                SELECT center_id, package_id, SUM(quantity_on_hand) AS shard_quantity
+                FROM Inventory_Shards
+                GROUP BY center_id, package_id
+            ) s ON s.center_id = i.center_id AND s.package_id = i.package_id
+            WHERE i.quantity_on_hand + COALESCE(s.shard_quantity, 0) <= i.reorder_level
+        ) AS low_stock_items,
+        (
+            SELECT COUNT(*) FROM Households h
+            WHERE h.status = 'active'
+              AND h.priority_level = 'critical'
+              AND NOT EXISTS (
+                  SELECT 1 FROM Household_Package_Last hpl
+                  WHERE hpl.household_id = h.household_id
+              )
+        ) AS critical_households,
+        (
+            SELECT COUNT(*) FROM Distribution_Log
+            WHERE transaction_status = 'success'
+              AND distribution_date >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+        ) AS recent_distributions
+""")
+
+
+def compute_dashboard(db: Session) -> dict:
+    """Run the dashboard query (uncached)"""
+    row = db.execute(_DASHBOARD_SQL, {"rollup_job": ROLLUP_JOB}).mappings().one()
+    return {
+        **{key: int(value) for key, value in row.items()},
+        "as_of": datetime.now()
+    }
+
+
+def get_dashboard(db: Session) -> dict:
+    """Dashboard statistics, at most DASHBOARD_CACHE_TTL_SECONDS old"""
+    return dashboard_cache.get_or_load("dashboard", lambda: compute_dashboard(db))
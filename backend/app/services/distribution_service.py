@@ -4,26 +4,155 @@ This is the CORE of the concurrency control implementation
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import insert, select, literal, and_, tuple_
+from collections import Counter, defaultdict
 from datetime import datetime, date
-from typing import Tuple
+from types import SimpleNamespace
+from typing import List, Tuple
 import logging
+import random
+import time
+
+from app.core import metrics
+from app.core.config import settings
 
 from app.models import (
     Household,
     AidPackage,
     DistributionCenter,
     Inventory,
-    DistributionLog
+    InventoryShard,
+    DistributionLog,
+    HouseholdPackageLast
+)
+from app.services.inventory_strategies import (
+    InventoryConflict,
+    InventoryStrategy,
+    get_inventory_strategy
+)
+from app.services.reference_data import reference_data, PACKAGES, CENTERS
+from app.services import idempotency, last_distribution, report_rollups, restock_service
+from app.services.idempotency import IdempotentRequest
+from app.services.transaction_retry import (
+    TransactionRetry,
+    busy_message,
+    set_lock_wait_timeout,
+    transient_error
 )
 
 logger = logging.getLogger(__name__)
 
 
+def _distribution_error(household, package, center, last_distribution_date) -> str | None:
+    """
+    Apply the distribution rules (steps 1-4) to already-loaded rows
+
+    Any object exposing the model attributes works (ORM instance or Row).
+    Returns the error message for the first rule that fails, or None.
+    """
+    if not household:
+        return "Household not found"
+
+    if household.status != "active":
+        return f"Household status is {household.status}"
+
+    if not package:
+        return "Package not found"
+
+    if not package.is_active:
+        return "Package is not active"
+
+    if not center:
+        return "Distribution center not found"
+
+    if center.status != "active":
+        return f"Center status is {center.status}"
+
+    if last_distribution_date:
+        days_since = (date.today() - last_distribution_date.date()).days
+
+        if days_since < package.validity_period_days:
+            remaining_days = package.validity_period_days - days_since
+            return (
+                f"Household not eligible. Last received {days_since} days ago. "
+                f"Must wait {remaining_days} more days."
+            )
+
+    return None
+
+
+def _eligibility_result(household, package, last_distribution_date) -> Tuple[bool, str]:
+    """
+    Apply the eligibility rules to already-loaded rows
+
+    Same contract as _distribution_error; these are the messages
+    check_eligibility has always returned.
+    """
+    if not household:
+        return (False, "Household not found")
+
+    if household.status != "active":
+        return (False, f"Household is {household.status}")
+
+    if not package:
+        return (False, "Package not found")
+
+    if not package.is_active:
+        return (False, "Package is not active")
+
+    if not last_distribution_date:
+        return (True, "Household has never received this package - ELIGIBLE")
+
+    days_since = (date.today() - last_distribution_date.date()).days
+
+    if days_since >= package.validity_period_days:
+        return (True, f"Last received {days_since} days ago - ELIGIBLE")
+    else:
+        remaining = package.validity_period_days - days_since
+        return (False, f"Must wait {remaining} more days")
+
+
+def _take_from_shards(shards: List[InventoryShard], quantity: int) -> None:
+    """Decrement locked shards, fullest first, until `quantity` is taken"""
+    remaining = quantity
+    for shard in sorted(shards, key=lambda shard: shard.quantity_on_hand, reverse=True):
+        taken = min(remaining, shard.quantity_on_hand)
+        shard.quantity_on_hand -= taken
+        remaining -= taken
+        if not remaining:
+            break
+
+
+def _inserted_log_ids(db: Session, center_id: int, log_rows: List[dict]) -> List[int]:
+    """
+    Ids of the Distribution_Log rows just inserted for `log_rows`, in row order
+
+    A multi-row INSERT need not get consecutive ids (innodb_autoinc_lock_mode
+    = 2), so they are read back per (household, package). Only a transaction
+    holding this center's inventory lock can log these packages here, so
+    each pair's newest rows are the batch's own.
+    """
+    counts = Counter((row["household_id"], row["package_id"]) for row in log_rows)
+    ids_by_pair = defaultdict(list)
+    for log in db.execute(
+        select(DistributionLog.log_id, DistributionLog.household_id, DistributionLog.package_id)
+        .where(
+            DistributionLog.center_id == center_id,
+            tuple_(DistributionLog.household_id, DistributionLog.package_id).in_(list(counts))
+        )
+        .order_by(DistributionLog.log_id)
+    ):
+        ids_by_pair[(log.household_id, log.package_id)].append(log.log_id)
+
+    newest = {pair: iter(ids_by_pair[pair][-count:]) for pair, count in counts.items()}
+    return [next(newest[(row["household_id"], row["package_id"])]) for row in log_rows]
+
+
 class DistributionService:
     """
     Service handling aid package distribution with ACID guarantees
     Uses pessimistic locking (SELECT ... FOR UPDATE) to prevent race conditions
+    by default; see inventory_strategies for the alternatives
     """
 
     @staticmethod
@@ -33,14 +162,16 @@ class DistributionService:
         package_id: int,
         center_id: int,
         staff_id: int | None,
-        quantity: int = 1
+        quantity: int = 1,
+        idempotent: IdempotentRequest | None = None
     ) -> Tuple[str, str, int | None]:
         """
         Distribute aid package to household with full ACID transaction
 
         Returns:
             Tuple of (status, message, log_id)
-            status: 'success' or 'error'
+            status: 'success', 'error' or 'duplicate' (the Idempotency-Key
+            of `idempotent` was stored by another request meanwhile)
             message: Human-readable result message
             log_id: ID of distribution log entry if successful
 
@@ -54,125 +185,590 @@ class DistributionService:
         7. Update inventory (decrement)
         8. Insert distribution log
         9. Commit transaction
+
+        With `idempotent`, the Idempotency-Key is claimed before step 1 and
+        its response stored before step 9 (see services/idempotency.py).
+
+        Steps 5-7 follow the center's inventory strategy (see
+        inventory_strategies): pessimistic as above, optimistic with a
+        version check and bounded retries, or one conditional UPDATE.
+
+        Lock wait timeouts and deadlocks roll back and run the transaction
+        again, within a retry budget and deadline (see transaction_retry).
         """
 
+        strategy = get_inventory_strategy(center_id)
+        retry = TransactionRetry()
+        conflicts = 0
+
         try:
-            # Start transaction explicitly
-            # (Note: SQLAlchemy already wraps operations in a transaction,
-            # but we make it explicit for clarity)
-
-            # 1. Validate household
-            household = db.query(Household).filter(
-                Household.household_id == household_id
-            ).first()
-
-            if not household:
-                return ("error", "Household not found", None)
-
-            if household.status != "active":
-                return ("error", f"Household status is {household.status}", None)
-
-            # 2. Validate package
-            package = db.query(AidPackage).filter(
-                AidPackage.package_id == package_id
-            ).first()
-
-            if not package:
-                return ("error", "Package not found", None)
-
-            if not package.is_active:
-                return ("error", "Package is not active", None)
-
-            # 3. Validate center
-            center = db.query(DistributionCenter).filter(
-                DistributionCenter.center_id == center_id
-            ).first()
-
-            if not center:
-                return ("error", "Distribution center not found", None)
-
-            if center.status != "active":
-                return ("error", f"Center status is {center.status}", None)
-
-            # 4. Check eligibility (validity period)
-            last_distribution = db.query(DistributionLog).filter(
-                DistributionLog.household_id == household_id,
-                DistributionLog.package_id == package_id,
-                DistributionLog.transaction_status == "success"
-            ).order_by(DistributionLog.distribution_date.desc()).first()
-
-            if last_distribution:
-                last_date = last_distribution.distribution_date.date()
-                days_since = (date.today() - last_date).days
-
-                if days_since < package.validity_period_days:
-                    remaining_days = package.validity_period_days - days_since
-                    return (
-                        "error",
-                        f"Household not eligible. Last received {days_since} days ago. "
-                        f"Must wait {remaining_days} more days.",
-                        None
+            while True:
+                try:
+                    lock_wait_timeout = retry.next_lock_wait_timeout()
+                    if lock_wait_timeout is not None:
+                        set_lock_wait_timeout(db, lock_wait_timeout)
+
+                    return DistributionService._distribute_once(
+                        db, strategy, household_id, package_id, center_id, staff_id, quantity,
+                        idempotent
                     )
 
-            # 5. CRITICAL: Lock inventory row using FOR UPDATE
-            # This prevents other transactions from reading/writing this row
-            # until our transaction completes (commits or rolls back)
-            inventory = db.query(Inventory).filter(
+                except InventoryConflict:
+                    # Optimistic update lost the race: start over in a new
+                    # transaction (fresh snapshot) after a short jittered pause
+                    db.rollback()
+                    if conflicts == settings.OPTIMISTIC_MAX_RETRIES:
+                        break
+                    strategy.stats.record("retries")
+                    time.sleep(random.uniform(0, 0.002 * 2 ** conflicts))
+                    conflicts += 1
+
+                except Exception as e:
+                    # Rollback on any error
+                    db.rollback()
+                    error = transient_error(e)
+                    if error is None:
+                        logger.error(f"❌ Distribution failed: {str(e)}")
+                        return ("error", f"Transaction failed: {str(e)}", None)
+
+                    # Lock wait timeout or deadlock: nothing was written, so
+                    # the whole transaction runs again after a backoff
+                    pause = retry.next_pause(error)
+                    if pause is None:
+                        logger.warning(
+                            f"⚠️ Distribution gave up after {retry.retries} retries ({error}): "
+                            f"Center {center_id}, Package {package_id}"
+                        )
+                        return ("error", busy_message(error), None)
+                    time.sleep(pause)
+
+            strategy.stats.record("exhausted")
+            logger.warning(
+                f"⚠️ Distribution gave up after {settings.OPTIMISTIC_MAX_RETRIES} retries: "
+                f"Center {center_id}, Package {package_id}"
+            )
+            return ("error", "Inventory is busy, please retry the distribution", None)
+
+        finally:
+            DistributionService._restore_lock_wait_timeout(db, retry)
+
+    @staticmethod
+    def _restore_lock_wait_timeout(db: Session, retry: TransactionRetry) -> None:
+        """
+        Give the pooled connection back with the server's lock wait timeout,
+        so only the distribution path runs with the shorter one (every
+        outcome has committed or rolled back by now)
+        """
+        if retry.lock_wait_timeout is None:
+            return
+        try:
+            set_lock_wait_timeout(db, None)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not reset innodb_lock_wait_timeout: {str(e)}")
+
+    @staticmethod
+    def _distribute_once(
+        db: Session,
+        strategy: InventoryStrategy,
+        household_id: int,
+        package_id: int,
+        center_id: int,
+        staff_id: int | None,
+        quantity: int,
+        idempotent: IdempotentRequest | None = None
+    ) -> Tuple[str, str, int | None]:
+        """One attempt of distribute_package (steps 1-9, no error handling)"""
+
+        # Start transaction explicitly
+        # (Note: SQLAlchemy already wraps operations in a transaction,
+        # but we make it explicit for clarity)
+
+        started = time.perf_counter()
+
+        # 0. Claim the Idempotency-Key first: a concurrent repeat of this
+        # request waits here until this transaction ends
+        if idempotent and not idempotency.claim(db, idempotent):
+            db.rollback()
+            return ("duplicate", "Idempotency-Key already used", None)
+
+        # 1-4. Validate household, package, center and eligibility with
+        # ONE joined query; nothing is locked yet
+        validation_started = time.perf_counter()
+        context = DistributionService._load_context(
+            db, household_id, package_id, center_id
+        )
+
+        error = _distribution_error(
+            context.household,
+            context.package,
+            context.center,
+            context.last_distribution_date
+        )
+        lock_started = time.perf_counter()
+        metrics.observe_distribution_phase("validation", lock_started - validation_started)
+        if error:
+            # End the transaction here: this releases the Idempotency-Key
+            # claim, so a corrected retry with the same key can run
+            db.rollback()
+            return ("error", error, None)
+
+        # 5-7. CRITICAL: Lock inventory, check quantity, decrement
+        # (the lock is only taken once validation has passed)
+        error = DistributionService._reserve_inventory(
+            db, strategy, center_id, package_id, quantity, context.shard_count
+        )
+        lock_wait = time.perf_counter() - lock_started
+        metrics.observe_distribution_phase("lock", lock_wait)
+        metrics.observe_inventory_lock_wait(center_id, package_id, lock_wait)
+        if error:
+            db.rollback()
+            return ("error", error, None)
+
+        # 8. Create distribution log entry
+        log_entry = DistributionLog(
+            household_id=household_id,
+            package_id=package_id,
+            center_id=center_id,
+            staff_id=staff_id,
+            quantity_distributed=quantity,
+            transaction_status="success",
+            notes="Successfully distributed via API"
+        )
+        db.add(log_entry)
+
+        # The INSERT reports the new log_id (cursor lastrowid), so no
+        # refresh SELECT is needed after the commit
+        db.flush()
+        log_id = log_entry.log_id
+
+        # Keep the last-distribution index in step (same transaction)
+        last_distribution.record_distributions(db, [log_id])
+
+        message = f"Successfully distributed {quantity} package(s)"
+        if idempotent:
+            idempotency.complete(db, idempotent, "success", message, log_id)
+
+        # 9. Commit transaction
+        commit_started = time.perf_counter()
+        db.commit()
+        finished = time.perf_counter()
+        metrics.observe_distribution_phase("commit", finished - commit_started)
+        metrics.observe_distribution_phase("total", finished - started)
+
+        if idempotent:
+            idempotency.remember(idempotent)
+
+        logger.info(
+            f"✅ Distribution successful: Household {household_id}, "
+            f"Package {package_id}, Quantity {quantity}, Log ID {log_id}"
+        )
+
+        return ("success", message, log_id)
+
+    @staticmethod
+    def _load_context(
+        db: Session,
+        household_id: int,
+        package_id: int,
+        center_id: int | None = None
+    ) -> SimpleNamespace:
+        """
+        Load everything the distribution rules need in ONE round trip
+
+        LEFT JOINs household, package, center and inventory onto a one-row
+        anchor (so a missing row shows up as NULLs instead of no result) and
+        reads the last successful distribution from Household_Package_Last
+        (a primary-key lookup) as a scalar subquery. With the
+        reference-data cache on, package and center come from the cache and
+        are left out of the query.
+
+        Returns:
+            Namespace with household, package, center (None when not found),
+            last_distribution_date and shard_count (None without inventory)
+        """
+        use_cache = reference_data.enabled
+
+        last_distribution_date = select(
+            HouseholdPackageLast.last_distribution_date
+        ).where(
+            HouseholdPackageLast.household_id == household_id,
+            HouseholdPackageLast.package_id == package_id
+        ).scalar_subquery()
+
+        columns = [
+            Household.household_id,
+            Household.status.label("household_status"),
+            last_distribution_date.label("last_distribution_date"),
+        ]
+        if not use_cache:
+            columns += [
+                AidPackage.package_id,
+                AidPackage.is_active,
+                AidPackage.validity_period_days,
+            ]
+        if center_id is not None:
+            columns.append(Inventory.shard_count)
+            if not use_cache:
+                columns += [
+                    DistributionCenter.center_id,
+                    DistributionCenter.status.label("center_status"),
+                ]
+
+        anchor = select(literal(1).label("anchor")).subquery("anchor")
+        query = select(*columns).select_from(anchor).outerjoin(
+            Household, Household.household_id == household_id
+        )
+        if not use_cache:
+            query = query.outerjoin(
+                AidPackage, AidPackage.package_id == package_id
+            )
+        if center_id is not None:
+            if not use_cache:
+                query = query.outerjoin(
+                    DistributionCenter, DistributionCenter.center_id == center_id
+                )
+            query = query.outerjoin(
+                Inventory, and_(
+                    Inventory.center_id == center_id,
+                    Inventory.package_id == package_id
+                )
+            )
+
+        row = db.execute(query).one()
+
+        if use_cache:
+            package = reference_data.get(db, PACKAGES, package_id)
+            center = reference_data.get(db, CENTERS, center_id) \
+                if center_id is not None else None
+        else:
+            package = SimpleNamespace(
+                is_active=row.is_active,
+                validity_period_days=row.validity_period_days
+            ) if row.package_id is not None else None
+            center = SimpleNamespace(status=row.center_status) \
+                if center_id is not None and row.center_id is not None else None
+
+        return SimpleNamespace(
+            household=SimpleNamespace(status=row.household_status)
+            if row.household_id is not None else None,
+            package=package,
+            center=center,
+            last_distribution_date=row.last_distribution_date,
+            shard_count=row.shard_count if center_id is not None else None
+        )
+
+    @staticmethod
+    def _reserve_inventory(
+        db: Session,
+        strategy: InventoryStrategy,
+        center_id: int,
+        package_id: int,
+        quantity: int,
+        shard_count: int | None
+    ) -> str | None:
+        """
+        Take `quantity` units of stock inside the current transaction
+
+        Sharded rows (shard_count > 1, as read during validation) lock one
+        of their shards, all other rows go through the center's inventory
+        strategy. validation read shard_count without a lock: when the
+        strategy finds too little stock, shard_count is read again with a
+        locking read, and a row sharded in the meantime is served from its
+        shards.
+
+        Returns:
+            Error message, or None once the stock is decremented
+        """
+        if shard_count and shard_count > 1:
+            return DistributionService._reserve_from_shards(
+                db, strategy, center_id, package_id, quantity, shard_count
+            )
+
+        error = strategy.reserve(db, center_id, package_id, quantity)
+        if error is None:
+            return None
+
+        current = db.execute(
+            select(Inventory.shard_count).where(
                 Inventory.center_id == center_id,
                 Inventory.package_id == package_id
-            ).with_for_update().first()  # <-- PESSIMISTIC LOCKING!
+            ).with_for_update(read=True)
+        ).scalar()
+        if current and current > 1:
+            return DistributionService._reserve_from_shards(
+                db, strategy, center_id, package_id, quantity, current
+            )
+        return error
+
+    @staticmethod
+    def _reserve_from_shards(
+        db: Session,
+        strategy: InventoryStrategy,
+        center_id: int,
+        package_id: int,
+        quantity: int,
+        shard_count: int
+    ) -> str | None:
+        """
+        Decrement one shard of a sharded Inventory row
+
+        Starts at a random shard and uses FOR UPDATE SKIP LOCKED, so
+        concurrent distributions grab different shards instead of waiting.
+        Only when no free shard can cover the quantity on its own does it
+        wait for all shards (in shard_no order) and take from several.
+        """
+        shard_query = db.query(InventoryShard).filter(
+            InventoryShard.center_id == center_id,
+            InventoryShard.package_id == package_id,
+            InventoryShard.quantity_on_hand >= quantity
+        ).order_by(InventoryShard.shard_no).with_for_update(skip_locked=True)
+
+        start = random.randrange(shard_count)
+        shard = shard_query.filter(InventoryShard.shard_no >= start).first()
+        if not shard and start > 0:
+            shard = shard_query.filter(InventoryShard.shard_no < start).first()
 
+        if shard:
+            shard.quantity_on_hand -= quantity
+            return None
+
+        shards = db.query(InventoryShard).filter(
+            InventoryShard.center_id == center_id,
+            InventoryShard.package_id == package_id
+        ).order_by(InventoryShard.shard_no).with_for_update().all()
+
+        if not shards:
+            # Sharding was switched off while we were validating
+            return strategy.reserve(db, center_id, package_id, quantity)
+
+        available = sum(shard.quantity_on_hand for shard in shards)
+        if available < quantity:
+            return f"Insufficient inventory. Available: {available}, Requested: {quantity}"
+
+        _take_from_shards(shards, quantity)
+        return None
+
+    @staticmethod
+    def distribute_batch(
+        db: Session,
+        items: List
+    ) -> List[Tuple[str, str, int | None]]:
+        """
+        Distribute many packages, one ACID transaction per center
+
+        Each item needs household_id, package_id, center_id, staff_id and
+        quantity (e.g. a DistributionRequest).
+
+        Returns:
+            List of (status, message, log_id) tuples in the same order as items
+
+        Per center, this method:
+        1. Loads households, packages, center and last distributions in
+           set-based queries (one per table, not one per item)
+        2. LOCKS every needed inventory row in ascending package_id order
+           (SELECT ... FOR UPDATE) <- fixed order, so concurrent batches and
+           single distributions cannot deadlock on each other
+        3. Applies the same rules as distribute_package to each item;
+           a failing item is reported and skipped, not the whole batch
+        4. Writes all distribution logs with ONE multi-row INSERT
+        5. Commits once
+        """
+        results: List[Tuple[str, str, int | None] | None] = [None] * len(items)
+
+        indexes_by_center = defaultdict(list)
+        for index, item in enumerate(items):
+            indexes_by_center[item.center_id].append(index)
+
+        # Centers are processed one at a time, so a transaction never holds
+        # inventory locks from two centers
+        for center_id in sorted(indexes_by_center):
+            indexes = indexes_by_center[center_id]
+            try:
+                DistributionService._distribute_center_batch(
+                    db, center_id, items, indexes, results
+                )
+            except Exception as e:
+                db.rollback()
+                logger.error(f"❌ Batch distribution failed for center {center_id}: {str(e)}")
+                for index in indexes:
+                    if results[index] is None or results[index][0] == "success":
+                        results[index] = ("error", f"Transaction failed: {str(e)}", None)
+
+        return results
+
+    @staticmethod
+    def _distribute_center_batch(
+        db: Session,
+        center_id: int,
+        items: List,
+        indexes: List[int],
+        results: List
+    ) -> None:
+        """
+        Run the items at one center in a single transaction
+
+        Error results are written into `results` as they are found;
+        success results only after the commit went through.
+        """
+        household_ids = {items[i].household_id for i in indexes}
+        package_ids = {items[i].package_id for i in indexes}
+
+        # 1. Set-based validation reads (no locks yet); package and center
+        # rows come from the reference-data cache
+        center = reference_data.get(db, CENTERS, center_id)
+
+        households = {
+            row.household_id: row
+            for row in db.query(Household.household_id, Household.status).filter(
+                Household.household_id.in_(household_ids)
+            )
+        }
+
+        packages = reference_data.get_many(db, PACKAGES, package_ids)
+
+        last_distributions = {
+            (row.household_id, row.package_id): row.last_distribution_date
+            for row in db.query(
+                HouseholdPackageLast.household_id,
+                HouseholdPackageLast.package_id,
+                HouseholdPackageLast.last_distribution_date
+            ).filter(
+                HouseholdPackageLast.household_id.in_(household_ids),
+                HouseholdPackageLast.package_id.in_(package_ids)
+            )
+        }
+
+        valid = []
+        for index in indexes:
+            item = items[index]
+            error = _distribution_error(
+                households.get(item.household_id),
+                packages.get(item.package_id),
+                center,
+                last_distributions.get((item.household_id, item.package_id))
+            )
+            if error:
+                results[index] = ("error", error, None)
+            else:
+                valid.append(index)
+
+        if not valid:
+            db.rollback()
+            return
+
+        # 2. CRITICAL: Lock all needed inventory rows in ascending package_id
+        # order. InnoDB takes the locks in index scan order, which ORDER BY
+        # package_id makes deterministic on uq_center_package.
+        inventory_rows = {
+            inventory.package_id: inventory
+            for inventory in db.query(Inventory).filter(
+                Inventory.center_id == center_id,
+                Inventory.package_id.in_({items[i].package_id for i in valid})
+            ).order_by(Inventory.package_id).with_for_update()
+        }
+
+        # Sharded rows keep their stock in Inventory_Shards: lock those too,
+        # still in (package_id, shard_no) order
+        sharded_package_ids = sorted(
+            package_id
+            for package_id, inventory in inventory_rows.items()
+            if inventory.shard_count > 1
+        )
+        shards_by_package = defaultdict(list)
+        if sharded_package_ids:
+            for shard in db.query(InventoryShard).filter(
+                InventoryShard.center_id == center_id,
+                InventoryShard.package_id.in_(sharded_package_ids)
+            ).order_by(
+                InventoryShard.package_id,
+                InventoryShard.shard_no
+            ).with_for_update():
+                shards_by_package[shard.package_id].append(shard)
+
+        # 3. Check eligibility and quantity item by item against the locked rows
+        log_rows = []
+        granted = []
+        for index in valid:
+            item = items[index]
+            key = (item.household_id, item.package_id)
+
+            # A household listed twice for one package gets it only once
+            if key in last_distributions:
+                error = _distribution_error(
+                    households[item.household_id],
+                    packages[item.package_id],
+                    center,
+                    last_distributions[key]
+                )
+                if error:
+                    results[index] = ("error", error, None)
+                    continue
+
+            inventory = inventory_rows.get(item.package_id)
             if not inventory:
-                return (
+                results[index] = (
                     "error",
                     "No inventory record found for this package at this center",
                     None
                 )
+                continue
+
+            shards = shards_by_package.get(item.package_id)
+            if shards:
+                available = sum(shard.quantity_on_hand for shard in shards)
+            else:
+                available = inventory.quantity_on_hand
 
-            # 6. Check quantity (now safe because row is locked)
-            if inventory.quantity_on_hand < quantity:
-                return (
+            if available < item.quantity:
+                results[index] = (
                     "error",
-                    f"Insufficient inventory. Available: {inventory.quantity_on_hand}, "
-                    f"Requested: {quantity}",
+                    f"Insufficient inventory. Available: {available}, "
+                    f"Requested: {item.quantity}",
                     None
                 )
+                continue
 
-            # 7. Update inventory (decrement)
-            inventory.quantity_on_hand -= quantity
-
-            # 8. Create distribution log entry
-            log_entry = DistributionLog(
-                household_id=household_id,
-                package_id=package_id,
-                center_id=center_id,
-                staff_id=staff_id,
-                quantity_distributed=quantity,
-                transaction_status="success",
-                notes="Successfully distributed via API"
-            )
-            db.add(log_entry)
+            if shards:
+                _take_from_shards(shards, item.quantity)
+            else:
+                inventory.quantity_on_hand -= item.quantity
+            last_distributions[key] = datetime.now()
+
+            log_rows.append({
+                "household_id": item.household_id,
+                "package_id": item.package_id,
+                "center_id": center_id,
+                "staff_id": item.staff_id,
+                "quantity_distributed": item.quantity,
+                "transaction_status": "success",
+                "notes": "Successfully distributed via API (batch)"
+            })
+            granted.append(index)
+
+        if not granted:
+            db.rollback()
+            return
 
-            # 9. Commit transaction
-            db.commit()
-            db.refresh(log_entry)
+        # 4. One multi-row INSERT for every log entry, ids read back after
+        db.execute(insert(DistributionLog.__table__).values(log_rows))
+        log_ids = _inserted_log_ids(db, center_id, log_rows)
+        last_distribution.record_distributions(db, log_ids)
 
-            logger.info(
-                f"✅ Distribution successful: Household {household_id}, "
-                f"Package {package_id}, Quantity {quantity}, Log ID {log_entry.log_id}"
-            )
+        # 5. Commit (flushes the inventory decrements as well)
+        db.commit()
 
-            return (
+        for index, log_id in zip(granted, log_ids):
+            item = items[index]
+            results[index] = (
                 "success",
-                f"Successfully distributed {quantity} package(s)",
-                log_entry.log_id
+                f"Successfully distributed {item.quantity} package(s)",
+                log_id
             )
 
-        except Exception as e:
-            # Rollback on any error
-            db.rollback()
-            logger.error(f"❌ Distribution failed: {str(e)}")
-            return ("error", f"Transaction failed: {str(e)}", None)
+        logger.info(
+            f"✅ Batch distribution at center {center_id}: "
+            f"{len(granted)}/{len(indexes)} succeeded"
+        )
 
     @staticmethod
     def check_eligibility(
@@ -182,52 +778,116 @@ class DistributionService:
     ) -> Tuple[bool, str]:
         """
         Check if household is eligible for a package
-        This is a READ-ONLY operation (no locking needed)
+        This is a READ-ONLY operation (no locking needed), one query
 
         Returns:
             Tuple of (eligible, message)
         """
 
-        # Check household
-        household = db.query(Household).filter(
-            Household.household_id == household_id
-        ).first()
+        context = DistributionService._load_context(db, household_id, package_id)
 
-        if not household:
-            return (False, "Household not found")
+        return _eligibility_result(
+            context.household,
+            context.package,
+            context.last_distribution_date
+        )
 
-        if household.status != "active":
-            return (False, f"Household is {household.status}")
+    @staticmethod
+    def check_eligibility_matrix(
+        db: Session,
+        household_ids: List[int],
+        package_ids: List[int]
+    ) -> List[Tuple[int, int, bool, str]]:
+        """
+        check_eligibility for every (household, package) pair
 
-        # Check package
-        package = db.query(AidPackage).filter(
-            AidPackage.package_id == package_id
-        ).first()
+        Per chunk of settings.ELIGIBILITY_MATRIX_CHUNK_SIZE households this
+        runs two set-based queries (households, last distributions); the
+        packages come from the reference-data cache. Duplicate ids are
+        checked once.
 
-        if not package:
-            return (False, "Package not found")
+        Returns:
+            List of (household_id, package_id, eligible, message),
+            household-major in request order
+        """
+        household_ids = list(dict.fromkeys(household_ids))
+        package_ids = list(dict.fromkeys(package_ids))
 
-        if not package.is_active:
-            return (False, "Package is not active")
+        packages = reference_data.get_many(db, PACKAGES, package_ids)
 
-        # Check last distribution
-        last_distribution = db.query(DistributionLog).filter(
-            DistributionLog.household_id == household_id,
-            DistributionLog.package_id == package_id,
-            DistributionLog.transaction_status == "success"
-        ).order_by(DistributionLog.distribution_date.desc()).first()
+        results = []
+        chunk_size = settings.ELIGIBILITY_MATRIX_CHUNK_SIZE
+        for start in range(0, len(household_ids), chunk_size):
+            chunk = household_ids[start:start + chunk_size]
 
-        if not last_distribution:
-            return (True, "Household has never received this package - ELIGIBLE")
+            households = {
+                row.household_id: row
+                for row in db.query(Household.household_id, Household.status).filter(
+                    Household.household_id.in_(chunk)
+                )
+            }
+
+            last_distributions = {
+                (row.household_id, row.package_id): row.last_distribution_date
+                for row in db.query(
+                    HouseholdPackageLast.household_id,
+                    HouseholdPackageLast.package_id,
+                    HouseholdPackageLast.last_distribution_date
+                ).filter(
+                    HouseholdPackageLast.household_id.in_(list(households)),
+                    HouseholdPackageLast.package_id.in_(package_ids)
+                )
+            } if households else {}
+
+            for household_id in chunk:
+                for package_id in package_ids:
+                    eligible, message = _eligibility_result(
+                        households.get(household_id),
+                        packages.get(package_id),
+                        last_distributions.get((household_id, package_id))
+                    )
+                    results.append((household_id, package_id, eligible, message))
 
-        last_date = last_distribution.distribution_date.date()
-        days_since = (date.today() - last_date).days
+        return results
 
-        if days_since >= package.validity_period_days:
-            return (True, f"Last received {days_since} days ago - ELIGIBLE")
-        else:
-            remaining = package.validity_period_days - days_since
-            return (False, f"Must wait {remaining} more days")
+    @staticmethod
+    def delete_logs(db: Session, household_ids: List[int], package_id: int) -> int:
+        """
+        Delete the log rows of some households for one package (does not commit)
+
+        Everything derived from those rows is corrected in the same
+        transaction: Household_Package_Last for the pairs and the report
+        rollups the rows were counted in.
+
+        Returns:
+            Number of log rows deleted
+        """
+        rows = db.execute(
+            select(
+                DistributionLog.log_id,
+                DistributionLog.distribution_date,
+                DistributionLog.center_id,
+                DistributionLog.package_id,
+                DistributionLog.household_id,
+                DistributionLog.transaction_status
+            ).where(
+                DistributionLog.household_id.in_(household_ids),
+                DistributionLog.package_id == package_id
+            ).with_for_update()
+        ).all()
+
+        if rows:
+            db.query(DistributionLog).filter(
+                DistributionLog.log_id.in_([row.log_id for row in rows])
+            ).delete(synchronize_session=False)
+
+        # The deleted rows may have been the newest ones for these pairs
+        last_distribution.rebuild(
+            db, [(household_id, package_id) for household_id in household_ids]
+        )
+        report_rollups.forget(db, rows)
+
+        return len(rows)
 
     @staticmethod
     def restock_inventory(
@@ -239,40 +899,93 @@ class DistributionService:
         """
         Add inventory to a center
 
+        One atomic upsert (see restock_service): the increment happens in
+        MySQL under the row lock, so concurrent restocks cannot lose units.
+
+        Returns:
+            Tuple of (status, message)
+        """
+        status, message, summary = restock_service.restock_many(
+            db, [(1, center_id, package_id, quantity)]
+        )
+
+        if status == "error":
+            errors = summary["errors"]
+            return ("error", errors[0]["message"] if errors else message)
+
+        logger.info(f"✅ Restocked: Center {center_id}, Package {package_id}, Quantity {quantity}")
+
+        return ("success", f"Successfully restocked {quantity} units")
+
+    @staticmethod
+    def set_shard_count(
+        db: Session,
+        center_id: int,
+        package_id: int,
+        shard_count: int
+    ) -> Tuple[str, str]:
+        """
+        Split (or merge back) the stock of an inventory record
+
+        Locks the Inventory row and all its shards, then redistributes the
+        total evenly over `shard_count` shards. shard_count = 1 moves all
+        stock back onto the Inventory row and removes the shards.
+
         Returns:
             Tuple of (status, message)
         """
 
         try:
-            # Check if inventory record exists
             inventory = db.query(Inventory).filter(
                 Inventory.center_id == center_id,
                 Inventory.package_id == package_id
-            ).first()
+            ).with_for_update().first()
 
-            if inventory:
-                # Update existing record
-                inventory.quantity_on_hand += quantity
-                inventory.last_restock_date = date.today()
-                inventory.last_restock_quantity = quantity
+            if not inventory:
+                return ("error", "No inventory record found for this package at this center")
+
+            shards = db.query(InventoryShard).filter(
+                InventoryShard.center_id == center_id,
+                InventoryShard.package_id == package_id
+            ).order_by(InventoryShard.shard_no).with_for_update().all()
+
+            total = inventory.quantity_on_hand + sum(shard.quantity_on_hand for shard in shards)
+            # First: the row only takes stock back once it is unsharded
+            inventory.shard_count = shard_count
+
+            if shard_count > 1:
+                per_shard, remainder = divmod(total, shard_count)
+                existing = {shard.shard_no: shard for shard in shards}
+                for shard_no in range(shard_count):
+                    shard_quantity = per_shard + (1 if shard_no < remainder else 0)
+                    shard = existing.pop(shard_no, None)
+                    if shard:
+                        shard.quantity_on_hand = shard_quantity
+                    else:
+                        db.add(InventoryShard(
+                            center_id=center_id,
+                            package_id=package_id,
+                            shard_no=shard_no,
+                            quantity_on_hand=shard_quantity
+                        ))
+                for shard in existing.values():
+                    db.delete(shard)
+                inventory.quantity_on_hand = 0
             else:
-                # Create new record
-                inventory = Inventory(
-                    center_id=center_id,
-                    package_id=package_id,
-                    quantity_on_hand=quantity,
-                    last_restock_date=date.today(),
-                    last_restock_quantity=quantity
-                )
-                db.add(inventory)
+                for shard in shards:
+                    db.delete(shard)
+                inventory.quantity_on_hand = total
 
             db.commit()
 
-            logger.info(f"✅ Restocked: Center {center_id}, Package {package_id}, Quantity {quantity}")
+            logger.info(
+                f"✅ Resharded: Center {center_id}, Package {package_id}, "
+                f"Shards {shard_count}, Quantity {total}"
+            )
 
-            return ("success", f"Successfully restocked {quantity} units")
+            return ("success", f"Inventory split across {shard_count} shard(s)")
 
         except Exception as e:
             db.rollback()
-            logger.error(f"❌ Restock failed: {str(e)}")
-            return ("error", f"Restock failed: {str(e)}")
+            logger.error(f"❌ Resharding failed: {str(e)}")
+            return ("error", f"Resharding failed: {str(e)}")
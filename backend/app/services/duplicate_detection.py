@@ -0,0 +1,808 @@
+"""
+Duplicate Household Detection
+Finds households that are probably one family registered twice (a new
+phone number, a spelling variant) without comparing all pairs:
+
+1. Blocking: every household gets a few keys - surname Soundex + zip code,
+   contact-name Soundex + city, street number + street + zip code. Only
+   households sharing a key are compared; a block larger than
+   DUPLICATE_MAX_BLOCK_SIZE is skipped (a key that common is no evidence).
+2. Scoring: names and addresses become MinHash signatures of their
+   character trigrams, computed in a process pool, and all candidate pairs
+   are scored at once with numpy: estimated trigram similarity of names
+   and addresses, plus zip code, family size and phone-tail agreement.
+3. Clustering: pairs scoring at least DUPLICATE_SCORE_THRESHOLD are joined
+   with union-find, merged with the pending clusters they touch, and
+   written to Duplicate_Clusters / Duplicate_Pairs for review.
+
+An incremental run compares only the households registered since the last
+run (household_id above the Job_Watermarks mark) with everyone sharing a
+key; a full run compares every pair again (after bulk edits of names or
+addresses). A stored pair, reviewed or not, is never proposed again.
+
+The API runs scans as background jobs (Duplicate_Scan_Jobs): queue_scan()
+records the job, run_scan() executes it, and the API process signs
+households in one pool created by its first scan (start_pool / stop_pool)
+instead of a pool per run. Workers that never scan never start one.
+
+Usage (from backend/):
+    python -m app.services.duplicate_detection [--full] [--workers 4]
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+import argparse
+import json
+import logging
+import multiprocessing
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "duplicate_detection"
+
+# (household_id, family_name, primary_contact_name, address, zip_code,
+#  city, phone_number, family_size)
+Record = Tuple[int, str, str, str, str, str, str, int]
+Block = Tuple[str, List[Record]]
+# (household_id_a, household_id_b, score, blocking key), a < b
+Pair = Tuple[int, int, float, str]
+
+# Score = weighted agreement; the weights sum to 1
+SCORE_WEIGHTS = {
+    "name": 0.45,
+    "address": 0.35,
+    "zip_code": 0.10,
+    "family_size": 0.05,
+    "phone_tail": 0.05,
+}
+
+# MinHash: h(x) = (a * x + b) mod p over trigram codes. Fixed seed, so every
+# pool worker derives the same functions.
+SIGNATURE_SIZE = 64
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(7)
+_HASH_A = _rng.integers(1, int(_PRIME), SIGNATURE_SIZE, dtype=np.uint64)
+_HASH_B = _rng.integers(0, int(_PRIME), SIGNATURE_SIZE, dtype=np.uint64)
+
+# Signing pool shared by the API's scan jobs (None: each run makes its own)
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+# Values hashed / pairs scored per numpy pass (bound the temporary arrays)
+_SIGNATURE_BATCH = 2000
+_SCORE_SLICE = 50_000
+
+_SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in {
+        "1": "bfpv", "2": "cgjkqsxz", "3": "dt", "4": "l", "5": "mn", "6": "r"
+    }.items()
+    for letter in letters
+}
+
+_COLUMNS = """
+    household_id, family_name, primary_contact_name, address, zip_code,
+    city, phone_number, family_size
+"""
+
+_HOUSEHOLD_COLUMNS = """
+    h.household_id, h.family_name, h.primary_contact_name, h.phone_number,
+    h.address, h.city, h.zip_code, h.family_size, h.registration_date, h.status
+"""
+
+
+def _normalize(value: str | None) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (value or "").lower()).split())
+
+
+def soundex(word: str) -> str:
+    """American Soundex code of a word ("" when it has no letters)"""
+    letters = [c for c in word.lower() if "a" <= c <= "z"]
+    if not letters:
+        return ""
+
+    code = letters[0].upper()
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for letter in letters[1:]:
+        digit = _SOUNDEX_CODES.get(letter, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # Vowels separate equal codes, h and w do not
+        if letter not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def blocking_keys(record: Record) -> List[str]:
+    """Keys under which a household is compared with others"""
+    _, family_name, contact_name, address, zip_code, city, _, _ = record
+    keys = []
+
+    surname = _normalize(family_name).split()
+    if surname and zip_code:
+        keys.append(f"name:{soundex(surname[0])}:{zip_code}")
+
+    contact = _normalize(contact_name).split()
+    if len(contact) >= 2 and city:
+        keys.append(f"contact:{soundex(contact[0])}{soundex(contact[-1])}:{city.lower()}")
+
+    street = _normalize(address).split()
+    if len(street) >= 2 and street[0].isdigit() and zip_code:
+        keys.append(f"address:{street[0]}:{street[1]}:{zip_code}")
+
+    return keys
+
+
+def _signatures(values: List[str]) -> np.ndarray:
+    """MinHash signatures (len(values) x SIGNATURE_SIZE) of character trigrams"""
+    # Hash values are below 2^31: stored as uint32, compared half as wide
+    signatures = np.empty((len(values), SIGNATURE_SIZE), dtype=np.uint32)
+
+    for start in range(0, len(values), _SIGNATURE_BATCH):
+        # Normalized text is ASCII: a trigram is its three bytes as one
+        # 24-bit integer, taken from the concatenated batch at once
+        padded = [f" {_normalize(value)} ".ljust(3) for value in values[start:start + _SIGNATURE_BATCH]]
+        data = np.frombuffer("".join(padded).encode("ascii"), dtype=np.uint8).astype(np.uint64)
+        codes = (data[:-2] << np.uint64(16)) | (data[1:-1] << np.uint64(8)) | data[2:]
+
+        lengths = np.array([len(value) for value in padded], dtype=np.int64)
+        counts = lengths - 2
+        firsts = np.cumsum(lengths) - lengths
+        offsets = np.cumsum(counts) - counts
+        positions = np.repeat(firsts, counts) + np.arange(counts.sum()) - np.repeat(offsets, counts)
+
+        hashes = (codes[positions][:, None] * _HASH_A + _HASH_B) % _PRIME
+        signatures[start:start + len(padded)] = np.minimum.reduceat(hashes, offsets, axis=0)
+
+    return signatures
+
+
+def signatures(names: List[str], addresses: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Name and address signatures of one chunk of households (pool worker)"""
+    return _signatures(names), _signatures(addresses)
+
+
+def build_blocks(records: List[Record], low: int) -> Tuple[List[Block], int]:
+    """
+    Group records by blocking key
+
+    Returns:
+        (blocks with at least one household above `low`, blocks skipped as
+        larger than DUPLICATE_MAX_BLOCK_SIZE)
+    """
+    grouped: Dict[str, List[Record]] = defaultdict(list)
+    for record in records:
+        for key in blocking_keys(record):
+            grouped[key].append(record)
+
+    blocks, skipped = [], 0
+    for key, members in grouped.items():
+        if len(members) < 2 or max(record[0] for record in members) <= low:
+            continue
+        if len(members) > settings.DUPLICATE_MAX_BLOCK_SIZE:
+            skipped += 1
+            continue
+        blocks.append((key, members))
+
+    return blocks, skipped
+
+
+def candidate_pairs(blocks: List[Block], low: int) -> Tuple[List[Record], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every pair inside a block, once
+
+    Returns:
+        (records by household_id, left positions, right positions, index of
+        the first block holding each pair); left < right, and only pairs
+        whose right household is above `low` (new) are kept
+    """
+    records: Dict[int, Record] = {}
+    for _, members in blocks:
+        for record in members:
+            records.setdefault(record[0], record)
+    rows = sorted(records.values(), key=lambda record: record[0])
+    position = {record[0]: index for index, record in enumerate(rows)}
+    household_ids = np.array([record[0] for record in rows], dtype=np.int64)
+
+    left, right, key_index = [], [], []
+    for index, (_, members) in enumerate(blocks):
+        positions = np.sort(np.array([position[record[0]] for record in members], dtype=np.int64))
+        first, second = np.triu_indices(len(positions), k=1)
+        keep = household_ids[positions[second]] > low
+        left.append(positions[first][keep])
+        right.append(positions[second][keep])
+        key_index.append(np.full(int(keep.sum()), index, dtype=np.int64))
+
+    if not left:
+        empty = np.empty(0, dtype=np.int64)
+        return rows, empty, empty, empty
+
+    left, right, key_index = np.concatenate(left), np.concatenate(right), np.concatenate(key_index)
+    # Households sharing several keys meet in several blocks
+    _, unique = np.unique(left * len(rows) + right, return_index=True)
+    return rows, left[unique], right[unique], key_index[unique]
+
+
+def score_pairs(
+    rows: List[Record],
+    name_signatures: np.ndarray,
+    address_signatures: np.ndarray,
+    left: np.ndarray,
+    right: np.ndarray
+) -> np.ndarray:
+    """Scores (0..1) of the pairs (rows[left[i]], rows[right[i]])"""
+    zip_codes = np.array([r[4] or "" for r in rows], dtype=object)
+    family_sizes = np.array([r[7] for r in rows], dtype=np.int64)
+    phone_tails = np.array([re.sub(r"\D", "", r[6] or "")[-4:] for r in rows], dtype=object)
+
+    scores = np.empty(len(left), dtype=np.float64)
+    for start in range(0, len(left), _SCORE_SLICE):
+        a = left[start:start + _SCORE_SLICE]
+        b = right[start:start + _SCORE_SLICE]
+        scores[start:start + len(a)] = (
+            SCORE_WEIGHTS["name"] * (name_signatures[a] == name_signatures[b]).mean(axis=1)
+            + SCORE_WEIGHTS["address"] * (address_signatures[a] == address_signatures[b]).mean(axis=1)
+            + SCORE_WEIGHTS["zip_code"] * (zip_codes[a] == zip_codes[b]).astype(np.float64)
+            + SCORE_WEIGHTS["family_size"] * (family_sizes[a] == family_sizes[b])
+            + SCORE_WEIGHTS["phone_tail"] * (phone_tails[a] == phone_tails[b]).astype(np.float64)
+        )
+    return scores
+
+
+def _new_pool(workers: int) -> ProcessPoolExecutor:
+    # spawn: forking a process that runs server threads is unsafe
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def start_pool(workers: int | None = None) -> None:
+    """Create the shared signing pool unless it exists (first scan job)"""
+    global _pool
+    workers = workers or settings.DUPLICATE_WORKERS
+    with _pool_lock:
+        if _pool is None and workers > 1:
+            _pool = _new_pool(workers)
+
+
+def stop_pool() -> None:
+    """Shut the shared signing pool down, if a scan started it (API shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def find_pairs(blocks: List[Block], low: int, workers: int) -> Tuple[Dict[Tuple[int, int], Pair], int]:
+    """
+    Score all candidate pairs of `blocks`
+
+    Signatures, the expensive part, are computed once per household in a
+    process pool (DUPLICATE_CHUNK_SIZE households per task); the pairs are
+    then scored in one vectorized pass.
+
+    Returns:
+        ({(a, b): pair} scoring at least DUPLICATE_SCORE_THRESHOLD, number
+        of pairs scored)
+    """
+    rows, left, right, key_index = candidate_pairs(blocks, low)
+    if not len(left):
+        return {}, 0
+
+    size = settings.DUPLICATE_CHUNK_SIZE
+    names = [f"{r[1]} {r[2]}" for r in rows]
+    addresses = [r[3] for r in rows]
+    name_chunks = [names[start:start + size] for start in range(0, len(rows), size)]
+    address_chunks = [addresses[start:start + size] for start in range(0, len(rows), size)]
+
+    if workers <= 1 or len(name_chunks) <= 1:
+        results = [signatures(n, a) for n, a in zip(name_chunks, address_chunks)]
+    elif _pool is not None:
+        results = list(_pool.map(signatures, name_chunks, address_chunks))
+    else:
+        with _new_pool(workers) as pool:
+            results = list(pool.map(signatures, name_chunks, address_chunks))
+
+    name_signatures = np.concatenate([result[0] for result in results])
+    address_signatures = np.concatenate([result[1] for result in results])
+    scores = score_pairs(rows, name_signatures, address_signatures, left, right)
+
+    pairs: Dict[Tuple[int, int], Pair] = {}
+    for i in np.flatnonzero(scores >= settings.DUPLICATE_SCORE_THRESHOLD):
+        a, b = rows[left[i]][0], rows[right[i]][0]
+        pairs[(a, b)] = (a, b, round(float(scores[i]), 4), blocks[key_index[i]][0])
+
+    return pairs, len(left)
+
+
+def _find(parent: Dict[int, int], node: int) -> int:
+    root = node
+    while parent.setdefault(root, root) != root:
+        root = parent[root]
+    while parent[node] != root:
+        parent[node], node = root, parent[node]
+    return root
+
+
+def _chunked(values: List[int], size: int = 1000) -> Iterator[List[int]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _load_records(db: Session, low: int, high: int, full: bool) -> List[Record]:
+    """Households up to `high` that could share a block with a new one"""
+    where = "household_id <= :high"
+    if low and not full:
+        # Every blocking key contains the zip code or the city
+        where += """ AND (
+            zip_code IN (SELECT zip_code FROM Households WHERE household_id > :low AND household_id <= :high)
+            OR city IN (SELECT city FROM Households WHERE household_id > :low AND household_id <= :high)
+        )"""
+    rows = db.execute(
+        text(f"SELECT {_COLUMNS} FROM Households WHERE {where}"),
+        {"low": low, "high": high}
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def _store(db: Session, found: Dict[Tuple[int, int], Pair]) -> Tuple[int, int, int]:
+    """
+    Write new pairs and their clusters (caller holds the watermark lock,
+    and commits)
+
+    Returns:
+        (pairs stored, clusters created, clusters merged away)
+    """
+    # Pairs already stored keep their cluster and review
+    firsts = sorted({a for a, _ in found})
+    for ids in _chunked(firsts):
+        for a, b in db.execute(
+            text("""
+                SELECT household_id_a, household_id_b FROM Duplicate_Pairs
+                WHERE household_id_a IN :ids
+            """).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids}
+        ):
+            found.pop((a, b), None)
+    if not found:
+        return 0, 0, 0
+
+    # Union-find over households; pending clusters join as -cluster_id so
+    # new pairs touching one (or linking two) are merged into it
+    parent: Dict[int, int] = {}
+    for a, b in found:
+        parent[_find(parent, a)] = _find(parent, b)
+
+    households = sorted({household for pair in found for household in pair})
+    for ids in _chunked(households):
+        for a, b, cluster_id in db.execute(
+            text("""
+                SELECT p.household_id_a, p.household_id_b, p.cluster_id
+                FROM Duplicate_Pairs p
+                INNER JOIN Duplicate_Clusters c
+                    ON c.cluster_id = p.cluster_id AND c.status = 'pending'
+                WHERE p.household_id_a IN :ids OR p.household_id_b IN :ids
+            """).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids}
+        ):
+            for household in (a, b):
+                parent[_find(parent, household)] = _find(parent, -cluster_id)
+
+    existing: Dict[int, List[int]] = defaultdict(list)
+    for node in list(parent):
+        if node < 0:
+            existing[_find(parent, node)].append(-node)
+    roots = sorted({_find(parent, a) for a, _ in found})
+
+    cluster_of: Dict[int, int] = {}
+    merged_away: List[Tuple[int, List[int]]] = []
+    fresh = [root for root in roots if not existing.get(root)]
+    for root in roots:
+        if existing.get(root):
+            keep, *others = sorted(existing[root])
+            cluster_of[root] = keep
+            if others:
+                merged_away.append((keep, others))
+    if fresh:
+        # The watermark lock makes this run the only one creating clusters,
+        # so the ids above the current maximum are the new ones, read back
+        # in row order (a multi-row INSERT need not get consecutive ids)
+        before = db.execute(text("SELECT COALESCE(MAX(cluster_id), 0) FROM Duplicate_Clusters")).scalar()
+        for start in range(0, len(fresh), 1000):
+            db.execute(text(
+                "INSERT INTO Duplicate_Clusters (status) VALUES "
+                + ", ".join(["(DEFAULT)"] * len(fresh[start:start + 1000]))
+            ))
+        cluster_of.update(zip(fresh, db.execute(
+            text("SELECT cluster_id FROM Duplicate_Clusters WHERE cluster_id > :before ORDER BY cluster_id"),
+            {"before": before}
+        ).scalars()))
+
+    for keep, others in merged_away:
+        params = {"keep": keep, "others": others}
+        db.execute(
+            text("UPDATE Duplicate_Pairs SET cluster_id = :keep WHERE cluster_id IN :others")
+            .bindparams(bindparam("others", expanding=True)),
+            params
+        )
+        db.execute(
+            text("DELETE FROM Duplicate_Clusters WHERE cluster_id IN :others")
+            .bindparams(bindparam("others", expanding=True)),
+            params
+        )
+
+    rows = [
+        {
+            "a": a,
+            "b": b,
+            "cluster_id": cluster_of[_find(parent, a)],
+            "score": score,
+            "blocking_key": key[:150]
+        }
+        for a, b, score, key in found.values()
+    ]
+    for start in range(0, len(rows), 1000):
+        db.execute(
+            text("""
+                INSERT IGNORE INTO Duplicate_Pairs (
+                    household_id_a, household_id_b, cluster_id, score, blocking_key
+                )
+                VALUES (:a, :b, :cluster_id, :score, :blocking_key)
+            """),
+            rows[start:start + 1000]
+        )
+
+    touched = sorted(set(cluster_of.values()))
+    for ids in _chunked(touched):
+        db.execute(
+            text("""
+                UPDATE Duplicate_Clusters c
+                INNER JOIN (
+                    SELECT cluster_id, COUNT(DISTINCT household_id) AS households, MAX(score) AS best
+                    FROM (
+                        SELECT cluster_id, household_id_a AS household_id, score
+                        FROM Duplicate_Pairs WHERE cluster_id IN :ids
+                        UNION ALL
+                        SELECT cluster_id, household_id_b, score
+                        FROM Duplicate_Pairs WHERE cluster_id IN :ids
+                    ) members
+                    GROUP BY cluster_id
+                ) s ON s.cluster_id = c.cluster_id
+                SET c.household_count = s.households, c.max_score = s.best
+            """).bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids}
+        )
+
+    return len(rows), len(fresh), sum(len(others) for _, others in merged_away)
+
+
+def detect_duplicates(
+    db: Session,
+    full: bool = False,
+    workers: int | None = None
+) -> Tuple[str, str, dict | None]:
+    """
+    Run the detection job (commits)
+
+    Households younger than DUPLICATE_SETTLE_SECONDS wait for the next run:
+    household_ids are handed out at INSERT time, so a smaller id may still
+    be uncommitted while a larger one is visible.
+
+    Returns:
+        (status, message, summary); status "busy" when another run moved
+        the watermark or holds it
+    """
+    started = time.perf_counter()
+    workers = workers or settings.DUPLICATE_WORKERS
+
+    low = db.execute(
+        text("SELECT last_household_id FROM Job_Watermarks WHERE job_name = :job"),
+        {"job": JOB_NAME}
+    ).scalar() or 0
+    high = db.execute(text("SELECT MAX(household_id) FROM Households")).scalar() or 0
+    unsettled = db.execute(
+        text("""
+            SELECT MIN(household_id) FROM Households
+            WHERE household_id > :low
+              AND created_at >= NOW() - INTERVAL :settle SECOND
+        """),
+        {"low": low, "settle": settings.DUPLICATE_SETTLE_SECONDS}
+    ).scalar()
+    if unsettled is not None:
+        high = min(high, unsettled - 1)
+    db.rollback()
+
+    scan_from = 0 if full else low
+    summary = {
+        "full": full,
+        "households_from": scan_from,
+        "households_to": high,
+        "households_loaded": 0,
+        "blocks": 0,
+        "blocks_skipped": 0,
+        "pairs_scored": 0,
+        "pairs_found": 0,
+        "pairs_stored": 0,
+        "clusters_created": 0,
+        "clusters_merged": 0,
+        "seconds": 0.0
+    }
+    if high <= scan_from:
+        return ("success", "No new households to check", summary)
+
+    records = _load_records(db, scan_from, high, full)
+    db.rollback()
+    blocks, skipped = build_blocks(records, scan_from)
+    found, scored = find_pairs(blocks, scan_from, workers)
+    summary.update({
+        "households_loaded": len(records),
+        "blocks": len(blocks),
+        "blocks_skipped": skipped,
+        "pairs_scored": scored,
+        "pairs_found": len(found)
+    })
+
+    # One writer at a time: a run that finds the watermark locked, or moved
+    # since it started, leaves the range to the other run
+    current = db.execute(
+        text("""
+            SELECT last_household_id FROM Job_Watermarks
+            WHERE job_name = :job FOR UPDATE SKIP LOCKED
+        """),
+        {"job": JOB_NAME}
+    ).scalar()
+    if current is None or current != low:
+        db.rollback()
+        return ("busy", "Another duplicate detection run is in progress", None)
+
+    try:
+        stored, created, merged = _store(db, found)
+        db.execute(
+            text("UPDATE Job_Watermarks SET last_household_id = :high WHERE job_name = :job"),
+            {"high": max(high, low), "job": JOB_NAME}
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Duplicate detection failed: {str(e)}")
+        return ("error", f"Duplicate detection failed: {str(e)}", None)
+
+    summary.update({
+        "pairs_stored": stored,
+        "clusters_created": created,
+        "clusters_merged": merged,
+        "seconds": round(time.perf_counter() - started, 3)
+    })
+    logger.info(
+        f"✅ Duplicate detection: {stored} new pair(s), {created} new cluster(s) "
+        f"from {scored} candidate pair(s) in {summary['seconds']}s"
+    )
+    return ("success", f"{stored} new duplicate pair(s) found", summary)
+
+
+_JOB_COLUMNS = """
+    job_id, full_scan, status, message, summary, created_at, started_at, finished_at
+"""
+
+
+def queue_scan(db: Session, full: bool = False) -> dict:
+    """Record a scan job for run_scan() (commits)"""
+    result = db.execute(
+        text("INSERT INTO Duplicate_Scan_Jobs (full_scan) VALUES (:full)"),
+        {"full": full}
+    )
+    db.commit()
+    return get_scan(db, result.lastrowid)
+
+
+def run_scan(job_id: int) -> None:
+    """
+    Run a queued scan job on its own session and store the outcome
+
+    Meant for a background task: the request that queued the job has
+    already returned.
+    """
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        full = db.execute(
+            text("SELECT full_scan FROM Duplicate_Scan_Jobs WHERE job_id = :job_id"),
+            {"job_id": job_id}
+        ).scalar()
+        db.execute(
+            text("UPDATE Duplicate_Scan_Jobs SET status = 'running', started_at = NOW() WHERE job_id = :job_id"),
+            {"job_id": job_id}
+        )
+        db.commit()
+
+        try:
+            start_pool()
+            status, message, summary = detect_duplicates(db, full=bool(full))
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Duplicate scan job {job_id} failed: {str(e)}")
+            status, message, summary = "error", f"Duplicate detection failed: {str(e)}", None
+
+        db.execute(
+            text("""
+                UPDATE Duplicate_Scan_Jobs
+                SET status = :status, message = :message, summary = :summary,
+                    finished_at = NOW()
+                WHERE job_id = :job_id
+            """),
+            {
+                "job_id": job_id,
+                "status": status,
+                "message": message[:500],
+                "summary": json.dumps(summary) if summary is not None else None
+            }
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def get_scan(db: Session, job_id: int) -> dict | None:
+    row = db.execute(
+        text(f"SELECT {_JOB_COLUMNS} FROM Duplicate_Scan_Jobs WHERE job_id = :job_id"),
+        {"job_id": job_id}
+    ).mappings().first()
+    if not row:
+        return None
+    summary = row["summary"]
+    return {
+        **row,
+        "full_scan": bool(row["full_scan"]),
+        "summary": json.loads(summary) if isinstance(summary, str) else summary
+    }
+
+
+def _with_members(db: Session, clusters: List[dict]) -> List[dict]:
+    """Attach pairs and member households to cluster rows"""
+    if not clusters:
+        return clusters
+
+    by_id = {cluster["cluster_id"]: {**cluster, "households": [], "pairs": []} for cluster in clusters}
+    pairs = db.execute(
+        text("""
+            SELECT cluster_id, household_id_a, household_id_b, score, blocking_key, detected_at
+            FROM Duplicate_Pairs WHERE cluster_id IN :ids
+            ORDER BY score DESC, household_id_a, household_id_b
+        """).bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(by_id)}
+    ).mappings().all()
+
+    members: Dict[int, set] = defaultdict(set)
+    for pair in pairs:
+        by_id[pair["cluster_id"]]["pairs"].append({**pair, "score": float(pair["score"])})
+        members[pair["cluster_id"]].update((pair["household_id_a"], pair["household_id_b"]))
+
+    household_ids = sorted(set().union(*members.values())) if members else []
+    households = {}
+    if household_ids:
+        households = {
+            row["household_id"]: dict(row)
+            for row in db.execute(
+                text(f"SELECT {_HOUSEHOLD_COLUMNS} FROM Households h WHERE h.household_id IN :ids")
+                .bindparams(bindparam("ids", expanding=True)),
+                {"ids": household_ids}
+            ).mappings()
+        }
+    for cluster_id, ids in members.items():
+        by_id[cluster_id]["households"] = [households[i] for i in sorted(ids) if i in households]
+
+    return list(by_id.values())
+
+
+_CLUSTER_COLUMNS = """
+    cluster_id, status, household_count, max_score, reviewed_by,
+    reviewed_at, review_notes, created_at, updated_at
+"""
+
+
+def _cluster_row(row) -> dict:
+    return {**row, "max_score": float(row["max_score"])}
+
+
+def list_clusters(db: Session, status: str | None, limit: int, offset: int = 0) -> List[dict]:
+    """Clusters with their households and pairs, strongest first"""
+    where = "WHERE status = :status" if status else ""
+    rows = db.execute(
+        text(f"""
+            SELECT {_CLUSTER_COLUMNS} FROM Duplicate_Clusters {where}
+            ORDER BY max_score DESC, cluster_id
+            LIMIT :limit OFFSET :offset
+        """),
+        {"status": status, "limit": limit, "offset": offset}
+    ).mappings().all()
+    return _with_members(db, [_cluster_row(row) for row in rows])
+
+
+def get_cluster(db: Session, cluster_id: int) -> dict | None:
+    row = db.execute(
+        text(f"SELECT {_CLUSTER_COLUMNS} FROM Duplicate_Clusters WHERE cluster_id = :cluster_id"),
+        {"cluster_id": cluster_id}
+    ).mappings().first()
+    return _with_members(db, [_cluster_row(row)])[0] if row else None
+
+
+def review_cluster(
+    db: Session,
+    cluster_id: int,
+    status: str,
+    staff_id: int,
+    notes: str | None = None
+) -> Tuple[str, str, dict | None]:
+    """
+    Record a reviewer's decision on a cluster (commits)
+
+    Returns:
+        (status, message, cluster); status "not_found" for an unknown cluster
+    """
+    staff = db.execute(
+        text("SELECT status FROM Staff_Members WHERE staff_id = :staff_id"),
+        {"staff_id": staff_id}
+    ).scalar()
+    if staff is None:
+        return ("error", "Staff member not found", None)
+    if staff != "active":
+        return ("error", "Staff member is not active", None)
+
+    updated = db.execute(
+        text("""
+            UPDATE Duplicate_Clusters
+            SET status = :status,
+                reviewed_by = :staff_id,
+                reviewed_at = IF(:status = 'pending', NULL, NOW()),
+                review_notes = :notes
+            WHERE cluster_id = :cluster_id
+        """),
+        {"status": status, "staff_id": staff_id, "notes": notes, "cluster_id": cluster_id}
+    ).rowcount
+    if not updated:
+        db.rollback()
+        return ("not_found", "Duplicate cluster not found", None)
+
+    db.commit()
+    return ("success", f"Cluster {cluster_id} marked {status}", get_cluster(db, cluster_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--full", action="store_true", help="compare every pair, not only new households")
+    parser.add_argument("--workers", type=int, help=f"pool size (default {settings.DUPLICATE_WORKERS})")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        status, message, summary = detect_duplicates(db, full=args.full, workers=args.workers)
+    finally:
+        db.close()
+
+    print(message)
+    if summary:
+        for key, value in summary.items():
+            print(f"  {key}: {value}")
+    return 0 if status == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
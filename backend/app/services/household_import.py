@@ -0,0 +1,268 @@
+"""
+Household Bulk Import
+Registers households from a CSV or NDJSON file, HOUSEHOLD_IMPORT_CHUNK_SIZE
+rows at a time. Per chunk:
+
+1. Rows are validated with HouseholdCreate in one TypeAdapter call
+2. Phone numbers already used earlier in the file are rejected (the first
+   row wins), then the rest are checked against Households with ONE
+   IN (...) query
+3. New households are written with ONE multi-row INSERT, added to the
+   pending queue and committed
+
+Every row gets a report entry: "created" with its household_id, or "error"
+with the reason. CSV needs a header row with the HouseholdCreate field
+names; empty cells count as missing.
+
+Usage (from backend/):
+    python -m app.services.household_import households.csv [--report report.ndjson]
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from pydantic import TypeAdapter, ValidationError
+from typing import IO, Iterable, Iterator, List, Literal, Tuple
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import time
+
+from app.core.config import settings
+from app.models import Household
+from app.schemas.household import HouseholdCreate
+from app.services import pending_queue
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# (line number, parsed row or None, parse error or None)
+RawRow = Tuple[int, dict | None, str | None]
+
+_households = TypeAdapter(List[HouseholdCreate])
+
+
+def read_rows(stream: IO[bytes], fmt: ImportFormat) -> Iterator[RawRow]:
+    """Parse a CSV (header row) or NDJSON stream into raw dicts"""
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    if fmt == "csv":
+        reader = csv.DictReader(text_stream)
+        for row in reader:
+            yield (
+                reader.line_num,
+                {key: value for key, value in row.items() if key and value not in (None, "")},
+                None
+            )
+        return
+
+    for line, content in enumerate(text_stream, start=1):
+        if not content.strip():
+            continue
+        try:
+            row = json.loads(content)
+        except json.JSONDecodeError as e:
+            yield (line, None, f"Invalid JSON: {e.msg}")
+            continue
+        if isinstance(row, dict):
+            yield (line, row, None)
+        else:
+            yield (line, None, "Each line must be a JSON object")
+
+
+def _validate(rows: List[dict]) -> Tuple[dict, dict]:
+    """
+    Validate a chunk in bulk
+
+    Returns:
+        ({index: HouseholdCreate}, {index: error message})
+    """
+    try:
+        return dict(enumerate(_households.validate_python(rows))), {}
+    except ValidationError as e:
+        errors = {}
+        for error in e.errors():
+            index, *field = error["loc"]
+            reason = f"{'.'.join(str(part) for part in field) or 'row'}: {error['msg']}"
+            errors[index] = f"{errors[index]}; {reason}" if index in errors else reason
+
+    # Only the failing rows are known; validate the others again to get
+    # their models
+    valid_indexes = [index for index in range(len(rows)) if index not in errors]
+    models = _households.validate_python([rows[index] for index in valid_indexes])
+    return dict(zip(valid_indexes, models)), errors
+
+
+def _existing_phones(db: Session, phones: Iterable[str]) -> set:
+    phones = list(phones)
+    if not phones:
+        return set()
+    return set(db.execute(
+        select(Household.phone_number).where(Household.phone_number.in_(phones))
+    ).scalars())
+
+
+def _household_ids(db: Session, phones: Iterable[str]) -> dict:
+    """phone_number -> household_id for the given numbers"""
+    return {
+        row.phone_number: row.household_id
+        for row in db.execute(
+            select(Household.phone_number, Household.household_id)
+            .where(Household.phone_number.in_(list(phones)))
+        )
+    }
+
+
+def _import_chunk(db: Session, chunk: List[RawRow], seen: dict, report: list) -> None:
+    parsed = [(line, row) for line, row, error in chunk if error is None]
+    for line, _, error in chunk:
+        if error is not None:
+            report.append({"line": line, "status": "error", "message": error})
+
+    models, errors = _validate([row for _, row in parsed])
+    for index, message in errors.items():
+        report.append({"line": parsed[index][0], "status": "error", "message": message})
+
+    # Duplicates inside the file: the first row with a phone number wins
+    candidates = []
+    for index in sorted(models):
+        line, household = parsed[index][0], models[index]
+        first_line = seen.setdefault(household.phone_number, line)
+        if first_line != line:
+            report.append({
+                "line": line,
+                "status": "error",
+                "message": f"Phone number already used on line {first_line}"
+            })
+        else:
+            candidates.append((line, household))
+
+    # Duplicates against the database; one retry if a concurrent
+    # registration took a number between the check and the INSERT
+    for attempt in range(2):
+        existing = _existing_phones(db, (household.phone_number for _, household in candidates))
+        for line, household in candidates:
+            if household.phone_number in existing:
+                report.append({
+                    "line": line,
+                    "status": "error",
+                    "message": "Household with this phone number already exists"
+                })
+        candidates = [
+            (line, household) for line, household in candidates
+            if household.phone_number not in existing
+        ]
+        if not candidates:
+            db.rollback()
+            return
+
+        try:
+            db.execute(
+                insert(Household.__table__).values(
+                    [household.model_dump() for _, household in candidates]
+                )
+            )
+            # Read the new ids back by phone number (unique), in row order
+            ids_by_phone = _household_ids(db, (household.phone_number for _, household in candidates))
+            household_ids = [ids_by_phone[household.phone_number] for _, household in candidates]
+            pending_queue.sync(db, household_ids)
+            db.commit()
+            break
+        except IntegrityError as e:
+            db.rollback()
+            if attempt:
+                logger.error(f"❌ Household import chunk failed: {str(e)}")
+                report.extend(
+                    {"line": line, "status": "error", "message": "Insert failed, retry the row"}
+                    for line, _ in candidates
+                )
+                return
+
+    for (line, _), household_id in zip(candidates, household_ids):
+        report.append({"line": line, "status": "created", "household_id": household_id})
+
+
+def import_households(db: Session, rows: Iterable[RawRow], max_rows: int | None = None) -> dict:
+    """
+    Import parsed rows chunk by chunk (commits per chunk)
+
+    Rows past `max_rows` are reported as errors, not imported.
+
+    Returns:
+        {"total", "created", "rejected", "seconds", "rows": [per-row report]}
+    """
+    started = time.perf_counter()
+    seen = {}
+    report = []
+    chunk = []
+
+    for count, row in enumerate(rows, start=1):
+        if max_rows is not None and count > max_rows:
+            report.append({
+                "line": row[0],
+                "status": "error",
+                "message": f"Import is limited to {max_rows} rows"
+            })
+            continue
+        chunk.append(row)
+        if len(chunk) >= settings.HOUSEHOLD_IMPORT_CHUNK_SIZE:
+            _import_chunk(db, chunk, seen, report)
+            chunk = []
+    if chunk:
+        _import_chunk(db, chunk, seen, report)
+
+    report.sort(key=lambda entry: entry["line"])
+    created = sum(1 for entry in report if entry["status"] == "created")
+    seconds = round(time.perf_counter() - started, 3)
+
+    logger.info(f"✅ Household import: {created} of {len(report)} row(s) created in {seconds}s")
+
+    return {
+        "total": len(report),
+        "created": created,
+        "rejected": len(report) - created,
+        "seconds": seconds,
+        "rows": report
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    parser.add_argument("--report", help="write the per-row report here (NDJSON)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.file.endswith((".ndjson", ".jsonl")) else "csv")
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        with open(args.file, "rb") as stream:
+            result = import_households(db, read_rows(stream, fmt))
+    finally:
+        db.close()
+
+    if args.report:
+        with open(args.report, "w") as report:
+            for entry in result["rows"]:
+                report.write(json.dumps(entry) + "\n")
+    else:
+        for entry in result["rows"]:
+            if entry["status"] == "error":
+                print(f"line {entry['line']}: {entry['message']}")
+
+    print(
+        f"{result['created']} household(s) created, {result['rejected']} rejected "
+        f"({result['total']} row(s), {result['seconds']}s)"
+    )
+    return 0 if not result["rejected"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
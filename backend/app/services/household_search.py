@@ -0,0 +1,129 @@
+"""
+Household Search
+Finds households by name / address fragments or by the end of their phone
+number, using the indexes from 13_household_search.sql:
+
+- text: MATCH ... AGAINST in BOOLEAN MODE on the ngram FULLTEXT index;
+  every term is required (+term), results ranked by relevance
+- phone: a query with no letters and at least HOUSEHOLD_SEARCH_MIN_DIGITS
+  digits matches phone numbers ending in those digits, as a prefix range on
+  phone_digits_reversed
+
+Every statement carries a MAX_EXECUTION_TIME hint of
+HOUSEHOLD_SEARCH_TIMEOUT_MS: a pathological query (one very common ngram on
+a large table) is cut off by the server instead of queueing the desk.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from typing import Tuple
+import re
+import time
+
+from app.core.config import settings
+
+# MySQL: "maximum statement execution time exceeded"
+ER_QUERY_TIMEOUT = 3024
+
+# ngram_token_size (server default 2): shorter terms cannot match
+MIN_TERM_LENGTH = 2
+MAX_TERMS = 8
+
+_COLUMNS = """
+    h.household_id, h.family_name, h.primary_contact_name, h.phone_number,
+    h.email, h.address, h.city, h.state, h.zip_code, h.family_size,
+    h.income_level, h.priority_level, h.registration_date,
+    h.last_verified_date, h.status, h.notes, h.created_at, h.updated_at
+"""
+
+
+def _statement(condition: str, score: str) -> str:
+    return f"""
+        SELECT /*+ MAX_EXECUTION_TIME({int(settings.HOUSEHOLD_SEARCH_TIMEOUT_MS)}) */
+            {_COLUMNS}, {score} AS score
+        FROM Households h
+        WHERE {condition}{{status_filter}}
+        ORDER BY score DESC, h.household_id
+        LIMIT :limit
+    """
+
+
+_TEXT_SQL = _statement(
+    "MATCH(h.family_name, h.primary_contact_name, h.address) AGAINST (:terms IN BOOLEAN MODE)",
+    "MATCH(h.family_name, h.primary_contact_name, h.address) AGAINST (:terms IN BOOLEAN MODE)"
+)
+
+# Score: share of the stored digits the query covers (1.0 = whole number)
+_PHONE_SQL = _statement(
+    "h.phone_digits_reversed LIKE :reversed",
+    ":digits / CHAR_LENGTH(h.phone_digits_reversed)"
+)
+
+
+def parse_query(query: str) -> Tuple[str, dict] | Tuple[None, str]:
+    """
+    Decide how to search for `query`
+
+    Returns:
+        ("phone" | "text", bind parameters), or (None, error message)
+    """
+    digits = re.sub(r"\D", "", query)
+    if not re.search(r"[^\W\d_]", query) and digits:
+        if len(digits) < settings.HOUSEHOLD_SEARCH_MIN_DIGITS:
+            return (None, f"Phone searches need at least {settings.HOUSEHOLD_SEARCH_MIN_DIGITS} digits")
+        return ("phone", {"reversed": digits[::-1] + "%", "digits": len(digits)})
+
+    # Word characters only: boolean-mode operators in the input are dropped
+    terms = [term for term in re.findall(r"\w+", query) if len(term) >= MIN_TERM_LENGTH]
+    if not terms:
+        return (None, f"Search terms need at least {MIN_TERM_LENGTH} characters")
+    return ("text", {"terms": " ".join(f"+{term}" for term in terms[:MAX_TERMS])})
+
+
+def search_households(
+    db: Session,
+    query: str,
+    limit: int,
+    status: str | None = None
+) -> Tuple[str, str, dict | None]:
+    """
+    Run a household search
+
+    Returns:
+        (status, message, result): status is "success", "error" (bad query)
+        or "timeout" (HOUSEHOLD_SEARCH_TIMEOUT_MS exceeded)
+    """
+    match, params = parse_query(query.strip())
+    if match is None:
+        return ("error", params, None)
+
+    sql = _PHONE_SQL if match == "phone" else _TEXT_SQL
+    params["limit"] = min(limit, settings.HOUSEHOLD_SEARCH_MAX_RESULTS)
+    if status:
+        params["status"] = status
+
+    started = time.perf_counter()
+    try:
+        rows = db.execute(
+            text(sql.format(status_filter=" AND h.status = :status" if status else "")),
+            params
+        ).mappings().all()
+    except OperationalError as e:
+        db.rollback()
+        if e.orig.args and e.orig.args[0] == ER_QUERY_TIMEOUT:
+            return (
+                "timeout",
+                f"Search exceeded {settings.HOUSEHOLD_SEARCH_TIMEOUT_MS} ms; use a more specific query",
+                None
+            )
+        raise
+
+    return ("success", f"{len(rows)} household(s) found", {
+        "query": query,
+        "match": match,
+        "households": [
+            {**row, "score": round(float(row["score"]), 4)} for row in rows
+        ],
+        "took_ms": round((time.perf_counter() - started) * 1000, 1)
+    })
@@ -0,0 +1,237 @@
+"""
+Idempotency Keys
+Replay protection for POST /distribution/distribute (table in
+15_idempotency_keys.sql)
+
+A request sent with an Idempotency-Key header distributes at most once.
+The distribution transaction claims the key before anything else and
+stores its DistributionResponse just before COMMIT, so a key is stored
+exactly when its Distribution_Log row is. Repeats are answered from the
+stored response without touching Inventory: from idempotency_cache when
+this worker has seen the key, otherwise with one primary-key read. A
+repeat that arrives while the first request is still running waits on the
+uncommitted key row in claim() and is answered once that commits.
+
+Failed distributions store nothing: every error path rolls its
+transaction back, which also releases the claim, so a retry after an error
+runs again. Keys expire IDEMPOTENCY_KEY_TTL_SECONDS
+after their first use; purge_expired() deletes them in batches.
+
+Usage (from backend/):
+    python -m app.services.idempotency purge
+"""
+
+from dataclasses import dataclass
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import text
+from pydantic import BaseModel
+from typing import Tuple
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+import time
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# key -> (request_hash, response, expiry as time.time())
+idempotency_cache = TTLCache(
+    "idempotency",
+    ttl_seconds=settings.IDEMPOTENCY_CACHE_TTL_SECONDS,
+    max_entries=settings.IDEMPOTENCY_CACHE_MAX_ENTRIES
+)
+
+_LOOKUP_SQL = text("""
+    SELECT request_hash, response, TIMESTAMPDIFF(SECOND, NOW(), expires_at) AS ttl
+    FROM Idempotency_Keys
+    WHERE idempotency_key = :key AND expires_at > NOW()
+""")
+
+_CLAIM_SQL = text("""
+    INSERT INTO Idempotency_Keys (idempotency_key, request_hash, expires_at)
+    VALUES (:key, :request_hash, NOW() + INTERVAL :ttl SECOND)
+""")
+
+_DELETE_EXPIRED_SQL = text("""
+    DELETE FROM Idempotency_Keys
+    WHERE idempotency_key = :key AND expires_at <= NOW()
+""")
+
+_LOG_DATE_SQL = text("""
+    SELECT distribution_date FROM Distribution_Log WHERE log_id = :log_id
+""")
+
+_COMPLETE_SQL = text("""
+    UPDATE Idempotency_Keys
+    SET log_id = :log_id, response = :response
+    WHERE idempotency_key = :key
+""")
+
+_PURGE_SQL = text("""
+    DELETE FROM Idempotency_Keys
+    WHERE expires_at <= NOW()
+    LIMIT :batch
+""")
+
+
+@dataclass
+class IdempotentRequest:
+    """Idempotency-Key of one request, and the response stored for it"""
+    key: str
+    request_hash: str
+    response: dict | None = None
+
+
+def request_hash(request: BaseModel) -> str:
+    """SHA-256 of the request body as validated (field order is fixed)"""
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
+def lookup(db: Session, request: IdempotentRequest) -> Tuple[str, str]:
+    """
+    Outcome of an earlier request with the same key
+
+    Returns:
+        Tuple of (status, message)
+        status: 'new' (key unused or expired), 'replay' (request.response
+        holds the stored response) or 'conflict' (key used for a
+        different request body)
+    """
+    cached = idempotency_cache.get(request.key)
+    if cached is None or cached[2] <= time.time():
+        row = db.execute(_LOOKUP_SQL, {"key": request.key}).first()
+        # End the read so the distribution starts from a fresh snapshot
+        db.rollback()
+        if row is None or row.response is None:
+            return ("new", "Idempotency key not used yet")
+
+        response = json.loads(row.response) if isinstance(row.response, str) else row.response
+        cached = (row.request_hash, response, time.time() + row.ttl)
+        idempotency_cache.set(request.key, cached)
+
+    stored_hash, response, _ = cached
+    if stored_hash != request.request_hash:
+        return ("conflict", "Idempotency-Key was already used for a different request")
+
+    request.response = response
+    return ("replay", "Response of the earlier request with this Idempotency-Key")
+
+
+def claim(db: Session, request: IdempotentRequest) -> bool:
+    """
+    Insert the key row at the start of the distribution transaction
+
+    Waits while another transaction holds the same key uncommitted.
+    Returns False when the key is already stored (and not expired); the
+    caller then rolls back and answers from lookup().
+    """
+    params = {
+        "key": request.key,
+        "request_hash": request.request_hash,
+        "ttl": settings.IDEMPOTENCY_KEY_TTL_SECONDS
+    }
+    try:
+        db.execute(_CLAIM_SQL, params)
+        return True
+    except IntegrityError:
+        pass
+
+    # Taken: an expired row not purged yet is freed and claimed again
+    if db.execute(_DELETE_EXPIRED_SQL, {"key": request.key}).rowcount:
+        db.execute(_CLAIM_SQL, params)
+        return True
+    return False
+
+
+def complete(
+    db: Session,
+    request: IdempotentRequest,
+    status: str,
+    message: str,
+    log_id: int
+) -> None:
+    """
+    Store the response on the claimed row (same transaction, before COMMIT)
+
+    distribution_date is the one MySQL wrote on the log row, so a replay
+    reports the same time as the Distribution_Log entry.
+    """
+    distribution_date = db.execute(_LOG_DATE_SQL, {"log_id": log_id}).scalar()
+    request.response = {
+        "status": status,
+        "message": message,
+        "log_id": log_id,
+        "distribution_date": distribution_date.isoformat()
+    }
+    db.execute(_COMPLETE_SQL, {
+        "key": request.key,
+        "log_id": log_id,
+        "response": json.dumps(request.response)
+    })
+
+
+def remember(request: IdempotentRequest) -> None:
+    """Cache a completed request's response (after COMMIT)"""
+    idempotency_cache.set(
+        request.key,
+        (request.request_hash, request.response, time.time() + settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+    )
+
+
+def purge_expired(db: Session) -> int:
+    """Delete expired keys, IDEMPOTENCY_PURGE_BATCH_SIZE rows per transaction"""
+    deleted = 0
+    while True:
+        removed = db.execute(
+            _PURGE_SQL, {"batch": settings.IDEMPOTENCY_PURGE_BATCH_SIZE}
+        ).rowcount
+        db.commit()
+        deleted += removed
+        if removed < settings.IDEMPOTENCY_PURGE_BATCH_SIZE:
+            return deleted
+
+
+def _purge_once() -> int:
+    db = SessionLocal()
+    try:
+        return purge_expired(db)
+    finally:
+        db.close()
+
+
+async def run_forever() -> None:
+    """Background loop started from the app lifespan"""
+    while True:
+        try:
+            deleted = await asyncio.to_thread(_purge_once)
+            if deleted:
+                logger.info(f"🧹 Purged {deleted} expired idempotency key(s)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Idempotency key purge failed: {str(e)}")
+        await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["purge"])
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"Purged {purge_expired(db)} expired idempotency key(s)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
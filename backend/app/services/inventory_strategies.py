@@ -0,0 +1,224 @@
+"""
+Inventory Concurrency Strategies
+How distribute_package takes stock from a (non-sharded) Inventory row
+
+- pessimistic: SELECT ... FOR UPDATE, check, decrement (the original mode)
+- optimistic:  plain read, then UPDATE ... WHERE version = :read_version;
+               a lost race raises InventoryConflict and the caller retries
+               the whole transaction
+- conditional: one UPDATE ... SET quantity_on_hand = quantity_on_hand - :q
+               WHERE ... AND quantity_on_hand >= :q; the row lock only lives
+               from that statement to the commit
+
+All three keep the "last kit goes to exactly one household" guarantee:
+the decision and the decrement are tied to the same row version.
+"""
+
+from abc import ABC, abstractmethod
+from sqlalchemy.orm import Session
+from typing import Dict
+import threading
+import time
+
+from app.core.config import settings
+from app.models import Inventory
+
+
+class InventoryConflict(Exception):
+    """The row changed between read and update; retry the transaction"""
+
+
+class StrategyStats:
+    """Thread-safe counters for one strategy (per process)"""
+
+    FIELDS = ("attempts", "successes", "insufficient", "conflicts", "retries", "exhausted")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {field: 0 for field in self.FIELDS}
+        self._lock_wait_seconds = 0.0
+
+    def record(self, field: str, lock_wait_seconds: float = 0.0) -> None:
+        with self._lock:
+            self._counts[field] += 1
+            self._lock_wait_seconds += lock_wait_seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self._counts, "lock_wait_seconds": round(self._lock_wait_seconds, 6)}
+
+
+class InventoryStrategy(ABC):
+    """Base class: reserve stock inside the caller's transaction"""
+
+    name = ""
+
+    def __init__(self):
+        self.stats = StrategyStats()
+
+    @abstractmethod
+    def reserve(
+        self,
+        db: Session,
+        center_id: int,
+        package_id: int,
+        quantity: int
+    ) -> str | None:
+        """
+        Decrement `quantity` units of the Inventory row
+
+        Returns:
+            Error message, or None once the stock is decremented
+        Raises:
+            InventoryConflict if the transaction has to be retried
+        """
+
+
+class PessimisticStrategy(InventoryStrategy):
+    """Lock the row with SELECT ... FOR UPDATE, then decrement in Python"""
+
+    name = "pessimistic"
+
+    def reserve(self, db, center_id, package_id, quantity):
+        started = time.perf_counter()
+
+        # CRITICAL: Lock inventory row using FOR UPDATE
+        # This prevents other transactions from reading/writing this row
+        # until our transaction completes (commits or rolls back)
+        inventory = db.query(Inventory).filter(
+            Inventory.center_id == center_id,
+            Inventory.package_id == package_id
+        ).with_for_update().first()  # <-- PESSIMISTIC LOCKING!
+
+        lock_wait = time.perf_counter() - started
+
+        if not inventory:
+            self.stats.record("attempts", lock_wait)
+            return "No inventory record found for this package at this center"
+
+        # Check quantity (now safe because row is locked)
+        if inventory.quantity_on_hand < quantity:
+            self.stats.record("attempts", lock_wait)
+            self.stats.record("insufficient")
+            return (
+                f"Insufficient inventory. Available: {inventory.quantity_on_hand}, "
+                f"Requested: {quantity}"
+            )
+
+        # Update inventory (decrement)
+        inventory.quantity_on_hand -= quantity
+        self.stats.record("attempts", lock_wait)
+        self.stats.record("successes")
+        return None
+
+
+class OptimisticStrategy(InventoryStrategy):
+    """Read without a lock, then compare-and-set on the version column"""
+
+    name = "optimistic"
+
+    def reserve(self, db, center_id, package_id, quantity):
+        inventory = db.query(
+            Inventory.inventory_id,
+            Inventory.quantity_on_hand,
+            Inventory.version
+        ).filter(
+            Inventory.center_id == center_id,
+            Inventory.package_id == package_id
+        ).first()
+
+        if not inventory:
+            self.stats.record("attempts")
+            return "No inventory record found for this package at this center"
+
+        if inventory.quantity_on_hand < quantity:
+            self.stats.record("attempts")
+            self.stats.record("insufficient")
+            return (
+                f"Insufficient inventory. Available: {inventory.quantity_on_hand}, "
+                f"Requested: {quantity}"
+            )
+
+        started = time.perf_counter()
+
+        # Relative decrement guarded by the version we read: if anyone wrote
+        # the row since, no row matches and the whole transaction is retried
+        # (a new transaction gets a fresh REPEATABLE READ snapshot)
+        updated = db.query(Inventory).filter(
+            Inventory.inventory_id == inventory.inventory_id,
+            Inventory.version == inventory.version
+        ).update(
+            {
+                Inventory.quantity_on_hand: Inventory.quantity_on_hand - quantity,
+                Inventory.version: Inventory.version + 1
+            },
+            synchronize_session=False
+        )
+
+        self.stats.record("attempts", time.perf_counter() - started)
+
+        if not updated:
+            self.stats.record("conflicts")
+            raise InventoryConflict(
+                f"Inventory version changed (center {center_id}, package {package_id})"
+            )
+
+        self.stats.record("successes")
+        return None
+
+
+class ConditionalUpdateStrategy(InventoryStrategy):
+    """Check and decrement in ONE UPDATE; no read before the write"""
+
+    name = "conditional"
+
+    def reserve(self, db, center_id, package_id, quantity):
+        started = time.perf_counter()
+
+        updated = db.query(Inventory).filter(
+            Inventory.center_id == center_id,
+            Inventory.package_id == package_id,
+            Inventory.quantity_on_hand >= quantity
+        ).update(
+            {
+                Inventory.quantity_on_hand: Inventory.quantity_on_hand - quantity,
+                Inventory.version: Inventory.version + 1
+            },
+            synchronize_session=False
+        )
+
+        self.stats.record("attempts", time.perf_counter() - started)
+
+        if updated:
+            self.stats.record("successes")
+            return None
+
+        # Nothing matched: find out why (only on the failure path)
+        inventory = db.query(Inventory.quantity_on_hand).filter(
+            Inventory.center_id == center_id,
+            Inventory.package_id == package_id
+        ).first()
+
+        if not inventory:
+            return "No inventory record found for this package at this center"
+
+        self.stats.record("insufficient")
+        return (
+            f"Insufficient inventory. Available: {inventory.quantity_on_hand}, "
+            f"Requested: {quantity}"
+        )
+
+
+INVENTORY_STRATEGIES: Dict[str, InventoryStrategy] = {
+    strategy.name: strategy
+    for strategy in (PessimisticStrategy(), OptimisticStrategy(), ConditionalUpdateStrategy())
+}
+
+
+def get_inventory_strategy(center_id: int) -> InventoryStrategy:
+    """Strategy configured for a center (falls back to the deployment default)"""
+    name = settings.DISTRIBUTION_LOCK_STRATEGY_BY_CENTER.get(
+        center_id,
+        settings.DISTRIBUTION_LOCK_STRATEGY
+    )
+    return INVENTORY_STRATEGIES[name]
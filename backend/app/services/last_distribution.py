@@ -0,0 +1,250 @@
+"""
+Last-Distribution Index
+Maintains Household_Package_Last, the newest successful distribution per
+(household, package), so eligibility is a primary-key lookup instead of a
+scan of Distribution_Log.
+
+- record_distributions() runs inside the distribution transaction, right
+  after the log rows are inserted
+- rebuild() recomputes rows from the log (backfill, or after log rows were
+  deleted)
+- find_inconsistencies() compares the table against the log
+
+Both writers also bring Pending_Queue up to date for the households they
+touched.
+
+Usage (from backend/):
+    python -m app.services.last_distribution backfill
+    python -m app.services.last_distribution check [--repair]
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam
+from typing import Iterable, List, Tuple
+import argparse
+import sys
+
+from app.services import pending_queue
+
+# Upsert the index from freshly inserted log rows. MySQL applies the
+# assignments left to right, so the columns that compare against the
+# stored last_distribution_date come before it is overwritten.
+_RECORD_SQL = text("""
+    INSERT INTO Household_Package_Last (
+        household_id, package_id, last_distribution_date,
+        next_eligible_date, last_log_id, distribution_count
+    )
+    SELECT
+        dl.household_id,
+        dl.package_id,
+        dl.distribution_date,
+        DATE(dl.distribution_date) + INTERVAL ap.validity_period_days DAY,
+        dl.log_id,
+        1
+    FROM Distribution_Log dl
+    INNER JOIN Aid_Packages ap ON ap.package_id = dl.package_id
+    WHERE dl.log_id IN :log_ids
+      AND dl.transaction_status = 'success'
+    ON DUPLICATE KEY UPDATE
+        next_eligible_date = IF(
+            VALUES(last_distribution_date) >= last_distribution_date,
+            VALUES(next_eligible_date), next_eligible_date
+        ),
+        last_log_id = IF(
+            VALUES(last_distribution_date) >= last_distribution_date,
+            VALUES(last_log_id), last_log_id
+        ),
+        last_distribution_date = GREATEST(
+            last_distribution_date, VALUES(last_distribution_date)
+        ),
+        distribution_count = distribution_count + 1
+""").bindparams(bindparam("log_ids", expanding=True))
+
+# Aggregate of the log, one row per (household, package); {where} narrows
+# it to the pairs being rebuilt
+_FROM_LOG_SQL = """
+    SELECT
+        agg.household_id,
+        agg.package_id,
+        agg.last_distribution_date,
+        DATE(agg.last_distribution_date) + INTERVAL ap.validity_period_days DAY
+            AS next_eligible_date,
+        (
+            SELECT MAX(dl.log_id)
+            FROM Distribution_Log dl
+            WHERE dl.household_id = agg.household_id
+              AND dl.package_id = agg.package_id
+              AND dl.transaction_status = 'success'
+              AND dl.distribution_date = agg.last_distribution_date
+        ) AS last_log_id,
+        agg.distribution_count
+    FROM (
+        SELECT
+            household_id,
+            package_id,
+            MAX(distribution_date) AS last_distribution_date,
+            COUNT(*) AS distribution_count
+        FROM Distribution_Log
+        WHERE transaction_status = 'success'{where}
+        GROUP BY household_id, package_id
+    ) agg
+    INNER JOIN Aid_Packages ap ON ap.package_id = agg.package_id
+"""
+
+_COLUMNS = (
+    "household_id, package_id, last_distribution_date, "
+    "next_eligible_date, last_log_id, distribution_count"
+)
+
+
+def record_distributions(db: Session, log_ids: Iterable[int]) -> None:
+    """Fold new successful log rows into the index (caller commits)"""
+    log_ids = list(log_ids)
+    if log_ids:
+        db.execute(_RECORD_SQL, {"log_ids": log_ids})
+        pending_queue.record_distributions(db, log_ids)
+
+
+def refresh_package(db: Session, package_id: int) -> None:
+    """Recompute next_eligible_date after a package's validity period changed"""
+    db.execute(
+        text("""
+            UPDATE Household_Package_Last hpl
+            INNER JOIN Aid_Packages ap ON ap.package_id = hpl.package_id
+            SET hpl.next_eligible_date =
+                DATE(hpl.last_distribution_date) + INTERVAL ap.validity_period_days DAY
+            WHERE hpl.package_id = :package_id
+        """),
+        {"package_id": package_id}
+    )
+
+
+def rebuild(db: Session, pairs: List[Tuple[int, int]] | None = None) -> int:
+    """
+    Recompute index rows from Distribution_Log (caller commits)
+
+    Args:
+        pairs: (household_id, package_id) pairs to rebuild; None rebuilds
+            the whole table
+
+    Returns:
+        Number of index rows written
+    """
+    if pairs is None:
+        db.execute(text("DELETE FROM Household_Package_Last"))
+        result = db.execute(text(
+            f"INSERT INTO Household_Package_Last ({_COLUMNS}) "
+            + _FROM_LOG_SQL.format(where="")
+        ))
+        pending_queue.sync(db)
+        return result.rowcount
+
+    pairs = sorted(set(pairs))
+    if not pairs:
+        return 0
+
+    params = {}
+    conditions = []
+    for i, (household_id, package_id) in enumerate(pairs):
+        params[f"h{i}"] = household_id
+        params[f"p{i}"] = package_id
+        conditions.append(f"(household_id = :h{i} AND package_id = :p{i})")
+    match = " OR ".join(conditions)
+
+    db.execute(text(f"DELETE FROM Household_Package_Last WHERE {match}"), params)
+    result = db.execute(
+        text(
+            f"INSERT INTO Household_Package_Last ({_COLUMNS}) "
+            + _FROM_LOG_SQL.format(where=f" AND ({match})")
+        ),
+        params
+    )
+    pending_queue.sync(db, [household_id for household_id, _ in pairs])
+    return result.rowcount
+
+
+def find_inconsistencies(db: Session, limit: int = 1000) -> List[dict]:
+    """
+    Pairs whose index row disagrees with the log (missing, extra, or a
+    different last date / count)
+    """
+    aggregate = """
+        SELECT household_id, package_id,
+               MAX(distribution_date) AS last_distribution_date,
+               COUNT(*) AS distribution_count
+        FROM Distribution_Log
+        WHERE transaction_status = 'success'
+        GROUP BY household_id, package_id
+    """
+    rows = db.execute(
+        text(f"""
+            SELECT log.household_id, log.package_id,
+                   log.last_distribution_date AS log_last_date,
+                   hpl.last_distribution_date AS index_last_date,
+                   log.distribution_count AS log_count,
+                   hpl.distribution_count AS index_count
+            FROM ({aggregate}) log
+            LEFT JOIN Household_Package_Last hpl
+              ON hpl.household_id = log.household_id
+             AND hpl.package_id = log.package_id
+            WHERE hpl.household_id IS NULL
+               OR hpl.last_distribution_date <> log.last_distribution_date
+               OR hpl.distribution_count <> log.distribution_count
+            UNION ALL
+            SELECT hpl.household_id, hpl.package_id,
+                   NULL, hpl.last_distribution_date,
+                   NULL, hpl.distribution_count
+            FROM Household_Package_Last hpl
+            LEFT JOIN ({aggregate}) log
+              ON log.household_id = hpl.household_id
+             AND log.package_id = hpl.package_id
+            WHERE log.household_id IS NULL
+            LIMIT :limit
+        """),
+        {"limit": limit}
+    ).mappings().all()
+
+    return [dict(row) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("backfill", help="rebuild the whole index from Distribution_Log")
+    check = sub.add_parser("check", help="compare the index against Distribution_Log")
+    check.add_argument("--repair", action="store_true", help="rebuild mismatching pairs")
+    check.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.command == "backfill":
+            written = rebuild(db)
+            db.commit()
+            print(f"Household_Package_Last rebuilt: {written} row(s)")
+            return 0
+
+        mismatches = find_inconsistencies(db, args.limit)
+        for row in mismatches:
+            print(
+                f"household {row['household_id']} package {row['package_id']}: "
+                f"log last={row['log_last_date']} count={row['log_count']} | "
+                f"index last={row['index_last_date']} count={row['index_count']}"
+            )
+        print(f"{len(mismatches)} inconsistent pair(s)")
+
+        if mismatches and args.repair:
+            rebuild(db, [(row["household_id"], row["package_id"]) for row in mismatches])
+            db.commit()
+            print("Repaired")
+            return 0
+
+        return 1 if mismatches else 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Pending-Household Work Queue
+Maintains Pending_Queue (one row per active household, in outreach order)
+and hands out disjoint batches of pending households to caseworkers.
+
+- sync() recomputes rows from Households and Household_Package_Last
+  (household created or changed, index rebuilt)
+- record_distributions() runs inside the distribution transaction, from
+  last_distribution.record_distributions()
+- claim() takes the next pending rows with FOR UPDATE SKIP LOCKED: two
+  caseworkers claiming at once skip each other's locked rows instead of
+  waiting, and never get the same household. A claim lapses on its own at
+  claim_expires_at; nothing has to clean it up.
+
+Usage (from backend/):
+    python -m app.services.pending_queue rebuild
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text, bindparam
+from typing import Iterable, List
+import argparse
+import sys
+
+from app.core.config import settings
+
+# A household is pending when it never received aid or its newest
+# distribution is more than 30 days old (same rule as the original view)
+PENDING_SQL = """(
+    q.last_distribution_date IS NULL
+    OR q.last_distribution_date < CURRENT_DATE - INTERVAL 30 DAY
+)"""
+
+_UNCLAIMED = "(q.claim_expires_at IS NULL OR q.claim_expires_at <= NOW())"
+
+# Rows from Households + index; {where} narrows to the households synced.
+# Claims survive a sync unless the household received aid since.
+_SYNC_SQL = """
+    INSERT INTO Pending_Queue (
+        household_id, priority_rank, registration_date,
+        last_distribution_date, total_distributions
+    )
+    SELECT
+        h.household_id,
+        FIELD(h.priority_level, 'critical', 'high', 'medium', 'low'),
+        h.registration_date,
+        MAX(hpl.last_distribution_date),
+        COALESCE(SUM(hpl.distribution_count), 0)
+    FROM Households h
+    LEFT JOIN Household_Package_Last hpl ON hpl.household_id = h.household_id
+    WHERE h.status = 'active'{where}
+    GROUP BY h.household_id
+    ON DUPLICATE KEY UPDATE
+        claimed_by = IF(
+            VALUES(last_distribution_date) <=> last_distribution_date, claimed_by, NULL
+        ),
+        claimed_at = IF(claimed_by IS NULL, NULL, claimed_at),
+        claim_expires_at = IF(claimed_by IS NULL, NULL, claim_expires_at),
+        priority_rank = VALUES(priority_rank),
+        registration_date = VALUES(registration_date),
+        last_distribution_date = VALUES(last_distribution_date),
+        total_distributions = VALUES(total_distributions)
+"""
+
+# Households that left the active set
+_PRUNE_SQL = """
+    DELETE q FROM Pending_Queue q
+    LEFT JOIN Households h ON h.household_id = q.household_id
+    WHERE (h.household_id IS NULL OR h.status <> 'active'){where}
+"""
+
+# Fold freshly inserted log rows in; served households drop their claim
+_RECORD_SQL = text("""
+    UPDATE Pending_Queue q
+    INNER JOIN (
+        SELECT household_id, MAX(distribution_date) AS last_date, COUNT(*) AS received
+        FROM Distribution_Log
+        WHERE log_id IN :log_ids
+          AND transaction_status = 'success'
+        GROUP BY household_id
+    ) d ON d.household_id = q.household_id
+    SET q.last_distribution_date = GREATEST(
+            COALESCE(q.last_distribution_date, d.last_date), d.last_date
+        ),
+        q.total_distributions = q.total_distributions + d.received,
+        q.claimed_by = NULL,
+        q.claimed_at = NULL,
+        q.claim_expires_at = NULL
+""").bindparams(bindparam("log_ids", expanding=True))
+
+_QUEUE_COLUMNS = """
+    h.household_id,
+    h.family_name,
+    h.primary_contact_name,
+    h.phone_number,
+    h.address,
+    h.city,
+    h.family_size,
+    h.priority_level,
+    h.registration_date,
+    q.total_distributions AS total_distributions_received,
+    q.last_distribution_date,
+    DATEDIFF(CURRENT_DATE, DATE(q.last_distribution_date)) AS days_since_last_distribution,
+    IF(q.last_distribution_date IS NULL, 'NEVER_RECEIVED', 'OVERDUE') AS distribution_status,
+    q.claimed_by,
+    q.claim_expires_at
+"""
+
+
+def sync(db: Session, household_ids: Iterable[int] | None = None) -> int:
+    """
+    Recompute queue rows (caller commits)
+
+    Args:
+        household_ids: households to refresh; None rebuilds the whole queue
+
+    Returns:
+        Rows inserted or changed
+    """
+    if household_ids is None:
+        db.execute(text(_PRUNE_SQL.format(where="")))
+        return db.execute(text(_SYNC_SQL.format(where=""))).rowcount
+
+    household_ids = sorted(set(household_ids))
+    if not household_ids:
+        return 0
+
+    params = {"household_ids": household_ids}
+    db.execute(
+        text(_PRUNE_SQL.format(where=" AND q.household_id IN :household_ids"))
+        .bindparams(bindparam("household_ids", expanding=True)),
+        params
+    )
+    return db.execute(
+        text(_SYNC_SQL.format(where=" AND h.household_id IN :household_ids"))
+        .bindparams(bindparam("household_ids", expanding=True)),
+        params
+    ).rowcount
+
+
+def record_distributions(db: Session, log_ids: List[int]) -> None:
+    """Move served households down the queue (caller commits)"""
+    if log_ids:
+        db.execute(_RECORD_SQL, {"log_ids": log_ids})
+
+
+def pending(db: Session, limit: int | None = None, offset: int = 0) -> List[dict]:
+    """Pending households in outreach order (claimed ones included; all of them without `limit`)"""
+    page = "" if limit is None else "LIMIT :limit OFFSET :offset"
+    rows = db.execute(
+        text(f"""
+            SELECT {_QUEUE_COLUMNS}
+            FROM Pending_Queue q
+            INNER JOIN Households h ON h.household_id = q.household_id
+            WHERE {PENDING_SQL}
+            ORDER BY q.priority_rank, q.registration_date, q.household_id
+            {page}
+        """),
+        {"limit": limit, "offset": offset}
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def count_pending(db: Session) -> int:
+    """Number of pending households"""
+    return db.execute(
+        text(f"""
+            SELECT COUNT(*)
+            FROM Pending_Queue q
+            INNER JOIN Households h ON h.household_id = q.household_id
+            WHERE {PENDING_SQL}
+        """)
+    ).scalar()
+
+
+def claim(
+    db: Session,
+    staff_id: int,
+    count: int,
+    timeout_seconds: int | None = None
+) -> List[dict]:
+    """
+    Claim the next `count` unclaimed pending households for a caseworker
+    (commits)
+
+    Rows locked by a concurrent claim are skipped, so the batch may be
+    shorter than `count` while other claims are in flight.
+    """
+    timeout_seconds = timeout_seconds or settings.PENDING_CLAIM_TIMEOUT_SECONDS
+
+    household_ids = db.execute(
+        text(f"""
+            SELECT q.household_id
+            FROM Pending_Queue q
+            WHERE {PENDING_SQL} AND {_UNCLAIMED}
+            ORDER BY q.priority_rank, q.registration_date, q.household_id
+            LIMIT :count
+            FOR UPDATE SKIP LOCKED
+        """),
+        {"count": count}
+    ).scalars().all()
+
+    if not household_ids:
+        db.rollback()
+        return []
+
+    db.execute(
+        text("""
+            UPDATE Pending_Queue
+            SET claimed_by = :staff_id,
+                claimed_at = NOW(),
+                claim_expires_at = NOW() + INTERVAL :timeout SECOND
+            WHERE household_id IN :household_ids
+        """).bindparams(bindparam("household_ids", expanding=True)),
+        {"staff_id": staff_id, "timeout": timeout_seconds, "household_ids": household_ids}
+    )
+    db.commit()
+
+    return claims(db, staff_id, household_ids)
+
+
+def claims(db: Session, staff_id: int, household_ids: List[int] | None = None) -> List[dict]:
+    """A caseworker's unexpired claims, in outreach order"""
+    where = " AND q.household_id IN :household_ids" if household_ids is not None else ""
+    statement = text(f"""
+        SELECT {_QUEUE_COLUMNS}
+        FROM Pending_Queue q
+        INNER JOIN Households h ON h.household_id = q.household_id
+        WHERE q.claimed_by = :staff_id
+          AND q.claim_expires_at > NOW(){where}
+        ORDER BY q.priority_rank, q.registration_date, q.household_id
+    """)
+    params = {"staff_id": staff_id}
+    if household_ids is not None:
+        statement = statement.bindparams(bindparam("household_ids", expanding=True))
+        params["household_ids"] = household_ids
+
+    return [dict(row) for row in db.execute(statement, params).mappings().all()]
+
+
+def release(db: Session, staff_id: int, household_ids: List[int] | None = None) -> int:
+    """
+    Give back a caseworker's claims before they expire (commits)
+
+    Args:
+        household_ids: claims to release; None releases all of them
+
+    Returns:
+        Number of claims released
+    """
+    where = " AND household_id IN :household_ids" if household_ids is not None else ""
+    statement = text(f"""
+        UPDATE Pending_Queue
+        SET claimed_by = NULL, claimed_at = NULL, claim_expires_at = NULL
+        WHERE claimed_by = :staff_id{where}
+    """)
+    params = {"staff_id": staff_id}
+    if household_ids is not None:
+        statement = statement.bindparams(bindparam("household_ids", expanding=True))
+        params["household_ids"] = household_ids
+
+    released = db.execute(statement, params).rowcount
+    db.commit()
+    return released
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        written = sync(db)
+        db.commit()
+        print(f"Pending_Queue rebuilt: {written} row(s) written")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Reference Data Cache
+Read-through cache for Aid_Packages and Distribution_Centers
+
+Both tables change a few times a month but are read by every distribution
+and eligibility check. Rows are cached per process as plain snapshots
+(column name -> value, no ORM state) with TTL + LRU eviction.
+
+Invalidation:
+- the packages/centers write handlers call invalidate() inside their
+  transaction: it bumps the table's row in Cache_Generations and clears the
+  local copy once that transaction commits
+- every other worker polls Cache_Generations (one indexed read, at most
+  every REFERENCE_CACHE_GENERATION_CHECK_SECONDS) and clears its copy when
+  the generation moved
+- rows changed behind the API's back (seed scripts, manual SQL) are picked
+  up when their TTL runs out
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, text
+from types import SimpleNamespace
+from typing import Dict, Iterable, List
+import threading
+import time
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models import AidPackage, DistributionCenter, CacheGeneration
+
+PACKAGES = "aid_packages"
+CENTERS = "distribution_centers"
+
+_ALL = "all"
+
+
+def _snapshot(instance) -> SimpleNamespace:
+    """Detached copy of an ORM row's column values"""
+    return SimpleNamespace(**{
+        attr.key: getattr(instance, attr.key)
+        for attr in inspect(instance).mapper.column_attrs
+    })
+
+
+class ReferenceDataCache:
+    """Per-process cache of packages and centers, kept in sync across workers"""
+
+    MODELS = {
+        PACKAGES: (AidPackage, AidPackage.package_id),
+        CENTERS: (DistributionCenter, DistributionCenter.center_id),
+    }
+
+    def __init__(self):
+        self.caches: Dict[str, TTLCache] = {
+            name: TTLCache(
+                name,
+                ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS,
+                max_entries=settings.REFERENCE_CACHE_MAX_ENTRIES,
+                enabled=settings.REFERENCE_CACHE_ENABLED
+            )
+            for name in self.MODELS
+        }
+        self._generations: Dict[str, int] = {}
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return all(cache.enabled for cache in self.caches.values())
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Switch caching on/off at runtime (tests turn it off)"""
+        for cache in self.caches.values():
+            cache.enabled = enabled
+            cache.clear()
+        with self._lock:
+            self._generations.clear()
+            self._checked_at = float("-inf")
+
+    # ---- reads ----------------------------------------------------------
+
+    def get(self, db: Session, name: str, key: int) -> SimpleNamespace | None:
+        """One row by primary key (None when it does not exist)"""
+        self._sync(db)
+        model, pk = self.MODELS[name]
+
+        def load():
+            row = db.query(model).filter(pk == key).first()
+            return _snapshot(row) if row else None
+
+        return self.caches[name].get_or_load(key, load)
+
+    def get_many(
+        self,
+        db: Session,
+        name: str,
+        keys: Iterable[int]
+    ) -> Dict[int, SimpleNamespace]:
+        """Rows by primary key; all misses are loaded with one IN query"""
+        self._sync(db)
+        model, pk = self.MODELS[name]
+        cache = self.caches[name]
+
+        found = {}
+        missing = []
+        for key in set(keys):
+            row = cache.get(key)
+            if row is None:
+                missing.append(key)
+            else:
+                found[key] = row
+
+        if missing:
+            for row in db.query(model).filter(pk.in_(missing)):
+                snapshot = _snapshot(row)
+                key = getattr(snapshot, pk.key)
+                cache.set(key, snapshot)
+                found[key] = snapshot
+
+        return found
+
+    def all(self, db: Session, name: str) -> List[SimpleNamespace]:
+        """Every row of the table, ordered by primary key"""
+        self._sync(db)
+        model, pk = self.MODELS[name]
+
+        def load():
+            return tuple(_snapshot(row) for row in db.query(model).order_by(pk))
+
+        return list(self.caches[name].get_or_load(_ALL, load))
+
+    # ---- invalidation ---------------------------------------------------
+
+    def invalidate(self, db: Session, name: str) -> None:
+        """
+        Bump the table's generation inside the caller's transaction and
+        drop the local copy after it commits (a read in between would cache
+        the old row again); call before db.commit()
+        """
+        db.execute(
+            text("""
+                INSERT INTO Cache_Generations (cache_name, generation)
+                VALUES (:name, 1)
+                ON DUPLICATE KEY UPDATE generation = generation + 1
+            """),
+            {"name": name}
+        )
+        event.listen(db, "after_commit", lambda session: self.caches[name].clear(), once=True)
+
+    def _sync(self, db: Session) -> None:
+        """Clear caches whose generation moved since the last check"""
+        if not self.enabled:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < settings.REFERENCE_CACHE_GENERATION_CHECK_SECONDS:
+                return
+            self._checked_at = now
+
+        generations = dict(
+            db.query(CacheGeneration.cache_name, CacheGeneration.generation).filter(
+                CacheGeneration.cache_name.in_(list(self.caches))
+            ).all()
+        )
+
+        with self._lock:
+            for name, cache in self.caches.items():
+                generation = generations.get(name)
+                if self._generations.get(name) != generation:
+                    cache.clear()
+                    self._generations[name] = generation
+
+    def stats(self) -> dict:
+        with self._lock:
+            generations = dict(self._generations)
+        return {
+            name: {**cache.stats(), "generation": generations.get(name)}
+            for name, cache in self.caches.items()
+        }
+
+
+reference_data = ReferenceDataCache()
@@ -0,0 +1,472 @@
+"""
+Report Rollups
+Incrementally maintained aggregates behind the monthly-summary and
+distribution-statistics reports (tables in 11_report_rollups.sql)
+
+catch_up() folds successful Distribution_Log rows with
+last_log_id < log_id <= high into the rollups and advances the watermark,
+all in one transaction. `high` stops short of rows younger than
+ROLLUP_SETTLE_SECONDS: log_ids are handed out at INSERT time, so a row with
+a smaller id may still be uncommitted. That keeps late commits rare, not
+impossible, so reconcile() periodically recomputes the last
+ROLLUP_RECONCILE_DAYS days from the log and picks up anything that
+committed below the watermark.
+
+Code that deletes log rows calls forget() in the same transaction; after
+packages change category, run `rebuild` to recompute everything.
+
+The loop runs in its own process (`run`, the `rollups` service in
+docker-compose.yml), so API workers do not compete for the watermark.
+
+Usage (from backend/):
+    python -m app.services.report_rollups run
+    python -m app.services.report_rollups catch-up
+    python -m app.services.report_rollups reconcile [--days N]
+    python -m app.services.report_rollups rebuild
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from datetime import date
+from typing import Iterable, Tuple
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "report_rollups"
+
+# Statements folding a set of log rows in; {rows} selects them (over
+# Distribution_Log dl) and every statement filters on success itself
+_FOLD_SQL = [
+    """
+        INSERT INTO Rollup_Daily_Distributions (
+            rollup_date, center_id, package_id, distributions,
+            packages_distributed, first_distribution, last_distribution
+        )
+        SELECT DATE(dl.distribution_date), dl.center_id, dl.package_id, COUNT(*),
+               SUM(dl.quantity_distributed), MIN(dl.distribution_date),
+               MAX(dl.distribution_date)
+        FROM Distribution_Log dl
+        WHERE {rows}
+          AND dl.transaction_status = 'success'
+        GROUP BY DATE(dl.distribution_date), dl.center_id, dl.package_id
+        ON DUPLICATE KEY UPDATE
+            distributions = distributions + VALUES(distributions),
+            packages_distributed = packages_distributed + VALUES(packages_distributed),
+            first_distribution = LEAST(first_distribution, VALUES(first_distribution)),
+            last_distribution = GREATEST(last_distribution, VALUES(last_distribution))
+    """,
+    """
+        INSERT IGNORE INTO Rollup_Monthly_Households (month_start, center_id, category, household_id)
+        SELECT DISTINCT
+            DATE(dl.distribution_date) - INTERVAL (DAYOFMONTH(dl.distribution_date) - 1) DAY,
+            dl.center_id, ap.category, dl.household_id
+        FROM Distribution_Log dl
+        INNER JOIN Aid_Packages ap ON ap.package_id = dl.package_id
+        WHERE {rows}
+          AND dl.transaction_status = 'success'
+    """,
+    """
+        INSERT INTO Rollup_Monthly_Unique (month_start, center_id, category, unique_households)
+        SELECT m.month_start, m.center_id, m.category, COUNT(*)
+        FROM Rollup_Monthly_Households m
+        INNER JOIN (
+            SELECT DISTINCT
+                DATE(dl.distribution_date) - INTERVAL (DAYOFMONTH(dl.distribution_date) - 1) DAY
+                    AS month_start,
+                dl.center_id, ap.category
+            FROM Distribution_Log dl
+            INNER JOIN Aid_Packages ap ON ap.package_id = dl.package_id
+            WHERE {rows}
+              AND dl.transaction_status = 'success'
+        ) touched
+          ON touched.month_start = m.month_start
+         AND touched.center_id = m.center_id
+         AND touched.category = m.category
+        GROUP BY m.month_start, m.center_id, m.category
+        ON DUPLICATE KEY UPDATE unique_households = VALUES(unique_households)
+    """,
+    """
+        INSERT IGNORE INTO Rollup_Center_Package_Households (center_id, package_id, household_id)
+        SELECT DISTINCT dl.center_id, dl.package_id, dl.household_id
+        FROM Distribution_Log dl
+        WHERE {rows}
+          AND dl.transaction_status = 'success'
+    """,
+    """
+        INSERT INTO Rollup_Center_Package_Unique (center_id, package_id, unique_households)
+        SELECT c.center_id, c.package_id, COUNT(*)
+        FROM Rollup_Center_Package_Households c
+        INNER JOIN (
+            SELECT DISTINCT dl.center_id, dl.package_id
+            FROM Distribution_Log dl
+            WHERE {rows}
+              AND dl.transaction_status = 'success'
+        ) touched
+          ON touched.center_id = c.center_id
+         AND touched.package_id = c.package_id
+        GROUP BY c.center_id, c.package_id
+        ON DUPLICATE KEY UPDATE unique_households = VALUES(unique_households)
+    """,
+]
+
+# catch_up(): a primary-key range; :low is exclusive, :high inclusive
+_BATCH_SQL = [
+    text(sql.format(rows="dl.log_id > :low AND dl.log_id <= :high")) for sql in _FOLD_SQL
+]
+
+# reconcile(): whole days from :since on (range on idx_date), up to the
+# watermark
+_RECENT_SQL = [
+    text(sql.format(rows="dl.distribution_date >= :since AND dl.log_id <= :high"))
+    for sql in _FOLD_SQL
+]
+
+# forget(): recompute one (day, center, package) row from what is left
+_DAY_DELETE_SQL = text("""
+    DELETE FROM Rollup_Daily_Distributions
+    WHERE rollup_date = :day AND center_id = :center_id AND package_id = :package_id
+""")
+
+_DAY_SQL = text(_FOLD_SQL[0].format(rows="""
+    dl.distribution_date >= :day AND dl.distribution_date < :day + INTERVAL 1 DAY
+    AND dl.center_id = :center_id AND dl.package_id = :package_id
+    AND dl.log_id <= :high
+"""))
+
+# forget(): drop memberships no remaining row backs (idx_household_package),
+# then recount the groups
+_MONTH_MEMBER_SQL = text("""
+    DELETE FROM Rollup_Monthly_Households
+    WHERE month_start = :month AND center_id = :center_id AND household_id = :household_id
+      AND category = (SELECT category FROM Aid_Packages WHERE package_id = :package_id)
+      AND NOT EXISTS (
+          SELECT 1 FROM Distribution_Log dl
+          INNER JOIN Aid_Packages ap ON ap.package_id = dl.package_id
+          WHERE dl.household_id = :household_id
+            AND dl.center_id = :center_id
+            AND ap.category = Rollup_Monthly_Households.category
+            AND dl.distribution_date >= :month
+            AND dl.distribution_date < :month + INTERVAL 1 MONTH
+            AND dl.transaction_status = 'success'
+            AND dl.log_id <= :high
+      )
+""")
+
+_MONTH_UNIQUE_SQL = text("""
+    UPDATE Rollup_Monthly_Unique u
+    SET unique_households = (
+        SELECT COUNT(*) FROM Rollup_Monthly_Households m
+        WHERE m.month_start = u.month_start
+          AND m.center_id = u.center_id
+          AND m.category = u.category
+    )
+    WHERE u.month_start = :month AND u.center_id = :center_id
+      AND u.category = (SELECT category FROM Aid_Packages WHERE package_id = :package_id)
+""")
+
+_PAIR_MEMBER_SQL = text("""
+    DELETE FROM Rollup_Center_Package_Households
+    WHERE center_id = :center_id AND package_id = :package_id AND household_id = :household_id
+      AND NOT EXISTS (
+          SELECT 1 FROM Distribution_Log dl
+          WHERE dl.household_id = :household_id
+            AND dl.package_id = :package_id
+            AND dl.center_id = :center_id
+            AND dl.transaction_status = 'success'
+            AND dl.log_id <= :high
+      )
+""")
+
+_PAIR_UNIQUE_SQL = text("""
+    UPDATE Rollup_Center_Package_Unique u
+    SET unique_households = (
+        SELECT COUNT(*) FROM Rollup_Center_Package_Households c
+        WHERE c.center_id = u.center_id AND c.package_id = u.package_id
+    )
+    WHERE u.center_id = :center_id AND u.package_id = :package_id
+""")
+
+_ROLLUP_TABLES = (
+    "Rollup_Daily_Distributions",
+    "Rollup_Monthly_Households",
+    "Rollup_Monthly_Unique",
+    "Rollup_Center_Package_Households",
+    "Rollup_Center_Package_Unique",
+)
+
+
+def catch_up(db: Session, batch_size: int | None = None) -> int:
+    """
+    Process one batch of new log rows (commits)
+
+    Only one worker runs a batch at a time: the watermark row is taken with
+    FOR UPDATE SKIP LOCKED and a worker that finds it locked returns 0.
+
+    Returns:
+        Number of log ids this batch covered (0 when there was nothing to do)
+    """
+    batch_size = batch_size or settings.ROLLUP_BATCH_SIZE
+
+    low = db.execute(
+        text("""
+            SELECT last_log_id FROM Job_Watermarks
+            WHERE job_name = :job FOR UPDATE SKIP LOCKED
+        """),
+        {"job": JOB_NAME}
+    ).scalar()
+
+    if low is None:
+        db.rollback()
+        return 0
+
+    max_log_id = db.execute(text("SELECT MAX(log_id) FROM Distribution_Log")).scalar() or 0
+    high = min(low + batch_size, max_log_id)
+
+    # First row of the batch still inside the settle window (PK range scan)
+    unsettled = db.execute(
+        text("""
+            SELECT MIN(log_id) FROM Distribution_Log
+            WHERE log_id > :low AND log_id <= :high
+              AND distribution_date >= NOW() - INTERVAL :settle SECOND
+        """),
+        {"low": low, "high": high, "settle": settings.ROLLUP_SETTLE_SECONDS}
+    ).scalar()
+
+    if unsettled is not None:
+        high = min(high, unsettled - 1)
+
+    if high <= low:
+        db.rollback()
+        return 0
+
+    params = {"low": low, "high": high}
+    for statement in _BATCH_SQL:
+        db.execute(statement, params)
+
+    db.execute(
+        text("UPDATE Job_Watermarks SET last_log_id = :high WHERE job_name = :job"),
+        {"high": high, "job": JOB_NAME}
+    )
+    db.commit()
+
+    return high - low
+
+
+def catch_up_all(db: Session) -> int:
+    """Run batches until the rollups are current; returns log_ids covered"""
+    total = 0
+    while True:
+        processed = catch_up(db)
+        if not processed:
+            return total
+        total += processed
+
+
+def reconcile(db: Session, days: int | None = None) -> date | None:
+    """
+    Recompute the rollups of the last `days` days from the log (commits)
+
+    The settle window only makes a late commit unlikely: a transaction that
+    commits more than ROLLUP_SETTLE_SECONDS after taking its log_id ends up
+    below the watermark, where catch_up() never looks again. This pass
+    rewrites the daily rows from `since` on and adds the memberships those
+    log rows imply, so such a row is counted by the next reconcile at the
+    latest. Rows above the watermark are left to catch_up().
+
+    Returns:
+        The first day reconciled, or None when another worker holds the
+        watermark
+    """
+    days = settings.ROLLUP_RECONCILE_DAYS if days is None else days
+
+    high = db.execute(
+        text("""
+            SELECT last_log_id FROM Job_Watermarks
+            WHERE job_name = :job FOR UPDATE SKIP LOCKED
+        """),
+        {"job": JOB_NAME}
+    ).scalar()
+
+    if high is None:
+        db.rollback()
+        return None
+
+    since = db.execute(
+        text("SELECT CURDATE() - INTERVAL :days DAY"), {"days": days}
+    ).scalar()
+
+    db.execute(
+        text("DELETE FROM Rollup_Daily_Distributions WHERE rollup_date >= :since"),
+        {"since": since}
+    )
+    params = {"since": since, "high": high}
+    for statement in _RECENT_SQL:
+        db.execute(statement, params)
+
+    db.commit()
+    return since
+
+
+def forget(db: Session, rows: Iterable) -> None:
+    """
+    Take deleted log rows back out of the rollups (does not commit)
+
+    Call in the transaction that deleted `rows` (objects with log_id,
+    distribution_date, center_id, package_id, household_id and
+    transaction_status), after the DELETE. Rows above the watermark were
+    never counted and are skipped; the daily rows and distinct-household
+    counters the others touched are recomputed from what is left in the
+    log. Waits for the watermark row, so a running batch finishes first.
+    """
+    high = db.execute(
+        text("SELECT last_log_id FROM Job_Watermarks WHERE job_name = :job FOR UPDATE"),
+        {"job": JOB_NAME}
+    ).scalar() or 0
+
+    counted = [
+        row for row in rows
+        if row.transaction_status == "success" and row.log_id <= high
+    ]
+    if not counted:
+        return
+
+    days = sorted({
+        (row.distribution_date.date(), row.center_id, row.package_id) for row in counted
+    })
+    day_params = [
+        {"day": day, "center_id": center_id, "package_id": package_id, "high": high}
+        for day, center_id, package_id in days
+    ]
+    db.execute(_DAY_DELETE_SQL, day_params)
+    db.execute(_DAY_SQL, day_params)
+
+    members = sorted({
+        (row.distribution_date.date().replace(day=1), row.center_id, row.package_id, row.household_id)
+        for row in counted
+    })
+    db.execute(_MONTH_MEMBER_SQL, [
+        {
+            "month": month, "center_id": center_id, "package_id": package_id,
+            "household_id": household_id, "high": high
+        }
+        for month, center_id, package_id, household_id in members
+    ])
+    db.execute(_MONTH_UNIQUE_SQL, [
+        {"month": month, "center_id": center_id, "package_id": package_id}
+        for month, center_id, package_id in sorted({member[:3] for member in members})
+    ])
+
+    db.execute(_PAIR_MEMBER_SQL, [
+        {"center_id": center_id, "package_id": package_id, "household_id": household_id, "high": high}
+        for center_id, package_id, household_id in sorted({member[1:] for member in members})
+    ])
+    db.execute(_PAIR_UNIQUE_SQL, [
+        {"center_id": center_id, "package_id": package_id}
+        for center_id, package_id in sorted({member[1:3] for member in members})
+    ])
+
+
+def rebuild(db: Session) -> int:
+    """Empty every rollup, reset the watermark and catch up from scratch"""
+    for table in _ROLLUP_TABLES:
+        db.execute(text(f"DELETE FROM {table}"))
+    db.execute(
+        text("""
+            INSERT INTO Job_Watermarks (job_name, last_log_id) VALUES (:job, 0)
+            ON DUPLICATE KEY UPDATE last_log_id = 0
+        """),
+        {"job": JOB_NAME}
+    )
+    db.commit()
+    return catch_up_all(db)
+
+
+def watermark(db: Session):
+    """(last_log_id, updated_at) of the rollup job, or None"""
+    return db.execute(
+        text("SELECT last_log_id, updated_at FROM Job_Watermarks WHERE job_name = :job"),
+        {"job": JOB_NAME}
+    ).first()
+
+
+def _run_once(reconcile_due: bool) -> Tuple[int, date | None]:
+    db = SessionLocal()
+    try:
+        processed = catch_up_all(db)
+        return processed, reconcile(db) if reconcile_due else None
+    finally:
+        db.close()
+
+
+async def run_forever() -> None:
+    """
+    Catch-up loop, with a reconcile every ROLLUP_RECONCILE_INTERVAL_SECONDS
+
+    Runs in the rollup worker (`run` below); the API lifespan only starts it
+    when ROLLUP_JOB_ENABLED is set.
+    """
+    next_reconcile = time.monotonic()
+    while True:
+        try:
+            reconcile_due = time.monotonic() >= next_reconcile
+            processed, since = await asyncio.to_thread(_run_once, reconcile_due)
+            if processed:
+                logger.info(f"📊 Report rollups advanced by {processed} log id(s)")
+            if since is not None:
+                logger.info(f"📊 Report rollups reconciled from {since}")
+            if reconcile_due:
+                next_reconcile = time.monotonic() + settings.ROLLUP_RECONCILE_INTERVAL_SECONDS
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Report rollup catch-up failed: {str(e)}")
+        await asyncio.sleep(settings.ROLLUP_INTERVAL_SECONDS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["catch-up", "reconcile", "rebuild", "run"])
+    parser.add_argument("--days", type=int, default=None,
+                        help="reconcile: days back from today (default ROLLUP_RECONCILE_DAYS)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        try:
+            asyncio.run(run_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    db = SessionLocal()
+    try:
+        if args.command == "reconcile":
+            since = reconcile(db, args.days)
+            if since is None:
+                print("Report rollups are busy in another worker")
+                return 1
+            print(f"Report rollups reconciled from {since}")
+            return 0
+        if args.command == "rebuild":
+            processed = rebuild(db)
+        else:
+            processed = catch_up_all(db)
+        print(f"Report rollups advanced by {processed} log id(s)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Restock Service - atomic (bulk) inventory restocks
+
+Stock is added with INSERT ... ON DUPLICATE KEY UPDATE
+quantity_on_hand = quantity_on_hand + VALUES(quantity_on_hand): the
+increment happens inside MySQL under the row lock, so concurrent restocks
+(and distributions) of the same row never lose an update, and a missing
+Inventory row is created by the same statement.
+
+A manifest's lines are validated first (invalid lines are reported with
+their line number and skipped), merged per (center, package) and applied
+in (center_id, package_id) order - the order every other writer locks
+inventory rows in - RESTOCK_BATCH_SIZE rows per statement, all in one
+transaction.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from collections import defaultdict
+from datetime import date
+from typing import IO, Dict, List, Tuple
+import csv
+import io
+import logging
+
+from app.core.config import settings
+from app.services.reference_data import reference_data, PACKAGES, CENTERS
+
+logger = logging.getLogger(__name__)
+
+# (line number, center_id, package_id, quantity)
+RestockLine = Tuple[int, int, int, int]
+
+MANIFEST_COLUMNS = ("center_id", "package_id", "quantity")
+
+# Sharded rows (shard_count > 1) keep their stock in Inventory_Shards:
+# their Inventory row only records the restock, the units go to the shards
+_UPSERT_SQL = """
+    INSERT INTO Inventory (
+        center_id, package_id, quantity_on_hand,
+        last_restock_date, last_restock_quantity
+    )
+    VALUES {rows}
+    ON DUPLICATE KEY UPDATE
+        quantity_on_hand = IF(
+            shard_count > 1, quantity_on_hand, quantity_on_hand + VALUES(quantity_on_hand)
+        ),
+        last_restock_date = VALUES(last_restock_date),
+        last_restock_quantity = VALUES(last_restock_quantity),
+        version = version + 1
+"""
+
+# Rows of the batch the upsert created: an updated row has its version
+# bumped past the column default of 1
+_CREATED_SQL = """
+    SELECT COUNT(*) FROM Inventory
+    WHERE (center_id, package_id) IN ({keys}) AND version = 1
+"""
+
+# Spread each sharded row's units evenly over its shards (the Inventory row
+# is already locked by the upsert above, so shard_count cannot change)
+_SHARDS_SQL = """
+    UPDATE Inventory_Shards s
+    INNER JOIN Inventory i
+        ON i.center_id = s.center_id AND i.package_id = s.package_id
+    INNER JOIN ({rows}) r
+        ON r.center_id = s.center_id AND r.package_id = s.package_id
+    SET s.quantity_on_hand = s.quantity_on_hand
+        + r.quantity DIV i.shard_count
+        + (s.shard_no < r.quantity MOD i.shard_count)
+    WHERE i.shard_count > 1
+"""
+
+
+def parse_manifest(stream: IO[bytes]) -> Tuple[List[RestockLine], List[dict]]:
+    """
+    Read a CSV manifest with a header row containing center_id, package_id
+    and quantity (other columns are ignored)
+
+    Returns:
+        (lines, errors) - errors carry the CSV line number
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    missing = [column for column in MANIFEST_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        return [], [{"line": 1, "message": f"Missing column(s): {', '.join(missing)}"}]
+
+    lines, errors = [], []
+    for row in reader:
+        line = reader.line_num
+        if len(lines) + len(errors) >= settings.RESTOCK_MANIFEST_MAX_LINES:
+            errors.append({
+                "line": line,
+                "message": f"Manifest exceeds {settings.RESTOCK_MANIFEST_MAX_LINES} lines"
+            })
+            break
+        try:
+            values = [int(row[column].strip()) for column in MANIFEST_COLUMNS]
+        except (AttributeError, ValueError):
+            errors.append({
+                "line": line,
+                "message": "center_id, package_id and quantity must be integers"
+            })
+            continue
+        lines.append((line, *values))
+
+    return lines, errors
+
+
+def _validate(db: Session, lines: List[RestockLine]) -> Tuple[List[RestockLine], List[dict]]:
+    """Split lines into valid ones and per-line errors"""
+    centers = reference_data.get_many(db, CENTERS, {line[1] for line in lines})
+    packages = reference_data.get_many(db, PACKAGES, {line[2] for line in lines})
+
+    valid, errors = [], []
+    for line, center_id, package_id, quantity in lines:
+        if quantity <= 0:
+            message = "Quantity must be positive"
+        elif center_id not in centers:
+            message = f"Distribution center {center_id} not found"
+        elif package_id not in packages:
+            message = f"Package {package_id} not found"
+        else:
+            valid.append((line, center_id, package_id, quantity))
+            continue
+        errors.append({
+            "line": line,
+            "center_id": center_id,
+            "package_id": package_id,
+            "quantity": quantity,
+            "message": message
+        })
+
+    return valid, errors
+
+
+def _apply(db: Session, totals: List[Tuple[Tuple[int, int], int]]) -> int:
+    """Upsert merged (center, package) totals; returns Inventory rows created"""
+    created = 0
+    today = date.today()
+
+    for start in range(0, len(totals), settings.RESTOCK_BATCH_SIZE):
+        batch = totals[start:start + settings.RESTOCK_BATCH_SIZE]
+        params = {"today": today}
+        values, keys, derived = [], [], []
+        for i, ((center_id, package_id), quantity) in enumerate(batch):
+            params.update({f"c{i}": center_id, f"p{i}": package_id, f"q{i}": quantity})
+            values.append(f"(:c{i}, :p{i}, :q{i}, :today, :q{i})")
+            keys.append(f"(:c{i}, :p{i})")
+            derived.append(f"SELECT :c{i} AS center_id, :p{i} AS package_id, :q{i} AS quantity")
+
+        db.execute(text(_UPSERT_SQL.format(rows=", ".join(values))), params)
+        # The upsert holds every row of the batch locked; read back which
+        # ones it created rather than decoding the affected-rows count
+        created += db.execute(text(_CREATED_SQL.format(keys=", ".join(keys))), params).scalar()
+        db.execute(text(_SHARDS_SQL.format(rows=" UNION ALL ".join(derived))), params)
+
+    return created
+
+
+def restock_many(db: Session, lines: List[RestockLine]) -> Tuple[str, str, dict]:
+    """
+    Validate and apply restock lines in one transaction (commits)
+
+    Returns:
+        (status, message, summary) - summary lists the rejected lines
+        under "errors"; status is "error" only when nothing could be applied
+    """
+    valid, errors = _validate(db, lines)
+
+    merged: Dict[Tuple[int, int], int] = defaultdict(int)
+    for _, center_id, package_id, quantity in valid:
+        merged[(center_id, package_id)] += quantity
+    totals = sorted(merged.items())
+
+    summary = {
+        "applied": len(valid),
+        "rejected": len(errors),
+        "inventory_rows": len(totals),
+        "created": 0,
+        "units": sum(merged.values()),
+        "errors": errors
+    }
+
+    if not totals:
+        db.rollback()
+        return ("error", "No valid restock lines", {**summary, "applied": 0, "units": 0})
+
+    try:
+        summary["created"] = _apply(db, totals)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Restock failed: {str(e)}")
+        return ("error", f"Restock failed: {str(e)}", {**summary, "applied": 0, "units": 0})
+
+    logger.info(
+        f"✅ Restocked {summary['units']} units over {len(totals)} inventory row(s) "
+        f"({len(errors)} line(s) rejected)"
+    )
+    return (
+        "success",
+        f"Restocked {summary['units']} units over {len(totals)} inventory row(s)",
+        summary
+    )
@@ -0,0 +1,128 @@
+"""
+Transaction Retry
+Transparent retry of the distribution transaction on transient InnoDB
+errors
+
+- 1205 lock wait timeout: another transaction held the inventory row
+  longer than innodb_lock_wait_timeout
+- 1213 deadlock: InnoDB rolled this transaction back to break a cycle
+
+Both leave the database unchanged once the transaction is rolled back, so
+the whole transaction is simply run again. Attempts are bounded
+(TRANSACTION_RETRY_MAX_RETRIES) and paused with full-jitter exponential
+backoff, so that clients retrying together do not collide again in step.
+Every retry must also fit within the request's deadline
+(TRANSACTION_RETRY_DEADLINE_SECONDS). The distribution session uses
+DISTRIBUTION_LOCK_WAIT_TIMEOUT_SECONDS for innodb_lock_wait_timeout,
+lowered further when less of the deadline is left. Retries and give-ups
+are counted per error, to tell contention apart from real failures.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy import text
+import math
+import random
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import TRANSACTION_RETRY_EVENTS
+
+# MySQL error code -> counter name
+TRANSIENT_ERRORS = {
+    1205: "lock_wait_timeout",
+    1213: "deadlock",
+}
+
+
+class TransientErrorStats:
+    """Thread-safe retry counters per transient error (per process)"""
+
+    FIELDS = ("errors", "retries", "exhausted", "deadline_exceeded")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {
+            error: {field: 0 for field in self.FIELDS}
+            for error in TRANSIENT_ERRORS.values()
+        }
+
+    def record(self, error: str, field: str) -> None:
+        with self._lock:
+            self._counts[error][field] += 1
+        TRANSACTION_RETRY_EVENTS.labels(error, field).inc()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {error: dict(counts) for error, counts in self._counts.items()}
+
+
+transient_error_stats = TransientErrorStats()
+
+
+def transient_error(exc: Exception) -> str | None:
+    """Counter name of a retryable MySQL error, None for anything else"""
+    if isinstance(exc, DBAPIError) and exc.orig is not None and exc.orig.args:
+        return TRANSIENT_ERRORS.get(exc.orig.args[0])
+    return None
+
+
+def set_lock_wait_timeout(db: Session, seconds: int | None) -> None:
+    """innodb_lock_wait_timeout for this session (None: server default)"""
+    if seconds is None:
+        db.execute(text("SET SESSION innodb_lock_wait_timeout = DEFAULT"))
+    else:
+        db.execute(text("SET SESSION innodb_lock_wait_timeout = :seconds"), {"seconds": seconds})
+
+
+class TransactionRetry:
+    """Retry budget of one request: attempts, backoff and deadline"""
+
+    def __init__(self):
+        self.retries = 0
+        self.deadline = time.monotonic() + settings.TRANSACTION_RETRY_DEADLINE_SECONDS
+        self.lock_wait_timeout: int | None = None
+
+    def next_lock_wait_timeout(self) -> int | None:
+        """
+        innodb_lock_wait_timeout for the next attempt, or None when the
+        session already has it
+
+        The configured value, capped by the time left before the deadline
+        (at least 1 second, the server minimum).
+        """
+        remaining = math.ceil(self.deadline - time.monotonic())
+        seconds = max(1, min(settings.DISTRIBUTION_LOCK_WAIT_TIMEOUT_SECONDS, remaining))
+        if seconds == self.lock_wait_timeout:
+            return None
+        self.lock_wait_timeout = seconds
+        return seconds
+
+    def next_pause(self, error: str) -> float | None:
+        """
+        Seconds to wait before retrying after `error`, or None to give up
+        (retries used up, or the pause would run past the deadline)
+        """
+        transient_error_stats.record(error, "errors")
+        if self.retries >= settings.TRANSACTION_RETRY_MAX_RETRIES:
+            transient_error_stats.record(error, "exhausted")
+            return None
+
+        # Full jitter: uniform in [0, min(cap, base * 2^n)]
+        pause = random.uniform(0, min(
+            settings.TRANSACTION_RETRY_MAX_DELAY_SECONDS,
+            settings.TRANSACTION_RETRY_BASE_DELAY_SECONDS * 2 ** self.retries
+        ))
+        if time.monotonic() + pause >= self.deadline:
+            transient_error_stats.record(error, "deadline_exceeded")
+            return None
+
+        self.retries += 1
+        transient_error_stats.record(error, "retries")
+        return pause
+
+
+def busy_message(error: str) -> str:
+    """Error returned to the client when the retries ran out"""
+    return f"Database is busy ({error.replace('_', ' ')}), please retry the distribution"
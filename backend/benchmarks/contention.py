@@ -0,0 +1,530 @@
+"""
+Contention Benchmark
+Drives distributions, eligibility checks, reports and restocks from N
+concurrent workers, either straight through the services (in this process)
+or over HTTP against a running API, and checks that no inventory was
+oversold.
+
+Operations (weights set with --mix):
+    distribute_hot      one (center, package) row everyone fights over
+    distribute_spread   a random row of the --centers x --packages grid
+    eligibility         POST /distribution/check-eligibility
+    report              GET /reports/monthly-summary
+    restock             +--restock-quantity on a random grid row
+
+Each run creates its own benchmark centers and packages (once), fresh
+active households (notes = 'contention-benchmark'), and resets the grid's
+stock to --hot-stock / --spread-stock. Run it against a throwaway database
+only: benchmarks/mysql_standin.sh starts one from database/schemas and
+database/seeds.
+
+After the run, the stock of every grid row must equal
+    stock before + restocked - distributed (Distribution_Log)
+and must not be negative. Every row that breaks this is an oversell
+violation, and the exit status is 1 if there is any.
+
+Usage (from backend/):
+    eval "$(benchmarks/mysql_standin.sh start)"
+    python -m benchmarks.contention --workers 16 --duration 30 --output results.json
+    python -m benchmarks.contention --target http://127.0.0.1:8000 --workers 64 \\
+        --mix distribute_hot=80,report=20 --compare results.json
+    benchmarks/mysql_standin.sh stop
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, datetime
+from urllib.parse import urlsplit
+
+from sqlalchemy import bindparam, insert, text
+
+from app.core.config import settings
+from app.api.reports import get_monthly_summary
+from app.core.database import SessionLocal, engine
+from app.models import Household
+from app.services.distribution_service import DistributionService
+from app.services.inventory_strategies import INVENTORY_STRATEGIES
+
+MARKER = "contention-benchmark"
+CENTER_PREFIX = "Benchmark Center"
+PACKAGE_PREFIX = "Benchmark Package"
+INSERT_BATCH = 5000
+
+OPERATIONS = ("distribute_hot", "distribute_spread", "eligibility", "report", "restock")
+DEFAULT_MIX = "distribute_hot=50,distribute_spread=25,eligibility=15,report=5,restock=5"
+
+# Service messages that mean "contended, try again" rather than a rule
+BUSY_PREFIXES = ("Inventory is busy", "Database is busy")
+
+
+def _outcome(ok: bool, message: str) -> str:
+    """ok | rejected (a distribution rule said no) | busy | error"""
+    if ok:
+        return "ok"
+    if message.startswith(BUSY_PREFIXES):
+        return "busy"
+    if message.startswith("Transaction failed"):
+        return "error"
+    return "rejected"
+
+
+class ServiceTarget:
+    """Calls the services in this process, one session per operation (as get_db)"""
+
+    name = "service"
+
+    def _run(self, call):
+        db = SessionLocal()
+        try:
+            return call(db)
+        finally:
+            db.close()
+
+    def distribute(self, household_id, center_id, package_id):
+        status, message, _ = self._run(lambda db: DistributionService.distribute_package(
+            db, household_id, package_id, center_id, None, 1
+        ))
+        return _outcome(status == "success", message)
+
+    def eligibility(self, household_id, package_id):
+        self._run(lambda db: DistributionService.check_eligibility(db, household_id, package_id))
+        return "ok"
+
+    def report(self):
+        self._run(lambda db: get_monthly_summary(limit=100, offset=0, db=db))
+        return "ok"
+
+    def restock(self, center_id, package_id, quantity):
+        status, message = self._run(lambda db: DistributionService.restock_inventory(
+            db, center_id, package_id, quantity
+        ))
+        return _outcome(status == "success", message)
+
+
+class HttpTarget:
+    """Calls a running API; one keep-alive connection per worker thread"""
+
+    name = "http"
+
+    def __init__(self, base_url: str):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/") + settings.API_V1_PREFIX
+        self._local = threading.local()
+
+    def _request(self, method, path, body=None):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        try:
+            connection.request(
+                method, self.prefix + path,
+                body=json.dumps(body) if body is not None else None,
+                headers={"Content-Type": "application/json"}
+            )
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self._local.connection = None
+            return 599, {}
+        try:
+            return response.status, json.loads(payload) if payload else {}
+        except ValueError:
+            return response.status, {}
+
+    def _result(self, status, payload):
+        if status == 200:
+            return "ok"
+        if status == 400:
+            return _outcome(False, str(payload.get("detail", "")))
+        return "error"
+
+    def distribute(self, household_id, center_id, package_id):
+        return self._result(*self._request("POST", "/distribution/distribute", {
+            "household_id": household_id, "package_id": package_id,
+            "center_id": center_id, "quantity": 1
+        }))
+
+    def eligibility(self, household_id, package_id):
+        return self._result(*self._request("POST", "/distribution/check-eligibility", {
+            "household_id": household_id, "package_id": package_id
+        }))
+
+    def report(self):
+        return self._result(*self._request("GET", "/reports/monthly-summary?limit=100"))
+
+    def restock(self, center_id, package_id, quantity):
+        return self._result(*self._request("POST", "/inventory/restock", {
+            "center_id": center_id, "package_id": package_id, "quantity": quantity
+        }))
+
+
+def _ensure_rows(db, table, id_column, name_column, prefix, count, insert_sql):
+    """Ids of the first `count` benchmark rows of table, creating missing ones"""
+    ids = [row[0] for row in db.execute(
+        text(f"SELECT {id_column} FROM {table} WHERE {name_column} LIKE :prefix ORDER BY {id_column}"),
+        {"prefix": prefix + " %"}
+    )]
+    for n in range(len(ids) + 1, count + 1):
+        ids.append(db.execute(text(insert_sql), {"name": f"{prefix} {n}"}).lastrowid)
+    return ids[:count]
+
+
+def prepare(db, centers, packages, households, hot_stock, spread_stock):
+    """Benchmark grid with fresh stock, and `households` new eligible households"""
+    center_ids = _ensure_rows(
+        db, "Distribution_Centers", "center_id", "center_name", CENTER_PREFIX, centers,
+        """INSERT INTO Distribution_Centers (center_name, address, city, state, zip_code, capacity)
+           VALUES (:name, '1 Benchmark Way', 'Springfield', 'IL', '62701', 100000)"""
+    )
+    package_ids = _ensure_rows(
+        db, "Aid_Packages", "package_id", "package_name", PACKAGE_PREFIX, packages,
+        """INSERT INTO Aid_Packages (package_name, category, estimated_cost, validity_period_days)
+           VALUES (:name, 'food', 10, 30)"""
+    )
+    grid = [(center_id, package_id) for center_id in center_ids for package_id in package_ids]
+    hot = grid[0]
+    for center_id, package_id in grid:
+        db.execute(text("""
+            INSERT INTO Inventory (center_id, package_id, quantity_on_hand, reorder_level)
+            VALUES (:center_id, :package_id, :stock, 0)
+            ON DUPLICATE KEY UPDATE quantity_on_hand = VALUES(quantity_on_hand)
+        """), {
+            "center_id": center_id, "package_id": package_id,
+            "stock": hot_stock if (center_id, package_id) == hot else spread_stock
+        })
+    db.commit()
+
+    # Fresh households every run: earlier runs' ones are no longer eligible.
+    # Phone numbers are unique, so numbering continues after earlier runs
+    run_marker = f"{MARKER} {datetime.now().isoformat(timespec='seconds')}"
+    first_number = db.execute(
+        text("SELECT COUNT(*) FROM Households WHERE notes LIKE :marker"), {"marker": MARKER + " %"}
+    ).scalar()
+    rng = random.Random(first_number)
+    for start in range(first_number, first_number + households, INSERT_BATCH):
+        db.execute(insert(Household.__table__), [
+            {
+                "family_name": f"Benchmark {n}",
+                "primary_contact_name": f"Contact {n}",
+                # 8xx area code, one number per row
+                "phone_number": f"8{n // 10_000_000 % 100:02d}-{n // 10_000 % 1000:03d}-{n % 10_000:04d}",
+                "address": f"{n} Benchmark Ave",
+                "city": "Springfield",
+                "state": "IL",
+                "zip_code": "62701",
+                "family_size": rng.randint(1, 8),
+                "income_level": "very_low",
+                "priority_level": "medium",
+                "registration_date": date.today(),
+                "status": "active",
+                "notes": run_marker,
+            }
+            for n in range(start, min(first_number + households, start + INSERT_BATCH))
+        ])
+        db.commit()
+    household_ids = [row[0] for row in db.execute(
+        text("SELECT household_id FROM Households WHERE notes = :marker ORDER BY household_id"),
+        {"marker": run_marker}
+    )]
+    return grid, hot, household_ids
+
+
+def _stock(db, grid):
+    """Units on hand per grid row, shards included"""
+    stock = {row: 0 for row in grid}
+    for center_id, package_id, quantity in db.execute(text("""
+        SELECT i.center_id, i.package_id,
+               i.quantity_on_hand + COALESCE((
+                   SELECT SUM(s.quantity_on_hand) FROM Inventory_Shards s
+                   WHERE s.center_id = i.center_id AND s.package_id = i.package_id
+               ), 0)
+        FROM Inventory i
+        WHERE i.center_id IN :centers AND i.package_id IN :packages
+    """).bindparams(
+        bindparam("centers", expanding=True), bindparam("packages", expanding=True)
+    ), {"centers": sorted({c for c, _ in grid}), "packages": sorted({p for _, p in grid})}):
+        if (center_id, package_id) in stock:
+            stock[(center_id, package_id)] = int(quantity)
+    return stock
+
+
+def _lock_counters(db) -> dict:
+    """Server-wide InnoDB lock counters (deltas are reported)"""
+    counters = {
+        name.lower(): int(value) for name, value in db.execute(text(
+            "SHOW GLOBAL STATUS WHERE Variable_name IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time')"
+        ))
+    }
+    try:
+        counters.update({
+            name: int(count) for name, count in db.execute(text(
+                "SELECT NAME, COUNT FROM information_schema.INNODB_METRICS "
+                "WHERE NAME IN ('lock_deadlocks', 'lock_timeouts')"
+            ))
+        })
+    except Exception:
+        db.rollback()
+    return counters
+
+
+def _parse_mix(spec: str):
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name}' (choose from {', '.join(OPERATIONS)})")
+        weights[name] = float(weight or 1)
+    return list(weights), list(weights.values())
+
+
+def _percentile(ordered: list, fraction: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(args) -> dict:
+    target = HttpTarget(args.target) if args.target != "service" else ServiceTarget()
+    operations, weights = _parse_mix(args.mix)
+
+    db = SessionLocal()
+    try:
+        grid, hot, household_ids = prepare(
+            db, args.centers, args.packages, args.households, args.hot_stock, args.spread_stock
+        )
+        stock_before = _stock(db, grid)
+        first_log_id = db.execute(text("SELECT COALESCE(MAX(log_id), 0) FROM Distribution_Log")).scalar()
+        locks_before = _lock_counters(db)
+        db.commit()
+    finally:
+        db.close()
+    strategy_wait_before = {
+        name: strategy.stats.snapshot()["lock_wait_seconds"] for name, strategy in INVENTORY_STRATEGIES.items()
+    }
+
+    next_household = itertools.cycle(household_ids).__next__
+    counter_lock = threading.Lock()
+    restocked = {row: 0 for row in grid}
+    distributed_ok = {row: 0 for row in grid}
+    samples = {name: [] for name in operations}
+    outcomes = {name: {} for name in operations}
+    deadline = time.monotonic() + args.duration
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        local = {name: [] for name in operations}
+        local_outcomes = {name: {} for name in operations}
+        local_restocked = {row: 0 for row in grid}
+        local_distributed = {row: 0 for row in grid}
+        while time.monotonic() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            row = hot if operation == "distribute_hot" else rng.choice(grid)
+            with counter_lock:
+                household_id = next_household()
+            started = time.perf_counter()
+            if operation in ("distribute_hot", "distribute_spread"):
+                outcome = target.distribute(household_id, *row)
+                if outcome == "ok":
+                    local_distributed[row] += 1
+            elif operation == "eligibility":
+                outcome = target.eligibility(household_id, row[1])
+            elif operation == "report":
+                outcome = target.report()
+            else:
+                outcome = target.restock(*row, args.restock_quantity)
+                if outcome == "ok":
+                    local_restocked[row] += args.restock_quantity
+            local[operation].append(time.perf_counter() - started)
+            local_outcomes[operation][outcome] = local_outcomes[operation].get(outcome, 0) + 1
+
+        with counter_lock:
+            for name in operations:
+                samples[name].extend(local[name])
+                for outcome, count in local_outcomes[name].items():
+                    outcomes[name][outcome] = outcomes[name].get(outcome, 0) + count
+            for row in grid:
+                restocked[row] += local_restocked[row]
+                distributed_ok[row] += local_distributed[row]
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(args.seed + n,)) for n in range(args.workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        stock_after = _stock(db, grid)
+        logged = {
+            (center_id, package_id): (int(rows), int(units))
+            for center_id, package_id, rows, units in db.execute(text("""
+                SELECT center_id, package_id, COUNT(*), SUM(quantity_distributed)
+                FROM Distribution_Log
+                WHERE log_id > :first AND transaction_status = 'success'
+                GROUP BY center_id, package_id
+            """), {"first": first_log_id})
+        }
+        locks_after = _lock_counters(db)
+    finally:
+        db.close()
+
+    violations = []
+    unacknowledged = 0
+    for row in grid:
+        log_rows, units = logged.get(row, (0, 0))
+        expected = stock_before[row] + restocked[row] - units
+        if stock_after[row] < 0 or stock_after[row] != expected:
+            violations.append({
+                "center_id": row[0], "package_id": row[1],
+                "stock_before": stock_before[row], "restocked": restocked[row],
+                "distributed": units, "stock_after": stock_after[row], "expected": expected
+            })
+        # Logged but not acknowledged: the client gave up (HTTP timeout)
+        # on a distribution that did commit
+        unacknowledged += log_rows - distributed_ok[row]
+
+    result_operations = {}
+    total = 0
+    for name in operations:
+        values = sorted(samples[name])
+        total += len(values)
+        result_operations[name] = {
+            "count": len(values),
+            "throughput_per_s": round(len(values) / elapsed, 2),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 3) if values else None,
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 3) if values else None,
+            "max_ms": round(values[-1] * 1000, 3) if values else None,
+            "outcomes": outcomes[name],
+        }
+
+    return {
+        "benchmark": "contention",
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "target": target.name if target.name == "service" else args.target,
+            "workers": args.workers, "duration_s": args.duration, "mix": args.mix,
+            "centers": args.centers, "packages": args.packages, "households": args.households,
+            "hot_stock": args.hot_stock, "spread_stock": args.spread_stock,
+            "restock_quantity": args.restock_quantity,
+            "lock_strategy": settings.DISTRIBUTION_LOCK_STRATEGY,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(total / elapsed, 2),
+        "operations": result_operations,
+        "lock_waits": {
+            **{name: locks_after.get(name, 0) - locks_before.get(name, 0) for name in locks_after},
+            **({
+                "strategy_lock_wait_seconds": {
+                    name: round(strategy.stats.snapshot()["lock_wait_seconds"] - strategy_wait_before[name], 6)
+                    for name, strategy in INVENTORY_STRATEGIES.items()
+                }
+            } if target.name == "service" else {}),
+        },
+        "hot_row": {"center_id": hot[0], "package_id": hot[1]},
+        "oversell_violations": len(violations),
+        "violations": violations,
+        "unacknowledged_distributions": unacknowledged,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _change(old, new) -> str:
+    if old in (None, 0) or new is None:
+        return ""
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def report(result: dict, baseline: dict | None) -> None:
+    config = result["config"]
+    print(
+        f"{config['target']}: {config['workers']} worker(s), {result['elapsed_s']}s, "
+        f"strategy {config['lock_strategy']}, mix {config['mix']}"
+    )
+    print(f"{'operation':<20}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}  outcomes")
+    for name, values in result["operations"].items():
+        outcomes = ", ".join(f"{key} {count}" for key, count in sorted(values["outcomes"].items()))
+        p50 = f"{values['p50_ms']:.1f}" if values["p50_ms"] is not None else "-"
+        p99 = f"{values['p99_ms']:.1f}" if values["p99_ms"] is not None else "-"
+        print(f"{name:<20}{values['throughput_per_s']:>10.1f}{p50:>10}{p99:>10}  {outcomes}")
+    print(f"total: {result['throughput_per_s']:.1f} ops/s")
+    print("lock waits: " + ", ".join(
+        f"{name} {value}" for name, value in result["lock_waits"].items() if not isinstance(value, dict)
+    ))
+    print(f"oversell violations: {result['oversell_violations']}")
+    if result["unacknowledged_distributions"]:
+        print(f"distributions committed without a client acknowledgement: {result['unacknowledged_distributions']}")
+    for violation in result["violations"]:
+        print(f"  {violation}")
+
+    if baseline:
+        print(f"\nvs {baseline.get('git_revision')} ({baseline.get('started_at')}):")
+        print(f"{'operation':<20}{'ops/s':>12}{'p99 ms':>12}")
+        for name, values in result["operations"].items():
+            old = baseline.get("operations", {}).get(name)
+            if not old:
+                continue
+            print(
+                f"{name:<20}{_change(old['throughput_per_s'], values['throughput_per_s']):>12}"
+                f"{_change(old['p99_ms'], values['p99_ms']):>12}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load and contention benchmark")
+    parser.add_argument("--target", default="service",
+                        help="'service' (in-process) or the API base URL, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight,...")
+    parser.add_argument("--centers", type=int, default=4)
+    parser.add_argument("--packages", type=int, default=5)
+    parser.add_argument("--households", type=int, default=50_000, help="New households for this run")
+    parser.add_argument("--hot-stock", type=int, default=2000, help="Stock of the hot row")
+    parser.add_argument("--spread-stock", type=int, default=100_000, help="Stock of the other rows")
+    parser.add_argument("--restock-quantity", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the result as JSON to this file")
+    parser.add_argument("--compare", help="Earlier --output file to compare with")
+    args = parser.parse_args()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    result = run(args)
+    report(result, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Result written to {args.output}")
+    return 1 if result["oversell_violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,501 @@
+"""
+Synthetic Dataset Generator
+Fills a database with production-size data for index, view and report
+benchmarks: hundreds of centers and packages, staff, inventory, millions of
+households and tens of millions of Distribution_Log rows.
+
+Scale factors (override any count with the flags):
+    SF1     100 centers, 100 packages,  100k households,   1M log rows
+    SF10    250 centers, 150 packages,    1M households,  10M log rows
+    SF100   500 centers, 200 packages,   10M households, 100M log rows
+
+The data is skewed the way real intake is:
+- Registrations accelerate over three years (ids increase with time).
+- Distributions grow over two years. They peak in winter and on weekdays,
+  cluster around midday, and are never dated before the household
+  registered.
+- Critical and high priority households, active households and a heavy
+  tail of frequent visitors get most distributions. Visits are mostly at
+  the household's home center.
+- Package popularity follows a Zipf curve. About 3.5% of log rows failed
+  or were cancelled.
+
+The same --seed, scale and --end-date always produce the same rows (every
+chunk has its own seeded generator). Rows are appended after the current
+largest ids, in chunks of --chunk-size. Each chunk is written to a TSV file
+and bulk-loaded with LOAD DATA LOCAL INFILE (the server needs
+local_infile=ON; benchmarks/mysql_standin.sh enables it), or sent as
+multi-row INSERTs with --method insert. Household_Package_Last, the pending
+queue and the report rollups are rebuilt afterwards.
+
+Usage (from backend/, against a throwaway database):
+    python -m benchmarks.dataset --scale SF1
+    python -m benchmarks.dataset --scale SF10 --seed 7 --end-date 2025-06-30
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services import last_distribution, report_rollups
+
+SCALES = {
+    "SF1": {"centers": 100, "packages": 100, "households": 100_000, "logs": 1_000_000},
+    "SF10": {"centers": 250, "packages": 150, "households": 1_000_000, "logs": 10_000_000},
+    "SF100": {"centers": 500, "packages": 200, "households": 10_000_000, "logs": 100_000_000},
+}
+
+REGISTRATION_DAYS = 3 * 365
+LOG_DAYS = 2 * 365
+STAFF_PER_CENTER = 8
+NULL = "\\N"
+
+# One seeded generator per (table, chunk), so chunks do not depend on each other
+STREAMS = {"centers": 1, "packages": 2, "staff": 3, "inventory": 4,
+           "household_profile": 5, "households": 6, "log_days": 7, "logs": 8}
+
+CITIES = [
+    ("San Jose", "California", 951), ("Oakland", "California", 946), ("Fresno", "California", 937),
+    ("Houston", "Texas", 770), ("San Antonio", "Texas", 782), ("El Paso", "Texas", 799),
+    ("Phoenix", "Arizona", 850), ("Tucson", "Arizona", 857), ("Chicago", "Illinois", 606),
+    ("Detroit", "Michigan", 482), ("Cleveland", "Ohio", 441), ("Memphis", "Tennessee", 381),
+    ("Atlanta", "Georgia", 303), ("Miami", "Florida", 331), ("Newark", "New Jersey", 71),
+    ("Baltimore", "Maryland", 212), ("Philadelphia", "Pennsylvania", 191), ("Bronx", "New York", 104),
+    ("New Orleans", "Louisiana", 701), ("Albuquerque", "New Mexico", 871), ("Denver", "Colorado", 802),
+    ("Seattle", "Washington", 981), ("Portland", "Oregon", 972), ("Las Vegas", "Nevada", 891),
+]
+FAMILY_NAMES = [
+    "Garcia", "Nguyen", "Smith", "Johnson", "Hernandez", "Lopez", "Martinez", "Williams", "Patel",
+    "Kim", "Tran", "Rodriguez", "Brown", "Okafor", "Haddad", "Kowalski", "Ivanova", "Mensah",
+    "Tanaka", "Castillo", "Delgado", "Novak", "Abdullah", "Fernandes", "Schmidt", "Ali", "Chen",
+    "Singh", "Jones", "Davis", "Reyes", "Flores", "Mohammed", "Yilmaz", "Dubois", "Rossi",
+]
+FIRST_NAMES = [
+    "Maria", "Ahmed", "Linh", "Chinwe", "Jose", "Priya", "Anna", "David", "Fatima", "Kenji",
+    "Olga", "Kwame", "Sofia", "Lucas", "Amara", "Omar", "Grace", "Wei", "Ana", "Samuel",
+]
+STREETS = [
+    "Main", "Oak", "Maple", "Cedar", "Pine", "Elm", "Washington", "Lincoln", "Park", "Lake",
+    "Hill", "Church", "Mill", "River", "Sunset", "Highland", "Jefferson", "Madison", "King", "Market",
+]
+STREET_KINDS = ["St", "Ave", "Rd", "Blvd", "Dr", "Ln"]
+CENTER_KINDS = ["Relief Center", "Community Hub", "Aid Station", "Distribution Point", "Family Services"]
+PACKAGE_KINDS = {
+    "food": (["Food Kit", "Food Basket", "Produce Box", "Pantry Box"], 7, 30.0),
+    "medical": (["First Aid Kit", "Chronic Care Package", "Medicine Kit"], 60, 45.0),
+    "shelter": (["Shelter Kit", "Winter Package", "Bedding Set"], 180, 85.0),
+    "hygiene": (["Hygiene Kit", "Baby Care Kit", "Sanitation Pack"], 30, 25.0),
+    "education": (["School Supplies Kit", "Learning Pack"], 180, 40.0),
+    "emergency": (["Emergency Box", "Disaster Kit"], 3, 35.0),
+}
+FAILURE_REASONS = ["Insufficient inventory", "Household not eligible", "Household not active",
+                   "Cancelled by staff", "Transaction timeout"]
+
+# Distribution weight by priority (critical, high, medium, low) and status
+# (active, inactive, suspended); heavy visitors get up to 3x on top
+PRIORITY_WEIGHTS = np.array([4.0, 2.5, 1.2, 0.6])
+STATUS_WEIGHTS = np.array([1.0, 0.3, 0.1])
+# Priority probabilities per income level (no_income, very_low, low, moderate)
+PRIORITY_BY_INCOME = np.array([
+    [0.20, 0.40, 0.30, 0.10],
+    [0.06, 0.30, 0.44, 0.20],
+    [0.02, 0.12, 0.50, 0.36],
+    [0.01, 0.05, 0.34, 0.60],
+])
+INCOME_LEVELS = np.array(["no_income", "very_low", "low", "moderate"])
+PRIORITY_LEVELS = np.array(["critical", "high", "medium", "low"])
+HOUSEHOLD_STATUSES = np.array(["active", "inactive", "suspended"])
+WEEKDAY_WEIGHTS = np.array([1.15, 1.1, 1.05, 1.05, 1.1, 0.55, 0.2])  # Monday first
+
+
+def _rng(seed: int, stream: str, chunk: int = 0) -> np.random.Generator:
+    return np.random.default_rng([seed, STREAMS[stream], chunk])
+
+
+def _strings(values) -> list:
+    return np.asarray(values).astype(str).tolist()
+
+
+def _dates(origin: date, day_offsets) -> list:
+    return _strings(np.datetime64(origin, "D") + np.asarray(day_offsets, dtype="timedelta64[D]"))
+
+
+def _nullable(values: list, present) -> list:
+    return [value if keep else NULL for value, keep in zip(values, present.tolist())]
+
+
+class Loader:
+    """Bulk-loads column lists with LOAD DATA LOCAL INFILE or multi-row INSERTs"""
+
+    def __init__(self, method: str, keep_dir: str | None):
+        self.method = method
+        self.keep_dir = keep_dir
+        self.engine = create_engine(settings.database_url, connect_args={"local_infile": True})
+        self.connection = self.engine.connect()
+        # Generated rows are consistent by construction
+        self.connection.exec_driver_sql("SET unique_checks = 0, foreign_key_checks = 0")
+        if method == "load" and not self.connection.exec_driver_sql("SELECT @@local_infile").scalar():
+            print("local_infile is OFF on the server, falling back to --method insert")
+            self.method = "insert"
+        self.rows = {}
+        self.seconds = 0.0
+
+    def max_id(self, table: str, column: str) -> int:
+        return self.connection.exec_driver_sql(f"SELECT COALESCE(MAX({column}), 0) FROM {table}").scalar()
+
+    def load(self, table: str, columns: dict, chunk: int = 0) -> None:
+        names = list(columns)
+        rows = list(zip(*columns.values()))
+        started = time.perf_counter()
+        if self.method == "load":
+            path = os.path.join(self.keep_dir or tempfile.gettempdir(), f"{table}.{chunk:05d}.tsv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join("\t".join(row) for row in rows))
+                f.write("\n")
+            self.connection.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} "
+                f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                f"({', '.join(names)})"
+            )
+            if not self.keep_dir:
+                os.remove(path)
+        else:
+            placeholders = ", ".join(["%s"] * len(names))
+            values = [tuple(None if value == NULL else value for value in row) for row in rows]
+            self.connection.exec_driver_sql(
+                f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})", values
+            )
+        self.connection.commit()
+        self.seconds += time.perf_counter() - started
+        self.rows[table] = self.rows.get(table, 0) + len(rows)
+
+    def close(self) -> None:
+        self.connection.exec_driver_sql("SET unique_checks = 1, foreign_key_checks = 1")
+        self.connection.close()
+        self.engine.dispose()
+
+
+class Dataset:
+    """Generates one scale of data; ids continue after the existing rows"""
+
+    def __init__(self, loader: Loader, seed: int, end_date: date, centers: int, packages: int,
+                 households: int, logs: int, chunk_size: int):
+        self.loader = loader
+        self.seed = seed
+        self.end_date = end_date
+        self.counts = {"centers": centers, "packages": packages, "households": households, "logs": logs}
+        self.chunk_size = chunk_size
+        self.registration_origin = end_date - timedelta(days=REGISTRATION_DAYS)
+        self.log_origin = end_date - timedelta(days=LOG_DAYS)
+
+        self.first_center = loader.max_id("Distribution_Centers", "center_id") + 1
+        self.first_package = loader.max_id("Aid_Packages", "package_id") + 1
+        self.first_staff = loader.max_id("Staff_Members", "staff_id") + 1
+        self.first_household = loader.max_id("Households", "household_id") + 1
+        self.first_log = loader.max_id("Distribution_Log", "log_id") + 1
+
+    # ---- reference data -------------------------------------------------
+
+    def centers(self) -> None:
+        n = self.counts["centers"]
+        rng = _rng(self.seed, "centers")
+        # Bigger cities get more centers
+        city_weights = 1 / np.arange(1, len(CITIES) + 1) ** 0.6
+        self.center_city = rng.choice(len(CITIES), n, p=city_weights / city_weights.sum())
+        self.center_size = np.clip(rng.lognormal(0, 0.6, n), 0.2, 6)
+        ids = np.arange(self.first_center, self.first_center + n)
+        self.loader.load("Distribution_Centers", {
+            "center_id": _strings(ids),
+            "center_name": [f"{CITIES[c][0]} {CENTER_KINDS[i % len(CENTER_KINDS)]} {i}"
+                            for i, c in zip(ids.tolist(), self.center_city.tolist())],
+            "address": [f"{number} {STREETS[s]} {STREET_KINDS[k]}" for number, s, k in zip(
+                rng.integers(1, 9999, n).tolist(), rng.integers(len(STREETS), size=n).tolist(),
+                rng.integers(len(STREET_KINDS), size=n).tolist())],
+            "city": [CITIES[c][0] for c in self.center_city.tolist()],
+            "state": [CITIES[c][1] for c in self.center_city.tolist()],
+            "zip_code": [f"{CITIES[c][2]:03d}{z:02d}" for c, z in zip(
+                self.center_city.tolist(), rng.integers(0, 100, n).tolist())],
+            "phone_number": [f"555-{i // 10_000 % 1000:03d}-{i % 10_000:04d}" for i in ids.tolist()],
+            "email": [f"center{i}@aidtracker.org" for i in ids.tolist()],
+            "capacity": _strings((self.center_size * 800).astype(int) + 50),
+            "status": _strings(rng.choice(["active", "inactive", "maintenance"], n, p=[0.94, 0.03, 0.03])),
+        })
+
+    def packages(self) -> None:
+        n = self.counts["packages"]
+        rng = _rng(self.seed, "packages")
+        categories = list(PACKAGE_KINDS)
+        category = rng.choice(len(categories), n, p=[0.4, 0.15, 0.1, 0.2, 0.05, 0.1])
+        names, validity, cost = [], [], []
+        for i, c in enumerate(category.tolist()):
+            kinds, days, base_cost = PACKAGE_KINDS[categories[c]]
+            names.append(f"{kinds[i % len(kinds)]} {i + 1}")
+            validity.append(max(1, int(days * rng.choice([0.5, 1, 1, 2]))))
+            cost.append(round(base_cost * rng.uniform(0.5, 2.5), 2))
+        # Zipf popularity: a few packages make up most distributions
+        popularity = 1 / np.arange(1, n + 1) ** 0.8
+        self.package_popularity = popularity / popularity.sum()
+        ids = np.arange(self.first_package, self.first_package + n)
+        self.loader.load("Aid_Packages", {
+            "package_id": _strings(ids),
+            "package_name": names,
+            "description": [f"Synthetic {categories[c]} package" for c in category.tolist()],
+            "category": [categories[c] for c in category.tolist()],
+            "unit_weight_kg": _strings(np.round(rng.uniform(0.5, 40, n), 2)),
+            "estimated_cost": _strings(cost),
+            "validity_period_days": _strings(validity),
+            "is_active": _strings(np.where(rng.random(n) < 0.92, 1, 0)),
+        })
+
+    def staff(self) -> None:
+        n = self.counts["centers"] * STAFF_PER_CENTER
+        rng = _rng(self.seed, "staff")
+        ids = np.arange(self.first_staff, self.first_staff + n)
+        self.loader.load("Staff_Members", {
+            "staff_id": _strings(ids),
+            "first_name": _strings(rng.choice(FIRST_NAMES, n)),
+            "last_name": _strings(rng.choice(FAMILY_NAMES, n)),
+            "email": [f"staff{i}@aidtracker.org" for i in ids.tolist()],
+            "role": _strings(rng.choice(["manager", "worker", "volunteer"], n, p=[0.1, 0.6, 0.3])),
+            "center_id": _strings(self.first_center + np.arange(n) // STAFF_PER_CENTER),
+            "hire_date": _dates(self.registration_origin, rng.integers(0, REGISTRATION_DAYS, n)),
+            "status": _strings(rng.choice(["active", "inactive", "on_leave"], n, p=[0.9, 0.07, 0.03])),
+        })
+
+    def inventory(self) -> None:
+        rng = _rng(self.seed, "inventory")
+        centers, packages = self.counts["centers"], self.counts["packages"]
+        # Every center stocks the popular packages, fewer of the long tail
+        stocked = rng.random((centers, packages)) < np.clip(self.package_popularity * packages * 0.9, 0.2, 1)
+        center_index, package_index = np.nonzero(stocked)
+        n = len(center_index)
+        quantity = (rng.lognormal(4.5, 1.0, n) * self.center_size[center_index]).astype(int)
+        quantity[rng.random(n) < 0.08] = 0  # some rows run out
+        self.loader.load("Inventory", {
+            "center_id": _strings(self.first_center + center_index),
+            "package_id": _strings(self.first_package + package_index),
+            "quantity_on_hand": _strings(quantity),
+            "reorder_level": _strings(rng.choice([20, 50, 100], n)),
+            "last_restock_date": _dates(self.end_date - timedelta(days=90), rng.integers(0, 90, n)),
+            "last_restock_quantity": _strings(rng.integers(50, 1000, n)),
+        })
+
+    # ---- households -----------------------------------------------------
+
+    def household_profile(self) -> None:
+        """Per-household attributes the log generator needs, for every household"""
+        n = self.counts["households"]
+        rng = _rng(self.seed, "household_profile")
+        self.income = rng.choice(4, n, p=[0.15, 0.35, 0.35, 0.15]).astype(np.int8)
+        cumulative = PRIORITY_BY_INCOME.cumsum(axis=1)[self.income]
+        self.priority = (rng.random(n)[:, None] > cumulative).sum(axis=1).astype(np.int8)
+        self.status = rng.choice(3, n, p=[0.85, 0.12, 0.03]).astype(np.int8)
+        self.activity = np.clip(rng.lognormal(0, 0.75, n), 0.2, 3.0).astype(np.float32)
+        center_weights = self.center_size / self.center_size.sum()
+        self.home_center = rng.choice(self.counts["centers"], n, p=center_weights).astype(np.int32)
+        # Registrations accelerate: household i registers at T * (i / n)^(1/2)
+        self.registration_day = (REGISTRATION_DAYS * np.sqrt(np.arange(n) / n)).astype(np.int32)
+
+    def households(self) -> None:
+        n = self.counts["households"]
+        for chunk, start in enumerate(range(0, n, self.chunk_size)):
+            stop = min(n, start + self.chunk_size)
+            size = stop - start
+            rng = _rng(self.seed, "households", chunk)
+            ids = np.arange(self.first_household + start, self.first_household + stop)
+            city = self.center_city[self.home_center[start:stop]]
+            family = rng.choice(len(FAMILY_NAMES), size)
+            registration = self.registration_day[start:stop]
+            verified_after = (rng.random(size) * (REGISTRATION_DAYS - registration)).astype(int)
+            self.loader.load("Households", {
+                "household_id": _strings(ids),
+                "family_name": [FAMILY_NAMES[f] for f in family.tolist()],
+                "primary_contact_name": [f"{FIRST_NAMES[i]} {FAMILY_NAMES[f]}" for i, f in zip(
+                    rng.integers(len(FIRST_NAMES), size=size).tolist(), family.tolist())],
+                # Unique per id; 2xx-3xx area codes stay clear of the seed data
+                "phone_number": [f"{200 + i // 10_000_000:03d}-{i // 10_000 % 1000:03d}-{i % 10_000:04d}"
+                                 for i in ids.tolist()],
+                "email": _nullable([f"family{i}@example.org" for i in ids.tolist()], rng.random(size) < 0.3),
+                "address": [f"{number} {STREETS[s]} {STREET_KINDS[k]}" for number, s, k in zip(
+                    rng.integers(1, 9999, size).tolist(), rng.integers(len(STREETS), size=size).tolist(),
+                    rng.integers(len(STREET_KINDS), size=size).tolist())],
+                "city": [CITIES[c][0] for c in city.tolist()],
+                "state": [CITIES[c][1] for c in city.tolist()],
+                "zip_code": [f"{CITIES[c][2]:03d}{z:02d}" for c, z in zip(
+                    city.tolist(), rng.integers(0, 100, size).tolist())],
+                "family_size": _strings(1 + np.minimum(rng.poisson(2.3, size), 11)),
+                "income_level": _strings(INCOME_LEVELS[self.income[start:stop]]),
+                "priority_level": _strings(PRIORITY_LEVELS[self.priority[start:stop]]),
+                "registration_date": _dates(self.registration_origin, registration),
+                "last_verified_date": _nullable(
+                    _dates(self.registration_origin, registration + verified_after), rng.random(size) < 0.6
+                ),
+                "status": _strings(HOUSEHOLD_STATUSES[self.status[start:stop]]),
+            }, chunk)
+            print(f"\rHouseholds {stop} / {n}", end="", flush=True)
+        print()
+
+    # ---- distribution log -----------------------------------------------
+
+    def _rows_per_day(self) -> np.ndarray:
+        """Log rows per day: growth, winter peak, weekday pattern"""
+        days = np.arange(LOG_DAYS)
+        dates = np.datetime64(self.log_origin, "D") + days
+        day_of_year = (dates - dates.astype("datetime64[Y]")).astype(int)
+        weekday = (dates.astype(int) + 3) % 7  # 1970-01-01 was a Thursday
+        weights = (
+            (1 + 1.5 * days / LOG_DAYS)
+            * (1 + 0.3 * np.cos(2 * np.pi * (day_of_year - 15) / 365))
+            * WEEKDAY_WEIGHTS[weekday]
+        )
+        return _rng(self.seed, "log_days").multinomial(self.counts["logs"], weights / weights.sum())
+
+    def _pick_households(self, rng, day_index: np.ndarray) -> np.ndarray:
+        """One household per row, registered by that day, skewed by priority/status/activity"""
+        n_households = self.counts["households"]
+        registration_offset = REGISTRATION_DAYS - LOG_DAYS
+        # Households registered on or before the day (registration_day is sorted)
+        registered = np.maximum(1, np.searchsorted(
+            self.registration_day, day_index + registration_offset, side="right"
+        ))
+        weight_max = PRIORITY_WEIGHTS.max() * STATUS_WEIGHTS.max() * 3.0
+        picked = np.empty(len(day_index), dtype=np.int64)
+        missing = np.arange(len(day_index))
+        while len(missing):
+            candidate = (rng.random(len(missing)) * registered[missing]).astype(np.int64)
+            candidate = np.minimum(candidate, n_households - 1)
+            weight = (PRIORITY_WEIGHTS[self.priority[candidate]]
+                      * STATUS_WEIGHTS[self.status[candidate]] * self.activity[candidate])
+            accepted = rng.random(len(missing)) * weight_max < weight
+            picked[missing[accepted]] = candidate[accepted]
+            missing = missing[~accepted]
+        return picked
+
+    def logs(self) -> None:
+        per_day = self._rows_per_day()
+        total = int(per_day.sum())
+        centers = self.counts["centers"]
+        center_weights = self.center_size / self.center_size.sum()
+        next_id = self.first_log
+        day = 0
+        chunk = 0
+        while day < LOG_DAYS:
+            # Whole days per chunk, so log_id order is date order
+            first_day = day
+            rows = 0
+            while day < LOG_DAYS and (rows == 0 or rows + per_day[day] <= self.chunk_size):
+                rows += int(per_day[day])
+                day += 1
+            if rows == 0:
+                continue
+            rng = _rng(self.seed, "logs", chunk)
+            day_index = np.repeat(np.arange(first_day, day), per_day[first_day:day])
+            # Seconds into the day: 8:00-20:00, peaking around noon
+            hours = rng.normal(12.5, 2.5, rows)
+            outside = (hours < 8) | (hours >= 20)
+            hours[outside] = rng.uniform(8, 20, int(outside.sum()))
+            seconds = hours * 3600
+            timestamps = (np.datetime64(self.log_origin, "s") + day_index * 86400
+                          + seconds.astype(np.int64)).astype("datetime64[s]")
+            order = np.argsort(timestamps, kind="stable")
+            timestamps = timestamps[order]
+            day_index = day_index[order]
+
+            household = self._pick_households(rng, day_index)
+            center = np.where(
+                rng.random(rows) < 0.85, self.home_center[household],
+                rng.choice(centers, rows, p=center_weights)
+            )
+            package = rng.choice(self.counts["packages"], rows, p=self.package_popularity)
+            staff = self.first_staff + center * STAFF_PER_CENTER + rng.integers(0, STAFF_PER_CENTER, rows)
+            status = rng.choice(3, rows, p=[0.965, 0.025, 0.01])
+            failure = rng.integers(len(FAILURE_REASONS), size=rows)
+
+            self.loader.load("Distribution_Log", {
+                "log_id": _strings(np.arange(next_id, next_id + rows)),
+                "household_id": _strings(self.first_household + household),
+                "package_id": _strings(self.first_package + package),
+                "center_id": _strings(self.first_center + center),
+                "staff_id": _nullable(_strings(staff), rng.random(rows) < 0.9),
+                "quantity_distributed": _strings(rng.choice([1, 2, 3], rows, p=[0.88, 0.09, 0.03])),
+                "distribution_date": np.char.replace(
+                    np.datetime_as_string(timestamps, unit="s"), "T", " "
+                ).tolist(),
+                "transaction_status": _strings(np.array(["success", "failed", "cancelled"])[status]),
+                "failure_reason": [FAILURE_REASONS[f] if s == 1 else NULL
+                                   for s, f in zip(status.tolist(), failure.tolist())],
+            }, chunk)
+            next_id += rows
+            chunk += 1
+            print(f"\rDistribution_Log {next_id - self.first_log} / {total}", end="", flush=True)
+        print()
+
+    def generate(self) -> None:
+        for step in (self.centers, self.packages, self.staff, self.inventory,
+                     self.household_profile, self.households, self.logs):
+            step()
+
+
+def rebuild_derived() -> None:
+    """Household_Package_Last, Pending_Queue and the report rollups"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = last_distribution.rebuild(db)
+        db.commit()
+        print(f"Household_Package_Last and Pending_Queue rebuilt ({rows} rows, "
+              f"{time.perf_counter() - started:.1f}s)")
+        started = time.perf_counter()
+        processed = report_rollups.rebuild(db)
+        print(f"Report rollups rebuilt ({processed} log ids, {time.perf_counter() - started:.1f}s)")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic large-scale dataset generator")
+    parser.add_argument("--scale", choices=list(SCALES), default="SF1")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(),
+                        help="Last day of the generated history (default: today)")
+    parser.add_argument("--centers", type=int)
+    parser.add_argument("--packages", type=int)
+    parser.add_argument("--households", type=int)
+    parser.add_argument("--logs", type=int, help="Distribution_Log rows")
+    parser.add_argument("--chunk-size", type=int, default=500_000, help="Rows per load")
+    parser.add_argument("--method", choices=["load", "insert"], default="load",
+                        help="LOAD DATA LOCAL INFILE (default) or multi-row INSERTs")
+    parser.add_argument("--keep-files", metavar="DIR", help="Keep the generated TSV files in DIR")
+    parser.add_argument("--skip-derived", action="store_true",
+                        help="Do not rebuild Household_Package_Last, the pending queue and rollups")
+    args = parser.parse_args()
+
+    counts = {key: getattr(args, key) or value for key, value in SCALES[args.scale].items()}
+    print(f"{args.scale} (seed {args.seed}, end date {args.end_date}): " + ", ".join(
+        f"{value} {key}" for key, value in counts.items()))
+
+    loader = Loader(args.method, args.keep_files)
+    started = datetime.now()
+    try:
+        Dataset(loader, args.seed, args.end_date, chunk_size=args.chunk_size, **counts).generate()
+    finally:
+        loader.close()
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"Loaded {sum(loader.rows.values())} rows in {elapsed:.1f}s "
+          f"({loader.seconds:.1f}s in the database, method {loader.method})")
+
+    if not args.skip_derived:
+        rebuild_derived()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Household Search Benchmark
+Measures GET /households/search latency (the service call, not HTTP) for a
+mix of intake-desk queries: surname fragments, full names, address words
+and phone suffixes.
+
+--populate N first inserts N synthetic households (notes =
+'search-benchmark', status 'inactive' so they never enter the pending
+queue); --cleanup deletes them again. Searches run with status=None, so the
+synthetic rows are searched together with the real ones.
+
+Usage (from backend/, against a development database):
+    python -m benchmarks.household_search --populate 1000000
+    python -m benchmarks.household_search --queries 2000
+    python -m benchmarks.household_search --cleanup
+"""
+
+import argparse
+import random
+import time
+
+from sqlalchemy import insert, text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Household
+from app.services.household_search import search_households
+
+MARKER = "search-benchmark"
+INSERT_BATCH = 5000
+
+FAMILY_NAMES = [
+    "Garcia", "Nguyen", "Okafor", "Hernandez", "Kowalski", "Patel", "Johnson",
+    "Martinez", "Haddad", "Fernandes", "Schmidt", "Ivanova", "Mensah", "Tanaka",
+    "Rodriguez", "Abdullah", "Oyelaran", "Castillo", "Delgado", "Novak",
+]
+FIRST_NAMES = [
+    "Maria", "Ahmed", "Linh", "Chinwe", "Jose", "Priya", "Anna", "David",
+    "Fatima", "Kenji", "Olga", "Kwame", "Sofia", "Lucas", "Amara", "Omar",
+]
+STREETS = [
+    "Maple", "Oak", "Cedar", "Pine", "Elm", "Washington", "Lincoln", "Jefferson",
+    "Riverside", "Highland", "Sunset", "Lakeview", "Park", "Mill", "Church",
+]
+CITIES = ["Springfield", "Riverton", "Fairview", "Georgetown", "Salem", "Madison"]
+
+
+def _households(count: int, rng: random.Random, first_number: int):
+    for n in range(first_number, first_number + count):
+        yield {
+            "family_name": f"{rng.choice(FAMILY_NAMES)}{rng.choice(['', '-' + rng.choice(FAMILY_NAMES)])}",
+            "primary_contact_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}",
+            # 9xx area code, one number per row
+            "phone_number": f"9{n // 10_000_000 % 100:02d}-{n // 10_000 % 1000:03d}-{n % 10_000:04d}",
+            "address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)} {rng.choice(['St', 'Ave', 'Rd', 'Blvd'])}",
+            "city": rng.choice(CITIES),
+            "state": "IL",
+            "zip_code": f"6{rng.randint(0, 9999):04d}",
+            "family_size": rng.randint(1, 9),
+            "income_level": rng.choice(["no_income", "very_low", "low", "moderate"]),
+            "priority_level": rng.choice(["critical", "high", "medium", "low"]),
+            "registration_date": "2024-01-01",
+            "status": "inactive",
+            "notes": MARKER,
+        }
+
+
+def populate(count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    db = SessionLocal()
+    try:
+        first_number = db.execute(
+            text("SELECT COUNT(*) FROM Households WHERE notes = :marker"), {"marker": MARKER}
+        ).scalar()
+        started = time.perf_counter()
+        for start in range(0, count, INSERT_BATCH):
+            batch = min(INSERT_BATCH, count - start)
+            db.execute(insert(Household.__table__), list(_households(batch, rng, first_number + start)))
+            db.commit()
+            print(f"\r{start + batch} / {count}", end="", flush=True)
+        print(f"\nInserted {count} household(s) in {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        deleted = 0
+        while True:
+            removed = db.execute(
+                text("DELETE FROM Households WHERE notes = :marker LIMIT :batch"),
+                {"marker": MARKER, "batch": INSERT_BATCH}
+            ).rowcount
+            db.commit()
+            deleted += removed
+            if not removed:
+                break
+        print(f"Deleted {deleted} benchmark household(s)")
+    finally:
+        db.close()
+
+
+def _query_mix(count: int, rng: random.Random) -> list:
+    makers = [
+        lambda: rng.choice(FAMILY_NAMES)[:rng.randint(3, 6)],
+        lambda: f"{rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}",
+        lambda: f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+        lambda: f"{rng.randint(0, 9999):04d}",
+        lambda: f"{rng.randint(0, 999):03d}-{rng.randint(0, 9999):04d}",
+    ]
+    return [rng.choice(makers)() for _ in range(count)]
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(queries: int, limit: int, seed: int) -> None:
+    rng = random.Random(seed)
+    mix = _query_mix(queries, rng)
+    latencies = {"text": [], "phone": []}
+    timeouts = 0
+
+    db = SessionLocal()
+    try:
+        total = db.execute(text("SELECT COUNT(*) FROM Households")).scalar()
+        for query in mix:
+            started = time.perf_counter()
+            status, _, result = search_households(db, query, limit)
+            elapsed = (time.perf_counter() - started) * 1000
+            if status == "timeout":
+                timeouts += 1
+            elif status == "success":
+                latencies[result["match"]].append(elapsed)
+    finally:
+        db.close()
+
+    budget = settings.HOUSEHOLD_SEARCH_TIMEOUT_MS
+    print(f"{total} household(s), {queries} queries, limit {limit}, budget {budget} ms")
+    print(f"{'match':<8}{'queries':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for match, values in latencies.items():
+        if not values:
+            continue
+        values.sort()
+        print(
+            f"{match:<8}{len(values):>9}{_percentile(values, 0.50):>10.1f}"
+            f"{_percentile(values, 0.95):>10.1f}{_percentile(values, 0.99):>10.1f}{values[-1]:>10.1f}"
+        )
+    print(f"timeouts: {timeouts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Household search latency benchmark")
+    parser.add_argument("--populate", type=int, metavar="N", help="Insert N synthetic households first")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the synthetic households and exit")
+    parser.add_argument("--queries", type=int, default=1000, help="Searches to run")
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+    if args.populate:
+        populate(args.populate, args.seed)
+    run(args.queries, args.limit, args.seed)
+
+
+if __name__ == "__main__":
+    main()
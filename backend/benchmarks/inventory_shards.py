@@ -0,0 +1,168 @@
+"""
+Inventory Sharding Benchmark
+Measures distribution throughput on ONE hot (center, package) inventory
+record as the number of concurrent workers grows, with and without shards.
+
+Each worker loops over the inventory part of the distribution transaction:
+reserve one unit (row lock or shard lock), hold the transaction open for
+--hold-ms to stand in for the log insert, then commit. Non-sharded runs are
+repeated for every inventory strategy given in --strategies.
+
+Usage (from backend/, against a development database):
+    python -m benchmarks.inventory_shards --center-id 1 --package-id 1 \\
+        --shards 1,8 --workers 1,2,4,8,16,32 --duration 5 \\
+        --strategies pessimistic,optimistic,conditional
+
+The record's stock and shard count are restored when the run finishes.
+"""
+
+import argparse
+import threading
+import time
+
+from app.core.database import SessionLocal
+from app.models import Inventory
+from app.services.distribution_service import DistributionService
+from app.services.inventory_strategies import INVENTORY_STRATEGIES, InventoryConflict
+
+BENCHMARK_STOCK = 10_000_000
+
+
+def _set_stock(center_id: int, package_id: int, shard_count: int, quantity: int) -> None:
+    """Put `quantity` units on the record, spread over `shard_count` shards"""
+    db = SessionLocal()
+    try:
+        DistributionService.set_shard_count(db, center_id, package_id, 1)
+        inventory = db.query(Inventory).filter(
+            Inventory.center_id == center_id,
+            Inventory.package_id == package_id
+        ).first()
+        inventory.quantity_on_hand = quantity
+        db.commit()
+        if shard_count > 1:
+            DistributionService.set_shard_count(db, center_id, package_id, shard_count)
+    finally:
+        db.close()
+
+
+def _worker(strategy, center_id, package_id, shard_count, hold_seconds, stop, counts, errors, lock):
+    done = 0
+    failed = 0
+    db = SessionLocal()
+    try:
+        while not stop.is_set():
+            try:
+                error = DistributionService._reserve_inventory(
+                    db, strategy, center_id, package_id, 1, shard_count
+                )
+            except InventoryConflict:
+                error = "conflict"
+            if error:
+                db.rollback()
+                failed += 1
+                continue
+            if hold_seconds:
+                time.sleep(hold_seconds)
+            db.commit()
+            done += 1
+    finally:
+        db.close()
+        with lock:
+            counts.append(done)
+            errors.append(failed)
+
+
+def run(center_id: int, package_id: int, shard_count: int, strategy_name: str,
+        workers: int, duration: float, hold_ms: float) -> dict:
+    """Run one configuration and return its throughput figures"""
+    _set_stock(center_id, package_id, shard_count, BENCHMARK_STOCK)
+    strategy = INVENTORY_STRATEGIES[strategy_name]
+
+    stop = threading.Event()
+    counts, errors, lock = [], [], threading.Lock()
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(
+                strategy, center_id, package_id, shard_count,
+                hold_ms / 1000, stop, counts, errors, lock
+            )
+        )
+        for _ in range(workers)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "shards": shard_count,
+        "strategy": strategy_name if shard_count == 1 else "shards",
+        "workers": workers,
+        "distributions": sum(counts),
+        "errors": sum(errors),
+        "per_second": sum(counts) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inventory sharding throughput benchmark")
+    parser.add_argument("--center-id", type=int, default=1)
+    parser.add_argument("--package-id", type=int, default=1)
+    parser.add_argument("--shards", default="1,8", help="Comma separated shard counts")
+    parser.add_argument("--workers", default="1,2,4,8,16,32", help="Comma separated worker counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per configuration")
+    parser.add_argument("--hold-ms", type=float, default=2.0, help="Time the lock is held per distribution")
+    parser.add_argument(
+        "--strategies", default="pessimistic",
+        help="Comma separated inventory strategies for the non-sharded runs"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        inventory = db.query(Inventory).filter(
+            Inventory.center_id == args.center_id,
+            Inventory.package_id == args.package_id
+        ).first()
+        if not inventory:
+            raise SystemExit("No inventory record found for this package at this center")
+        original_shards = inventory.shard_count
+        original_quantity = inventory.total_quantity
+    finally:
+        db.close()
+
+    configurations = []
+    for shard_count in (int(value) for value in args.shards.split(",")):
+        if shard_count > 1:
+            configurations.append((shard_count, "pessimistic"))
+        else:
+            configurations.extend((1, name) for name in args.strategies.split(","))
+
+    print(
+        f"{'shards':>6} {'strategy':>12} {'workers':>7} {'distributions':>13} "
+        f"{'errors':>6} {'per second':>10}"
+    )
+    try:
+        for shard_count, strategy_name in configurations:
+            for workers in (int(value) for value in args.workers.split(",")):
+                result = run(
+                    args.center_id, args.package_id, shard_count, strategy_name,
+                    workers, args.duration, args.hold_ms
+                )
+                print(
+                    f"{result['shards']:>6} {result['strategy']:>12} {result['workers']:>7} "
+                    f"{result['distributions']:>13} {result['errors']:>6} "
+                    f"{result['per_second']:>10.1f}"
+                )
+    finally:
+        _set_stock(args.center_id, args.package_id, original_shards, original_quantity)
+
+
+if __name__ == "__main__":
+    main()
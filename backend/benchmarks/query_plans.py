@@ -0,0 +1,494 @@
+"""
+Query Plan Regression Suite
+Checks the plans of the hot queries against their expected index usage,
+access type and row-estimate ceiling, so that a model, index or view change
+that turns a lookup into a full scan fails the build.
+
+Each case calls the real route function or service (eligibility lookup,
+inventory lock per strategy, logs listing, household filters, reports,
+inventory views) with a recorder on the engine, then runs EXPLAIN
+FORMAT=JSON on every SELECT / UPDATE / DELETE it sent. Export cases EXPLAIN
+the SQL their route builds without running it (it would stream the whole
+view). Every table access in the plan is checked:
+
+- listed tables must use one of the expected access types and indexes,
+  within their ceiling on rows_examined_per_scan (absolute, or a share of
+  the table's estimated rows)
+- tables a case does not list (small reference tables, internal derived
+  tables) may not be scanned in full beyond UNLISTED_SCAN_ROWS rows
+
+Plans only mean something on production-size data. The suite is skipped
+with exit status 2 when Distribution_Log has fewer than --min-log-rows rows,
+unless --generate SCALE loads benchmarks.dataset first. Statistics are
+refreshed with ANALYZE TABLE before the run (--no-analyze skips it).
+
+Exit status: 0 when every plan is as expected, 1 on regressions, 2 when the
+dataset is too small.
+
+Usage (from backend/, against a throwaway database):
+    python -m benchmarks.query_plans --generate SF1
+    python -m benchmarks.query_plans --verbose --output plans.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine, SessionLocal
+from app.core.pagination import NEXT_CURSOR_HEADER, estimated_row_count
+from app.api.distribution import get_distribution_logs, get_household_distribution_history
+from app.api.exports import report_sql
+from app.api.households import get_households
+from app.api.inventory import get_inventory_status, get_low_stock_alerts
+from app.api.reports import get_monthly_summary, get_distribution_statistics, get_pending_households
+from app.services.distribution_service import DistributionService
+from app.services.inventory_strategies import INVENTORY_STRATEGIES
+from app.services.reference_data import reference_data
+from benchmarks import dataset
+
+FULL_SCANS = ("ALL", "index")
+UNLISTED_SCAN_ROWS = 10_000
+EXPLAINABLE = re.compile(r"\s*(SELECT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+ANALYZED_TABLES = (
+    "Households", "Distribution_Log", "Inventory", "Inventory_Shards", "Aid_Packages",
+    "Distribution_Centers", "Household_Package_Last", "Pending_Queue",
+    "Rollup_Daily_Distributions", "Rollup_Monthly_Unique", "Rollup_Center_Package_Unique",
+)
+
+
+@dataclass(frozen=True)
+class Access:
+    """Expected access to one table, by the name or alias EXPLAIN shows"""
+    types: Tuple[str, ...]
+    keys: Tuple[str, ...] = ()  # one of these indexes must be used; () = any
+    max_rows: int | None = None
+    max_share: float | None = None  # ceiling as a share of `table`'s rows
+    table: str | None = None
+
+    def ceiling(self, table_rows: Dict[str, int]) -> int | None:
+        if self.max_rows is not None:
+            return self.max_rows
+        if self.max_share is not None:
+            return int(self.max_share * max(table_rows.get(self.table, 0), 1))
+        return None
+
+
+# Primary-key lookup of one row (system: one-row table, no key)
+PK_LOOKUP = Access(("system", "const", "eq_ref"), ("PRIMARY",), max_rows=1)
+
+
+def one_pass(table: str, types: Tuple[str, ...] = FULL_SCANS) -> Access:
+    """Accepted scan of a whole table (aggregations, full extracts), at most once"""
+    return Access(types, max_share=1.5, table=table)
+
+
+# Materialized derived table or view: its own rows, no ceiling
+MATERIALIZED = Access(("ALL", "index", "ref", "eq_ref"))
+
+
+@dataclass
+class Sample:
+    """Real ids from the dataset to run the cases with"""
+    household_id: int
+    package_id: int
+    center_id: int
+    city: str
+    household_ids: List[int]
+    package_ids: List[int]
+    inventory_center_id: int
+    inventory_package_id: int
+
+
+@dataclass
+class Case:
+    """One hot path: either `run` (SQL recorded) or `sql` (SQL built, not run)"""
+    name: str
+    expect: Dict[str, Access]
+    run: Callable[[Session, Sample], object] | None = None
+    sql: Callable[[Sample], Tuple[str, dict]] | None = None
+
+
+def _households_next_page(db: Session, s: Sample):
+    first = get_households(skip=0, limit=100, status="active", priority=None, city=s.city,
+                           cursor=None, db=db)
+    return get_households(skip=0, limit=100, status="active", priority=None, city=s.city,
+                          cursor=first.headers.get(NEXT_CURSOR_HEADER), db=db)
+
+
+def _logs_next_page(db: Session, s: Sample):
+    first = get_distribution_logs(limit=100, offset=0, cursor=None, total="none", db=db)
+    cursor = json.loads(first.body)["next_cursor"]
+    return get_distribution_logs(limit=100, offset=0, cursor=cursor, total="none", db=db)
+
+
+HOUSEHOLD_FILTER = Access(
+    ("ref", "range", "index", "index_merge"),
+    ("PRIMARY", "idx_status", "idx_priority", "idx_city"),
+    max_share=0.3, table="Households"
+)
+LOG_JOINS = {"Households": PK_LOOKUP, "Aid_Packages": PK_LOOKUP, "Distribution_Centers": PK_LOOKUP}
+INVENTORY_ROW = Access(("const", "eq_ref", "ref", "range"), ("uq_center_package", "PRIMARY"), max_rows=1)
+
+CASES = [
+    Case(
+        "eligibility lookup",
+        {"Households": PK_LOOKUP, "Household_Package_Last": PK_LOOKUP, "Aid_Packages": PK_LOOKUP},
+        run=lambda db, s: DistributionService.check_eligibility(db, s.household_id, s.package_id),
+    ),
+    Case(
+        "eligibility matrix",
+        {
+            "Households": Access(("range", "const", "eq_ref"), ("PRIMARY",), max_rows=1_000),
+            "Household_Package_Last": Access(("range", "ref", "eq_ref"), ("PRIMARY",), max_rows=10_000),
+        },
+        run=lambda db, s: DistributionService.check_eligibility_matrix(db, s.household_ids, s.package_ids),
+    ),
+    *[
+        Case(
+            f"inventory lock ({name})",
+            {"Inventory": INVENTORY_ROW},
+            run=lambda db, s, strategy=strategy: strategy.reserve(
+                db, s.inventory_center_id, s.inventory_package_id, 1
+            ),
+        )
+        for name, strategy in INVENTORY_STRATEGIES.items()
+    ],
+    Case(
+        "distribution logs, first page",
+        {"Distribution_Log": Access(("index",), ("idx_date",), max_rows=5_000), **LOG_JOINS},
+        run=lambda db, s: get_distribution_logs(limit=100, offset=0, cursor=None, total="none", db=db),
+    ),
+    Case(
+        # The range estimate counts every older row; LIMIT stops the scan
+        "distribution logs, next page (cursor)",
+        {"Distribution_Log": Access(("index", "range"), ("idx_date",)), **LOG_JOINS},
+        run=_logs_next_page,
+    ),
+    Case(
+        "household distribution history",
+        {
+            "Distribution_Log": Access(("ref", "range"), ("idx_household", "idx_household_package"),
+                                       max_rows=5_000),
+            **LOG_JOINS,
+        },
+        run=lambda db, s: get_household_distribution_history(
+            household_id=s.household_id, limit=100, cursor=None, db=db
+        ),
+    ),
+    Case(
+        "households by priority",
+        {"Households": HOUSEHOLD_FILTER},
+        run=lambda db, s: get_households(skip=0, limit=100, status=None, priority="critical", city=None,
+                                         cursor=None, db=db),
+    ),
+    Case(
+        "households by status, priority and city",
+        {"Households": HOUSEHOLD_FILTER},
+        run=lambda db, s: get_households(skip=0, limit=100, status="active", priority="high", city=s.city,
+                                         cursor=None, db=db),
+    ),
+    Case(
+        "households by city, next page (cursor)",
+        {"Households": HOUSEHOLD_FILTER},
+        run=_households_next_page,
+    ),
+    Case(
+        "report: monthly summary (rollups)",
+        {
+            "r": one_pass("Rollup_Daily_Distributions", FULL_SCANS + ("range", "ref")),
+            "m": MATERIALIZED,
+            "u": PK_LOOKUP,
+        },
+        run=lambda db, s: get_monthly_summary(limit=100, offset=0, db=db),
+    ),
+    Case(
+        "report: distribution statistics (rollups)",
+        {
+            "Rollup_Daily_Distributions": one_pass("Rollup_Daily_Distributions", FULL_SCANS + ("range", "ref")),
+            "s": MATERIALIZED,
+            "u": PK_LOOKUP,
+        },
+        run=lambda db, s: get_distribution_statistics(limit=1000, offset=0, db=db),
+    ),
+    Case(
+        "report: pending households (queue)",
+        {"q": Access(("index", "range"), ("idx_queue_order",), max_rows=50_000), "h": PK_LOOKUP},
+        run=lambda db, s: get_pending_households(limit=1000, offset=0, db=db),
+    ),
+    Case(
+        "view: vw_current_inventory_status",
+        {"i": one_pass("Inventory")},
+        run=lambda db, s: get_inventory_status(limit=1000, offset=0, db=db),
+    ),
+    Case(
+        "view: vw_current_inventory_status, low stock",
+        {"i": one_pass("Inventory", FULL_SCANS + ("range",))},
+        run=lambda db, s: get_low_stock_alerts(limit=1000, offset=0, db=db),
+    ),
+    Case(
+        # Full extract: one pass over the log, names joined by primary key
+        "export: vw_monthly_summary",
+        {
+            "vw_monthly_summary": MATERIALIZED,
+            "dl": one_pass("Distribution_Log", FULL_SCANS + ("range", "ref")),
+        },
+        sql=lambda s: report_sql("monthly-summary", start_date=date.today() - timedelta(days=365),
+                                 center_id=s.center_id),
+    ),
+    Case(
+        "export: vw_distribution_statistics",
+        {
+            "vw_distribution_statistics": MATERIALIZED,
+            "dl": one_pass("Distribution_Log", FULL_SCANS + ("range", "ref")),
+        },
+        sql=lambda s: report_sql("distribution-statistics", center_id=s.center_id),
+    ),
+    Case(
+        "export: vw_pending_households",
+        {"q": one_pass("Pending_Queue", FULL_SCANS + ("range",)), "h": PK_LOOKUP},
+        sql=lambda s: report_sql("pending-households"),
+    ),
+]
+
+
+class StatementRecorder:
+    """Explainable statements the engine sends while active"""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, object]] = []
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or not EXPLAINABLE.match(statement) or "information_schema" in statement:
+            return
+        # Replay exactly what the driver got (no arguments: no %-formatting)
+        if not parameters and context is not None and context.no_parameters:
+            parameters = None
+        self.statements.append((statement, parameters))
+
+
+def explain(statement: str, parameters) -> dict:
+    """EXPLAIN FORMAT=JSON of a statement as the driver received it"""
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN FORMAT=JSON " + statement, parameters)
+        return json.loads(cursor.fetchone()[0])
+    finally:
+        connection.close()
+
+
+def table_accesses(plan) -> List[dict]:
+    """Every table access in an EXPLAIN FORMAT=JSON plan, subqueries included"""
+    found = []
+    if isinstance(plan, dict):
+        if "table_name" in plan and "access_type" in plan:
+            found.append(plan)
+        for value in plan.values():
+            found.extend(table_accesses(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            found.extend(table_accesses(value))
+    return found
+
+
+def _index_names(key: str | None) -> set:
+    """Index names of a plan key; index_merge shows e.g. intersect(idx_a,idx_b)"""
+    if not key:
+        return set()
+    return set(re.findall(r"\w+", key)) - {"intersect", "union", "sort_union"}
+
+
+def check(accesses: List[dict], expect: Dict[str, Access], table_rows: Dict[str, int]) -> List[str]:
+    """Problems of one case's table accesses against its expectations"""
+    problems = []
+    seen = set()
+    for access in accesses:
+        name = access["table_name"]
+        access_type = access["access_type"]
+        rows = access.get("rows_examined_per_scan") or 0
+        expected = expect.get(name)
+
+        if expected is None:
+            if access_type in FULL_SCANS and rows > UNLISTED_SCAN_ROWS:
+                problems.append(f"{name}: unexpected {access_type} scan of {rows} rows")
+            continue
+
+        seen.add(name)
+        if access_type not in expected.types:
+            problems.append(f"{name}: access {access_type}, expected {'/'.join(expected.types)}")
+        keys = _index_names(access.get("key"))
+        if expected.keys and access_type != "system" and (not keys or not keys <= set(expected.keys)):
+            problems.append(
+                f"{name}: index {access.get('key') or 'none'}, expected {'/'.join(expected.keys)}"
+            )
+        ceiling = expected.ceiling(table_rows)
+        if ceiling is not None and rows > ceiling:
+            problems.append(f"{name}: {rows} rows examined per scan, ceiling {ceiling}")
+
+    for name in expect.keys() - seen:
+        problems.append(f"{name}: not in the plan")
+    return problems
+
+
+def load_sample(db: Session) -> Sample:
+    latest = db.execute(text("""
+        SELECT household_id, package_id, center_id FROM Distribution_Log
+        WHERE transaction_status = 'success'
+        ORDER BY log_id DESC LIMIT 1
+    """)).one()
+    recent_households = list(dict.fromkeys(db.execute(text("""
+        SELECT household_id FROM Distribution_Log ORDER BY log_id DESC LIMIT 500
+    """)).scalars()))[:100]
+    packages = db.execute(text("""
+        SELECT package_id FROM Aid_Packages WHERE is_active = TRUE ORDER BY package_id LIMIT 5
+    """)).scalars().all()
+    inventory = db.execute(text("""
+        SELECT center_id, package_id FROM Inventory
+        WHERE quantity_on_hand > 0 AND shard_count = 1
+        ORDER BY inventory_id DESC LIMIT 1
+    """)).one()
+    city = db.execute(
+        text("SELECT city FROM Households WHERE household_id = :id"), {"id": latest.household_id}
+    ).scalar()
+    return Sample(
+        household_id=latest.household_id,
+        package_id=latest.package_id,
+        center_id=latest.center_id,
+        city=city,
+        household_ids=recent_households,
+        package_ids=list(packages),
+        inventory_center_id=inventory.center_id,
+        inventory_package_id=inventory.package_id,
+    )
+
+
+def run_case(case: Case, sample: Sample) -> List[Tuple[str, dict]]:
+    """(statement, plan) for each statement of a case; nothing is committed"""
+    db = SessionLocal()
+    try:
+        if case.sql is not None:
+            sql, params = case.sql(sample)
+            plan = db.execute(text("EXPLAIN FORMAT=JSON " + sql), params).scalar()
+            return [(sql, json.loads(plan))]
+
+        with StatementRecorder() as recorder:
+            case.run(db, sample)
+        return [(statement, explain(statement, parameters))
+                for statement, parameters in recorder.statements]
+    finally:
+        db.rollback()
+        db.close()
+
+
+def _analyze(db: Session) -> None:
+    """Fresh index statistics (and TABLE_ROWS) for the optimizer"""
+    db.execute(text(f"ANALYZE TABLE {', '.join(ANALYZED_TABLES)}")).fetchall()
+
+
+def _table_rows(db: Session) -> Dict[str, int]:
+    return dict(db.execute(text("""
+        SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)).all())
+
+
+def _generate(scale: str) -> None:
+    loader = dataset.Loader("load", None)
+    try:
+        dataset.Dataset(loader, 42, date.today(), chunk_size=500_000, **dataset.SCALES[scale]).generate()
+    finally:
+        loader.close()
+    dataset.rebuild_derived()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plan regression suite")
+    parser.add_argument("--min-log-rows", type=int, default=500_000,
+                        help="Skip (exit 2) below this many Distribution_Log rows")
+    parser.add_argument("--generate", choices=list(dataset.SCALES),
+                        help="Load this dataset scale first when the data is too small")
+    parser.add_argument("--no-analyze", action="store_true", help="Do not run ANALYZE TABLE first")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement and table access")
+    parser.add_argument("--output", help="Write the plans and problems to this JSON file")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if not args.no_analyze:
+            _analyze(db)
+        log_rows = estimated_row_count(db, "Distribution_Log") or 0
+        if log_rows < args.min_log_rows and args.generate:
+            print(f"Distribution_Log has ~{log_rows} rows, loading {args.generate}")
+            db.close()
+            _generate(args.generate)
+            db = SessionLocal()
+            _analyze(db)
+            log_rows = estimated_row_count(db, "Distribution_Log") or 0
+        if log_rows < args.min_log_rows:
+            print(f"SKIPPED: Distribution_Log has ~{log_rows} rows (< {args.min_log_rows}); "
+                  f"plans on a small dataset say nothing. Load one with "
+                  f"python -m benchmarks.dataset or pass --generate SF1")
+            return 2
+
+        table_rows = _table_rows(db)
+        sample = load_sample(db)
+    finally:
+        db.close()
+
+    print(f"Distribution_Log ~{table_rows.get('Distribution_Log')} rows, "
+          f"Households ~{table_rows.get('Households')} rows")
+
+    # Check the full queries: with the reference-data cache on, package and
+    # center columns are left out of the eligibility query
+    cache_enabled = reference_data.enabled
+    reference_data.set_enabled(False)
+    results = []
+    try:
+        for case in CASES:
+            statements = run_case(case, sample)
+            accesses = [access for _, plan in statements for access in table_accesses(plan)]
+            problems = check(accesses, case.expect, table_rows)
+            results.append({
+                "case": case.name,
+                "problems": problems,
+                "statements": [{"sql": sql, "plan": plan} for sql, plan in statements],
+            })
+
+            print(f"{'FAIL' if problems else 'ok  '}  {case.name}")
+            for problem in problems:
+                print(f"        {problem}")
+            if args.verbose:
+                for sql, plan in statements:
+                    print("        " + " ".join(sql.split()))
+                    for access in table_accesses(plan):
+                        print(f"          {access['table_name']:<28} {access['access_type']:<12} "
+                              f"{access.get('key') or '-':<28} "
+                              f"rows={access.get('rows_examined_per_scan', '-')}")
+    finally:
+        reference_data.set_enabled(cache_enabled)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"table_rows": table_rows, "results": results}, f, indent=2, default=str)
+
+    failed = [result["case"] for result in results if result["problems"]]
+    print(f"\n{len(results) - len(failed)} / {len(results)} plans as expected")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Shared fixtures: an in-memory SQLite stand-in for the inventory and
+distribution tables, enough for the ORM paths of the inventory strategies,
+shard reserve, batch distribution and eligibility checks
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models import Inventory, InventoryShard
+
+# MySQL-only DDL in the models (ON UPDATE CURRENT_TIMESTAMP) does not
+# translate, so the tables are spelled out here
+_INVENTORY_DDL = [
+    """
+    CREATE TABLE Inventory (
+        inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        center_id INTEGER NOT NULL,
+        package_id INTEGER NOT NULL,
+        quantity_on_hand INTEGER NOT NULL DEFAULT 0 CHECK (quantity_on_hand >= 0),
+        reorder_level INTEGER NOT NULL DEFAULT 50,
+        shard_count INTEGER NOT NULL DEFAULT 1,
+        version INTEGER NOT NULL DEFAULT 1,
+        last_restock_date DATE,
+        last_restock_quantity INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (center_id, package_id)
+    )
+    """,
+    """
+    CREATE TABLE Inventory_Shards (
+        center_id INTEGER NOT NULL,
+        package_id INTEGER NOT NULL,
+        shard_no INTEGER NOT NULL,
+        quantity_on_hand INTEGER NOT NULL DEFAULT 0 CHECK (quantity_on_hand >= 0),
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (center_id, package_id, shard_no)
+    )
+    """,
+    """
+    CREATE TABLE Households (
+        household_id INTEGER PRIMARY KEY,
+        status TEXT NOT NULL DEFAULT 'active'
+    )
+    """,
+    """
+    CREATE TABLE Household_Package_Last (
+        household_id INTEGER NOT NULL,
+        package_id INTEGER NOT NULL,
+        last_distribution_date TIMESTAMP NOT NULL,
+        next_eligible_date DATE NOT NULL,
+        last_log_id INTEGER NOT NULL,
+        distribution_count INTEGER NOT NULL DEFAULT 1,
+        PRIMARY KEY (household_id, package_id)
+    )
+    """,
+    """
+    CREATE TABLE Distribution_Log (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        household_id INTEGER NOT NULL,
+        package_id INTEGER NOT NULL,
+        center_id INTEGER NOT NULL,
+        staff_id INTEGER,
+        quantity_distributed INTEGER NOT NULL DEFAULT 1,
+        distribution_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        transaction_status TEXT NOT NULL DEFAULT 'success',
+        failure_reason TEXT,
+        notes TEXT
+    )
+    """,
+]
+
+
+@pytest.fixture
+def inventory_db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as connection:
+        for ddl in _INVENTORY_DDL:
+            connection.exec_driver_sql(ddl)
+
+    db = Session(engine)
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def add_inventory(inventory_db):
+    """Insert an Inventory row (and its shards, when given) and commit"""
+    def add(center_id, package_id, quantity, shards=()):
+        inventory_db.execute(
+            Inventory.__table__.insert().values(
+                center_id=center_id, package_id=package_id,
+                quantity_on_hand=0 if shards else quantity,
+                shard_count=max(len(shards), 1), version=1
+            )
+        )
+        for shard_no, shard_quantity in enumerate(shards):
+            inventory_db.execute(
+                InventoryShard.__table__.insert().values(
+                    center_id=center_id, package_id=package_id,
+                    shard_no=shard_no, quantity_on_hand=shard_quantity
+                )
+            )
+        inventory_db.commit()
+    return add
+
+
+@pytest.fixture
+def add_household(inventory_db):
+    """Insert a Households row (and its last distributions per package) and commit"""
+    def add(household_id, status="active", last_distributions=None):
+        inventory_db.execute(
+            text("INSERT INTO Households (household_id, status) VALUES (:id, :status)"),
+            {"id": household_id, "status": status}
+        )
+        for package_id, when in (last_distributions or {}).items():
+            inventory_db.execute(
+                text("""
+                    INSERT INTO Household_Package_Last
+                    VALUES (:household_id, :package_id, :when, :next, 1, 1)
+                """),
+                {"household_id": household_id, "package_id": package_id,
+                 "when": when, "next": when.date()}
+            )
+        inventory_db.commit()
+    return add
@@ -0,0 +1,76 @@
+"""
+Test doubles for service code that talks SQL through a Session
+"""
+
+
+class FakeScalars(list):
+    def all(self):
+        return list(self)
+
+
+class FakeResult:
+    def __init__(self, rows=(), rowcount=None, lastrowid=None):
+        self.rows = list(rows)
+        self.rowcount = len(self.rows) if rowcount is None else rowcount
+        self.lastrowid = lastrowid
+
+    def scalar(self):
+        return self.rows[0][0] if self.rows else None
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def one(self):
+        if len(self.rows) != 1:
+            raise AssertionError(f"expected one row, got {len(self.rows)}")
+        return self.rows[0]
+
+    def all(self):
+        return list(self.rows)
+
+    fetchall = all
+
+    def scalars(self):
+        return FakeScalars(row[0] for row in self.rows)
+
+    def mappings(self):
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    """
+    Records every statement; answers from `responses`, a list of
+    (sql substring, FakeResult or callable(params) -> FakeResult) tried in
+    order. Unmatched statements return an empty result.
+    """
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append((sql, params))
+        for fragment, response in self.responses:
+            if fragment in sql:
+                return response(params) if callable(response) else response
+        return FakeResult()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+    def executed(self, fragment):
+        """(sql, params) of the statements containing `fragment`"""
+        return [(sql, params) for sql, params in self.statements if fragment in sql]
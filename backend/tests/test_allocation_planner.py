@@ -0,0 +1,160 @@
+"""
+Allocation planner: greedy and min-cost-flow plans against their constraints
+"""
+
+import itertools
+from collections import namedtuple
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services import allocation_planner
+from app.services.allocation_planner import (
+    _min_cost_max_flow,
+    plan_greedy,
+    plan_min_cost_flow,
+)
+
+from tests.fakes import FakeResult, FakeSession
+
+Candidate = namedtuple("Candidate", "household_id priority_rank family_size registered city")
+Stock = namedtuple("Stock", "center_id city available")
+
+WEIGHTS = np.array([8.0, 4.0, 2.0, 1.0])
+
+
+def households(ranks, cities, sizes=None):
+    count = len(ranks)
+    return (
+        np.array(ranks, dtype=np.int64),
+        np.array(sizes or [1] * count, dtype=np.int64),
+        np.arange(count, dtype=np.int64),
+        np.array(cities, dtype=np.int64),
+    )
+
+
+def assert_feasible(served, assigned, capacity, count):
+    assert len(served) == len(assigned) == min(count, capacity.sum())
+    assert len(set(served.tolist())) == len(served)
+    assert (np.bincount(assigned, minlength=len(capacity)) <= capacity).all()
+
+
+def test_greedy_serves_the_most_deserving_within_capacity():
+    rank, size, registered, city = households([3, 0, 2, 0, 1], [0, 0, 1, 1, 0], sizes=[1, 2, 1, 5, 1])
+    capacity = np.array([2, 1])
+
+    served, assigned = plan_greedy(rank, size, registered, city, np.array([0, 1]), capacity)
+
+    assert_feasible(served, assigned, capacity, 5)
+    # Critical first (larger family first), then high
+    assert served.tolist() == [3, 1, 4]
+
+
+def test_greedy_prefers_a_local_center():
+    rank, size, registered, city = households([0, 0], [1, 0])
+    capacity = np.array([1, 1])
+
+    served, assigned = plan_greedy(rank, size, registered, city, np.array([0, 1]), capacity)
+
+    assert dict(zip(served.tolist(), assigned.tolist())) == {0: 1, 1: 0}
+
+
+def test_greedy_sends_the_rest_to_other_cities():
+    rank, size, registered, city = households([0, 1, 2], [0, 0, 0])
+    capacity = np.array([1, 2])
+
+    served, assigned = plan_greedy(rank, size, registered, city, np.array([0, 1]), capacity)
+
+    assert_feasible(served, assigned, capacity, 3)
+    assert assigned[served.tolist().index(0)] == 0
+
+
+def brute_force_cost(supply, capacity, cost):
+    """Cheapest max-flow by enumerating every integral flow matrix"""
+    best = None
+    shape = cost.shape
+    ranges = [range(min(supply[g], capacity[c]) + 1) for g in range(shape[0]) for c in range(shape[1])]
+    for values in itertools.product(*ranges):
+        flow = np.array(values).reshape(shape)
+        if (flow.sum(axis=1) > supply).any() or (flow.sum(axis=0) > capacity).any():
+            continue
+        key = (-flow.sum(), (flow * cost).sum())
+        best = key if best is None or key < best else best
+    return -best[0], best[1]
+
+
+def test_min_cost_max_flow_matches_brute_force():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        supply = rng.integers(0, 3, 2)
+        capacity = rng.integers(0, 3, 3)
+        cost = rng.integers(-5, 5, (2, 3)).astype(float)
+
+        flow = _min_cost_max_flow(supply, capacity, cost)
+
+        assert (flow >= 0).all()
+        assert (flow.sum(axis=1) <= supply).all()
+        assert (flow.sum(axis=0) <= capacity).all()
+        assert (flow.sum(), (flow * cost).sum()) == brute_force_cost(supply, capacity, cost)
+
+
+def test_min_cost_flow_trades_priority_against_distance():
+    # One unit in city 0; a low-priority local and a critical remote household
+    rank, size, registered, city = households([3, 0], [0, 1])
+    capacity = np.array([1])
+
+    served, _ = plan_min_cost_flow(rank, size, registered, city, np.array([0]), capacity, WEIGHTS, 2.0)
+    assert served.tolist() == [1]
+
+    served, _ = plan_min_cost_flow(rank, size, registered, city, np.array([0]), capacity, WEIGHTS, 10.0)
+    assert served.tolist() == [0]
+
+
+def test_min_cost_flow_is_feasible_and_serves_as_many_as_greedy():
+    rng = np.random.default_rng(11)
+    rank, size, registered, city = households(
+        rng.integers(0, 4, 40).tolist(), rng.integers(0, 3, 40).tolist(), rng.integers(1, 6, 40).tolist()
+    )
+    center_city = np.array([0, 1, 2, 2])
+    capacity = np.array([5, 3, 4, 6])
+
+    greedy = plan_greedy(rank, size, registered, city, center_city, capacity)
+    refined = plan_min_cost_flow(rank, size, registered, city, center_city, capacity, WEIGHTS, 1.5)
+
+    assert_feasible(*refined, capacity, 40)
+    assert len(refined[0]) == len(greedy[0])
+
+
+def test_plan_package_builds_items_from_the_stock(monkeypatch):
+    package = SimpleNamespace(package_name="Food Box", is_active=True)
+    monkeypatch.setattr(allocation_planner.reference_data, "get", lambda db, kind, key: package)
+    db = FakeSession([
+        ("FROM Households h", FakeResult([
+            Candidate(10, 2, 3, 700000, "Springfield"),
+            Candidate(11, 0, 4, 700001, "Shelbyville"),
+            Candidate(12, 1, 1, 700002, "springfield "),
+        ])),
+        ("FROM Inventory i", FakeResult([Stock(1, "Springfield", 5), Stock(2, "Shelbyville", -3)])),
+    ])
+
+    status, _, plan = allocation_planner.plan_package(db, package_id=7, quantity=2)
+
+    assert status == "success"
+    assert (plan["candidates"], plan["planned"], plan["unserved"]) == (3, 2, 1)
+    assert [(item["household_id"], item["center_id"], item["same_city"]) for item in plan["items"]] == [
+        (11, 1, False), (12, 1, True)
+    ]
+    assert plan["by_center"] == [
+        {"center_id": 1, "available": 5, "planned": 2},
+        {"center_id": 2, "available": 0, "planned": 0},
+    ]
+    assert "Pending_Queue" in db.executed("FROM Households h")[0][0]
+
+
+def test_plan_package_rejects_an_inactive_package(monkeypatch):
+    package = SimpleNamespace(package_name="Food Box", is_active=False)
+    monkeypatch.setattr(allocation_planner.reference_data, "get", lambda db, kind, key: package)
+
+    assert allocation_planner.plan_package(FakeSession(), package_id=7) == (
+        "error", "Package 7 is not active", None
+    )
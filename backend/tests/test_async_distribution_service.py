@@ -0,0 +1,113 @@
+"""
+Async distribution path: the sync transaction driven through run_sync, with
+retries awaited instead of slept
+"""
+
+import asyncio
+
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.services import async_distribution_service
+from app.services.async_distribution_service import AsyncDistributionService
+from app.services.distribution_service import DistributionService
+from app.services.inventory_strategies import InventoryConflict
+
+from tests.fakes import FakeSession
+
+
+class FakeAsyncSession:
+    """AsyncSession stand-in: run_sync calls straight into a FakeSession"""
+
+    def __init__(self):
+        self.sync_session = FakeSession()
+        self.rollbacks = 0
+
+    async def run_sync(self, fn, *args):
+        return fn(self.sync_session, *args)
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def attempts(monkeypatch, *outcomes):
+    """_distribute_once raising / returning `outcomes` in turn; records the pauses"""
+    remaining = list(outcomes)
+    pauses = []
+
+    def distribute_once(db, *args):
+        outcome = remaining.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def sleep(seconds):
+        pauses.append(seconds)
+
+    monkeypatch.setattr(DistributionService, "_distribute_once", staticmethod(distribute_once))
+    monkeypatch.setattr(async_distribution_service.asyncio, "sleep", sleep)
+    return pauses
+
+
+def distribute(db):
+    return asyncio.run(AsyncDistributionService.distribute_package(db, 1, 1, 1, None))
+
+
+def deadlock():
+    return OperationalError("UPDATE", {}, Exception(1213, "Deadlock found"))
+
+
+def test_optimistic_conflicts_are_retried(monkeypatch):
+    pauses = attempts(monkeypatch, InventoryConflict(), ("success", "ok", 7))
+    db = FakeAsyncSession()
+
+    assert distribute(db) == ("success", "ok", 7)
+    assert db.rollbacks == 1 and len(pauses) == 1
+
+
+def test_gives_up_after_the_optimistic_retries(monkeypatch):
+    monkeypatch.setattr(settings, "OPTIMISTIC_MAX_RETRIES", 2)
+    pauses = attempts(monkeypatch, InventoryConflict(), InventoryConflict(), InventoryConflict())
+    db = FakeAsyncSession()
+
+    assert distribute(db) == ("error", "Inventory is busy, please retry the distribution", None)
+    assert db.rollbacks == 3 and len(pauses) == 2
+
+
+def test_deadlocks_are_retried_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSACTION_RETRY_MAX_RETRIES", 2)
+    pauses = attempts(monkeypatch, deadlock(), deadlock(), deadlock())
+    db = FakeAsyncSession()
+
+    assert distribute(db) == ("error", "Database is busy (deadlock), please retry the distribution", None)
+    assert db.rollbacks == 3 and len(pauses) == 2
+
+
+def test_other_errors_are_not_retried(monkeypatch):
+    pauses = attempts(monkeypatch, ValueError("boom"))
+    db = FakeAsyncSession()
+
+    assert distribute(db) == ("error", "Transaction failed: boom", None)
+    assert pauses == []
+
+
+def test_batch_and_eligibility_run_the_sync_service(monkeypatch):
+    monkeypatch.setattr(DistributionService, "distribute_batch", staticmethod(lambda db, items: ["batch", items]))
+    monkeypatch.setattr(DistributionService, "check_eligibility", staticmethod(lambda db, h, p: (True, f"{h}/{p}")))
+    db = FakeAsyncSession()
+
+    assert asyncio.run(AsyncDistributionService.distribute_batch(db, [1])) == ["batch", [1]]
+    assert asyncio.run(AsyncDistributionService.check_eligibility(db, 3, 4)) == (True, "3/4")
+
+
+def test_lock_wait_timeout_is_set_for_the_attempt_and_reset(monkeypatch):
+    monkeypatch.setattr(settings, "DISTRIBUTION_LOCK_WAIT_TIMEOUT_SECONDS", 5)
+    attempts(monkeypatch, ("success", "ok", 7))
+    db = FakeAsyncSession()
+
+    distribute(db)
+
+    assert db.sync_session.statements == [
+        ("SET SESSION innodb_lock_wait_timeout = :seconds", {"seconds": 5}),
+        ("SET SESSION innodb_lock_wait_timeout = DEFAULT", None),
+    ]
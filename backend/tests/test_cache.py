@@ -0,0 +1,114 @@
+"""
+TTLCache: expiry, LRU eviction and single-flight read-through
+"""
+
+import threading
+import time
+
+import greenlet
+
+from app.core.cache import TTLCache
+
+
+def test_get_set_and_expiry(monkeypatch):
+    cache = TTLCache("test", ttl_seconds=10, max_entries=10)
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    now[0] += 11
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction():
+    cache = TTLCache("test", ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+
+def test_disabled_cache_always_loads():
+    cache = TTLCache("test", ttl_seconds=60, max_entries=10, enabled=False)
+    calls = []
+    assert cache.get_or_load("a", lambda: calls.append(1) or "v") == "v"
+    assert cache.get_or_load("a", lambda: calls.append(1) or "v") == "v"
+    assert len(calls) == 2
+
+
+def test_get_or_load_does_not_cache_none():
+    cache = TTLCache("test", ttl_seconds=60, max_entries=10)
+    assert cache.get_or_load("a", lambda: None) is None
+    assert cache.get_or_load("a", lambda: "v") == "v"
+    assert cache.get_or_load("a", lambda: "other") == "v"
+
+
+def test_concurrent_misses_on_other_threads_are_coalesced():
+    cache = TTLCache("test", ttl_seconds=60, max_entries=10)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "v"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_load("k", slow_loader)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(cache.get_or_load("k", slow_loader)))
+    second.start()
+    time.sleep(0.05)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert results == ["v", "v"]
+    assert len(calls) == 1
+    assert cache.coalesced == 1
+
+
+def test_same_thread_miss_never_waits_for_a_suspended_loader():
+    """
+    Async path: a loader suspended in a greenlet (its query awaiting the
+    loop) and a second request on the same thread missing the same key
+    """
+    cache = TTLCache("test", ttl_seconds=60, max_entries=10)
+    main = greenlet.getcurrent()
+
+    def suspending_loader():
+        main.switch()  # yield to the "event loop" mid-query
+        return "first"
+
+    first = greenlet.greenlet(lambda: cache.get_or_load("k", suspending_loader))
+    first.switch()  # first request is now suspended inside its loader
+
+    # Would block the thread forever if it waited for the first load
+    assert cache.get_or_load("k", lambda: "second") == "second"
+
+    assert first.switch() == "first"
+    assert cache.get("k") == "first"
+    assert cache._loading == {}
+
+
+def test_failed_loader_releases_waiters():
+    cache = TTLCache("test", ttl_seconds=60, max_entries=10)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    try:
+        cache.get_or_load("k", failing)
+    except RuntimeError:
+        pass
+    assert cache._loading == {}
+    assert cache.get_or_load("k", lambda: "v") == "v"
@@ -0,0 +1,71 @@
+"""
+Contention benchmark: outcome classification, mix parsing and summaries
+"""
+
+import pytest
+
+from app.core.config import settings
+from benchmarks import contention
+from benchmarks.contention import HttpTarget, ServiceTarget, _change, _outcome, _parse_mix, _percentile
+from tests.fakes import FakeSession
+
+
+def test_outcome_classification():
+    assert _outcome(True, "") == "ok"
+    assert _outcome(False, "Inventory is busy, please retry") == "busy"
+    assert _outcome(False, "Database is busy, please retry") == "busy"
+    assert _outcome(False, "Transaction failed: lost connection") == "error"
+    assert _outcome(False, "Insufficient inventory") == "rejected"
+
+
+def test_parse_mix():
+    assert _parse_mix("distribute_hot=80, report=20") == (["distribute_hot", "report"], [80.0, 20.0])
+    assert _parse_mix("eligibility") == (["eligibility"], [1.0])
+    with pytest.raises(SystemExit, match="Unknown operation 'refund'"):
+        _parse_mix("refund=5")
+
+
+def test_percentile_and_change():
+    ordered = list(range(1, 101))
+
+    assert _percentile([], 0.5) is None
+    assert _percentile(ordered, 0.5) == 51
+    assert _percentile(ordered, 0.99) == 100
+    assert _percentile(ordered, 1.0) == 100
+    assert _change(200, 150) == "-25.0%"
+    assert _change(0, 150) == ""
+    assert _change(None, 150) == ""
+
+
+def test_http_results_map_to_outcomes():
+    target = HttpTarget("http://localhost:8000")
+
+    assert target.prefix == settings.API_V1_PREFIX
+    assert target._result(200, {}) == "ok"
+    assert target._result(400, {"detail": "Inventory is busy, please retry"}) == "busy"
+    assert target._result(400, {"detail": "Household not eligible"}) == "rejected"
+    assert target._result(599, {}) == "error"
+
+
+def test_service_target_closes_its_session(monkeypatch):
+    sessions = []
+
+    def session_factory():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    monkeypatch.setattr(contention, "SessionLocal", session_factory)
+    monkeypatch.setattr(
+        contention.DistributionService, "distribute_package",
+        staticmethod(lambda db, *args: ("failed", "Inventory is busy, please retry", None))
+    )
+    monkeypatch.setattr(
+        contention.DistributionService, "restock_inventory",
+        staticmethod(lambda db, *args: ("success", "Restocked"))
+    )
+
+    target = ServiceTarget()
+
+    assert target.distribute(1, 2, 3) == "busy"
+    assert target.restock(2, 3, 10) == "ok"
+    assert [session.closed for session in sessions] == [True, True]
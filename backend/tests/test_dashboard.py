@@ -0,0 +1,51 @@
+"""
+Dashboard statistics: one query, served from the TTL cache
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.services import dashboard
+from app.services.report_rollups import JOB_NAME
+
+from tests.fakes import FakeResult, FakeSession
+
+ROW = {
+    "total_households": 120,
+    "total_distributions": Decimal("4031"),
+    "total_centers": 3,
+    "low_stock_items": 2,
+    "critical_households": 7,
+    "recent_distributions": 95,
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    dashboard.dashboard_cache.clear()
+    yield
+    dashboard.dashboard_cache.clear()
+
+
+def test_compute_dashboard_runs_one_query():
+    db = FakeSession([("AS total_households", FakeResult([ROW]))])
+
+    stats = dashboard.compute_dashboard(db)
+
+    assert {key: value for key, value in stats.items() if key != "as_of"} == {
+        **ROW, "total_distributions": 4031
+    }
+    assert type(stats["total_distributions"]) is int
+    (_, params), = db.statements
+    assert params == {"rollup_job": JOB_NAME}
+
+
+def test_get_dashboard_is_cached():
+    db = FakeSession([("AS total_households", FakeResult([ROW]))])
+
+    first = dashboard.get_dashboard(db)
+    second = dashboard.get_dashboard(db)
+
+    assert second is first
+    assert len(db.statements) == 1
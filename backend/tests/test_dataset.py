@@ -0,0 +1,96 @@
+"""
+Benchmark dataset generator: seeded streams, chunking and id ranges
+"""
+
+from datetime import date
+
+import numpy as np
+
+from benchmarks.dataset import NULL, SCALES, Dataset, _dates, _nullable, _rng, _strings
+
+
+class RecordingLoader:
+    """Keeps the column lists instead of loading them"""
+
+    def __init__(self, max_ids=None):
+        self.max_ids = max_ids or {}
+        self.loads = []
+
+    def max_id(self, table, column):
+        return self.max_ids.get(table, 0)
+
+    def load(self, table, columns, chunk=0):
+        self.loads.append((table, chunk, columns))
+
+    def rows(self, table):
+        return [row for name, _, columns in self.loads if name == table
+                for row in zip(*columns.values())]
+
+    def column(self, table, name):
+        return [value for loaded, _, columns in self.loads if loaded == table
+                for value in columns[name]]
+
+
+def generate(seed=7, max_ids=None, logs=2_000):
+    loader = RecordingLoader(max_ids)
+    Dataset(loader, seed, date(2024, 6, 30), centers=5, packages=6, households=300,
+            logs=logs, chunk_size=100).generate()
+    return loader
+
+
+def test_helpers():
+    assert _strings(np.array([1, 2])) == ["1", "2"]
+    assert _dates(date(2024, 2, 28), [0, 1, 2]) == ["2024-02-28", "2024-02-29", "2024-03-01"]
+    assert _nullable(["a", "b"], np.array([True, False])) == ["a", NULL]
+
+
+def test_streams_depend_only_on_seed_stream_and_chunk():
+    draw = lambda *key: _rng(*key).integers(1_000_000, size=4).tolist()
+
+    assert draw(1, "households", 3) == draw(1, "households", 3)
+    assert draw(1, "households", 3) != draw(1, "households", 4)
+    assert draw(1, "households", 3) != draw(1, "logs", 3)
+    assert draw(1, "households", 3) != draw(2, "households", 3)
+
+
+def test_generation_is_reproducible_per_seed():
+    first, again, other = generate(), generate(), generate(seed=8)
+
+    assert first.rows("Distribution_Log") == again.rows("Distribution_Log")
+    assert first.rows("Households") == again.rows("Households")
+    assert first.rows("Households") != other.rows("Households")
+
+
+def test_row_counts_and_chunk_sizes():
+    loader = generate()
+
+    assert len(loader.rows("Distribution_Centers")) == 5
+    assert len(loader.rows("Aid_Packages")) == 6
+    assert len(loader.rows("Households")) == 300
+    assert len(loader.rows("Distribution_Log")) == 2_000
+    assert all(len(columns["log_id"]) <= 100 for table, _, columns in loader.loads
+               if table == "Distribution_Log")
+
+
+def test_logs_are_in_date_order_and_reference_generated_rows():
+    loader = generate()
+
+    log_ids = [int(value) for value in loader.column("Distribution_Log", "log_id")]
+    dates = loader.column("Distribution_Log", "distribution_date")
+    assert log_ids == list(range(1, 2_001))
+    assert dates == sorted(dates)
+    assert set(loader.column("Distribution_Log", "household_id")) <= set(loader.column("Households", "household_id"))
+    assert set(loader.column("Distribution_Log", "package_id")) <= set(loader.column("Aid_Packages", "package_id"))
+    assert set(loader.column("Distribution_Log", "center_id")) <= set(loader.column("Distribution_Centers", "center_id"))
+
+
+def test_ids_continue_after_existing_rows():
+    loader = generate(max_ids={"Households": 1_000, "Distribution_Log": 50_000}, logs=200)
+
+    assert loader.column("Households", "household_id")[0] == "1001"
+    assert loader.column("Distribution_Log", "log_id")[0] == "50001"
+    assert set(loader.column("Distribution_Log", "household_id")) <= set(loader.column("Households", "household_id"))
+
+
+def test_scales_grow_tenfold():
+    assert [SCALES[name]["logs"] for name in ("SF1", "SF10", "SF100")] == [1_000_000, 10_000_000, 100_000_000]
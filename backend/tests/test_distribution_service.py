@@ -0,0 +1,213 @@
+"""
+DistributionService on the SQLite stand-in: batch distribution, the
+distribution rules and eligibility checks
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, text
+
+from app.services import distribution_service
+from app.services.distribution_service import DistributionService
+from app.services.reference_data import CENTERS, PACKAGES
+
+PACKAGE_ROWS = {
+    1: SimpleNamespace(package_id=1, is_active=True, validity_period_days=30),
+    2: SimpleNamespace(package_id=2, is_active=False, validity_period_days=30),
+}
+CENTER_ROWS = {
+    1: SimpleNamespace(center_id=1, status="active"),
+    2: SimpleNamespace(center_id=2, status="active"),
+    3: SimpleNamespace(center_id=3, status="maintenance"),
+}
+
+
+@pytest.fixture
+def reference(monkeypatch):
+    """Packages and centers served as if from the reference-data cache"""
+    tables = {PACKAGES: PACKAGE_ROWS, CENTERS: CENTER_ROWS}
+    monkeypatch.setattr(
+        distribution_service.reference_data, "get",
+        lambda db, name, key: tables[name].get(key)
+    )
+    monkeypatch.setattr(
+        distribution_service.reference_data, "get_many",
+        lambda db, name, keys: {key: tables[name][key] for key in keys if key in tables[name]}
+    )
+
+
+def item(household_id, package_id=1, center_id=1, quantity=1):
+    return SimpleNamespace(
+        household_id=household_id, package_id=package_id, center_id=center_id,
+        staff_id=None, quantity=quantity
+    )
+
+
+def stock(db, center_id, package_id):
+    return db.execute(
+        text("""
+            SELECT i.quantity_on_hand + COALESCE(SUM(s.quantity_on_hand), 0)
+            FROM Inventory i
+            LEFT JOIN Inventory_Shards s
+              ON s.center_id = i.center_id AND s.package_id = i.package_id
+            WHERE i.center_id = :center_id AND i.package_id = :package_id
+        """),
+        {"center_id": center_id, "package_id": package_id}
+    ).scalar()
+
+
+# ---- batch distribution -----------------------------------------------
+
+
+@pytest.fixture
+def batch(monkeypatch, reference):
+    """distribute_batch with the MySQL-only index upsert recorded instead"""
+    recorded = []
+    monkeypatch.setattr(
+        distribution_service.last_distribution, "record_distributions",
+        lambda db, log_ids: recorded.append(list(log_ids))
+    )
+    return recorded
+
+
+def test_batch_reports_every_item_in_request_order(inventory_db, add_inventory, add_household, batch):
+    add_inventory(1, 1, 5)
+    for household_id in (1, 2, 3):
+        add_household(household_id)
+    add_household(4, status="inactive")
+
+    results = DistributionService.distribute_batch(inventory_db, [
+        item(1, quantity=2),
+        item(2, quantity=10),
+        item(1),
+        item(4),
+        item(3, center_id=2),
+        item(3, quantity=3),
+    ])
+
+    assert [status for status, _, _ in results] == ["success", "error", "error", "error", "error", "success"]
+    assert results[1][1] == "Insufficient inventory. Available: 3, Requested: 10"
+    assert results[2][1].startswith("Household not eligible")
+    assert results[3][1] == "Household status is inactive"
+    assert results[4][1] == "No inventory record found for this package at this center"
+    assert stock(inventory_db, 1, 1) == 0
+
+
+def test_batch_log_ids_are_read_back_per_household(inventory_db, add_inventory, add_household, batch):
+    add_inventory(1, 1, 5)
+    for household_id in (1, 2, 3):
+        add_household(household_id)
+    # Older logs of the same households, here and at another center
+    for household_id, center_id in [(2, 1), (3, 2), (1, 1)]:
+        inventory_db.execute(
+            text("INSERT INTO Distribution_Log (household_id, package_id, center_id) VALUES (:h, 1, :c)"),
+            {"h": household_id, "c": center_id}
+        )
+    inventory_db.commit()
+
+    results = DistributionService.distribute_batch(inventory_db, [item(3), item(9), item(1), item(2)])
+
+    log_ids = [log_id for _, _, log_id in results]
+    assert log_ids[1] is None
+    households = dict(inventory_db.execute(text("SELECT log_id, household_id FROM Distribution_Log")).all())
+    assert [households[log_id] for log_id in (log_ids[0], log_ids[2], log_ids[3])] == [3, 1, 2]
+    assert min(log_ids[0], log_ids[2], log_ids[3]) > 3
+    assert batch == [[log_ids[0], log_ids[2], log_ids[3]]]
+
+
+def test_batch_takes_sharded_stock_fullest_shard_first(inventory_db, add_inventory, add_household, batch):
+    add_inventory(1, 1, 0, shards=(1, 4, 2))
+    add_household(1)
+    add_household(2)
+
+    results = DistributionService.distribute_batch(inventory_db, [item(1, quantity=3), item(2, quantity=3)])
+
+    assert [status for status, _, _ in results] == ["success", "success"]
+    shards = inventory_db.execute(text(
+        "SELECT quantity_on_hand FROM Inventory_Shards ORDER BY shard_no"
+    )).scalars().all()
+    assert shards == [0, 1, 0]
+
+
+def test_batch_with_nothing_valid_writes_nothing(inventory_db, add_inventory, add_household, batch):
+    add_inventory(1, 1, 5)
+
+    results = DistributionService.distribute_batch(inventory_db, [item(9), item(1, package_id=2)])
+
+    assert [message for _, message, _ in results] == ["Household not found", "Household not found"]
+    assert batch == []
+    assert inventory_db.execute(text("SELECT COUNT(*) FROM Distribution_Log")).scalar() == 0
+
+
+# ---- distribution rules and the one-query context ---------------------
+
+
+def ago(days):
+    return datetime.now() - timedelta(days=days)
+
+
+@pytest.mark.parametrize("household, package, center, last, expected", [
+    (None, PACKAGE_ROWS[1], CENTER_ROWS[1], None, "Household not found"),
+    (SimpleNamespace(status="suspended"), PACKAGE_ROWS[1], CENTER_ROWS[1], None, "Household status is suspended"),
+    (SimpleNamespace(status="active"), None, CENTER_ROWS[1], None, "Package not found"),
+    (SimpleNamespace(status="active"), PACKAGE_ROWS[2], CENTER_ROWS[1], None, "Package is not active"),
+    (SimpleNamespace(status="active"), PACKAGE_ROWS[1], None, None, "Distribution center not found"),
+    (SimpleNamespace(status="active"), PACKAGE_ROWS[1], CENTER_ROWS[3], None, "Center status is maintenance"),
+    (SimpleNamespace(status="active"), PACKAGE_ROWS[1], CENTER_ROWS[1], ago(10),
+     "Household not eligible. Last received 10 days ago. Must wait 20 more days."),
+    (SimpleNamespace(status="active"), PACKAGE_ROWS[1], CENTER_ROWS[1], ago(30), None),
+])
+def test_distribution_rules(household, package, center, last, expected):
+    assert distribution_service._distribution_error(household, package, center, last) == expected
+
+
+def test_load_context_reads_everything_in_one_statement(inventory_db, add_inventory, add_household, reference):
+    add_inventory(1, 1, 5, shards=(2, 3))
+    add_household(1, last_distributions={1: datetime(2026, 1, 5, 9)})
+    statements = []
+    event.listen(inventory_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    distribution_service.reference_data.set_enabled(True)
+    try:
+        context = DistributionService._load_context(inventory_db, 1, 1, center_id=1)
+        missing = DistributionService._load_context(inventory_db, 9, 1, center_id=2)
+    finally:
+        distribution_service.reference_data.set_enabled(
+            distribution_service.settings.REFERENCE_CACHE_ENABLED
+        )
+
+    assert len(statements) == 2
+    assert context.household.status == "active"
+    assert context.package is PACKAGE_ROWS[1] and context.center is CENTER_ROWS[1]
+    assert str(context.last_distribution_date).startswith("2026-01-05 09:00")
+    assert context.shard_count == 2
+    assert (missing.household, missing.shard_count, missing.last_distribution_date) == (None, None, None)
+
+
+# ---- eligibility matrix -------------------------------------------------
+
+
+def test_eligibility_matrix_matches_single_checks(inventory_db, add_household, reference, monkeypatch):
+    monkeypatch.setattr(distribution_service.settings, "ELIGIBILITY_MATRIX_CHUNK_SIZE", 2)
+    add_household(1, last_distributions={1: ago(5)})
+    add_household(2, last_distributions={1: ago(45)})
+    add_household(3, status="inactive")
+
+    matrix = DistributionService.check_eligibility_matrix(inventory_db, [3, 1, 9, 1, 2], [1, 2, 7])
+
+    assert [(h, p) for h, p, _, _ in matrix] == [
+        (h, p) for h in (3, 1, 9, 2) for p in (1, 2, 7)
+    ]
+    by_pair = {(h, p): (eligible, message) for h, p, eligible, message in matrix}
+    assert by_pair[(1, 1)] == (False, "Must wait 25 more days")
+    assert by_pair[(2, 1)] == (True, "Last received 45 days ago - ELIGIBLE")
+    assert by_pair[(3, 1)] == (False, "Household is inactive")
+    assert by_pair[(9, 1)] == (False, "Household not found")
+    assert by_pair[(2, 2)] == (False, "Package is not active")
+    assert by_pair[(2, 7)] == (False, "Package not found")
+    for household_id, package_id in [(1, 1), (2, 1), (3, 1)]:
+        assert DistributionService.check_eligibility(inventory_db, household_id, package_id) == by_pair[
+            (household_id, package_id)
+        ]
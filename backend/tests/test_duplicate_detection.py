@@ -0,0 +1,153 @@
+"""
+Duplicate detection: blocking, MinHash scoring, clustering and scan jobs
+"""
+
+import numpy as np
+
+from app.services import duplicate_detection
+from app.services.duplicate_detection import _find
+
+from tests.fakes import FakeResult, FakeSession
+
+
+def record(household_id, name, address, zip_code="62701", phone="555-0100", size=3):
+    return (household_id, name, name, address, zip_code, "Springfield", phone, size)
+
+
+def test_soundex():
+    assert duplicate_detection.soundex("Robert") == "R163"
+    assert duplicate_detection.soundex("Rupert") == "R163"
+    assert duplicate_detection.soundex("") == ""
+
+
+def test_minhash_signatures_agree_on_equal_values_only():
+    names, addresses = duplicate_detection.signatures(
+        ["Jane Doe", "jane  doe", "Bob Stone"], ["1 Main St", "1 main st.", "9 Elm Rd"]
+    )
+    assert np.array_equal(names[0], names[1])
+    assert np.array_equal(addresses[0], addresses[1])
+    assert np.mean(names[0] == names[2]) < 0.5
+
+
+def test_find_pairs_scores_near_duplicates_in_one_block():
+    records = [
+        record(1, "Jane Doe", "1 Main St"),
+        record(2, "Jane Doe", "1 Main Street"),
+        record(3, "Bob Stone", "9 Elm Rd", zip_code="10001", phone="555-0199", size=1),
+    ]
+    blocks, _ = duplicate_detection.build_blocks(records, low=0)
+
+    found, _ = duplicate_detection.find_pairs(blocks, low=0, workers=1)
+
+    assert set(found) == {(1, 2)}
+
+
+def test_union_find_joins_chains():
+    parent = {}
+    for a, b in [(1, 2), (2, 3), (5, 6)]:
+        parent[_find(parent, a)] = _find(parent, b)
+
+    assert _find(parent, 1) == _find(parent, 3)
+    assert _find(parent, 1) != _find(parent, 5)
+
+
+def test_store_reads_the_new_cluster_ids_back():
+    db = FakeSession([
+        ("MAX(cluster_id)", FakeResult([(99,)])),
+        # Not consecutive: another table's inserts interleaved
+        ("cluster_id > :before", FakeResult([(100,), (102,)])),
+    ])
+    found = {
+        (1, 2): (1, 2, 0.9, "k"),
+        (2, 3): (2, 3, 0.8, "k"),
+        (5, 6): (5, 6, 0.95, "k"),
+    }
+
+    stored, created, merged = duplicate_detection._store(db, found)
+
+    assert (stored, created, merged) == (3, 2, 0)
+    assert db.executed("cluster_id > :before")[0][1] == {"before": 99}
+    (_, rows), = db.executed("INSERT IGNORE INTO Duplicate_Pairs")
+    assert {(row["a"], row["b"]): row["cluster_id"] for row in rows} == {
+        (1, 2): 100, (2, 3): 100, (5, 6): 102
+    }
+
+
+def test_store_adds_pairs_to_a_pending_cluster_they_touch():
+    db = FakeSession([
+        ("c.status = 'pending'", FakeResult([(8, 10, 9)])),
+    ])
+
+    stored, created, merged = duplicate_detection._store(db, {(7, 8): (7, 8, 0.9, "k")})
+
+    assert (stored, created, merged) == (1, 0, 0)
+    assert not db.executed("INSERT INTO Duplicate_Clusters")
+    (_, rows), = db.executed("INSERT IGNORE INTO Duplicate_Pairs")
+    assert rows[0]["cluster_id"] == 9
+
+
+def test_detect_advances_the_household_watermark(monkeypatch):
+    db = FakeSession([
+        ("SELECT last_household_id FROM Job_Watermarks", FakeResult([(10,)])),
+        ("MAX(household_id)", FakeResult([(20,)])),
+    ])
+    monkeypatch.setattr(duplicate_detection, "_load_records", lambda db, low, high, full: [])
+    monkeypatch.setattr(duplicate_detection, "find_pairs", lambda blocks, low, workers: ({}, 0))
+
+    status, _, summary = duplicate_detection.detect_duplicates(db)
+
+    assert status == "success"
+    assert (summary["households_from"], summary["households_to"]) == (10, 20)
+    (_, params), = db.executed("UPDATE Job_Watermarks SET last_household_id")
+    assert params == {"high": 20, "job": "duplicate_detection"}
+    assert db.commits == 1
+
+
+def test_find_pairs_signs_in_the_shared_pool(monkeypatch):
+    class Pool:
+        calls = 0
+
+        def map(self, fn, *iterables):
+            Pool.calls += 1
+            return map(fn, *iterables)
+
+    monkeypatch.setattr(duplicate_detection, "_pool", Pool())
+    monkeypatch.setattr(duplicate_detection.settings, "DUPLICATE_CHUNK_SIZE", 1)
+    records = [record(1, "Jane Doe", "1 Main St"), record(2, "Jane Doe", "1 Main Street")]
+    blocks, _ = duplicate_detection.build_blocks(records, low=0)
+
+    found, _ = duplicate_detection.find_pairs(blocks, low=0, workers=4)
+
+    assert set(found) == {(1, 2)}
+    assert Pool.calls == 1
+
+
+def test_run_scan_starts_the_pool_and_records_the_outcome(monkeypatch):
+    db = FakeSession([("SELECT full_scan", FakeResult([(1,)]))])
+    monkeypatch.setattr("app.core.database.SessionLocal", lambda: db)
+    runs = []
+
+    def detect(session, full=False):
+        runs.append(full)
+        return ("busy", "Another duplicate detection run is in progress", None)
+
+    monkeypatch.setattr(duplicate_detection, "detect_duplicates", detect)
+    monkeypatch.setattr(duplicate_detection.settings, "DUPLICATE_WORKERS", 4)
+    monkeypatch.setattr(duplicate_detection, "_pool", None)
+    pools = []
+    monkeypatch.setattr(duplicate_detection, "_new_pool", lambda workers: pools.append(workers) or object())
+
+    duplicate_detection.run_scan(5)
+
+    assert runs == [True]
+    assert pools == [4] and duplicate_detection._pool is not None
+    (_, params), = db.executed("SET status = :status")
+    assert params == {
+        "job_id": 5,
+        "status": "busy",
+        "message": "Another duplicate detection run is in progress",
+        "summary": None,
+    }
+    assert db.executed("status = 'running'")
+    assert db.commits == 2
+    assert db.closed
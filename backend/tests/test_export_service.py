@@ -0,0 +1,91 @@
+"""
+Streaming exports: encoding, incremental gzip and the report filters
+"""
+
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.exports import report_sql
+from app.core.config import settings
+from app.services import export_service
+from app.services.export_service import _encode, date_range_params, stream_query
+
+PARTITIONS = [
+    [(1, "Food, Box", date(2026, 1, 5), None)],
+    [(2, "Kit", datetime(2026, 1, 6, 9, 30), Decimal("2.50")), (3, "Bag", date(2026, 1, 7), Decimal("40"))],
+]
+
+
+def test_csv_has_a_header_and_one_chunk_per_batch():
+    chunks = list(_encode(["id", "name", "when", "value"], PARTITIONS, "csv"))
+
+    assert len(chunks) == 2
+    assert b"".join(chunks).decode().splitlines() == [
+        "id,name,when,value",
+        '1,"Food, Box",2026-01-05,',
+        "2,Kit,2026-01-06T09:30:00,2.50",
+        "3,Bag,2026-01-07,40",
+    ]
+
+
+def test_ndjson_serializes_dates_and_decimals():
+    lines = b"".join(_encode(["id", "name", "when", "value"], PARTITIONS, "ndjson")).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "name": "Food, Box", "when": "2026-01-05", "value": None},
+        {"id": 2, "name": "Kit", "when": "2026-01-06T09:30:00", "value": 2.5},
+        {"id": 3, "name": "Bag", "when": "2026-01-07", "value": 40},
+    ]
+    assert lines[2].endswith(b'"value": 40}')
+
+
+def test_date_range_is_half_open():
+    assert date_range_params(date(2026, 1, 1), date(2026, 1, 31)) == {
+        "start": datetime(2026, 1, 1),
+        "end": datetime(2026, 2, 1),
+    }
+    assert date_range_params(None, None) == {"start": None, "end": None}
+
+
+@pytest.fixture
+def export_db(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE t (id INTEGER, name TEXT)")
+        connection.exec_driver_sql(
+            "INSERT INTO t VALUES " + ", ".join(f"({i}, 'n{i}')" for i in range(25))
+        )
+    monkeypatch.setattr(export_service, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 10)
+    yield
+    engine.dispose()
+
+
+def test_stream_query_reads_in_batches_and_gzips(export_db):
+    plain = list(stream_query("SELECT id, name FROM t WHERE id >= :low ORDER BY id", {"low": 5}, "csv"))
+    packed = b"".join(stream_query("SELECT id, name FROM t WHERE id >= :low ORDER BY id", {"low": 5}, "csv", gzip=True))
+
+    assert len(plain) == 2
+    assert gzip.decompress(packed) == b"".join(plain)
+    lines = b"".join(plain).decode().splitlines()
+    assert lines[0] == "id,name" and lines[1] == "5,n5" and len(lines) == 21
+
+
+def test_report_sql_filters():
+    sql, params = report_sql("monthly-summary", date(2026, 1, 15), date(2026, 3, 1), center_id=2)
+
+    assert "FROM vw_monthly_summary" in sql
+    assert params == {"start_month": 202601, "end_month": 202603, "center_id": 2}
+
+    with pytest.raises(HTTPException):
+        report_sql("distribution-statistics", start_date=date(2026, 1, 1))
+    with pytest.raises(HTTPException):
+        report_sql("pending-households", center_id=1)
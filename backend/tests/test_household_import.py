@@ -0,0 +1,93 @@
+"""
+Household import: file parsing, validation, duplicates and the new ids
+"""
+
+import io
+from collections import namedtuple
+
+from app.services import household_import
+
+from tests.fakes import FakeResult, FakeSession
+
+PhoneId = namedtuple("PhoneId", "phone_number household_id")
+
+
+def household(phone, **overrides):
+    row = {
+        "family_name": "Doe",
+        "primary_contact_name": "Jane Doe",
+        "phone_number": phone,
+        "address": "1 Main St",
+        "city": "Springfield",
+        "state": "IL",
+        "zip_code": "62701",
+        "family_size": 3,
+        "income_level": "low",
+        "registration_date": "2026-01-05",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_read_rows_parses_csv_and_reports_bad_ndjson_lines():
+    csv_rows = list(household_import.read_rows(
+        io.BytesIO(b"family_name,phone_number,email\nDoe,555-0100,\n"), "csv"
+    ))
+    assert csv_rows == [(2, {"family_name": "Doe", "phone_number": "555-0100"}, None)]
+
+    ndjson_rows = list(household_import.read_rows(io.BytesIO(b'{"a": 1}\n\n[1]\n{oops\n'), "ndjson"))
+    assert ndjson_rows[0] == (1, {"a": 1}, None)
+    assert [(line, error) for line, _, error in ndjson_rows[1:]] == [
+        (3, "Each line must be a JSON object"),
+        (4, "Invalid JSON: Expecting property name enclosed in double quotes"),
+    ]
+
+
+def test_import_reads_the_new_ids_back_by_phone_number():
+    db = FakeSession([
+        # Ids come back in any order and need not be consecutive
+        ("phone_number, \"Households\".household_id", FakeResult([
+            PhoneId("555-0102", 40), PhoneId("555-0101", 17),
+        ])),
+        ("SELECT \"Households\".phone_number", FakeResult([("555-0103",)])),
+    ])
+    rows = [
+        (1, household("555-0101"), None),
+        (2, household("555-0102"), None),
+        (3, household("555-0103"), None),
+        (4, household("555-0101"), None),
+        (5, household("555-0104", family_size="many"), None),
+    ]
+
+    summary = household_import.import_households(db, rows)
+
+    assert summary["created"] == 2
+    assert [(entry["line"], entry["status"], entry.get("household_id")) for entry in summary["rows"]] == [
+        (1, "created", 17),
+        (2, "created", 40),
+        (3, "error", None),
+        (4, "error", None),
+        (5, "error", None),
+    ]
+    assert summary["rows"][3]["message"] == "Phone number already used on line 1"
+    assert db.commits == 1
+
+
+def test_rows_past_the_limit_and_invalid_rows_are_reported(monkeypatch):
+    monkeypatch.setattr(household_import.settings, "HOUSEHOLD_IMPORT_CHUNK_SIZE", 2)
+    db = FakeSession()
+    rows = [
+        (1, household("555-0101", family_size="many"), None),
+        (2, None, "Invalid JSON: Expecting value"),
+        (3, household("555-0101", family_size="many"), None),
+    ]
+
+    summary = household_import.import_households(db, rows, max_rows=2)
+
+    assert (summary["total"], summary["created"], summary["rejected"]) == (3, 0, 3)
+    assert [entry["message"] for entry in summary["rows"]] == [
+        "family_size: Input should be a valid integer, unable to parse string as an integer",
+        "Invalid JSON: Expecting value",
+        "Import is limited to 2 rows",
+    ]
+    assert db.commits == 0
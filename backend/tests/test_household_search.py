@@ -0,0 +1,72 @@
+"""
+Household search: query parsing and the timeout path
+"""
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.services import household_search
+from app.services.household_search import parse_query
+
+from tests.fakes import FakeResult, FakeSession
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("555-0142", ("phone", {"reversed": "2410555%", "digits": 7})),
+    ("(555) 014", ("phone", {"reversed": "410555%", "digits": 6})),
+    ("garcia maple", ("text", {"terms": "+garcia +maple"})),
+    ("O'Brien 42 Elm", ("text", {"terms": "+Brien +42 +Elm"})),
+    ('+garcia -"maple st"*', ("text", {"terms": "+garcia +maple +st"})),
+])
+def test_parse_query(query, expected):
+    assert parse_query(query) == expected
+
+
+def test_parse_query_rejects_short_input():
+    assert parse_query("42") == (
+        None, f"Phone searches need at least {settings.HOUSEHOLD_SEARCH_MIN_DIGITS} digits"
+    )
+    assert parse_query("a b") == (None, "Search terms need at least 2 characters")
+
+
+def test_parse_query_keeps_the_first_terms():
+    _, params = parse_query(" ".join(f"w{i}" for i in range(12)))
+
+    assert params["terms"].split() == [f"+w{i}" for i in range(household_search.MAX_TERMS)]
+
+
+def test_search_caps_the_limit_and_filters_status():
+    db = FakeSession([("FROM Households h", FakeResult([{"household_id": 3, "score": 0.5714285}]))])
+
+    status, _, result = household_search.search_households(db, "555-0142", limit=10_000, status="active")
+
+    assert status == "success"
+    assert result["match"] == "phone"
+    assert result["households"] == [{"household_id": 3, "score": 0.5714}]
+    (sql, params), = db.statements
+    assert "MAX_EXECUTION_TIME" in sql and "AND h.status = :status" in sql
+    assert params["limit"] == settings.HOUSEHOLD_SEARCH_MAX_RESULTS
+
+
+def test_search_reports_a_server_timeout():
+    class TimedOut(Exception):
+        pass
+
+    def timeout(params):
+        raise OperationalError("SELECT", params, TimedOut(household_search.ER_QUERY_TIMEOUT, "timeout"))
+
+    db = FakeSession([("FROM Households h", timeout)])
+
+    status, message, result = household_search.search_households(db, "garcia", limit=10)
+
+    assert (status, result) == ("timeout", None)
+    assert str(settings.HOUSEHOLD_SEARCH_TIMEOUT_MS) in message
+    assert db.rollbacks == 1
+
+
+def test_search_rejects_a_bad_query_without_sql():
+    db = FakeSession()
+
+    assert household_search.search_households(db, " x ", limit=10)[0] == "error"
+    assert db.statements == []
@@ -0,0 +1,148 @@
+"""
+Idempotency keys: lookup/replay, claim, the stored response and claim
+release on failed distributions
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+import json
+import time
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.services import idempotency
+from app.services.distribution_service import DistributionService
+from app.services.idempotency import IdempotentRequest
+from app.services.inventory_strategies import PessimisticStrategy
+from tests.fakes import FakeResult, FakeSession
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    idempotency.idempotency_cache.clear()
+    yield
+    idempotency.idempotency_cache.clear()
+
+
+def _stored(request_hash, response, ttl=600):
+    row = SimpleNamespace(request_hash=request_hash, response=json.dumps(response), ttl=ttl)
+    return FakeResult([row])
+
+
+def test_lookup_new_key():
+    db = FakeSession()
+
+    assert idempotency.lookup(db, IdempotentRequest("k", "h"))[0] == "new"
+    assert db.rollbacks == 1
+
+
+def test_lookup_replays_and_caches_the_stored_response():
+    response = {"status": "success", "message": "ok", "log_id": 7, "distribution_date": "2024-03-01T10:00:00"}
+    db = FakeSession([("FROM Idempotency_Keys", _stored("h", response))])
+    request = IdempotentRequest("k", "h")
+
+    assert idempotency.lookup(db, request)[0] == "replay"
+    assert request.response == response
+
+    # Second lookup is answered from the cache
+    again = IdempotentRequest("k", "h")
+    assert idempotency.lookup(FakeSession(), again)[0] == "replay"
+    assert again.response == response
+
+
+def test_lookup_conflict_on_different_body():
+    db = FakeSession([("FROM Idempotency_Keys", _stored("other", {"status": "success"}))])
+
+    assert idempotency.lookup(db, IdempotentRequest("k", "h"))[0] == "conflict"
+
+
+def test_lookup_ignores_expired_cache_entries():
+    idempotency.idempotency_cache.set("k", ("h", {"status": "success"}, time.time() - 1))
+
+    assert idempotency.lookup(FakeSession(), IdempotentRequest("k", "h"))[0] == "new"
+
+
+def _duplicate(params):
+    raise IntegrityError("INSERT INTO Idempotency_Keys", params, Exception(1062, "Duplicate"))
+
+
+def test_claim_taken_key():
+    db = FakeSession([("INSERT INTO Idempotency_Keys", _duplicate)])
+
+    assert idempotency.claim(db, IdempotentRequest("k", "h")) is False
+
+
+def test_claim_reclaims_an_expired_key():
+    inserts = []
+
+    def insert(params):
+        inserts.append(params)
+        if len(inserts) == 1:
+            _duplicate(params)
+        return FakeResult()
+
+    db = FakeSession([
+        ("INSERT INTO Idempotency_Keys", insert),
+        ("DELETE FROM Idempotency_Keys", FakeResult(rowcount=1)),
+    ])
+
+    assert idempotency.claim(db, IdempotentRequest("k", "h")) is True
+    assert len(inserts) == 2
+
+
+def test_complete_stores_the_log_rows_distribution_date():
+    written = datetime(2024, 3, 1, 10, 15, 30)
+    db = FakeSession([("FROM Distribution_Log", FakeResult([(written,)]))])
+    request = IdempotentRequest("k", "h")
+
+    idempotency.complete(db, request, "success", "done", 42)
+
+    (_, params), = db.executed("UPDATE Idempotency_Keys")
+    stored = json.loads(params["response"])
+    assert stored == request.response
+    assert stored["distribution_date"] == "2024-03-01T10:15:30"
+    assert params["log_id"] == 42
+
+
+def test_failed_validation_rolls_back_the_claim(monkeypatch):
+    db = FakeSession()
+    monkeypatch.setattr(
+        DistributionService, "_load_context",
+        staticmethod(lambda *args, **kwargs: SimpleNamespace(
+            household=None, package=None, center=None,
+            last_distribution_date=None, shard_count=None
+        ))
+    )
+
+    result = DistributionService._distribute_once(
+        db, PessimisticStrategy(), 1, 1, 1, None, 1, IdempotentRequest("k", "h")
+    )
+
+    assert result == ("error", "Household not found", None)
+    assert db.executed("INSERT INTO Idempotency_Keys")
+    assert db.rollbacks == 1
+    assert db.commits == 0
+
+
+def test_failed_reserve_rolls_back_the_claim(monkeypatch):
+    db = FakeSession()
+    active = SimpleNamespace(status="active", is_active=True, validity_period_days=30)
+    monkeypatch.setattr(
+        DistributionService, "_load_context",
+        staticmethod(lambda *args, **kwargs: SimpleNamespace(
+            household=active, package=active, center=active,
+            last_distribution_date=None, shard_count=1
+        ))
+    )
+    monkeypatch.setattr(
+        DistributionService, "_reserve_inventory",
+        staticmethod(lambda *args: "Insufficient inventory. Available: 0, Requested: 1")
+    )
+
+    status, message, _ = DistributionService._distribute_once(
+        db, PessimisticStrategy(), 1, 1, 1, None, 1, IdempotentRequest("k", "h")
+    )
+
+    assert (status, message) == ("error", "Insufficient inventory. Available: 0, Requested: 1")
+    assert db.rollbacks == 1
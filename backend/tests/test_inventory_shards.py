@@ -0,0 +1,127 @@
+"""
+Sharded inventory: resharding and taking stock from shards
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import Inventory, InventoryShard
+from app.services import distribution_service
+from app.services.distribution_service import DistributionService, _take_from_shards
+from app.services.inventory_strategies import PessimisticStrategy
+
+
+def _shards(db):
+    db.expire_all()
+    return [
+        shard.quantity_on_hand
+        for shard in db.query(InventoryShard).order_by(InventoryShard.shard_no)
+    ]
+
+
+def test_set_shard_count_spreads_and_merges_stock(inventory_db, add_inventory):
+    add_inventory(1, 1, 10)
+
+    assert DistributionService.set_shard_count(inventory_db, 1, 1, 4)[0] == "success"
+    assert _shards(inventory_db) == [3, 3, 2, 2]
+    assert inventory_db.query(Inventory.quantity_on_hand, Inventory.shard_count).one() == (0, 4)
+
+    assert DistributionService.set_shard_count(inventory_db, 1, 1, 1)[0] == "success"
+    assert _shards(inventory_db) == []
+    assert inventory_db.query(Inventory.quantity_on_hand, Inventory.shard_count).one() == (10, 1)
+
+
+def test_take_from_shards_empties_fullest_first():
+    shards = [SimpleNamespace(quantity_on_hand=q) for q in (2, 5, 3)]
+
+    _take_from_shards(shards, 7)
+
+    assert [shard.quantity_on_hand for shard in shards] == [2, 0, 1]
+
+
+def test_reserve_from_one_shard_that_covers_the_quantity(inventory_db, add_inventory, monkeypatch):
+    add_inventory(1, 1, 0, shards=(1, 4, 4))
+    monkeypatch.setattr(distribution_service.random, "randrange", lambda n: 2)
+
+    message = DistributionService._reserve_from_shards(
+        inventory_db, PessimisticStrategy(), 1, 1, 3, 3
+    )
+    inventory_db.commit()
+
+    assert message is None
+    assert _shards(inventory_db) == [1, 4, 1]
+
+
+def test_reserve_wraps_around_from_the_random_start(inventory_db, add_inventory, monkeypatch):
+    add_inventory(1, 1, 0, shards=(5, 1, 1))
+    monkeypatch.setattr(distribution_service.random, "randrange", lambda n: 1)
+
+    assert DistributionService._reserve_from_shards(
+        inventory_db, PessimisticStrategy(), 1, 1, 3, 3
+    ) is None
+    inventory_db.commit()
+
+    assert _shards(inventory_db) == [2, 1, 1]
+
+
+def test_reserve_across_shards_when_none_covers_it_alone(inventory_db, add_inventory):
+    add_inventory(1, 1, 0, shards=(2, 3, 2))
+
+    assert DistributionService._reserve_from_shards(
+        inventory_db, PessimisticStrategy(), 1, 1, 6, 3
+    ) is None
+    inventory_db.commit()
+
+    assert sum(_shards(inventory_db)) == 1
+
+
+def test_reserve_reports_insufficient_total(inventory_db, add_inventory):
+    add_inventory(1, 1, 0, shards=(2, 3))
+
+    message = DistributionService._reserve_from_shards(
+        inventory_db, PessimisticStrategy(), 1, 1, 6, 2
+    )
+
+    assert message == "Insufficient inventory. Available: 5, Requested: 6"
+    assert _shards(inventory_db) == [2, 3]
+
+
+def test_reserve_falls_back_to_row_when_sharding_was_switched_off(inventory_db, add_inventory):
+    add_inventory(1, 1, 8)
+
+    assert DistributionService._reserve_from_shards(
+        inventory_db, PessimisticStrategy(), 1, 1, 3, 4
+    ) is None
+    inventory_db.commit()
+
+    assert inventory_db.query(Inventory.quantity_on_hand).scalar() == 5
+
+
+def test_reserve_uses_the_shards_when_the_row_was_sharded_after_validation(inventory_db, add_inventory):
+    add_inventory(1, 1, 0, shards=(2, 5))
+
+    # shard_count = 1 is what validation read before the resharding committed
+    assert DistributionService._reserve_inventory(
+        inventory_db, PessimisticStrategy(), 1, 1, 3, 1
+    ) is None
+    inventory_db.commit()
+
+    assert _shards(inventory_db) == [2, 2]
+
+
+def test_reserve_still_reports_insufficient_stock_on_an_unsharded_row(inventory_db, add_inventory):
+    add_inventory(1, 1, 2)
+
+    assert DistributionService._reserve_inventory(
+        inventory_db, PessimisticStrategy(), 1, 1, 3, 1
+    ) == "Insufficient inventory. Available: 2, Requested: 3"
+
+
+def test_stock_of_a_sharded_row_cannot_be_written_directly(inventory_db, add_inventory):
+    add_inventory(1, 1, 0, shards=(2, 5))
+    inventory = inventory_db.query(Inventory).one()
+
+    with pytest.raises(ValueError):
+        inventory.quantity_on_hand = 7
+    inventory.quantity_on_hand = 0
@@ -0,0 +1,84 @@
+"""
+Inventory strategies: decrement, insufficient stock and lost races
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Inventory
+from app.services.inventory_strategies import (
+    ConditionalUpdateStrategy,
+    InventoryConflict,
+    InventoryStrategy,
+    OptimisticStrategy,
+    PessimisticStrategy
+)
+
+STRATEGIES = [PessimisticStrategy, OptimisticStrategy, ConditionalUpdateStrategy]
+
+
+def _row(db):
+    db.expire_all()
+    return db.query(Inventory.quantity_on_hand, Inventory.version).one()
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_reserve_decrements_and_bumps_version(inventory_db, add_inventory, strategy_class):
+    add_inventory(1, 1, 10)
+    strategy = strategy_class()
+
+    assert strategy.reserve(inventory_db, 1, 1, 3) is None
+    inventory_db.commit()
+
+    assert tuple(_row(inventory_db)) == (7, 2)
+    assert strategy.stats.snapshot()["successes"] == 1
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_reserve_reports_insufficient_stock(inventory_db, add_inventory, strategy_class):
+    add_inventory(1, 1, 2)
+    strategy = strategy_class()
+
+    message = strategy.reserve(inventory_db, 1, 1, 3)
+
+    assert message == "Insufficient inventory. Available: 2, Requested: 3"
+    assert tuple(_row(inventory_db)) == (2, 1)
+    assert strategy.stats.snapshot()["insufficient"] == 1
+
+
+@pytest.mark.parametrize("strategy_class", STRATEGIES)
+def test_reserve_without_inventory_row(inventory_db, strategy_class):
+    message = strategy_class().reserve(inventory_db, 1, 1, 1)
+
+    assert message == "No inventory record found for this package at this center"
+
+
+def test_optimistic_conflict_when_row_changes_after_read(inventory_db, add_inventory):
+    add_inventory(1, 1, 10)
+    strategy = OptimisticStrategy()
+    engine = inventory_db.get_bind()
+
+    # Another writer commits between our read and our compare-and-set
+    def concurrent_write(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT"):
+            cursor.connection.execute(
+                "UPDATE Inventory SET quantity_on_hand = quantity_on_hand - 1, version = version + 1"
+            )
+
+    event.listen(engine, "after_cursor_execute", concurrent_write)
+    try:
+        with pytest.raises(InventoryConflict):
+            strategy.reserve(inventory_db, 1, 1, 3)
+    finally:
+        event.remove(engine, "after_cursor_execute", concurrent_write)
+
+    assert strategy.stats.snapshot()["conflicts"] == 1
+    assert strategy.stats.snapshot()["successes"] == 0
+
+
+def test_a_strategy_must_implement_reserve():
+    class Incomplete(InventoryStrategy):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
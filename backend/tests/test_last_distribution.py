@@ -0,0 +1,135 @@
+"""
+Last-distribution index: the consistency checker against the log, and the
+writers' statements
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.services import last_distribution
+
+from tests.fakes import FakeSession
+
+_DDL = [
+    """
+    CREATE TABLE Distribution_Log (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        household_id INTEGER NOT NULL,
+        package_id INTEGER NOT NULL,
+        distribution_date TIMESTAMP NOT NULL,
+        transaction_status TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE Household_Package_Last (
+        household_id INTEGER NOT NULL,
+        package_id INTEGER NOT NULL,
+        last_distribution_date TIMESTAMP NOT NULL,
+        next_eligible_date DATE NOT NULL,
+        last_log_id INTEGER,
+        distribution_count INTEGER NOT NULL,
+        PRIMARY KEY (household_id, package_id)
+    )
+    """,
+]
+
+
+@pytest.fixture
+def log_db():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        for ddl in _DDL:
+            connection.exec_driver_sql(ddl)
+    db = Session(engine)
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def log(db, household_id, package_id, when, status="success"):
+    db.execute(
+        text("""
+            INSERT INTO Distribution_Log (household_id, package_id, distribution_date, transaction_status)
+            VALUES (:h, :p, :when, :status)
+        """),
+        {"h": household_id, "p": package_id, "when": when, "status": status}
+    )
+
+
+def index(db, household_id, package_id, when, count):
+    db.execute(
+        text("""
+            INSERT INTO Household_Package_Last VALUES (:h, :p, :when, '2027-01-01', NULL, :count)
+        """),
+        {"h": household_id, "p": package_id, "when": when, "count": count}
+    )
+
+
+def test_find_inconsistencies_reports_missing_extra_and_stale_rows(log_db):
+    jan, feb = datetime(2026, 1, 5, 10), datetime(2026, 2, 5, 10)
+    # (1, 1): consistent; a failed attempt does not count
+    log(log_db, 1, 1, jan)
+    log(log_db, 1, 1, feb, status="failed")
+    index(log_db, 1, 1, jan, 1)
+    # (2, 1): index missed the newer distribution
+    log(log_db, 2, 1, jan)
+    log(log_db, 2, 1, feb)
+    index(log_db, 2, 1, jan, 1)
+    # (3, 1): no index row; (4, 1): index row without log rows
+    log(log_db, 3, 1, jan)
+    index(log_db, 4, 1, jan, 1)
+
+    mismatches = last_distribution.find_inconsistencies(log_db)
+
+    assert sorted((row["household_id"], row["log_count"], row["index_count"]) for row in mismatches) == [
+        (2, 2, 1), (3, 1, None), (4, None, 1)
+    ]
+
+
+def test_find_inconsistencies_respects_the_limit(log_db):
+    for household_id in range(1, 6):
+        log(log_db, household_id, 1, datetime(2026, 1, 5))
+
+    assert len(last_distribution.find_inconsistencies(log_db, limit=3)) == 3
+
+
+def test_record_distributions_skips_empty_batches():
+    db = FakeSession()
+
+    last_distribution.record_distributions(db, [])
+
+    assert db.statements == []
+
+
+def test_record_distributions_updates_the_index_and_the_queue():
+    db = FakeSession()
+
+    last_distribution.record_distributions(db, iter([7, 9]))
+
+    assert [params for _, params in db.executed("log_ids")] == [{"log_ids": [7, 9]}] * 2
+    assert db.executed("INSERT INTO Household_Package_Last")
+
+
+def test_rebuild_pairs_deletes_and_recomputes_only_those_pairs():
+    db = FakeSession()
+
+    last_distribution.rebuild(db, [(5, 2), (3, 1), (5, 2)])
+
+    (delete_sql, params), = db.executed("DELETE FROM Household_Package_Last")
+    assert "(household_id = :h0 AND package_id = :p0) OR (household_id = :h1 AND package_id = :p1)" in delete_sql
+    assert params == {"h0": 3, "p0": 1, "h1": 5, "p1": 2}
+    (insert_sql, _), = db.executed("INSERT INTO Household_Package_Last")
+    assert "AND ((household_id = :h0" in insert_sql
+
+
+def test_rebuild_nothing():
+    db = FakeSession()
+
+    assert last_distribution.rebuild(db, []) == 0
+    assert db.statements == []
@@ -0,0 +1,78 @@
+"""
+Prometheus instrumentation: pool gauges, checkout waits, route templates
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core import metrics
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class LabelledPool(metrics.TimedQueuePool):
+    metrics_engine = "test"
+
+
+def test_pool_gauges_and_checkout_waits(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=LabelledPool, pool_size=1, max_overflow=2
+    )
+    metrics.instrument_pool(engine, "test")
+    waits = sample("aidtracker_db_pool_wait_seconds_count", engine="test")
+    try:
+        first, second = engine.connect(), engine.connect()
+        first.execute(text("SELECT 1"))
+        assert sample("aidtracker_db_pool_checked_out", engine="test") == 2
+        assert sample("aidtracker_db_pool_overflow", engine="test") == 1
+        first.close()
+        second.close()
+        assert sample("aidtracker_db_pool_checked_out", engine="test") == 0
+        assert sample("aidtracker_db_pool_wait_seconds_count", engine="test") == waits + 2
+    finally:
+        engine.dispose()
+
+
+def test_requests_are_recorded_under_the_route_template():
+    app = FastAPI()
+
+    @app.get("/households/{household_id}")
+    def household(household_id: int):
+        return {"household_id": household_id}
+
+    instrumented = metrics.MetricsMiddleware(app)
+    labels = {"method": "GET", "route": "/households/{household_id}", "status": "200"}
+    before = sample("aidtracker_http_request_duration_seconds_count", **labels)
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for household_id in (1, 2):
+        scope = {
+            "type": "http", "method": "GET", "path": f"/households/{household_id}",
+            "raw_path": f"/households/{household_id}".encode(), "query_string": b"",
+            "headers": [], "scheme": "http", "server": ("test", 80), "root_path": "",
+        }
+        asyncio.run(instrumented(scope, receive, send))
+
+    assert sample("aidtracker_http_request_duration_seconds_count", **labels) == before + 2
+
+
+def test_distribution_phases_and_render():
+    before = sample("aidtracker_distribution_transaction_seconds_count", phase="lock")
+
+    metrics.observe_distribution_phase("lock", 0.002)
+    metrics.observe_inventory_lock_wait(1, 7, 0.002)
+
+    assert sample("aidtracker_distribution_transaction_seconds_count", phase="lock") == before + 1
+    body, content_type = metrics.render_metrics()
+    assert content_type.startswith("text/plain")
+    assert b'aidtracker_inventory_lock_wait_seconds_count{center_id="1",package_id="7"}' in body
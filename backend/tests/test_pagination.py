@@ -0,0 +1,126 @@
+"""
+Keyset pagination helpers and the list endpoints' defaults
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import mysql
+
+from app.api.distribution import LOG_KEYS, history_page_size, logs_statement, log_sort_key
+from app.api.inventory import _inventory_status
+from app.core.config import settings
+from app.core.pagination import (
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    next_cursor,
+    page_size
+)
+from app.models import DistributionLog
+from app.schemas.distribution import DistributionLogResponse
+from tests.fakes import FakeResult, FakeSession
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_cursor_round_trip_keeps_types():
+    values = (datetime(2024, 3, 1, 10, 30, 5), date(2024, 3, 1), 42, "x")
+
+    cursor = encode_cursor(values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 4) == values
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor([1, 2]), "e30"])
+def test_malformed_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 3)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("limit, expected", [(0, 1), (-5, 1), (50, 50), (10**9, None)])
+def test_page_size_is_clamped(limit, expected):
+    assert page_size(limit) == (settings.MAX_PAGE_SIZE if expected is None else expected)
+
+
+def test_keyset_after_expands_to_a_range():
+    condition = keyset_after(
+        (DistributionLog.distribution_date, DistributionLog.log_id),
+        (datetime(2024, 3, 1), 42),
+        descending=True
+    )
+
+    sql = " ".join(_sql(condition).split())
+    assert sql == (
+        "`Distribution_Log`.distribution_date < '2024-03-01 00:00:00' OR "
+        "`Distribution_Log`.distribution_date = '2024-03-01 00:00:00' AND "
+        "`Distribution_Log`.log_id < 42"
+    )
+
+
+def test_next_cursor_only_when_an_extra_row_was_read():
+    rows = [SimpleNamespace(distribution_date=datetime(2024, 3, i), log_id=i) for i in (3, 2, 1)]
+
+    assert next_cursor(rows, 3, log_sort_key) is None
+    assert decode_cursor(next_cursor(rows, 2, log_sort_key), 2) == (datetime(2024, 3, 2), 2)
+
+
+def test_household_history_is_complete_unless_paging_is_asked_for():
+    assert history_page_size(None, None) is None
+    assert history_page_size(None, "abc") == 100
+    assert history_page_size(10, None) == 10
+    assert history_page_size(10**9, None) == settings.MAX_PAGE_SIZE
+
+    assert "LIMIT" not in _sql(logs_statement(None, household_id=1))
+    assert "LIMIT 11" in _sql(logs_statement(10, household_id=1))
+
+
+def test_log_rows_carry_every_response_field():
+    assert set(LOG_KEYS) == set(DistributionLogResponse.model_fields)
+    assert "notes" in LOG_KEYS
+
+
+def test_count_rows_modes():
+    db = FakeSession([("information_schema.TABLES", FakeResult([(1234,)]))])
+
+    assert count_rows(db, DistributionLog, "none") is None
+    assert count_rows(db, DistributionLog, "estimated") == 1234
+    assert db.statements[-1][1] == {"table_name": "Distribution_Log"}
+
+
+def _view(rows):
+    result = FakeResult(rows)
+    result.keys = lambda: ["inventory_id", "stock_status"]
+    return result
+
+
+def test_inventory_status_returns_everything_by_default():
+    db = FakeSession([("FROM vw_current_inventory_status", _view([(1, "IN_STOCK"), (2, "LOW_STOCK")]))])
+
+    rows, total, has_more = _inventory_status(db, "", "stock_status", None, 0)
+
+    assert (len(rows), total, has_more) == (2, 2, False)
+    assert "LIMIT" not in db.statements[0][0]
+
+
+def test_inventory_status_page_reports_the_real_total():
+    db = FakeSession([
+        ("SELECT COUNT(*)", FakeResult([(84,)])),
+        ("FROM vw_current_inventory_status", _view([(1, "IN_STOCK"), (2, "IN_STOCK"), (3, "LOW_STOCK")])),
+    ])
+
+    rows, total, has_more = _inventory_status(db, "WHERE 1", "stock_status", 2, 10)
+
+    assert rows == [
+        {"inventory_id": 1, "stock_status": "IN_STOCK"},
+        {"inventory_id": 2, "stock_status": "IN_STOCK"},
+    ]
+    assert (total, has_more) == (84, True)
+    assert db.statements[0][1] == {"limit": 3, "offset": 10}
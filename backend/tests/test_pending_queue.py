@@ -0,0 +1,84 @@
+"""
+Pending-household queue: claims, releases and the sync statements
+"""
+
+from app.services import pending_queue
+
+from tests.fakes import FakeResult, FakeSession
+
+
+def test_claim_skips_locked_rows_and_claims_what_it_got():
+    db = FakeSession([
+        ("FOR UPDATE SKIP LOCKED", FakeResult([(4,), (9,)])),
+        ("WHERE q.claimed_by = :staff_id", FakeResult([{"household_id": 4}, {"household_id": 9}])),
+    ])
+
+    claimed = pending_queue.claim(db, staff_id=2, count=5, timeout_seconds=60)
+
+    assert claimed == [{"household_id": 4}, {"household_id": 9}]
+    (select_sql, params), = db.executed("SKIP LOCKED")
+    assert "LIMIT :count" in select_sql and params == {"count": 5}
+    (_, params), = db.executed("SET claimed_by = :staff_id")
+    assert params == {"staff_id": 2, "timeout": 60, "household_ids": [4, 9]}
+    assert db.commits == 1
+
+
+def test_claim_with_nothing_left_releases_the_transaction():
+    db = FakeSession()
+
+    assert pending_queue.claim(db, staff_id=2, count=5) == []
+    assert db.rollbacks == 1
+    assert not db.executed("UPDATE Pending_Queue")
+
+
+def test_release_some_or_all_claims():
+    db = FakeSession([("SET claimed_by = NULL", FakeResult(rowcount=3))])
+
+    assert pending_queue.release(db, staff_id=2) == 3
+    assert pending_queue.release(db, staff_id=2, household_ids=[4]) == 3
+
+    (all_sql, all_params), (some_sql, some_params) = db.executed("SET claimed_by = NULL")
+    assert "household_id IN" not in all_sql and all_params == {"staff_id": 2}
+    assert "household_id IN" in some_sql and some_params == {"staff_id": 2, "household_ids": [4]}
+    assert db.commits == 2
+
+
+def test_release_of_no_households_keeps_every_claim():
+    db = FakeSession()
+
+    pending_queue.release(db, staff_id=2, household_ids=[])
+    pending_queue.claims(db, staff_id=2, household_ids=[])
+
+    (release_sql, release_params), = db.executed("SET claimed_by = NULL")
+    assert "household_id IN" in release_sql and release_params["household_ids"] == []
+    (claims_sql, claims_params), = db.executed("FROM Pending_Queue q")
+    assert "household_id IN" in claims_sql and claims_params["household_ids"] == []
+
+
+def test_pending_pages_only_with_a_limit():
+    db = FakeSession()
+
+    pending_queue.pending(db)
+    pending_queue.pending(db, limit=20, offset=40)
+
+    (everything, _), (page, params) = db.executed("FROM Pending_Queue q")
+    assert "LIMIT" not in everything
+    assert "LIMIT :limit OFFSET :offset" in page and params == {"limit": 20, "offset": 40}
+
+
+def test_sync_households_prunes_and_upserts_only_those():
+    db = FakeSession([("INSERT INTO Pending_Queue", FakeResult(rowcount=2))])
+
+    assert pending_queue.sync(db, [5, 3, 5]) == 2
+
+    (prune_sql, params), = db.executed("DELETE q FROM Pending_Queue q")
+    assert "q.household_id IN" in prune_sql and params == {"household_ids": [3, 5]}
+    (sync_sql, _), = db.executed("INSERT INTO Pending_Queue")
+    assert "h.household_id IN" in sync_sql
+
+
+def test_sync_nothing():
+    db = FakeSession()
+
+    assert pending_queue.sync(db, []) == 0
+    assert db.statements == []
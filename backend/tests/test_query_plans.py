@@ -0,0 +1,97 @@
+"""
+Query plan regression suite: plan parsing and the expectation checks
+"""
+
+from benchmarks import query_plans
+from benchmarks.query_plans import (
+    MATERIALIZED,
+    PK_LOOKUP,
+    Access,
+    Sample,
+    check,
+    one_pass,
+    table_accesses,
+)
+
+PLAN = {
+    "query_block": {
+        "nested_loop": [
+            {"table": {"table_name": "dl", "access_type": "index", "key": "idx_date",
+                       "rows_examined_per_scan": 100}},
+            {"table": {"table_name": "h", "access_type": "eq_ref", "key": "PRIMARY",
+                       "rows_examined_per_scan": 1}},
+        ],
+        "select_list_subqueries": [
+            {"query_block": {"table": {"table_name": "hpl", "access_type": "const", "key": "PRIMARY"}}}
+        ],
+    }
+}
+
+
+def accesses(*rows):
+    return [
+        {"table_name": name, "access_type": access_type, "key": key, "rows_examined_per_scan": examined}
+        for name, access_type, key, examined in rows
+    ]
+
+
+def test_table_accesses_include_subqueries():
+    assert [access["table_name"] for access in table_accesses(PLAN)] == ["dl", "h", "hpl"]
+
+
+def test_a_plan_meeting_its_expectations_passes():
+    expect = {"dl": Access(("index",), ("idx_date",), max_rows=5_000), "h": PK_LOOKUP, "hpl": PK_LOOKUP}
+
+    assert check(table_accesses(PLAN), expect, {}) == []
+
+
+def test_wrong_access_index_and_row_ceiling_are_reported():
+    expect = {"Inventory": Access(("const", "ref"), ("uq_center_package",), max_rows=1)}
+
+    problems = check(accesses(("Inventory", "ALL", None, 5_000)), expect, {})
+
+    assert problems == [
+        "Inventory: access ALL, expected const/ref",
+        "Inventory: index none, expected uq_center_package",
+        "Inventory: 5000 rows examined per scan, ceiling 1",
+    ]
+
+
+def test_missing_tables_and_large_unlisted_scans_are_reported():
+    problems = check(
+        accesses(("Households", "ALL", None, 20_000), ("Aid_Packages", "ALL", None, 40)),
+        {"Inventory": PK_LOOKUP},
+        {},
+    )
+
+    assert problems == [
+        "Households: unexpected ALL scan of 20000 rows",
+        "Inventory: not in the plan",
+    ]
+
+
+def test_index_merge_keys_and_share_ceilings():
+    expect = {"Households": Access(("index_merge",), ("idx_status", "idx_city"), max_share=0.3, table="Households")}
+    merged = accesses(("Households", "index_merge", "intersect(idx_status,idx_city)", 2_000))
+
+    assert check(merged, expect, {"Households": 10_000}) == []
+    assert check(merged, expect, {"Households": 5_000}) == [
+        "Households: 2000 rows examined per scan, ceiling 1500"
+    ]
+
+
+def test_access_presets():
+    assert one_pass("Inventory").ceiling({"Inventory": 200}) == 300
+    assert MATERIALIZED.ceiling({}) is None
+    assert PK_LOOKUP.ceiling({}) == 1
+
+
+def test_every_case_runs_code_or_builds_sql():
+    sample = Sample(1, 1, 1, "Springfield", [1, 2], [1], 1, 1)
+
+    for case in query_plans.CASES:
+        assert (case.run is None) != (case.sql is None), case.name
+        assert case.expect, case.name
+        if case.sql is not None:
+            sql, params = case.sql(sample)
+            assert query_plans.EXPLAINABLE.match(sql), case.name
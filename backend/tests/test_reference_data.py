@@ -0,0 +1,132 @@
+"""
+Reference-data cache: read-through, batched misses and cross-worker
+invalidation through Cache_Generations
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.services.reference_data import CENTERS, PACKAGES, ReferenceDataCache
+
+
+_DDL = [
+    """
+    CREATE TABLE Aid_Packages (
+        package_id INTEGER PRIMARY KEY, package_name TEXT NOT NULL, description TEXT,
+        category TEXT NOT NULL, unit_weight_kg NUMERIC, estimated_cost NUMERIC NOT NULL,
+        validity_period_days INTEGER NOT NULL, is_active BOOLEAN,
+        created_at TIMESTAMP, updated_at TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE Distribution_Centers (
+        center_id INTEGER PRIMARY KEY, center_name TEXT NOT NULL, address TEXT NOT NULL,
+        city TEXT NOT NULL, state TEXT NOT NULL, zip_code TEXT NOT NULL, phone_number TEXT,
+        email TEXT, capacity INTEGER NOT NULL, status TEXT, created_at TIMESTAMP,
+        updated_at TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE Cache_Generations (
+        cache_name TEXT PRIMARY KEY, generation INTEGER NOT NULL, updated_at TIMESTAMP
+    )
+    """,
+]
+
+
+@pytest.fixture
+def reference_db(monkeypatch):
+    monkeypatch.setattr(settings, "REFERENCE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "REFERENCE_CACHE_GENERATION_CHECK_SECONDS", 0)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as connection:
+        for ddl in _DDL:
+            connection.exec_driver_sql(ddl)
+        for package_id in (1, 2, 3):
+            connection.exec_driver_sql(
+                f"INSERT INTO Aid_Packages (package_id, package_name, category, estimated_cost,"
+                f" validity_period_days, is_active) VALUES ({package_id}, 'Box {package_id}', 'food', 10, 30, 1)"
+            )
+
+    queries = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: queries.append(statement)
+    )
+    db = Session(engine)
+    db.queries = queries
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def package_reads(db):
+    return [sql for sql in db.queries if "FROM \"Aid_Packages\"" in sql]
+
+
+def test_get_reads_through_once(reference_db):
+    cache = ReferenceDataCache()
+
+    first = cache.get(reference_db, PACKAGES, 2)
+    second = cache.get(reference_db, PACKAGES, 2)
+
+    assert isinstance(first, SimpleNamespace) and first.package_name == "Box 2"
+    assert second is first
+    assert len(package_reads(reference_db)) == 1
+    assert cache.get(reference_db, PACKAGES, 99) is None
+
+
+def test_get_many_loads_the_misses_with_one_query(reference_db):
+    cache = ReferenceDataCache()
+    cache.get(reference_db, PACKAGES, 1)
+
+    rows = cache.get_many(reference_db, PACKAGES, [1, 2, 3, 99])
+
+    assert sorted(rows) == [1, 2, 3]
+    reads = package_reads(reference_db)
+    assert len(reads) == 2 and " IN (" in reads[1]
+
+
+def test_a_generation_bump_elsewhere_clears_the_local_copy(reference_db):
+    cache = ReferenceDataCache()
+    assert cache.get(reference_db, PACKAGES, 1).package_name == "Box 1"
+
+    # Another worker renames the package and bumps the generation
+    reference_db.execute(text("UPDATE Aid_Packages SET package_name = 'Renamed' WHERE package_id = 1"))
+    reference_db.execute(text("INSERT INTO Cache_Generations (cache_name, generation) VALUES (:name, 1)"), {"name": PACKAGES})
+    reference_db.commit()
+
+    assert cache.get(reference_db, PACKAGES, 1).package_name == "Renamed"
+
+
+def test_all_is_ordered_and_cached(reference_db):
+    cache = ReferenceDataCache()
+
+    assert [row.package_id for row in cache.all(reference_db, PACKAGES)] == [1, 2, 3]
+    cache.all(reference_db, PACKAGES)
+    assert len(package_reads(reference_db)) == 1
+    assert cache.all(reference_db, CENTERS) == []
+
+
+def test_invalidate_bumps_the_generation_and_clears_after_commit(reference_db, monkeypatch):
+    cache = ReferenceDataCache()
+    cache.caches[PACKAGES].set(1, SimpleNamespace(package_id=1))
+    reference_db.execute(text("SELECT 1"))
+    # Cache_Generations upsert is MySQL syntax: record it instead
+    executed = []
+    monkeypatch.setattr(reference_db, "execute", lambda statement, params=None: executed.append(params))
+
+    cache.invalidate(reference_db, PACKAGES)
+
+    assert executed == [{"name": PACKAGES}]
+    # A read before the commit may still see (and cache) the old row
+    assert cache.caches[PACKAGES].get(1) is not None
+    reference_db.commit()
+    assert cache.caches[PACKAGES].get(1) is None
@@ -0,0 +1,114 @@
+"""
+Report rollups: watermark batches, reconcile of recent days and taking
+deleted rows back out
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from app.services import report_rollups
+from tests.fakes import FakeResult, FakeSession
+
+
+def _row(log_id, when, household_id=6, center_id=1, package_id=1, status="success"):
+    return SimpleNamespace(
+        log_id=log_id, distribution_date=when, center_id=center_id,
+        package_id=package_id, household_id=household_id, transaction_status=status
+    )
+
+
+def test_catch_up_stops_before_unsettled_rows():
+    db = FakeSession([
+        ("FROM Job_Watermarks", FakeResult([(100,)])),
+        ("SELECT MAX(log_id)", FakeResult([(500,)])),
+        ("INTERVAL :settle SECOND", FakeResult([(301,)])),
+    ])
+
+    assert report_rollups.catch_up(db, batch_size=1000) == 200
+
+    folds = db.executed("Rollup_Daily_Distributions")
+    assert folds[0][1] == {"low": 100, "high": 300}
+    assert db.executed("UPDATE Job_Watermarks")[0][1]["high"] == 300
+    assert db.commits == 1
+
+
+def test_catch_up_skips_when_watermark_is_locked():
+    db = FakeSession()
+
+    assert report_rollups.catch_up(db) == 0
+    assert db.rollbacks == 1
+    assert not db.executed("INSERT")
+
+
+def test_catch_up_respects_batch_size():
+    db = FakeSession([
+        ("FROM Job_Watermarks", FakeResult([(0,)])),
+        ("SELECT MAX(log_id)", FakeResult([(10_000,)])),
+    ])
+
+    assert report_rollups.catch_up(db, batch_size=250) == 250
+    assert db.executed("UPDATE Job_Watermarks")[0][1]["high"] == 250
+
+
+def test_reconcile_rewrites_recent_days_up_to_the_watermark():
+    db = FakeSession([
+        ("FROM Job_Watermarks", FakeResult([(900,)])),
+        ("SELECT CURDATE()", FakeResult([(date(2024, 3, 9),)])),
+    ])
+
+    assert report_rollups.reconcile(db, days=1) == date(2024, 3, 9)
+
+    sqls = [sql for sql, _ in db.statements]
+    delete = next(i for i, sql in enumerate(sqls) if sql.startswith("DELETE FROM Rollup_Daily"))
+    refold = next(i for i, sql in enumerate(sqls) if sql.startswith("INSERT INTO Rollup_Daily"))
+    assert delete < refold
+    assert db.statements[refold][1] == {"since": date(2024, 3, 9), "high": 900}
+    assert "dl.distribution_date >= :since AND dl.log_id <= :high" in sqls[refold]
+    # Memberships are only added, never dropped, by a reconcile
+    assert not db.executed("DELETE FROM Rollup_Monthly_Households")
+    assert db.commits == 1
+
+
+def test_reconcile_skips_when_watermark_is_locked():
+    db = FakeSession()
+
+    assert report_rollups.reconcile(db) is None
+    assert db.rollbacks == 1
+    assert not db.executed("DELETE")
+
+
+def test_forget_recomputes_only_counted_rows():
+    db = FakeSession([("FROM Job_Watermarks", FakeResult([(50,)]))])
+    rows = [
+        _row(10, datetime(2024, 3, 1, 9)),
+        _row(11, datetime(2024, 3, 1, 15), household_id=7),
+        _row(12, datetime(2024, 3, 20, 10), center_id=2),
+        _row(13, datetime(2024, 3, 21), status="failed"),
+        _row(60, datetime(2024, 3, 22)),  # above the watermark: never counted
+    ]
+
+    report_rollups.forget(db, rows)
+
+    (sql, day_params), = db.executed("DELETE FROM Rollup_Daily_Distributions")
+    assert [(p["day"], p["center_id"]) for p in day_params] == [
+        (date(2024, 3, 1), 1), (date(2024, 3, 20), 2)
+    ]
+    assert all(p["high"] == 50 for p in day_params)
+
+    (_, members), = db.executed("DELETE FROM Rollup_Monthly_Households")
+    assert {(p["month"], p["center_id"], p["household_id"]) for p in members} == {
+        (date(2024, 3, 1), 1, 6), (date(2024, 3, 1), 1, 7), (date(2024, 3, 1), 2, 6)
+    }
+    (_, groups), = db.executed("UPDATE Rollup_Monthly_Unique")
+    assert len(groups) == 2
+    (_, pairs), = db.executed("UPDATE Rollup_Center_Package_Unique")
+    assert {(p["center_id"], p["package_id"]) for p in pairs} == {(1, 1), (2, 1)}
+    assert db.commits == 0
+
+
+def test_forget_without_counted_rows_touches_nothing():
+    db = FakeSession([("FROM Job_Watermarks", FakeResult([(5,)]))])
+
+    report_rollups.forget(db, [_row(10, datetime(2024, 3, 1))])
+
+    assert len(db.statements) == 1
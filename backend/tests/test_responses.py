@@ -0,0 +1,82 @@
+"""
+orjson responses and the compression middleware (driven as a raw ASGI app)
+"""
+
+import asyncio
+import gzip
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+import orjson
+from starlette.responses import Response
+
+from app.core.responses import CompressionMiddleware, FastJSONResponse, rows_as_dicts
+
+
+def test_render_matches_the_fastapi_encoder():
+    body = FastJSONResponse({
+        "count": Decimal("12"),
+        "cost": Decimal("2.50"),
+        "when": datetime(2026, 1, 5, 9, 30),
+        "day": date(2026, 1, 5),
+        "ids": np.array([1, 2]),
+        3: "non-string key",
+    }).body
+
+    assert orjson.loads(body) == {
+        "count": 12, "cost": 2.5, "when": "2026-01-05T09:30:00", "day": "2026-01-05",
+        "ids": [1, 2], "3": "non-string key",
+    }
+
+
+def test_rows_as_dicts():
+    assert rows_as_dicts([(1, "a"), (2, "b")], ["id", "name"]) == [
+        {"id": 1, "name": "a"}, {"id": 2, "name": "b"}
+    ]
+
+
+def call(app, accept_encoding="gzip"):
+    """Run one GET through an ASGI app; returns (headers, body)"""
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+    return headers, b"".join(message.get("body", b"") for message in messages[1:])
+
+
+def middleware(response):
+    async def app(scope, receive, send):
+        await response(scope, receive, send)
+    return CompressionMiddleware(app, minimum_size=100)
+
+
+def test_large_json_is_gzipped_for_clients_that_accept_it():
+    payload = [{"id": i, "name": "household"} for i in range(50)]
+
+    headers, body = call(middleware(FastJSONResponse(payload)))
+    assert headers["content-encoding"] == "gzip"
+    assert orjson.loads(gzip.decompress(body)) == payload
+
+    headers, body = call(middleware(FastJSONResponse(payload)), accept_encoding="identity")
+    assert "content-encoding" not in headers
+    assert orjson.loads(body) == payload
+
+
+def test_compressed_exports_pass_through():
+    archive = gzip.compress(b"id,name\n" * 100)
+
+    headers, body = call(middleware(Response(archive, media_type="application/gzip")))
+
+    assert "content-encoding" not in headers
+    assert body == archive
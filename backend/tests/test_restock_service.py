@@ -0,0 +1,79 @@
+"""
+Bulk restock: manifest parsing, validation and batched upserts
+"""
+
+import io
+
+from app.core.config import settings
+from app.services import restock_service
+
+from tests.fakes import FakeResult, FakeSession
+
+
+def manifest(text):
+    return io.BytesIO(text.encode())
+
+
+def test_parse_manifest_reports_bad_lines_by_line_number():
+    lines, errors = restock_service.parse_manifest(manifest(
+        "center_id,package_id,quantity,note\n1,2,30,x\n1,two,5,\n 3 , 4 , 7,\n"
+    ))
+
+    assert lines == [(2, 1, 2, 30), (4, 3, 4, 7)]
+    assert errors == [{"line": 3, "message": "center_id, package_id and quantity must be integers"}]
+
+
+def test_parse_manifest_needs_the_columns():
+    lines, errors = restock_service.parse_manifest(manifest("center_id,qty\n1,2\n"))
+
+    assert lines == []
+    assert errors == [{"line": 1, "message": "Missing column(s): package_id, quantity"}]
+
+
+def test_parse_manifest_stops_at_the_line_limit(monkeypatch):
+    monkeypatch.setattr(settings, "RESTOCK_MANIFEST_MAX_LINES", 2)
+
+    lines, errors = restock_service.parse_manifest(manifest(
+        "center_id,package_id,quantity\n1,1,1\n1,2,1\n1,3,1\n1,4,1\n"
+    ))
+
+    assert len(lines) == 2
+    assert errors == [{"line": 4, "message": "Manifest exceeds 2 lines"}]
+
+
+def test_apply_counts_created_rows_per_batch(monkeypatch):
+    monkeypatch.setattr(settings, "RESTOCK_BATCH_SIZE", 2)
+    created = iter([(1,), (0,)])
+    db = FakeSession([("version = 1", lambda params: FakeResult([next(created)]))])
+    totals = [((1, 1), 10), ((1, 2), 5), ((2, 1), 7)]
+
+    assert restock_service._apply(db, totals) == 1
+
+    upserts = db.executed("INSERT INTO Inventory")
+    assert [len([key for key in params if key.startswith("c")]) for _, params in upserts] == [2, 1]
+    sql, params = db.executed("version = 1")[0]
+    assert "(center_id, package_id) IN ((:c0, :p0), (:c1, :p1))" in sql
+
+
+def test_restock_many_merges_lines_and_rejects_unknown_ids(monkeypatch):
+    known = {restock_service.CENTERS: {1}, restock_service.PACKAGES: {1, 2}}
+    monkeypatch.setattr(
+        restock_service.reference_data, "get_many",
+        lambda db, kind, ids: {i: object() for i in ids if i in known[kind]}
+    )
+    db = FakeSession([("version = 1", FakeResult([(0,)]))])
+
+    status, _, summary = restock_service.restock_many(db, [
+        (2, 1, 2, 5), (3, 1, 1, 10), (4, 1, 2, 5), (5, 9, 1, 3), (6, 1, 1, 0),
+    ])
+
+    assert status == "success"
+    assert (summary["applied"], summary["rejected"], summary["inventory_rows"], summary["units"]) == (3, 2, 2, 20)
+    assert [error["message"] for error in summary["errors"]] == [
+        "Distribution center 9 not found", "Quantity must be positive"
+    ]
+    (_, params), = db.executed("INSERT INTO Inventory")
+    assert [(params["c0"], params["p0"], params["q0"]), (params["c1"], params["p1"], params["q1"])] == [
+        (1, 1, 10), (1, 2, 10)
+    ]
+    assert db.commits == 1
@@ -0,0 +1,80 @@
+"""
+Transaction retry: transient error detection, backoff budget and the
+lock wait timeout near the deadline
+"""
+
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.services import transaction_retry
+from app.services.distribution_service import DistributionService
+from app.services.transaction_retry import TransactionRetry, busy_message, transient_error
+from tests.fakes import FakeSession
+
+
+def _mysql_error(code):
+    return OperationalError("UPDATE Inventory ...", {}, Exception(code, "mysql says no"))
+
+
+def test_transient_error_codes():
+    assert transient_error(_mysql_error(1205)) == "lock_wait_timeout"
+    assert transient_error(_mysql_error(1213)) == "deadlock"
+    assert transient_error(_mysql_error(1062)) is None
+    assert transient_error(ValueError("nope")) is None
+
+
+def test_nothing_to_restore_when_the_timeout_was_never_set():
+    db = FakeSession()
+
+    DistributionService._restore_lock_wait_timeout(db, TransactionRetry())
+
+    assert db.statements == []
+
+
+def test_lock_wait_timeout_is_capped_near_the_deadline_and_restored(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(settings, "DISTRIBUTION_LOCK_WAIT_TIMEOUT_SECONDS", 5)
+    monkeypatch.setattr(settings, "TRANSACTION_RETRY_DEADLINE_SECONDS", 15.0)
+    retry = TransactionRetry()
+
+    assert retry.next_lock_wait_timeout() == 5
+    assert retry.next_lock_wait_timeout() is None
+    now[0] += 12.5
+    assert retry.next_lock_wait_timeout() == 3
+    now[0] += 2.9
+    assert retry.next_lock_wait_timeout() == 1
+
+    db = FakeSession()
+    DistributionService._restore_lock_wait_timeout(db, retry)
+    assert db.statements == [("SET SESSION innodb_lock_wait_timeout = DEFAULT", None)]
+
+
+def test_next_pause_respects_retry_budget(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSACTION_RETRY_MAX_RETRIES", 2)
+    monkeypatch.setattr(transaction_retry.random, "uniform", lambda low, high: high)
+    retry = TransactionRetry()
+
+    pauses = [retry.next_pause("deadlock") for _ in range(3)]
+
+    base = settings.TRANSACTION_RETRY_BASE_DELAY_SECONDS
+    assert pauses == [base, base * 2, None]
+    assert retry.retries == 2
+
+
+def test_next_pause_gives_up_past_the_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "TRANSACTION_RETRY_DEADLINE_SECONDS", 0.01)
+    monkeypatch.setattr(transaction_retry.random, "uniform", lambda low, high: 1.0)
+
+    assert TransactionRetry().next_pause("lock_wait_timeout") is None
+
+
+@pytest.mark.parametrize("error, text", [
+    ("deadlock", "Database is busy (deadlock), please retry the distribution"),
+    ("lock_wait_timeout", "Database is busy (lock wait timeout), please retry the distribution"),
+])
+def test_busy_message(error, text):
+    assert busy_message(error) == text
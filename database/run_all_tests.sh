@@ -19,6 +19,10 @@ MYSQL_USER="root"
 MYSQL_PASSWORD="rootpassword123"
 MYSQL_DATABASE="aidtracker_db"
 TEST_DIR="database/tests"
+BACKEND_CONTAINER="aidtracker_backend"
+# Dataset scale to generate for the query plan suite when the log is small
+# (e.g. SF1); unset, the suite is skipped on a small database
+QUERY_PLAN_SCALE="${QUERY_PLAN_SCALE:-}"
 
 # Colors for output
 GREEN='\033[0;32m'
@@ -74,10 +78,10 @@ echo ""
 
 for test_file in "${test_files[@]}"; do
     if [ -f "$test_file" ]; then
-        ((total_tests++))
+        ((total_tests++)) || true
         
         if run_test "$test_file"; then
-            ((passed_tests++))
+            ((passed_tests++)) || true
         else
             ((failed_tests++))
         fi
@@ -90,6 +94,40 @@ for test_file in "${test_files[@]}"; do
     fi
 done
 
+# Query plan regression suite: EXPLAIN of the hot queries on a large dataset
+echo "======================================================================"
+echo "Running: query plan regression (benchmarks.query_plans)"
+echo "======================================================================"
+
+if docker ps | grep -q "$BACKEND_CONTAINER"; then
+    plan_args=()
+    if [ -n "$QUERY_PLAN_SCALE" ]; then
+        plan_args+=(--generate "$QUERY_PLAN_SCALE")
+    fi
+
+    set +e
+    docker exec "$BACKEND_CONTAINER" python -m benchmarks.query_plans "${plan_args[@]}"
+    plan_status=$?
+    set -e
+
+    # 2 = dataset too small to judge plans: reported, not counted
+    if [ $plan_status -eq 2 ]; then
+        echo -e "${YELLOW}Warning: query plan suite skipped (set QUERY_PLAN_SCALE=SF1 to generate data)${NC}"
+    else
+        ((total_tests++)) || true
+        if [ $plan_status -eq 0 ]; then
+            echo -e "${GREEN}[PASS] query plans PASSED${NC}"
+            ((passed_tests++)) || true
+        else
+            echo -e "${RED}[FAIL] query plans FAILED${NC}"
+            ((failed_tests++)) || true
+        fi
+    fi
+else
+    echo -e "${YELLOW}Warning: backend container '$BACKEND_CONTAINER' is not running, query plans skipped${NC}"
+fi
+echo ""
+
 # Summary
 echo "======================================================================"
 echo "Test Execution Summary"
@@ -36,6 +36,13 @@ sp_distribute_package: BEGIN
     DECLARE v_last_distribution_date DATE;
     DECLARE v_validity_period INT;
     DECLARE v_days_since_last INT;
+    DECLARE v_shard_count INT;
+    DECLARE v_shard_rows INT DEFAULT 0;
+    DECLARE v_shard_no INT;
+    DECLARE v_shard_start INT;
+    DECLARE v_shard_quantity INT;
+    DECLARE v_remaining INT;
+    DECLARE v_taken INT;
     DECLARE EXIT HANDLER FOR SQLEXCEPTION
     BEGIN
         -- Rollback on any error
@@ -107,13 +114,11 @@ sp_distribute_package: BEGIN
     END IF;
 
     -- 4. Check eligibility (validity period)
-    SELECT DATE(distribution_date) INTO v_last_distribution_date
-    FROM Distribution_Log
+    -- Household_Package_Last holds the newest successful distribution
+    SELECT DATE(last_distribution_date) INTO v_last_distribution_date
+    FROM Household_Package_Last
     WHERE household_id = p_household_id
-      AND package_id = p_package_id
-      AND transaction_status = 'success'
-    ORDER BY distribution_date DESC
-    LIMIT 1;
+      AND package_id = p_package_id;
 
     IF v_last_distribution_date IS NOT NULL THEN
         SET v_days_since_last = DATEDIFF(CURRENT_DATE, v_last_distribution_date);
@@ -125,33 +130,122 @@ sp_distribute_package: BEGIN
         END IF;
     END IF;
 
-    -- 5. CRITICAL: Lock inventory row and check quantity
-    -- FOR UPDATE prevents other transactions from reading/writing this row
-    -- This is the PESSIMISTIC LOCKING that prevents race conditions
-    SELECT quantity_on_hand INTO v_current_quantity
+    -- 5. Sharded rows (07_inventory_shards.sql) keep their stock in
+    -- Inventory_Shards. Read the layout without a lock, as the API does:
+    -- locking the Inventory row would serialize exactly the distributions
+    -- sharding spreads out
+    SELECT shard_count INTO v_shard_count
     FROM Inventory
-    WHERE center_id = p_center_id AND package_id = p_package_id
-    FOR UPDATE;  -- <-- THIS IS THE KEY TO PREVENTING RACE CONDITIONS
+    WHERE center_id = p_center_id AND package_id = p_package_id;
 
-    IF v_current_quantity IS NULL THEN
+    IF v_shard_count IS NULL THEN
         SET p_status = 'error';
         SET p_message = 'No inventory record found for this package at this center';
         ROLLBACK;
         LEAVE sp_distribute_package;
     END IF;
 
-    IF v_current_quantity < p_quantity THEN
-        SET p_status = 'error';
-        SET p_message = CONCAT('Insufficient inventory. Available: ', v_current_quantity, ', Requested: ', p_quantity);
-        ROLLBACK;
-        LEAVE sp_distribute_package;
+    IF v_shard_count > 1 THEN
+        -- One shard that covers the quantity on its own, starting at a
+        -- random shard and skipping shards other transactions hold
+        SET v_shard_no = NULL;
+        SET v_shard_start = FLOOR(RAND() * v_shard_count);
+
+        SELECT shard_no INTO v_shard_no
+        FROM Inventory_Shards
+        WHERE center_id = p_center_id AND package_id = p_package_id
+          AND shard_no >= v_shard_start
+          AND quantity_on_hand >= p_quantity
+        ORDER BY shard_no
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED;
+
+        IF v_shard_no IS NULL AND v_shard_start > 0 THEN
+            SELECT shard_no INTO v_shard_no
+            FROM Inventory_Shards
+            WHERE center_id = p_center_id AND package_id = p_package_id
+              AND shard_no < v_shard_start
+              AND quantity_on_hand >= p_quantity
+            ORDER BY shard_no
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED;
+        END IF;
+
+        IF v_shard_no IS NOT NULL THEN
+            UPDATE Inventory_Shards
+            SET quantity_on_hand = quantity_on_hand - p_quantity
+            WHERE center_id = p_center_id AND package_id = p_package_id
+              AND shard_no = v_shard_no;
+        ELSE
+            -- No free shard covers it: wait for all of them (shard_no
+            -- order) and take from several, fullest first
+            SELECT COUNT(*), COALESCE(SUM(quantity_on_hand), 0)
+            INTO v_shard_rows, v_current_quantity
+            FROM Inventory_Shards
+            WHERE center_id = p_center_id AND package_id = p_package_id
+            FOR UPDATE;
+
+            IF v_shard_rows > 0 AND v_current_quantity < p_quantity THEN
+                SET p_status = 'error';
+                SET p_message = CONCAT('Insufficient inventory. Available: ', v_current_quantity, ', Requested: ', p_quantity);
+                ROLLBACK;
+                LEAVE sp_distribute_package;
+            END IF;
+
+            SET v_remaining = p_quantity;
+            WHILE v_shard_rows > 0 AND v_remaining > 0 DO
+                SELECT shard_no, quantity_on_hand INTO v_shard_no, v_shard_quantity
+                FROM Inventory_Shards
+                WHERE center_id = p_center_id AND package_id = p_package_id
+                  AND quantity_on_hand > 0
+                ORDER BY quantity_on_hand DESC, shard_no
+                LIMIT 1;
+
+                SET v_taken = LEAST(v_remaining, v_shard_quantity);
+                UPDATE Inventory_Shards
+                SET quantity_on_hand = quantity_on_hand - v_taken
+                WHERE center_id = p_center_id AND package_id = p_package_id
+                  AND shard_no = v_shard_no;
+                SET v_remaining = v_remaining - v_taken;
+            END WHILE;
+            -- v_shard_rows = 0: sharding was switched off meanwhile, the
+            -- stock is back on the Inventory row (below)
+        END IF;
     END IF;
 
-    -- 6. All validations passed - Update inventory (decrement)
-    UPDATE Inventory
-    SET quantity_on_hand = quantity_on_hand - p_quantity,
-        updated_at = CURRENT_TIMESTAMP
-    WHERE center_id = p_center_id AND package_id = p_package_id;
+    IF v_shard_count <= 1 OR (v_shard_no IS NULL AND v_shard_rows = 0) THEN
+        -- CRITICAL: Lock inventory row and check quantity
+        -- FOR UPDATE prevents other transactions from reading/writing this row
+        -- This is the PESSIMISTIC LOCKING that prevents race conditions
+        SET v_current_quantity = NULL;
+        SELECT quantity_on_hand INTO v_current_quantity
+        FROM Inventory
+        WHERE center_id = p_center_id AND package_id = p_package_id
+        FOR UPDATE;  -- <-- THIS IS THE KEY TO PREVENTING RACE CONDITIONS
+
+        IF v_current_quantity IS NULL THEN
+            SET p_status = 'error';
+            SET p_message = 'No inventory record found for this package at this center';
+            ROLLBACK;
+            LEAVE sp_distribute_package;
+        END IF;
+
+        IF v_current_quantity < p_quantity THEN
+            SET p_status = 'error';
+            SET p_message = CONCAT('Insufficient inventory. Available: ', v_current_quantity, ', Requested: ', p_quantity);
+            ROLLBACK;
+            LEAVE sp_distribute_package;
+        END IF;
+
+        -- 6. All validations passed - Update inventory (decrement)
+        -- Bump the row version (08_inventory_version.sql) like every other
+        -- writer, or an optimistic reader would not notice this change
+        UPDATE Inventory
+        SET quantity_on_hand = quantity_on_hand - p_quantity,
+            version = version + 1,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE center_id = p_center_id AND package_id = p_package_id;
+    END IF;
 
     -- 7. Record successful distribution in audit log
     INSERT INTO Distribution_Log (
@@ -174,6 +268,34 @@ sp_distribute_package: BEGIN
 
     SET p_log_id = LAST_INSERT_ID();
 
+    -- Keep the last-distribution index in step (same transaction)
+    INSERT INTO Household_Package_Last (
+        household_id, package_id, last_distribution_date,
+        next_eligible_date, last_log_id, distribution_count
+    )
+    SELECT household_id, package_id, distribution_date,
+           DATE(distribution_date) + INTERVAL v_validity_period DAY,
+           log_id, 1
+    FROM Distribution_Log
+    WHERE log_id = p_log_id
+    ON DUPLICATE KEY UPDATE
+        next_eligible_date = VALUES(next_eligible_date),
+        last_log_id = VALUES(last_log_id),
+        last_distribution_date = VALUES(last_distribution_date),
+        distribution_count = distribution_count + 1;
+
+    -- ...and the pending-household queue (served: drop any claim)
+    UPDATE Pending_Queue q
+    INNER JOIN Distribution_Log dl ON dl.log_id = p_log_id
+    SET q.last_distribution_date = GREATEST(
+            COALESCE(q.last_distribution_date, dl.distribution_date), dl.distribution_date
+        ),
+        q.total_distributions = q.total_distributions + 1,
+        q.claimed_by = NULL,
+        q.claimed_at = NULL,
+        q.claim_expires_at = NULL
+    WHERE q.household_id = p_household_id;
+
     -- 8. Commit transaction
     COMMIT;
 
@@ -198,7 +320,7 @@ CREATE PROCEDURE sp_restock_inventory(
     OUT p_message VARCHAR(255)
 )
 BEGIN
-    DECLARE v_inventory_exists INT;
+    DECLARE v_shard_count INT;
     DECLARE EXIT HANDLER FOR SQLEXCEPTION
     BEGIN
         ROLLBACK;
@@ -208,23 +330,35 @@ BEGIN
 
     START TRANSACTION;
 
-    -- Check if inventory record exists
-    SELECT COUNT(*) INTO v_inventory_exists
+    -- Check if inventory record exists (and lock it, so the shard layout
+    -- cannot change until the units are in)
+    SELECT shard_count INTO v_shard_count
     FROM Inventory
-    WHERE center_id = p_center_id AND package_id = p_package_id;
+    WHERE center_id = p_center_id AND package_id = p_package_id
+    FOR UPDATE;
 
-    IF v_inventory_exists = 0 THEN
+    IF v_shard_count IS NULL THEN
         -- Create new inventory record
         INSERT INTO Inventory (center_id, package_id, quantity_on_hand, last_restock_date, last_restock_quantity)
         VALUES (p_center_id, p_package_id, p_quantity, CURRENT_DATE, p_quantity);
     ELSE
-        -- Update existing inventory
+        -- Update existing inventory; a sharded row (07_inventory_shards.sql)
+        -- only records the restock, its units are spread over the shards
         UPDATE Inventory
-        SET quantity_on_hand = quantity_on_hand + p_quantity,
+        SET quantity_on_hand = IF(v_shard_count > 1, quantity_on_hand, quantity_on_hand + p_quantity),
             last_restock_date = CURRENT_DATE,
             last_restock_quantity = p_quantity,
+            version = version + 1,
             updated_at = CURRENT_TIMESTAMP
         WHERE center_id = p_center_id AND package_id = p_package_id;
+
+        IF v_shard_count > 1 THEN
+            UPDATE Inventory_Shards
+            SET quantity_on_hand = quantity_on_hand
+                + p_quantity DIV v_shard_count
+                + (shard_no < p_quantity MOD v_shard_count)
+            WHERE center_id = p_center_id AND package_id = p_package_id;
+        END IF;
     END IF;
 
     COMMIT;
@@ -0,0 +1,93 @@
+-- =====================================================
+-- AidTracker - Sharded Inventory Counters
+-- =====================================================
+-- Optional per-row sharding of hot Inventory rows.
+-- A row with shard_count > 1 keeps its stock in
+-- Inventory_Shards, so concurrent distributions lock
+-- different sub-rows instead of queueing on one row.
+-- =====================================================
+
+USE aidtracker_db;
+
+-- =====================================================
+-- Inventory.shard_count
+-- =====================================================
+-- 1 = classic single row (default)
+-- N = stock split across N rows of Inventory_Shards
+--     (Inventory.quantity_on_hand is then kept at 0)
+-- =====================================================
+
+ALTER TABLE Inventory
+    ADD COLUMN shard_count INT NOT NULL DEFAULT 1
+        COMMENT 'Number of Inventory_Shards rows holding the stock (1 = not sharded)'
+        AFTER reorder_level,
+    ADD CONSTRAINT chk_shard_count CHECK (shard_count BETWEEN 1 AND 64);
+
+-- =====================================================
+-- Table: Inventory_Shards
+-- =====================================================
+-- Sub-counters of a sharded Inventory row
+-- Stock of (center, package) = SUM(quantity_on_hand)
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS Inventory_Shards (
+    center_id INT NOT NULL,
+    package_id INT NOT NULL,
+    shard_no INT NOT NULL COMMENT '0 .. shard_count - 1',
+    quantity_on_hand INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (center_id, package_id, shard_no),
+    CONSTRAINT fk_shard_inventory FOREIGN KEY (center_id, package_id)
+        REFERENCES Inventory(center_id, package_id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    CONSTRAINT chk_shard_quantity CHECK (quantity_on_hand >= 0)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Sharded stock counters for hot inventory rows';
+
+-- =====================================================
+-- View: vw_current_inventory_status (sharding aware)
+-- =====================================================
+-- quantity_on_hand is the row stock plus all its shards
+-- =====================================================
+
+CREATE OR REPLACE VIEW vw_current_inventory_status AS
+SELECT
+    i.inventory_id,
+    i.center_id,
+    dc.center_name,
+    dc.city,
+    i.package_id,
+    ap.package_name,
+    ap.category,
+    i.quantity_on_hand + COALESCE(s.shard_quantity, 0) AS quantity_on_hand,
+    i.reorder_level,
+    CASE
+        WHEN i.quantity_on_hand + COALESCE(s.shard_quantity, 0) = 0 THEN 'OUT_OF_STOCK'
+        WHEN i.quantity_on_hand + COALESCE(s.shard_quantity, 0) <= i.reorder_level THEN 'LOW_STOCK'
+        ELSE 'IN_STOCK'
+    END AS stock_status,
+    i.last_restock_date,
+    i.updated_at,
+    i.shard_count
+FROM Inventory i
+INNER JOIN Distribution_Centers dc ON i.center_id = dc.center_id
+INNER JOIN Aid_Packages ap ON i.package_id = ap.package_id
+LEFT JOIN (
+    SELECT center_id, package_id, SUM(quantity_on_hand) AS shard_quantity
+    FROM Inventory_Shards
+    GROUP BY center_id, package_id
+) s ON s.center_id = i.center_id AND s.package_id = i.package_id
+WHERE dc.status = 'active' AND ap.is_active = TRUE
+ORDER BY
+    CASE
+        WHEN i.quantity_on_hand + COALESCE(s.shard_quantity, 0) = 0 THEN 1
+        WHEN i.quantity_on_hand + COALESCE(s.shard_quantity, 0) <= i.reorder_level THEN 2
+        ELSE 3
+    END,
+    dc.center_name,
+    ap.package_name;
+
+-- Display confirmation
+SELECT 'Inventory sharding created successfully' AS status;
@@ -0,0 +1,18 @@
+-- =====================================================
+-- AidTracker - Inventory Row Versions
+-- =====================================================
+-- Version counter for optimistic concurrency control.
+-- Every writer bumps it; the optimistic strategy only
+-- applies its decrement when the version it read is
+-- still current (UPDATE ... WHERE version = :read).
+-- =====================================================
+
+USE aidtracker_db;
+
+ALTER TABLE Inventory
+    ADD COLUMN version INT NOT NULL DEFAULT 1
+        COMMENT 'Incremented on every update (optimistic locking)'
+        AFTER shard_count;
+
+-- Display confirmation
+SELECT 'Inventory version column created successfully' AS status;
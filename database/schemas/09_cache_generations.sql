@@ -0,0 +1,23 @@
+-- =====================================================
+-- AidTracker - Cache Generations
+-- =====================================================
+-- One counter per in-process cache. Every API worker
+-- caches Aid_Packages and Distribution_Centers; a write
+-- bumps the counter in the same transaction and the other
+-- workers drop their copy when they see a new value.
+-- =====================================================
+
+USE aidtracker_db;
+
+CREATE TABLE IF NOT EXISTS Cache_Generations (
+    cache_name VARCHAR(50) PRIMARY KEY,
+    generation BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB COMMENT='Invalidation counters for in-process caches';
+
+INSERT IGNORE INTO Cache_Generations (cache_name, generation) VALUES
+    ('aid_packages', 1),
+    ('distribution_centers', 1);
+
+-- Display confirmation
+SELECT 'Cache_Generations table created successfully' AS status;
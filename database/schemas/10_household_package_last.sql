@@ -0,0 +1,106 @@
+-- =====================================================
+-- AidTracker - Last-Distribution Index
+-- =====================================================
+-- Household_Package_Last keeps the newest successful
+-- distribution per (household, package). The API and
+-- sp_distribute_package update it in the distribution
+-- transaction, so eligibility is a primary-key lookup
+-- instead of a scan of Distribution_Log.
+--
+-- Backfill / check from backend/:
+--   python -m app.services.last_distribution backfill
+--   python -m app.services.last_distribution check
+-- =====================================================
+
+USE aidtracker_db;
+
+CREATE TABLE IF NOT EXISTS Household_Package_Last (
+    household_id INT NOT NULL,
+    package_id INT NOT NULL,
+    last_distribution_date TIMESTAMP NOT NULL,
+    next_eligible_date DATE NOT NULL
+        COMMENT 'DATE(last_distribution_date) + package validity period',
+    last_log_id INT NOT NULL,
+    distribution_count INT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (household_id, package_id),
+
+    CONSTRAINT fk_hpl_household FOREIGN KEY (household_id)
+        REFERENCES Households(household_id)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_hpl_package FOREIGN KEY (package_id)
+        REFERENCES Aid_Packages(package_id)
+        ON DELETE CASCADE,
+
+    INDEX idx_package (package_id),
+    INDEX idx_next_eligible (next_eligible_date)
+) ENGINE=InnoDB COMMENT='Newest successful distribution per household and package';
+
+-- =====================================================
+-- Eligibility views over the index
+-- =====================================================
+-- Same columns as before; they no longer GROUP BY over
+-- the whole Distribution_Log.
+-- =====================================================
+
+CREATE OR REPLACE VIEW vw_household_eligibility AS
+SELECT
+    h.household_id,
+    h.family_name,
+    h.primary_contact_name,
+    h.phone_number,
+    h.city,
+    h.family_size,
+    h.priority_level,
+    h.status AS household_status,
+    hpl.package_id,
+    ap.package_name,
+    hpl.last_distribution_date,
+    ap.validity_period_days,
+    DATEDIFF(CURRENT_DATE, DATE(hpl.last_distribution_date)) AS days_since_last_distribution,
+    CASE
+        WHEN hpl.next_eligible_date <= CURRENT_DATE THEN 'ELIGIBLE'
+        ELSE 'NOT_ELIGIBLE'
+    END AS eligibility_status
+FROM Households h
+LEFT JOIN Household_Package_Last hpl ON h.household_id = hpl.household_id
+LEFT JOIN Aid_Packages ap ON hpl.package_id = ap.package_id
+WHERE h.status = 'active'
+ORDER BY h.priority_level DESC, h.family_name;
+
+CREATE OR REPLACE VIEW vw_pending_households AS
+SELECT
+    h.household_id,
+    h.family_name,
+    h.primary_contact_name,
+    h.phone_number,
+    h.address,
+    h.city,
+    h.family_size,
+    h.priority_level,
+    h.registration_date,
+    COALESCE(SUM(hpl.distribution_count), 0) AS total_distributions_received,
+    MAX(hpl.last_distribution_date) AS last_distribution_date,
+    DATEDIFF(CURRENT_DATE, DATE(MAX(hpl.last_distribution_date))) AS days_since_last_distribution,
+    CASE
+        WHEN COUNT(hpl.package_id) = 0 THEN 'NEVER_RECEIVED'
+        WHEN DATEDIFF(CURRENT_DATE, DATE(MAX(hpl.last_distribution_date))) > 30 THEN 'OVERDUE'
+        ELSE 'RECENT'
+    END AS distribution_status
+FROM Households h
+LEFT JOIN Household_Package_Last hpl ON h.household_id = hpl.household_id
+WHERE h.status = 'active'
+GROUP BY h.household_id
+HAVING distribution_status IN ('NEVER_RECEIVED', 'OVERDUE')
+ORDER BY
+    CASE h.priority_level
+        WHEN 'critical' THEN 1
+        WHEN 'high' THEN 2
+        WHEN 'medium' THEN 3
+        WHEN 'low' THEN 4
+    END,
+    h.registration_date;
+
+-- Display confirmation
+SELECT 'Household_Package_Last table and eligibility views created successfully' AS status;
@@ -0,0 +1,77 @@
+-- =====================================================
+-- AidTracker - Report Rollups
+-- =====================================================
+-- Pre-aggregated distribution counts behind
+-- /reports/monthly-summary and /reports/distribution-statistics.
+-- A catch-up job (app/services/report_rollups.py) folds new
+-- successful Distribution_Log rows in, remembering how far
+-- it got in Job_Watermarks (high-water mark on log_id).
+--
+-- Distinct households are exact: a membership table per
+-- grain (INSERT IGNORE) and a counter recomputed for the
+-- groups each batch touched.
+-- =====================================================
+
+USE aidtracker_db;
+
+CREATE TABLE IF NOT EXISTS Job_Watermarks (
+    job_name VARCHAR(50) PRIMARY KEY,
+    last_log_id INT NOT NULL DEFAULT 0
+        COMMENT 'Every Distribution_Log row up to this id has been processed',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB COMMENT='Progress of incremental jobs over Distribution_Log';
+
+INSERT IGNORE INTO Job_Watermarks (job_name, last_log_id) VALUES ('report_rollups', 0);
+
+-- Sums at (day, center, package) grain
+CREATE TABLE IF NOT EXISTS Rollup_Daily_Distributions (
+    rollup_date DATE NOT NULL,
+    center_id INT NOT NULL,
+    package_id INT NOT NULL,
+    distributions INT NOT NULL DEFAULT 0,
+    packages_distributed INT NOT NULL DEFAULT 0,
+    first_distribution TIMESTAMP NULL,
+    last_distribution TIMESTAMP NULL,
+
+    PRIMARY KEY (rollup_date, center_id, package_id),
+    INDEX idx_center_package (center_id, package_id)
+) ENGINE=InnoDB COMMENT='Successful distributions per day, center and package';
+
+-- Distinct households per (month, center, category)
+CREATE TABLE IF NOT EXISTS Rollup_Monthly_Households (
+    month_start DATE NOT NULL,
+    center_id INT NOT NULL,
+    category VARCHAR(20) NOT NULL,
+    household_id INT NOT NULL,
+
+    PRIMARY KEY (month_start, center_id, category, household_id)
+) ENGINE=InnoDB COMMENT='Households served per month, center and package category';
+
+CREATE TABLE IF NOT EXISTS Rollup_Monthly_Unique (
+    month_start DATE NOT NULL,
+    center_id INT NOT NULL,
+    category VARCHAR(20) NOT NULL,
+    unique_households INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (month_start, center_id, category)
+) ENGINE=InnoDB;
+
+-- Distinct households per (center, package), all time
+CREATE TABLE IF NOT EXISTS Rollup_Center_Package_Households (
+    center_id INT NOT NULL,
+    package_id INT NOT NULL,
+    household_id INT NOT NULL,
+
+    PRIMARY KEY (center_id, package_id, household_id)
+) ENGINE=InnoDB COMMENT='Households ever served per center and package';
+
+CREATE TABLE IF NOT EXISTS Rollup_Center_Package_Unique (
+    center_id INT NOT NULL,
+    package_id INT NOT NULL,
+    unique_households INT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (center_id, package_id)
+) ENGINE=InnoDB;
+
+-- Display confirmation
+SELECT 'Report rollup tables created successfully' AS status;
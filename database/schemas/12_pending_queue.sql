@@ -0,0 +1,72 @@
+-- =====================================================
+-- AidTracker - Pending-Household Work Queue
+-- =====================================================
+-- Pending_Queue has one row per active household with the
+-- columns the outreach list sorts and filters on, kept in
+-- step with Households and Household_Package_Last by the
+-- API and sp_distribute_package. A household is pending when
+-- it never received aid or its last distribution is more
+-- than 30 days old.
+--
+-- Caseworkers claim rows with FOR UPDATE SKIP LOCKED
+-- (POST /api/outreach/claim); a claim lapses on its own at
+-- claim_expires_at.
+--
+-- Rebuild from backend/:
+--   python -m app.services.pending_queue rebuild
+-- =====================================================
+
+USE aidtracker_db;
+
+CREATE TABLE IF NOT EXISTS Pending_Queue (
+    household_id INT PRIMARY KEY,
+    priority_rank TINYINT NOT NULL
+        COMMENT '1 = critical, 2 = high, 3 = medium, 4 = low',
+    registration_date DATE NOT NULL,
+    last_distribution_date TIMESTAMP NULL
+        COMMENT 'Newest successful distribution of any package',
+    total_distributions INT NOT NULL DEFAULT 0,
+    claimed_by INT NULL,
+    claimed_at TIMESTAMP NULL,
+    claim_expires_at TIMESTAMP NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    CONSTRAINT fk_queue_household FOREIGN KEY (household_id)
+        REFERENCES Households(household_id)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_queue_staff FOREIGN KEY (claimed_by)
+        REFERENCES Staff_Members(staff_id)
+        ON DELETE SET NULL,
+
+    INDEX idx_queue_order (priority_rank, registration_date, household_id),
+    INDEX idx_claimed_by (claimed_by, claim_expires_at)
+) ENGINE=InnoDB COMMENT='Active households in outreach order, with caseworker claims';
+
+-- =====================================================
+-- vw_pending_households read from the queue instead of
+-- grouping the index per request (same columns)
+-- =====================================================
+
+CREATE OR REPLACE VIEW vw_pending_households AS
+SELECT
+    h.household_id,
+    h.family_name,
+    h.primary_contact_name,
+    h.phone_number,
+    h.address,
+    h.city,
+    h.family_size,
+    h.priority_level,
+    h.registration_date,
+    q.total_distributions AS total_distributions_received,
+    q.last_distribution_date,
+    DATEDIFF(CURRENT_DATE, DATE(q.last_distribution_date)) AS days_since_last_distribution,
+    CASE
+        WHEN q.last_distribution_date IS NULL THEN 'NEVER_RECEIVED'
+        ELSE 'OVERDUE'
+    END AS distribution_status
+FROM Pending_Queue q
+INNER JOIN Households h ON h.household_id = q.household_id
+WHERE q.last_distribution_date IS NULL
+   OR q.last_distribution_date < CURRENT_DATE - INTERVAL 30 DAY
+ORDER BY q.priority_rank, q.registration_date, q.household_id;
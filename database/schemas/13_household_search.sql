@@ -0,0 +1,29 @@
+-- =====================================================
+-- AidTracker - Household Search Indexes
+-- =====================================================
+-- Backs GET /api/households/search (intake desks):
+-- - FULLTEXT (ngram parser) over family_name,
+--   primary_contact_name and address, so fragments of a
+--   word match (ngram_token_size, default 2)
+-- - phone_digits_reversed: the phone number's digits,
+--   reversed, so "ends with 4567" is an index range scan
+--   (LIKE '7654%') instead of a full scan
+-- =====================================================
+
+USE aidtracker_db;
+
+ALTER TABLE Households
+    ADD COLUMN phone_digits_reversed VARCHAR(20)
+        GENERATED ALWAYS AS (
+            REVERSE(
+                REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(
+                    phone_number, '-', ''), ' ', ''), '(', ''), ')', ''), '+', ''), '.', '')
+            )
+        ) STORED
+        COMMENT 'Digits of phone_number, reversed (suffix search)',
+    ADD INDEX idx_phone_suffix (phone_digits_reversed),
+    ADD FULLTEXT INDEX ft_household_search (family_name, primary_contact_name, address)
+        WITH PARSER ngram;
+
+-- Display confirmation
+SELECT 'Household search indexes created successfully' AS status;
@@ -0,0 +1,69 @@
+-- =====================================================
+-- AidTracker - Duplicate Household Detection
+-- =====================================================
+-- Review tables filled by app/services/duplicate_detection.py.
+-- The job compares households that share a blocking key
+-- (surname sound + zip, contact name sound + city, street
+-- number + street + zip), scores each candidate pair and
+-- groups connected pairs into clusters for staff review.
+--
+-- A pair is stored once (household_id_a < household_id_b) and
+-- never re-proposed after review. The job's progress is the
+-- highest household_id scanned, kept in Job_Watermarks
+-- ('duplicate_detection', column last_household_id).
+-- =====================================================
+
+USE aidtracker_db;
+
+CREATE TABLE IF NOT EXISTS Duplicate_Clusters (
+    cluster_id INT PRIMARY KEY AUTO_INCREMENT,
+    status ENUM('pending', 'confirmed', 'dismissed') NOT NULL DEFAULT 'pending',
+    household_count INT NOT NULL DEFAULT 0,
+    max_score DECIMAL(5,4) NOT NULL DEFAULT 0,
+    reviewed_by INT NULL,
+    reviewed_at TIMESTAMP NULL,
+    review_notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (reviewed_by) REFERENCES Staff_Members(staff_id)
+        ON DELETE SET NULL,
+
+    INDEX idx_review (status, max_score)
+) ENGINE=InnoDB COMMENT='Groups of households that may be one family';
+
+CREATE TABLE IF NOT EXISTS Duplicate_Pairs (
+    household_id_a INT NOT NULL,
+    household_id_b INT NOT NULL,
+    cluster_id INT NOT NULL,
+    score DECIMAL(5,4) NOT NULL,
+    blocking_key VARCHAR(150) NOT NULL COMMENT 'Key that made the pair a candidate',
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (household_id_a, household_id_b),
+    FOREIGN KEY (household_id_a) REFERENCES Households(household_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (household_id_b) REFERENCES Households(household_id)
+        ON DELETE CASCADE,
+    FOREIGN KEY (cluster_id) REFERENCES Duplicate_Clusters(cluster_id)
+        ON DELETE CASCADE,
+
+    INDEX idx_household_b (household_id_b),
+    INDEX idx_cluster (cluster_id),
+    CONSTRAINT chk_pair_order CHECK (household_id_a < household_id_b)
+) ENGINE=InnoDB COMMENT='Scored candidate duplicate pairs';
+
+-- Incremental runs load only the zip codes / cities of new households
+ALTER TABLE Households ADD INDEX idx_zip_code (zip_code);
+
+-- The watermark is a household_id, not a log_id
+ALTER TABLE Job_Watermarks
+    ADD COLUMN last_household_id INT NOT NULL DEFAULT 0
+        COMMENT 'Every household up to this id has been scanned'
+        AFTER last_log_id,
+    COMMENT = 'Progress of incremental jobs';
+
+INSERT IGNORE INTO Job_Watermarks (job_name) VALUES ('duplicate_detection');
+
+-- Display confirmation
+SELECT 'Duplicate detection tables created successfully' AS status;
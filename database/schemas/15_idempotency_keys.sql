@@ -0,0 +1,30 @@
+-- =====================================================
+-- AidTracker - Idempotency Keys for POST /distribution/distribute
+-- =====================================================
+-- A client that sends an Idempotency-Key header gets the stored
+-- response back when it retries, instead of a second distribution.
+-- The row is claimed (inserted) at the start of the distribution
+-- transaction and filled in just before its COMMIT, so the key, the
+-- Distribution_Log row and the inventory change commit or roll back
+-- together. A concurrent retry waits on the uncommitted key row and
+-- then reads the stored response.
+--
+-- Rows past expires_at are ignored and purged in batches by
+-- app/services/idempotency.py (IDEMPOTENCY_KEY_TTL_SECONDS).
+-- =====================================================
+
+USE aidtracker_db;
+
+CREATE TABLE IF NOT EXISTS Idempotency_Keys (
+    idempotency_key VARCHAR(255) PRIMARY KEY,
+    request_hash CHAR(64) NOT NULL COMMENT 'SHA-256 of the request body',
+    log_id INT NULL COMMENT 'Distribution_Log row created by the request',
+    response JSON NULL COMMENT 'DistributionResponse returned to the client',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+
+    INDEX idx_expires_at (expires_at)
+) ENGINE=InnoDB COMMENT='Stored responses of idempotent distribution requests';
+
+-- Display confirmation
+SELECT 'Idempotency keys table created successfully' AS status;
@@ -0,0 +1,29 @@
+-- =====================================================
+-- AidTracker - Duplicate Detection Scan Jobs
+-- =====================================================
+-- POST /duplicates/scan queues a row here and returns its
+-- job_id; the API worker runs the scan in the background
+-- (app/services/duplicate_detection.py, run_scan) and
+-- records the outcome. Clients poll GET /duplicates/scan/{job_id}.
+--
+-- status: queued -> running -> success | busy | error
+-- (busy: another run held or moved the watermark).
+-- =====================================================
+
+USE aidtracker_db;
+
+CREATE TABLE IF NOT EXISTS Duplicate_Scan_Jobs (
+    job_id INT PRIMARY KEY AUTO_INCREMENT,
+    full_scan BOOLEAN NOT NULL DEFAULT FALSE,
+    status ENUM('queued', 'running', 'success', 'busy', 'error') NOT NULL DEFAULT 'queued',
+    message VARCHAR(500) NULL,
+    summary JSON NULL COMMENT 'detect_duplicates() summary of a successful run',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL,
+
+    INDEX idx_created_at (created_at)
+) ENGINE=InnoDB COMMENT='Background duplicate detection runs started through the API';
+
+-- Display confirmation
+SELECT 'Duplicate scan jobs table created successfully' AS status;
@@ -0,0 +1,44 @@
+-- =====================================================
+-- AidTracker - Backfill Last-Distribution Index
+-- =====================================================
+-- Rebuilds Household_Package_Last from Distribution_Log
+-- after the seed data (which inserts log rows directly).
+-- Same as: python -m app.services.last_distribution backfill
+-- =====================================================
+
+USE aidtracker_db;
+
+DELETE FROM Household_Package_Last;
+
+INSERT INTO Household_Package_Last (
+    household_id, package_id, last_distribution_date,
+    next_eligible_date, last_log_id, distribution_count
+)
+SELECT
+    agg.household_id,
+    agg.package_id,
+    agg.last_distribution_date,
+    DATE(agg.last_distribution_date) + INTERVAL ap.validity_period_days DAY,
+    (
+        SELECT MAX(dl.log_id)
+        FROM Distribution_Log dl
+        WHERE dl.household_id = agg.household_id
+          AND dl.package_id = agg.package_id
+          AND dl.transaction_status = 'success'
+          AND dl.distribution_date = agg.last_distribution_date
+    ),
+    agg.distribution_count
+FROM (
+    SELECT
+        household_id,
+        package_id,
+        MAX(distribution_date) AS last_distribution_date,
+        COUNT(*) AS distribution_count
+    FROM Distribution_Log
+    WHERE transaction_status = 'success'
+    GROUP BY household_id, package_id
+) agg
+INNER JOIN Aid_Packages ap ON ap.package_id = agg.package_id;
+
+-- Display confirmation
+SELECT COUNT(*) AS household_package_last_rows FROM Household_Package_Last;
@@ -0,0 +1,29 @@
+-- =====================================================
+-- AidTracker - Backfill Pending-Household Queue
+-- =====================================================
+-- Builds Pending_Queue from Households and
+-- Household_Package_Last after the seed data.
+-- Same as: python -m app.services.pending_queue rebuild
+-- =====================================================
+
+USE aidtracker_db;
+
+DELETE FROM Pending_Queue;
+
+INSERT INTO Pending_Queue (
+    household_id, priority_rank, registration_date,
+    last_distribution_date, total_distributions
+)
+SELECT
+    h.household_id,
+    FIELD(h.priority_level, 'critical', 'high', 'medium', 'low'),
+    h.registration_date,
+    MAX(hpl.last_distribution_date),
+    COALESCE(SUM(hpl.distribution_count), 0)
+FROM Households h
+LEFT JOIN Household_Package_Last hpl ON hpl.household_id = h.household_id
+WHERE h.status = 'active'
+GROUP BY h.household_id;
+
+-- Display confirmation
+SELECT COUNT(*) AS pending_queue_rows FROM Pending_Queue;
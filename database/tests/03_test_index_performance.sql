@@ -2,6 +2,8 @@
 -- AidTracker - Index Performance Analysis
 -- =====================================================
 -- Demonstrates performance improvements from proper indexing
+-- The plans of the queries the API actually sends are
+-- asserted by backend/benchmarks/query_plans.py
 -- =====================================================
 
 USE aidtracker_db;